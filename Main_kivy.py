@@ -7,53 +7,65 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.uix.progressbar import ProgressBar
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.widget import Widget
+from kivy.uix.behaviors import ButtonBehavior
 from kivy.uix.popup import Popup
 from kivy.core.window import Window
 from kivy.utils import get_color_from_hex
 from kivy.clock import Clock
-from kivy.metrics import dp
+from kivy.metrics import dp, sp
 from kivy.properties import BooleanProperty, ListProperty, NumericProperty
 import random
-import math
 import os
-import re
+import threading
+import time
 from datetime import datetime
 
 # Import your existing logic
 from wrestler import Wrestler, WrestlerState, GrappleRole, MAX_HEALTH
 from moves_db import MOVES
+from cards import COLORS as CARD_COLORS
 from wrestler_roster import ROSTER, DEFAULT_CPU_PROFILE, DEFAULT_PLAYER_PROFILE
+from career import CAREER_DB_FILENAME, CareerSimulator, CareerStore, history_record, play_card_match
+from history import HISTORY_DB_FILENAME, HistoryStore, HistoryWriter, record_from_engine
+from endgame import load_table as load_endgame_table
+from winprob import load_model as load_winprob_model
+from hot_reload import SourceWatcher, reload_moves, reload_roster
+from snapshot import SNAPSHOT_FILENAME, discard_snapshot, load_snapshot, restore as restore_snapshot, save_snapshot
+
+# Headless match engine (rules, CPU AI) + the gameplay tuning knobs the UI reads
+from engine import (
+    MatchEngine,
+    HEADLESS_MAX_BEATS,
+    COLOR_HEX_NAME_YOU,
+    COLOR_HEX_GRAPPLE_LOG,
+    COLOR_HEX_DEFENSIVE_LOG,
+    COLOR_HEX_HP_STRAINED,
+    COLOR_HEX_HP_CRITICAL,
+    TUNING_HYPE_SHOP_GRIT_REFILL_COST,
+    TUNING_HYPE_SHOP_GRIT_REFILL_AMOUNT,
+    TUNING_FIRED_UP_CARD_BONUS_PER_CARD,
+    TUNING_DAZE_COOLDOWN_TURNS,
+    MOMENTUM_MAX_ABS,
+    MOMENTUM_SCORE_TIER1_MAX,
+    MOMENTUM_SCORE_TIER1_BONUS,
+    MOMENTUM_SCORE_TIER2_BONUS,
+    STALE_CLASH_SCORE_PENALTY,
+)
 
 # Stable move IDs (slugs)
-MOVE_DEFENSIVE = "def_defensive"
-MOVE_REST = "util_rest"
-MOVE_GROGGY_RECOVERY = "util_groggy_recovery"
-MOVE_TAUNT = "util_taunt"
-MOVE_SLOW_STAND_UP = "util_slow_stand_up"
-MOVE_KIP_UP = "util_kip_up"
-MOVE_LOCK_UP = "grap_lock_up"
-MOVE_FIGHT_FOR_CONTROL = "grap_fight_for_control"
-MOVE_SHOVE_OFF = "grap_shove_off"
-MOVE_STOP_SHORT = "util_stop_short"
-MOVE_CLIMB_DOWN = "air_climb_down"
-MOVE_PIN = "pin_pin"
-MOVE_DOUBLE_LEG_TAKEDOWN = "grap_double_leg_takedown"
-MOVE_DESPERATION_PUNCH = "strike_desperation_punch"
-MOVE_LIGHT_JAB = "strike_light_jab"
-MOVE_HEADBUTT = "grap_headbutt"
-MOVE_UPKICK = "strike_upkick"
-MOVE_GROUND_ROLL = "util_ground_roll"
-MOVE_BITE = "strike_bite"
-MOVE_FOREARM_CLUB = "strike_forearm_club"
-MOVE_KNEE_TO_GUT = "strike_knee_to_gut"
-MOVE_EAR_CLAP = "strike_ear_clap"
-MOVE_GUT_PUNCH = "strike_gut_punch"
-MOVE_CHARGE = "util_charge"
-MOVE_RUNNING_CLOTHESLINE = "strike_running_clothesline"
-MOVE_BRACE_CLOTHESLINE = "strike_brace_clothesline"
-MOVE_RUNNING_COLLISION = "strike_running_collision"
-MOVE_TRIP = "strike_trip"
-MOVE_REGAIN_BALANCE = "util_regain_balance"
+from move_ids import (
+    MOVE_DEFENSIVE,
+    MOVE_REST,
+    MOVE_GROGGY_RECOVERY,
+    MOVE_TAUNT,
+    MOVE_SLOW_STAND_UP,
+    MOVE_KIP_UP,
+    MOVE_LOCK_UP,
+    MOVE_FIGHT_FOR_CONTROL,
+    MOVE_SHOVE_OFF,
+    MOVE_STOP_SHORT,
+    MOVE_CLIMB_DOWN,
+)
 
 # ==========================================
 #  🎨 THEME & TUNING (Tinker Here!)
@@ -92,22 +104,6 @@ COLOR_HEX_RETURN = "#9900FF"              # Arcade Purple
 COLOR_HEX_PLAY_ENABLED = "00FF00"         # Pure Green
 COLOR_HEX_PLAY_DISABLED = "333333"        # Dim Grey
 
-# Markup/log colors (hex)
-COLOR_HEX_NAME_YOU = "00FFFF"             # Cyber Cyan
-COLOR_HEX_NAME_CPU = "FF00FF"             # Neon Magenta
-COLOR_HEX_DAMAGE = "FF0000"               # Pure Red
-COLOR_HEX_STRIKE_LOG = "FF3333"           # Bright Crimson
-COLOR_HEX_GRAPPLE_LOG = "3333FF"          # Bright Blue
-COLOR_HEX_SETUP_LOG = "FFFF00"            # Classic Yellow
-COLOR_HEX_DEFENSIVE_LOG = "AAAAAA"        # Silver
-
-# HP status colors (Fog of War)
-COLOR_HEX_HP_OPTIMAL   = "00FF00"         # Pure Green
-COLOR_HEX_HP_STABLE    = "ADFF2F"         # Green-Yellow
-COLOR_HEX_HP_STRAINED  = "FFFF00"         # Pure Yellow
-COLOR_HEX_HP_EXHAUSTED = "FF8C00"         # Dark Orange
-COLOR_HEX_HP_CRITICAL  = "FF0000"         # Pure Red
-
 # --- Refined 16-Bit Arcade (Physical Button feel) ---
 COLOR_STRIKE    = (0.70, 0.05, 0.05, 1)   # Deep Punchy Red
 COLOR_GRAPPLE   = (0.05, 0.20, 0.70, 1)   # Power Blue
@@ -123,121 +119,26 @@ COLOR_CHAIN = (1.00, 1.00, 0.00, 1)       # Flashing Yellow
 # Card selection highlight
 COLOR_CARD_SELECTED = (1.00, 0.00, 1.00, 1) # Neon Magenta
 
+# Hand card faces by card color (anything else: COLOR_BTN_BASE)
+CARD_FACE_COLORS = {
+    "RED": COLOR_STRIKE,
+    "BLUE": COLOR_GRAPPLE,
+    "GREEN": COLOR_SUBMIT,
+    "YELLOW": COLOR_AERIAL,
+}
+
 # ==========================================
-#  🎛️ TUNING KNOBS
+#  🎛️ UI TUNING
 # ==========================================
-TUNING_ENABLE_PASSIVE_REGEN = True
-TUNING_GRIT_PASSIVE_REGEN = 2  # Grit recovered if you spent 0 this turn
-
-# --- Tinker: Hype Economy (Taunt + Hype Shop) ---
-# These were previously hard-coded in execution/UI logic.
-# Goal: prevent "Hype Shop > Grit Refill" from being an unlimited grit loop.
-TUNING_TAUNT_HYPE_BASE = 20
-TUNING_TAUNT_HYPE_PER_CARD_VALUE = 2
-TUNING_TAUNT_HYPE_MAX = 45
-
-TUNING_HYPE_SHOP_GRIT_REFILL_COST = 50
-TUNING_HYPE_SHOP_GRIT_REFILL_AMOUNT = 3
-
-# Rest punish: if you get hit while Resting, your recovery is interrupted.
-# Additionally, the hit has a chance to become a "caught resting" critical (150% damage).
-TUNING_CAUGHT_RESTING_CRIT_CHANCE = 0.25
-
-# Botch mechanic: injured wrestlers may fail Attack moves.
-# Chance (%) = Missing_HP / TUNING_BOTCH_DIVISOR
-TUNING_BOTCH_DIVISOR = 4
-
-# True ties (score AND strength tied): chance of a classic double-down spot.
-TUNING_DOUBLE_DOWN_ON_TRUE_TIE_CHANCE = 0.25
-
-# True ties: if clash score and Strength are tied, sometimes both crash.
-TUNING_DOUBLE_DOWN_ON_TRUE_TIE_CHANCE = 0.25
-
-# Grapple-break strikes: if defender wins the clash by this margin while using a
-# grapple-defense Strike, the grapple breaks and both reset to STANDING.
-GRAPPLE_BREAK_STRIKE_VALUE = 3
-
-# Log readability
-LOG_EXCHANGE_SEPARATOR = "────────────────────────"
-
-# Clash reveal tuning
-REVEAL_LOSER_MOVE_NAME = True
-REVEAL_LOSER_CARDS = False
-
-# Optional debugging: show score math in the log
-REVEAL_SCORE_BREAKDOWN = True
-
-# Damage tuning
-DOUBLES_DAMAGE_MODIFIER = 1.25
-SUBMISSION_TICK_DAMAGE = 4
-
-# Pin anti-spam: when a defender escapes a pin, future pin escapes get easier.
-# (Threshold is multiplied by this factor each successful pin escape.)
-TUNING_PIN_ESCAPE_THRESHOLD_MULT_ON_SUCCESS = 0.85
-
-# Pin anti-spam recovery: taking damage makes future pin escapes harder again
-# by slowly recovering the pin escape multiplier back toward 1.0.
-# This fixes the "threshold keeps going net negative" feel after repeated kickouts.
-TUNING_PIN_ESCAPE_THRESHOLD_MULT_RECOVER_PER_DAMAGE = 0.0025
-
-# FIRE UP!: cash in momentum to enter a short buff state.
-# - +2 bonus to each played card for a few turns (duration based on momentum tier)
-# - cannot botch while active
-# - wins clash ties while only one side is fired up
-TUNING_FIRED_UP_CARD_BONUS_PER_CARD = 2
-TUNING_CPU_FIRE_UP_CHANCE_PER_MOM = 0.10
-
-# AKI-style DAZED tuning (probabilistic, HP-based)
-TUNING_DAZE_HP_THRESHOLD = 80       # HP% above this = immune to Daze
-TUNING_DAZE_CHANCE_SCALAR = 1.5     # Lower HP => higher chance
-TUNING_DAZE_MAX_TURNS = 3           # Max duration applied
-TUNING_DAZE_WAKE_DAMAGE = 15        # If hit this hard while dazed, wake up instantly
-
-# Daze death-spiral protection: after clearing groggy/daze, grant brief immunity
-# to re-applying DAZED so a wrestler can re-stabilize.
-TUNING_DAZE_COOLDOWN_TURNS = 2
-
-# Strike knockdowns: for strike moves that *can* ground a standing/running opponent,
-# chance = missing_hp_pct * 100 * scalar (clamped to 0..100).
-TUNING_STRIKE_KNOCKDOWN_CHANCE_SCALAR = 1.0
-
-# Momentum tuning
-MOMENTUM_MAX_ABS = 5
-MOMENTUM_WIN_DELTA = 1
-MOMENTUM_GAIN_ON_ATTACKS_ONLY = True
-MOMENTUM_REVERSAL_RESET_THRESHOLD = 4
-
-# Momentum -> clash score modifier mapping
-# 1-3 = +1, 4-5 = +2 (signed)
-MOMENTUM_SCORE_TIER1_MAX = 3
-MOMENTUM_SCORE_TIER1_BONUS = 1
-MOMENTUM_SCORE_TIER2_MAX = 5
-MOMENTUM_SCORE_TIER2_BONUS = 2
-
-# CPU grounded behavior
-CPU_GETUP_HEALTHY_PCT = 0.60
-CPU_GETUP_BONUS_HEALTHY = 45
-CPU_UPKICK_PENALTY_WHEN_HEALTHY = 22
-CPU_REST_BONUS_WHEN_HURT = 28
-CPU_REST_HURT_PCT = 0.45
-
-# CPU anti-turtle tuning
-CPU_RND_PICK_FROM_TOP_N = 5
-CPU_DEFENSIVE_BASE_PENALTY = 18
-CPU_DEFENSIVE_EMERGENCY_HP_PCT = 0.35
-CPU_DEFENSIVE_EMERGENCY_BONUS = 14
-
-# Additional guardrails against Defensive / Reversal spam.
-CPU_DEFENSIVE_COOLDOWN_TURNS = 2
-CPU_DEFENSIVE_COOLDOWN_SCORE_PENALTY = 999
-CPU_DEFENSIVE_REPEAT_EXTRA_PENALTY = 25
-
-# Stale move tuning (discourages repeating the same attack)
-# A move becomes STALE if it's used >= STALE_REPEAT_THRESHOLD times within the
-# last STALE_WINDOW_ATTACK_MOVES attack moves (including the current attempt).
-STALE_WINDOW_ATTACK_MOVES = 4
-STALE_REPEAT_THRESHOLD = 2
-STALE_CLASH_SCORE_PENALTY = 3
+# Gameplay tuning knobs live in engine.py.
+
+# CPU decision runs on a worker thread against a state snapshot (False = inline).
+CPU_THINK_ASYNC = True
+
+# Dev mode: watch moves_db.py / wrestler_roster.py and reload edits into the
+# running app between beats (hot_reload.py). Polls the files every DEV_HOT_RELOAD_POLL_S.
+DEV_HOT_RELOAD = False
+DEV_HOT_RELOAD_POLL_S = 1.0
 
 # Character Select: difficulty/power level (derived from ai_traits)
 AI_POWER_WEIGHT_GREED = 2.00
@@ -246,12 +147,12 @@ AI_POWER_WEIGHT_RND = 1.00
 AI_POWER_WEIGHT_BAD = 0.75
 AI_POWER_SCALE = 100  # final score is roughly 75..200
 
-# Auto-grit: prevent high-damage 0-cost moves from being "free".
-TUNING_AUTO_GRIT_ON_DAMAGE = True
-AUTO_GRIT_ONLY_WHEN_BASE_COST_ZERO = True
-AUTO_GRIT_DAMAGE_THRESHOLD = 6
-AUTO_GRIT_DAMAGE_STEP = 4
-AUTO_GRIT_PER_STEP = 1
+# Spectator mode (CPU vs CPU): (button label, seconds per beat). None = run as
+# many beats as fit in SPECTATE_FRAME_BUDGET_S each frame; only the last is painted.
+SPECTATE_SPEEDS = (("1×", 0.9), ("4×", 0.225), ("MAX", None))
+SPECTATE_FRAME_BUDGET_S = 0.012
+# Pause on the finish at 1× before the next match starts (turbo speeds don't wait).
+SPECTATE_NEXT_MATCH_DELAY_S = 2.0
 
 # ==========================================
 #  ✨ VFX (Clash / Damage Overlay)
@@ -270,6 +171,21 @@ VFX_OVERLAY_DAMAGE_CAP = 20
 # - "FLAT": always uses VFX_OVERLAY_FADE_MAX
 VFX_OVERLAY_DURATION_MODE = "DYNAMIC"  # DYNAMIC | FLAT
 
+# Resume after the OS killed the app: log lines re-added to the log widget
+# (the full log is still kept for EXPORT LOG).
+RESUME_LOG_TAIL = 40
+
+# Critical-limb HUD blink: a limb below LIMB_CRITICAL (0..100; where the
+# concussed / winded / hobbled penalties start) shows red, and its line dims to
+# LIMB_BLINK_DIM_OPACITY on the "off" beat.
+LIMB_CRITICAL = 30
+LIMB_BLINK_DIM_OPACITY = 0.35
+LIMB_BLINK_INTERVAL_S = 0.55
+
+# Power saving: seconds without a touch or key before decorative animation
+# (the limb blink) is suspended. The next input brings it back.
+IDLE_AFTER_S = 30.0
+
 # ==========================================
 #  📏 DIMENSIONS & LAYOUT
 # ==========================================
@@ -393,16 +309,21 @@ class CenteredBar(Widget):
 
 
 class ScreenFlash(Widget):
-    """Full-screen overlay flash that fades out."""
+    """Full-screen overlay flash that fades out.
+
+    The fade is a single Animation on the overlay's Color instruction, so no
+    per-frame callback of our own runs. A flash that starts while another is
+    still fading takes over the overlay (new color, the brighter alpha and the
+    longer remaining time) instead of stacking. While `enabled` is False
+    (e.g. turbo spectating) flashes are dropped.
+    """
 
-    alpha = NumericProperty(0.0)
-    rgba = ListProperty([1, 1, 1, 0])
+    enabled = BooleanProperty(True)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._fade_ev = None
-        self._t = 0.0
-        self._dur = 0.5
+        self._anim = None
+        self._ends_at = 0.0
         with self.canvas:
             from kivy.graphics import Color, Rectangle
 
@@ -410,47 +331,40 @@ class ScreenFlash(Widget):
             self._rect = Rectangle(pos=self.pos, size=self.size)
 
         self.bind(pos=self._redraw, size=self._redraw)
-        self.bind(alpha=self._apply)
-        self.bind(rgba=self._apply)
+        self.bind(enabled=lambda *_a: None if self.enabled else self._stop())
 
     def _redraw(self, *_args):
         self._rect.pos = self.pos
         self._rect.size = self.size
 
-    def _apply(self, *_args):
-        r, g, b, _a = (list(self.rgba) + [0, 0, 0, 0])[:4]
-        self._color.rgba = (float(r), float(g), float(b), float(self.alpha))
+    def _stop(self) -> None:
+        if self._anim is not None:
+            self._anim.cancel(self._color)
+            self._anim = None
+        self._color.a = 0.0
 
     def flash(self, *, rgb: tuple[float, float, float], duration: float, alpha: float | None = None) -> None:
-        if self._fade_ev is not None:
-            try:
-                self._fade_ev.cancel()
-            except Exception:
-                pass
-            self._fade_ev = None
+        if not self.enabled:
+            return
+        from kivy.animation import Animation
 
-        self.rgba = [float(rgb[0]), float(rgb[1]), float(rgb[2]), 1.0]
         start_alpha = float(VFX_OVERLAY_ALPHA) if alpha is None else float(alpha)
         start_alpha = max(0.0, min(1.0, float(start_alpha)))
-        self.alpha = float(start_alpha)
-        self._t = 0.0
-        self._dur = max(0.05, float(duration))
-
-        def step(dt: float) -> None:
-            self._t += float(dt)
-            p = min(1.0, self._t / max(0.001, self._dur))
-            # Linear fade to 0
-            self.alpha = float(start_alpha) * (1.0 - p)
-            if p >= 1.0:
-                self.alpha = 0.0
-                if self._fade_ev is not None:
-                    try:
-                        self._fade_ev.cancel()
-                    except Exception:
-                        pass
-                    self._fade_ev = None
-
-        self._fade_ev = Clock.schedule_interval(step, 1 / 60.0)
+        duration = max(0.05, float(duration))
+
+        # Coalesce with a fade still in progress.
+        now = Clock.get_time()
+        if self._anim is not None:
+            self._anim.cancel(self._color)
+            start_alpha = max(start_alpha, float(self._color.a))
+            duration = max(duration, self._ends_at - now)
+        self._ends_at = now + duration
+
+        self._color.rgba = (float(rgb[0]), float(rgb[1]), float(rgb[2]), start_alpha)
+        anim = Animation(a=0.0, duration=duration, t="linear")
+        anim.bind(on_complete=lambda *_a: setattr(self, "_anim", None) if self._anim is anim else None)
+        self._anim = anim
+        anim.start(self._color)
 
 
 class BorderedButton(Button):
@@ -519,43 +433,187 @@ class BorderedButton(Button):
         self._border_line.rectangle = (float(self.x), float(self.y), float(self.width), float(self.height))
         self._border_line.width = float(self.border_width)
 
-class WrestleApp(App):
+class CardAtlas:
+    """Every hand-card face (value x color) rendered once into one texture.
+
+    Faces are drawn into an Fbo the first time the hand is painted; card
+    widgets then just point a Rectangle at a region of it. Modifier captions
+    ("+1 TYPE", "+3") are a handful of strings, so their textures are cached
+    by text.
+    """
+
+    VALUES = tuple(range(1, 11))
+
+    def __init__(self) -> None:
+        from kivy.core.text import Label as CoreLabel
+        from kivy.graphics import ClearBuffers, ClearColor, Color, Fbo, Rectangle
+
+        self._CoreLabel = CoreLabel
+        glyphs = {}
+        for v in self.VALUES:
+            lbl = CoreLabel(text=str(v), font_size=sp(24), bold=True)
+            lbl.refresh()
+            glyphs[v] = lbl.texture
+        pad = int(dp(4))
+        cw = max(int(t.width) for t in glyphs.values()) + 2 * pad
+        ch = max(int(t.height) for t in glyphs.values()) + 2 * pad
+        self.cell_size = (cw, ch)
+
+        colors = list(CARD_COLORS)
+        self._fbo = Fbo(size=(cw * len(self.VALUES), ch * len(colors)))
+        self._cells: dict[tuple[int, str], tuple[int, int]] = {}
+        with self._fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+            for row, color in enumerate(colors):
+                for col, v in enumerate(self.VALUES):
+                    x, y = col * cw, row * ch
+                    self._cells[(v, color)] = (x, y)
+                    Color(*CARD_FACE_COLORS.get(color, COLOR_BTN_BASE))
+                    Rectangle(pos=(x, y), size=(cw, ch))
+                    t = glyphs[v]
+                    Color(1, 1, 1, 1)
+                    Rectangle(texture=t, size=t.size, pos=(x + (cw - t.width) // 2, y + (ch - t.height) // 2))
+        self._fbo.draw()
+        self._faces: dict = {}
+        self._captions: dict = {}
+
+    def face(self, value: int, color: str):
+        key = (int(value), str(color))
+        tex = self._faces.get(key)
+        if tex is None:
+            x, y = self._cells.get(key, self._cells[(max(1, min(10, int(value))), "GRAY")])
+            tex = self._fbo.texture.get_region(x, y, *self.cell_size)
+            self._faces[key] = tex
+        return tex
+
+    def caption(self, text: str):
+        if not text:
+            return None
+        tex = self._captions.get(text)
+        if tex is None:
+            lbl = self._CoreLabel(text=str(text), font_size=sp(12), bold=True)
+            lbl.refresh()
+            tex = lbl.texture
+            self._captions[text] = tex
+        return tex
+
+
+class CardFace(ButtonBehavior, Widget):
+    """Hand card drawn from CardAtlas textures: tapping or re-painting only swaps textures."""
+
+    card_index = NumericProperty(-1)
+    selected = BooleanProperty(False)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._face_tex = None
+        self._caption_tex = None
+        with self.canvas:
+            from kivy.graphics import Color, Line, Rectangle
+
+            self._bg_color = Color(*COLOR_BTN_BASE)
+            self._bg_rect = Rectangle(pos=self.pos, size=self.size)
+            self._tint = Color(1, 1, 1, 1)
+            self._face_rect = Rectangle(pos=self.pos, size=(0, 0))
+            self._caption_rect = Rectangle(pos=self.pos, size=(0, 0))
+            self._border_color = Color(*COLOR_CARD_SELECTED)
+            self._border_line = Line(rectangle=(self.x, self.y, self.width, self.height), width=float(dp(2)))
+        self.bind(pos=self._relayout, size=self._relayout, selected=self._relayout, state=self._on_state)
+        self._relayout()
+
+    def show(self, *, bg, face, caption, selected: bool) -> None:
+        self._bg_color.rgba = list(bg)
+        self._face_tex = face
+        self._caption_tex = caption
+        self._face_rect.texture = face
+        self._caption_rect.texture = caption
+        self.selected = bool(selected)
+        self._relayout()
+
+    def _on_state(self, *_a) -> None:
+        # Pressed feedback, like a Button's darker background.
+        v = 0.75 if self.state == "down" else 1.0
+        self._tint.rgba = [v, v, v, 1]
+
+    def _relayout(self, *_a) -> None:
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+        fw, fh = self._face_tex.size if self._face_tex is not None else (0, 0)
+        cw, chh = self._caption_tex.size if self._caption_tex is not None else (0, 0)
+        # Value above its modifier caption, the pair centered in the card.
+        top = self.center_y + (fh + chh) / 2.0
+        self._face_rect.size = (fw, fh)
+        self._face_rect.pos = (self.center_x - fw / 2.0, top - fh)
+        self._caption_rect.size = (cw, chh)
+        self._caption_rect.pos = (self.center_x - cw / 2.0, top - fh - chh)
+        self._border_color.a = 1.0 if self.selected else 0.0
+        self._border_line.rectangle = (float(self.x), float(self.y), float(self.width), float(self.height))
+
+
+class WrestleApp(MatchEngine, App):
     def build(self):
         Window.clearcolor = COLOR_BG_MAIN
 
+        # Frame-coalesced UI: engine hooks mark regions dirty, _flush_ui paints once per frame.
+        self._ui_dirty: set[str] = set()
+        self._ui_hud_force: bool = False
+        self._log_pending: list[str] = []
+        # timeout -1: run before the next frame is drawn.
+        self._ui_flush_trigger = Clock.create_trigger(self._flush_ui, -1)
+
         # --- Game Objects (default; replaced after character select) ---
         p_prof = dict(ROSTER.get(DEFAULT_PLAYER_PROFILE, {}))
         c_prof = dict(ROSTER.get(DEFAULT_CPU_PROFILE, {}))
-        self.player = Wrestler("YOU", True, profile=p_prof)
-        self.cpu = Wrestler("CPU", False, profile=c_prof)
-
-        # Buffs (simple flags; stored on wrestler objects)
-        self.player.lockup_edge_ready = False
-        self.cpu.lockup_edge_ready = False
-        
-        # Game State
-        self.game_over = False
-        self._last_cpu_mode: str | None = None
-        self.turn = "player"
-        self._escape_mode: dict | None = None
-        self.selected_cards: set[int] = set()
-        self.selected_move: str | None = None
-        self._menu_stage: str = "CATEGORIES"  # CATEGORIES | MOVES | HYPE_SHOP | ESCAPE
-        self._selected_category: str | None = None
-
-        # UX: avoid confusion when cards are tapped before a move is selected.
-        self._card_tap_hint_shown: bool = False
-
-        # Log capture (exportable)
-        self._log_lines: list[str] = []
+        # Wrestlers + game state (see MatchEngine._setup_match)
+        self._setup_match(p_prof, c_prof)
         self._match_started_at = datetime.now()
 
+        # Hand cards: face textures (built on first paint) + reusable card widgets.
+        self._card_atlas: CardAtlas | None = None
+        self._hand_faces: list[CardFace] = []
+
         # HUD limb blink (warn when limb penalties are active)
         self._limb_blink_on: bool = True
 
-        # Momentum: -5..+5 (positive favors the player)
-        self.momentum: int = 0
-        
+        # Power saving: the blink interval only exists while it has something to do.
+        self._blink_ev = None
+        self._power_paused: bool = False
+        self._power_idle: bool = False
+        self._idle_trigger = Clock.create_trigger(self._enter_idle, IDLE_AFTER_S)
+
+        # Last painted HUD values (see _hud_change_set)
+        self._hud_prev: dict = {}
+
+        # CPU thinking: bumped to discard in-flight results; player move waiting on the CPU.
+        self._cpu_think_gen: int = 0
+        self._cpu_pending_submit: tuple | None = None
+        # Worker threads still running (they read MOVES; hot reload waits for 0).
+        self._cpu_think_live: int = 0
+        # Speculative CPU action for the current beat: {"key": ..., "result": (mode, move, cards) | None}
+        self._cpu_plan: dict | None = None
+        self._cpu_plan_ev = None
+
+        # Career mode: save + background sims for this week's other matches.
+        self._career: CareerStore | None = None
+        self._career_sim: CareerSimulator | None = None
+        # {"week", "gen", "live": CardMatch, "expected": int, "results": {slot: dict}} while a week is open
+        self._career_week: dict | None = None
+        self._career_gen: int = 0
+
+        # Match history (SQLite); slugs of the match in progress for recording.
+        self._history: HistoryStore | None = None
+        self._history_writer: HistoryWriter | None = None
+        self._match_slugs: tuple[str, str] = (DEFAULT_PLAYER_PROFILE, DEFAULT_CPU_PROFILE)
+
+        # CPU-vs-CPU spectating: {"slugs", "speed", "ev", "next_ev", "matches", "tally"} or None.
+        self._spectate: dict | None = None
+
+        # Win-probability model (HUD readout + CPU dynamic difficulty); None if not shipped.
+        self.win_model = load_winprob_model()
+        # Endgame tablebase (CPU pin-or-press and escape card play); None if not shipped.
+        self.endgame_table = load_endgame_table()
+
         # --- ROOT LAYOUT ---
         root = FloatLayout()
         self.root = root
@@ -581,7 +639,7 @@ class WrestleApp(App):
         )
         self.state_label.bind(size=lambda inst, _v: setattr(inst, 'text_size', (inst.width, inst.height)))
         hud.add_widget(self.state_label)
-        
+
         hp_row = BoxLayout(orientation='horizontal', spacing=GAP_SM, size_hint_y=None, height=dp(54))
         left_hp = BoxLayout(orientation='vertical')
         right_hp = BoxLayout(orientation='vertical')
@@ -722,7 +780,7 @@ class WrestleApp(App):
         mom_row = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(28))
         mom_row.add_widget(mom_box)
         mom_row.add_widget(self.fire_up_btn)
-        
+
         meters_row = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(82))
 
         purple = get_color_from_hex(COLOR_HEX_GRIT)
@@ -863,17 +921,11 @@ class WrestleApp(App):
         hud.add_widget(mom_row)
         hud.add_widget(meters_row)
 
-        # Blink the limb HUD when penalties are active.
-        try:
-            Clock.schedule_interval(self._tick_limb_blink, 0.55)
-        except Exception:
-            pass
-
         # 2. ARENA (Middle)
         arena_box = BoxLayout(orientation='vertical', size_hint_y=1)
 
         # (Log Controls removed; Export/Rules moved into a single Settings menu.)
-        
+
         # A. Game Log (Top of Arena)
         self.log_scroll = ScrollView(size_hint_y=ARENA_LOG_PCT)
         self.log_scroll.do_scroll_x = False
@@ -889,13 +941,13 @@ class WrestleApp(App):
         self.move_list_layout.bind(minimum_height=self.move_list_layout.setter('height'))
         self.move_scroll.add_widget(self.move_list_layout)
         arena_box.add_widget(self.move_scroll)
-        
+
         main.add_widget(hud)
         main.add_widget(arena_box)
 
         # 3. CONTROL BAR
         controls = BoxLayout(orientation='horizontal', size_hint_y=None, height=CONTROL_HEIGHT, spacing=GAP_SM, padding=[PAD_SM, PAD_XS, PAD_SM, PAD_XS])
-        
+
         self.return_btn = Button(
             text="< RETURN",
             background_color=get_color_from_hex(COLOR_HEX_RETURN),
@@ -961,9 +1013,20 @@ class WrestleApp(App):
         self._flash = ScreenFlash(size_hint=(1, 1), pos_hint={'x': 0, 'y': 0})
         root.add_widget(self._flash)
 
-        # Character select overlay (shown by default)
+        # Dev hot reload of moves / roster (see DEV HOT RELOAD).
+        self._reload_watcher: SourceWatcher | None = None
+        if DEV_HOT_RELOAD:
+            self._reload_watcher = SourceWatcher()
+            Clock.schedule_interval(self._poll_hot_reload, DEV_HOT_RELOAD_POLL_S)
+
+        # Any input ends idle mode (see POWER SAVING).
+        Window.bind(on_touch_down=self._on_user_input, on_key_down=self._on_user_input)
+        self._idle_trigger()
+
+        # Character select overlay (shown unless a suspended match comes back)
         self._build_character_select_overlay(root)
-        self._enter_character_select()
+        if not self._resume_suspended_match():
+            self._enter_character_select()
         return root
 
     # -------------------------------------------------------------------------
@@ -1081,8 +1144,17 @@ class WrestleApp(App):
             width=dp(120),
         )
         self._select_random_btn.bind(on_release=self._on_select_random)
+        self._select_career_btn = Button(
+            text="CAREER",
+            background_color=COLOR_BTN_BASE,
+            background_normal="",
+            size_hint_x=None,
+            width=dp(120),
+        )
+        self._select_career_btn.bind(on_release=self._on_select_career)
         top.add_widget(self._select_title)
         top.add_widget(self._select_random_btn)
+        top.add_widget(self._select_career_btn)
         sel.add_widget(top)
 
         # Selection status line
@@ -1131,6 +1203,23 @@ class WrestleApp(App):
             width=dp(120),
         )
         self._select_reset_btn.bind(on_release=self._on_select_reset)
+        self._select_stats_btn = Button(
+            text="STATS",
+            background_color=COLOR_BTN_BASE,
+            background_normal="",
+            size_hint_x=None,
+            width=dp(120),
+        )
+        self._select_stats_btn.bind(on_release=self._show_stats)
+        self._select_spectate_btn = Button(
+            text="SPECTATE",
+            background_color=COLOR_BTN_BASE,
+            background_normal="",
+            size_hint_x=None,
+            width=dp(120),
+            disabled=True,
+        )
+        self._select_spectate_btn.bind(on_release=self._on_select_spectate)
         self._select_start_btn = Button(
             text="START",
             background_color=get_color_from_hex(COLOR_HEX_PLAY_DISABLED),
@@ -1139,6 +1228,8 @@ class WrestleApp(App):
         )
         self._select_start_btn.bind(on_release=self._on_select_start)
         bottom.add_widget(self._select_reset_btn)
+        bottom.add_widget(self._select_stats_btn)
+        bottom.add_widget(self._select_spectate_btn)
         bottom.add_widget(self._select_start_btn)
         sel.add_widget(bottom)
 
@@ -1177,6 +1268,7 @@ class WrestleApp(App):
             pass
 
     def _enter_character_select(self) -> None:
+        self._stop_spectate()
         self._select_stage = "PLAYER"  # PLAYER | CPU
         self._selected_player_slug = None
         self._selected_cpu_slug = None
@@ -1279,11 +1371,17 @@ class WrestleApp(App):
         c_slug = getattr(self, "_selected_cpu_slug", None)
         p_name = str(ROSTER.get(p_slug, {}).get("name", "(none)")) if p_slug else "(none)"
         c_name = str(ROSTER.get(c_slug, {}).get("name", "(none)")) if c_slug else "(none)"
-        self._select_status.text = f"Player: {p_name}   |   CPU: {c_name}"
+        status = f"Player: {p_name}   |   CPU: {c_name}"
+        if p_slug and c_slug:
+            h2h = self._head_to_head(str(p_slug), str(c_slug))
+            if h2h is not None:
+                status += f"   |   H2H {h2h['wins']}-{h2h['losses']}-{h2h['draws']}"
+        self._select_status.text = status
 
         can_start = bool(p_slug) and bool(c_slug)
         self._select_start_btn.disabled = not bool(can_start)
         self._select_start_btn.background_color = get_color_from_hex(COLOR_HEX_PLAY_ENABLED if can_start else COLOR_HEX_PLAY_DISABLED)
+        self._select_spectate_btn.disabled = not bool(can_start)
 
         # Highlight selected
         for slug, btn in (getattr(self, "_select_buttons", {}) or {}).items():
@@ -1340,42 +1438,32 @@ class WrestleApp(App):
     def _on_select_start(self, _inst=None) -> None:
         p_slug = getattr(self, "_selected_player_slug", None) or DEFAULT_PLAYER_PROFILE
         c_slug = getattr(self, "_selected_cpu_slug", None) or DEFAULT_CPU_PROFILE
+        self._abandon_career_week()
         self._start_new_match_from_roster(str(p_slug), str(c_slug))
         self._set_character_select_visible(False)
 
-    def _start_new_match_from_roster(self, player_slug: str, cpu_slug: str) -> None:
-        # Create fresh wrestler instances
+    def _start_new_match_from_roster(
+        self,
+        player_slug: str,
+        cpu_slug: str,
+        *,
+        player_limbs: dict | None = None,
+        cpu_limbs: dict | None = None,
+    ) -> None:
+        self._cancel_cpu_think()
+
+        # Fresh wrestlers and match state
         p_prof = dict(ROSTER.get(str(player_slug), {}) or {})
         c_prof = dict(ROSTER.get(str(cpu_slug), {}) or {})
-        self.player = Wrestler("YOU", True, profile=p_prof)
-        self.cpu = Wrestler("CPU", False, profile=c_prof)
-
-        # Per-match trackers
-        self.player.recent_attack_moves = []
-        self.cpu.recent_attack_moves = []
-
-        # Buffs
-        self.player.lockup_edge_ready = False
-        self.cpu.lockup_edge_ready = False
-
-        # Reset match state
-        self.game_over = False
-        self._last_cpu_mode = None
-        self.turn = "player"
-        self._escape_mode = None
-        self.selected_cards = set()
-        self.selected_move = None
-        self._menu_stage = "CATEGORIES"
-        self._selected_category = None
-        self._card_tap_hint_shown = False
-        self._log_lines = []
+        self._setup_match(p_prof, c_prof)
+        self._apply_limb_carryover(player_limbs, cpu_limbs)
+        self._match_slugs = (str(player_slug), str(cpu_slug))
         self._match_started_at = datetime.now()
         self._limb_blink_on = True
-        self.momentum = 0
 
         # UI refresh
         try:
-            self._update_hud()
+            self._update_hud(force=True)
         except Exception:
             pass
         try:
@@ -1427,188 +1515,676 @@ class WrestleApp(App):
             return
 
     # -------------------------------------------------------------------------
-    # CORE GAME LOOP & LOGIC
+    # CAREER MODE
     # -------------------------------------------------------------------------
 
-    def _start_turn(self, who):
-        if self.game_over: return
-
-        # Tick down turn-based buffs.
-        for w in (self.player, self.cpu):
+    def _career_store(self) -> CareerStore | None:
+        if self._career is None:
             try:
-                t = int(getattr(w, "fired_up_turns_remaining", 0) or 0)
-                if t > 0:
-                    w.fired_up_turns_remaining = max(0, t - 1)
+                self._career = CareerStore(os.path.join(self.user_data_dir, CAREER_DB_FILENAME))
             except Exception:
-                pass
+                self._career = None
+        return self._career
 
-            # Tick down daze cooldown (prevents immediate re-dazing loops).
-            try:
-                dc = int(getattr(w, "daze_cooldown_turns", 0) or 0)
-                if dc > 0:
-                    w.daze_cooldown_turns = max(0, int(dc) - 1)
-            except Exception:
-                pass
+    def _on_select_career(self, _inst=None) -> None:
+        """Play this week's career match live; the rest of the card simulates in the background."""
+        store = self._career_store()
+        if store is None:
+            return
+        p_slug = str(getattr(self, "_selected_player_slug", None) or store.player_slug or DEFAULT_PLAYER_PROFILE)
+        try:
+            if (not store.active) or store.player_slug != p_slug:
+                store.new_career(p_slug, list(ROSTER.keys()))
+            week = store.week
+            card = store.card(week)
+        except Exception:
+            return
+        if not card:
+            return
 
-            # Tick down defensive cooldown (prevents Defensive / Reversal spam by AI).
-            try:
-                dd = int(getattr(w, "defensive_cooldown_turns", 0) or 0)
-                if dd > 0:
-                    w.defensive_cooldown_turns = max(0, int(dd) - 1)
-            except Exception:
-                pass
+        n_other = self._career_open_week(store, week, card)
+        live = card[0]
+        self._start_new_match_from_roster(
+            live.red,
+            live.blue,
+            player_limbs=store.limbs_for(live.red, week),
+            cpu_limbs=store.limbs_for(live.blue, week),
+        )
+        self._set_character_select_visible(False)
+        opp = self._profile_short_name(ROSTER.get(live.blue, {}) or {})
+        self._log(f"[b]CAREER — WEEK {week}[/b]: main event vs {opp}. {n_other} other matches on the card.")
 
-        # Reset per-beat UX hints.
-        self._card_tap_hint_shown = False
+    def _career_open_week(self, store: CareerStore, week: int, card: list) -> int:
+        """Track `week` with card[0] played live; simulate the rest. Returns how many other matches there are.
 
-        # Expire combo windows at the start of the next beat.
-        for w in (self.player, self.cpu):
-            if int(getattr(w, "chain_turns_remaining", 0)) > 0:
-                w.chain_turns_remaining -= 1
-                if int(w.chain_turns_remaining) <= 0:
-                    w.chain_turns_remaining = 0
-                    w.chain_window = None
-                    w.chain_potency = 0
+        Matches the process pool can't take (no multiprocessing on the
+        platform) are queued and played in-process once the live match is over.
+        """
+        self._abandon_career_week()
+        self._career_gen += 1
+        gen = self._career_gen
+        self._career_week = {"week": week, "gen": gen, "live": card[0], "expected": len(card), "results": {}, "local": [], "local_busy": False}
+
+        if self._career_sim is None:
+            self._career_sim = CareerSimulator()
+        try:
+            futs = self._career_sim.submit(store, card[1:])
+        except Exception:
+            self._career_sim.shutdown()
+            futs = []
+            self._career_week["local"] = list(card[1:])
+        for m, fut in zip(card[1:], futs):
+            # Pool callbacks arrive on a worker thread; hop to the main thread.
+            fut.add_done_callback(lambda f, g=gen, m=m: Clock.schedule_once(lambda _dt: self._on_career_sim_done(g, f, m), 0))
+        return len(card) - 1
+
+    def _abandon_career_week(self) -> None:
+        """Drop an unfinished week (it replays from the same seeds next time)."""
+        if self._career_week is not None:
+            self._career_gen += 1
+            self._career_week = None
+
+    def _on_career_sim_done(self, gen: int, fut, match) -> None:
+        wk = self._career_week
+        if wk is None or int(wk.get("gen", -1)) != int(gen):
+            return
+        try:
+            res = fut.result()
+        except Exception:
+            # The worker failed (or the pool broke): play it here after the live match.
+            wk["local"].append(match)
+            self._career_start_local()
+            return
+        wk["results"][int(res["slot"])] = res
+        self._career_maybe_finish_week()
+
+    def _career_start_local(self) -> None:
+        """Start playing queued card matches in-process, once the live match is over."""
+        wk = self._career_week
+        if wk is None or not wk["local"] or wk["local_busy"] or 0 not in wk["results"]:
+            return
+        wk["local_busy"] = True
+        self._log("Background sims unavailable: simulating the rest of the card here...")
+        Clock.schedule_once(lambda _dt, g=wk["gen"]: self._career_play_local(g), 0)
+
+    def _career_play_local(self, gen: int) -> None:
+        """Play one queued card match, then the next on a later frame so the UI keeps drawing."""
+        wk = self._career_week
+        if wk is None or int(wk.get("gen", -1)) != int(gen) or self._career is None:
+            return
+        if not wk["local"]:
+            wk["local_busy"] = False
+            self._career_maybe_finish_week()
+            return
+        m = wk["local"].pop(0)
+        try:
+            res = play_card_match(self._career, m)
+        except Exception:
+            # Don't hold the week hostage, but say what is missing from it.
+            wk["expected"] = int(wk["expected"]) - 1
+            red = self._profile_short_name(ROSTER.get(m.red, {}) or {})
+            blue = self._profile_short_name(ROSTER.get(m.blue, {}) or {})
+            self._log(f"Career: {red} vs {blue} could not be simulated and is left off week {m.week}.")
+        else:
+            wk["results"][int(res["slot"])] = res
+        Clock.schedule_once(lambda _dt: self._career_play_local(gen), 0)
+
+    def _on_match_over(self) -> None:
+        if self._spectate is not None:
+            self._spectate_match_done()
+            return
+        source = "career" if self._career_week is not None else "live"
+        self._record_history([record_from_engine(self, *self._match_slugs, source=source)])
+
+        wk = self._career_week
+        if wk is None or 0 in wk["results"]:
+            return
+        live = wk["live"]
+        esc = self._escape_mode or {}
+        wk["results"][0] = {
+            "week": live.week,
+            "slot": live.slot,
+            "red": live.red,
+            "blue": live.blue,
+            "seed": live.seed,
+            "live": True,
+            "winner": "red" if bool(esc.get("attacker_is_player")) else "blue",
+            "kind": str(esc.get("kind", "")).upper() or None,
+            "beats": int(getattr(self, "clash_count", 0) or 0),
+            "red_limbs": dict(self.player.body_parts),
+            "blue_limbs": dict(self.cpu.body_parts),
+        }
+        self._career_start_local()
+        self._career_maybe_finish_week()
+
+    def _career_maybe_finish_week(self) -> None:
+        wk = self._career_week
+        store = self._career
+        if wk is None or store is None or len(wk["results"]) < int(wk["expected"]):
+            return
+        self._career_week = None
+        week = int(wk["week"])
+        results = [wk["results"][k] for k in sorted(wk["results"])]
+        try:
+            store.record_week(week, results)
+        except Exception:
+            self._log("Career save failed.")
+            return
+        # The live match went into the history when it ended.
+        self._record_history([history_record(r) for r in results if not r.get("live")])
 
-        # Phase 2: player always initiates the clash; CPU responds instantly.
-        self.turn = "player"
+        def short(slug: str) -> str:
+            return self._profile_short_name(ROSTER.get(slug, {}) or {})
 
-        # CPU may auto-trigger FIRE UP if momentum favors them.
+        self._log(f"[b]CAREER — WEEK {week} RESULTS[/b]")
+        for r in results:
+            if r.get("winner") in ("red", "blue"):
+                w, l = (r["red"], r["blue"]) if r["winner"] == "red" else (r["blue"], r["red"])
+                self._log(f"{short(w)} def. {short(l)} ({str(r.get('kind') or '').title()}, {int(r.get('beats', 0))} beats)")
+            else:
+                self._log(f"{short(r['red'])} vs {short(r['blue'])}: time-limit draw")
         try:
-            mom = int(getattr(self, "momentum", 0) or 0)
-            cpu_adv = max(0, -int(mom))
-            cpu_fired = int(getattr(self.cpu, "fired_up_turns_remaining", 0) or 0) > 0
-            if (not cpu_fired) and cpu_adv > 0 and self._escape_mode is None:
-                chance = float(TUNING_CPU_FIRE_UP_CHANCE_PER_MOM) * float(min(int(MOMENTUM_MAX_ABS), int(cpu_adv)))
-                chance = max(0.0, min(0.50, float(chance)))
-                if random.random() < chance:
-                    self._activate_fire_up(self.cpu)
+            me = store.player_slug
+            row = next((x for x in store.standings() if x["slug"] == me), None)
+            if row:
+                self._log(f"{short(me)}: rating {row['rating']:.0f}, {row['wins']}-{row['losses']}-{row['draws']}.")
         except Exception:
             pass
-        
-        self.player.draw_to_full()
-        self.cpu.draw_to_full()
-        
-        self.selected_cards.clear()
-        self.selected_move = None
-        self._escape_mode = None
 
-        self._menu_stage = "CATEGORIES"
-        self._selected_category = None
-        
-        self._update_hud()
+    def on_stop(self):
+        self._stop_spectate()
+        self._abandon_career_week()
+        if self._career_sim is not None:
+            self._career_sim.shutdown()
+        if self._career is not None:
+            self._career.close()
+        if self._history is not None:
+            self._history.close()
+
+    # -------------------------------------------------------------------------
+    # SUSPEND / RESUME
+    # -------------------------------------------------------------------------
+    # Android kills backgrounded apps without calling on_stop, so on_pause
+    # writes the live match to a snapshot (snapshot.py) and the next launch
+    # picks it up instead of showing character select. The snapshot is only
+    # good for one launch: it is deleted when read and when we resume in-process.
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.user_data_dir, SNAPSHOT_FILENAME)
+
+    def _match_in_progress(self) -> bool:
+        try:
+            selecting = not bool(self._select_overlay.disabled)
+        except Exception:
+            selecting = False
+        return not self.game_over and self._spectate is None and not selecting
+
+    def on_pause(self):
+        self._set_power_paused(True)
+        path = self._snapshot_path()
+        if not self._match_in_progress():
+            discard_snapshot(path)
+            return True
+        wk = self._career_week
+        meta = {
+            "slugs": list(self._match_slugs),
+            "started_at": self._match_started_at.isoformat(),
+            "career_week": int(wk["week"]) if wk is not None else None,
+        }
+        try:
+            save_snapshot(path, self, meta=meta)
+        except Exception:
+            discard_snapshot(path)
+        return True
+
+    def on_resume(self):
+        self._set_power_paused(False)
+        # Still in memory: the match carries on, and a stale snapshot must not
+        # come back on some later launch.
+        discard_snapshot(self._snapshot_path())
+
+    def _resume_suspended_match(self) -> bool:
+        """Restore a match saved by on_pause. True if one was restored."""
+        path = self._snapshot_path()
+        state = load_snapshot(path)
+        discard_snapshot(path)
+        if state is None:
+            return False
+        try:
+            meta = restore_snapshot(self, state)
+        except Exception:
+            return False
+
+        slugs = meta.get("slugs") or (DEFAULT_PLAYER_PROFILE, DEFAULT_CPU_PROFILE)
+        self._match_slugs = (str(slugs[0]), str(slugs[1]))
+        try:
+            self._match_started_at = datetime.fromisoformat(str(meta.get("started_at")))
+        except Exception:
+            self._match_started_at = datetime.now()
+        week = meta.get("career_week")
+        if week is not None:
+            self._career_resume_week(int(week))
+        self._set_character_select_visible(False)
+
+        # Lazy rebuild: everything repaints in the first frame's flush; the log
+        # widget only gets the tail of the log.
+        self._log_pending.extend(list(self._log_lines or [])[-int(RESUME_LOG_TAIL):])
+        self._log("Match resumed.")
+        self._update_hud(force=True)
         self._render_hand()
         self._render_moves_ui()
         self._update_control_bar()
-        
-        # Soft-lock protection: if you can't afford any play (no low cards and 0 grit), auto-rest.
-        if self.player.grit == 0 and not self.player.has_low_card(max_value=5):
-            self._log("GASSED OUT! You can’t afford any cards — auto Rest.")
-            Clock.schedule_once(lambda _dt: self._submit_forced_rest(), 0.6)
+        if self._escape_mode is None:
+            self._schedule_cpu_speculation()
+        return True
 
-    def _submit_forced_rest(self) -> None:
-        if self.game_over:
+    def _career_resume_week(self, week: int) -> None:
+        """Reopen a career week whose main event was restored from a snapshot.
+
+        The other matches re-simulate from their fixed seeds, so results match
+        what the killed process would have recorded.
+        """
+        store = self._career_store()
+        if store is None:
             return
-        if self._escape_mode is not None:
+        try:
+            if not store.active or int(store.week) != int(week):
+                return
+            card = store.card(week)
+        except Exception:
             return
-        self.selected_move = MOVE_REST
-        self.selected_cards.clear()
-        self._submit_cards()
+        if card and (card[0].red, card[0].blue) == tuple(self._match_slugs):
+            self._career_open_week(store, week, card)
 
-    def _log(self, text: str):
+    # -------------------------------------------------------------------------
+    # SPECTATOR MODE (CPU vs CPU)
+    # -------------------------------------------------------------------------
+    # Both seats are played by the headless AI (_headless_beat /
+    # _headless_escape_step) from a Clock event, escapes included, so nothing
+    # waits for CONTINUE. Above 1× several beats run per tick; the UI hooks
+    # only mark regions dirty, so each frame paints just the final state and
+    # the log widget gets one summary line per match.
+
+    def _on_select_spectate(self, _inst=None) -> None:
+        p_slug = getattr(self, "_selected_player_slug", None) or DEFAULT_PLAYER_PROFILE
+        c_slug = getattr(self, "_selected_cpu_slug", None) or DEFAULT_CPU_PROFILE
+        self._abandon_career_week()
+        self._spectate = {
+            "slugs": (str(p_slug), str(c_slug)),
+            "speed": 0,
+            "ev": None,
+            "next_ev": None,
+            "matches": 0,
+            "tally": [0, 0, 0],  # red wins, blue wins, draws
+        }
+        self._set_character_select_visible(False)
+        self._spectate_next_match()
+        self._spectate_set_speed(0)
+
+    def _stop_spectate(self) -> None:
+        sp = self._spectate
+        if sp is None:
+            return
+        self._spectate = None
+        for key in ("ev", "next_ev"):
+            if sp[key] is not None:
+                sp[key].cancel()
+        try:
+            self._flash.enabled = True
+        except Exception:
+            pass
+        self._update_control_bar()
+        self._render_moves_ui()
+
+    def _spectate_set_speed(self, index: int) -> None:
+        sp = self._spectate
+        if sp is None:
+            return
+        index = int(index) % len(SPECTATE_SPEEDS)
+        sp["speed"] = index
+        if sp["ev"] is not None:
+            sp["ev"].cancel()
+        interval = SPECTATE_SPEEDS[index][1]
+        # interval 0: every frame, with _spectate_tick filling the frame budget.
+        sp["ev"] = Clock.schedule_interval(self._spectate_tick, 0 if interval is None else float(interval))
+        # A flash per beat is just strobing at turbo speeds.
         try:
-            self._log_lines.append(str(text))
+            self._flash.enabled = index == 0
         except Exception:
             pass
+        self._update_control_bar()
+        self._render_moves_ui()
+
+    def _on_spectate_speed(self, _inst=None) -> None:
+        if self._spectate is not None:
+            self._spectate_set_speed(int(self._spectate["speed"]) + 1)
+
+    def _spectate_quiet(self) -> bool:
+        """Turbo spectating: per-beat lines stay out of the log widget."""
+        sp = self._spectate
+        return sp is not None and int(sp["speed"]) > 0
+
+    def _spectate_log(self, text: str) -> None:
+        """Log widget only (shown at every speed)."""
+        self._log_pending.append(str(text))
+        self._ui_flush_trigger()
+
+    def _spectate_next_match(self) -> None:
+        sp = self._spectate
+        if sp is None:
+            return
+        sp["next_ev"] = None
+        self._start_new_match_from_roster(*sp["slugs"])
+
+    def _spectate_tick(self, _dt) -> None:
+        sp = self._spectate
+        if sp is None or self.game_over:
+            return
+        turbo = SPECTATE_SPEEDS[int(sp["speed"])][1] is None
+        deadline = time.perf_counter() + SPECTATE_FRAME_BUDGET_S
+        while self._spectate is sp and not self.game_over:
+            if self._escape_mode is not None:
+                self._headless_escape_step()
+            elif int(self.clash_count) >= int(HEADLESS_MAX_BEATS):
+                # Same cap as simulate_match: a time-limit draw.
+                self.game_over = True
+                self._spectate_match_done()
+            else:
+                self._headless_beat()
+            if not turbo or time.perf_counter() >= deadline:
+                break
+
+    def _spectate_match_done(self) -> None:
+        sp = self._spectate
+        if sp is None:
+            return
+        red, blue = sp["slugs"]
+        self._record_history([record_from_engine(self, red, blue, source="spectate")])
+
+        esc = self._escape_mode or {}
+        red_name = self._profile_short_name(ROSTER.get(red, {}) or {})
+        blue_name = self._profile_short_name(ROSTER.get(blue, {}) or {})
+        beats = int(getattr(self, "clash_count", 0) or 0)
+        tally = sp["tally"]
+        sp["matches"] += 1
+        if esc:
+            red_won = bool(esc.get("attacker_is_player"))
+            tally[0 if red_won else 1] += 1
+            w, l = (red_name, blue_name) if red_won else (blue_name, red_name)
+            line = f"{w} def. {l} ({str(esc.get('kind', '')).title()}, {beats} beats)"
+        else:
+            tally[2] += 1
+            line = f"{red_name} vs {blue_name}: time-limit draw ({beats} beats)"
+        self._spectate_log(f"Match {sp['matches']}: {line}. Series {tally[0]}-{tally[1]}-{tally[2]}.")
+        self._update_control_bar()
 
+        delay = SPECTATE_NEXT_MATCH_DELAY_S if int(sp["speed"]) == 0 else 0
+        sp["next_ev"] = Clock.schedule_once(lambda _dt: self._spectate_next_match(), delay)
+
+    def _paint_spectate_panel(self) -> None:
+        """Read-only moves panel while spectating (no category/move buttons)."""
+        sp = self._spectate or {}
+        try:
+            self.move_list_layout.cols = 1
+        except Exception:
+            pass
+        lines = [f"[b]CPU vs CPU[/b]  —  match {int(sp.get('matches', 0)) + 1}"]
+        for w in (self.player, self.cpu):
+            last = str(getattr(w, "last_move_name", "") or "")
+            lines.append(f"{w.name}: {self._move_display_name(last) if last else '—'}")
+        esc = self._escape_mode
+        if esc:
+            lines.append(f"ESCAPE!  Total: {esc.get('total', 0)}/{esc.get('threshold', 1)}   Plays left: {esc.get('plays_left', 0)}")
+        lines.append("MENU > RESELECT WRESTLERS to stop.")
         lbl = Label(
-            text=f"> {text}",
+            text="\n".join(lines),
             markup=True,
-            size_hint_x=1,
+            color=COLOR_TEXT_SOFT,
             size_hint_y=None,
+            height=dp(120),
             halign="left",
-            valign="top",
-            color=COLOR_TEXT_MAIN,
+            valign="middle",
         )
+        lbl.bind(size=lambda inst, _v: setattr(inst, "text_size", (inst.width, None)))
+        self.move_list_layout.add_widget(lbl)
 
-        def refresh_wrap(*_a) -> None:
-            pad = 16
-            w = max(120, int(self.log_scroll.width) - pad)
-            lbl.text_size = (w, None)
-            lbl.texture_update()
-            lbl.height = max(26, int(lbl.texture_size[1]) + 6)
+    def _paint_spectate_controls(self) -> None:
+        sp = self._spectate or {}
+        self.return_btn.disabled = True
+        self.return_btn.opacity = 0.0
+        try:
+            self.move_info_btn.disabled = True
+        except Exception:
+            pass
+        t = sp.get("tally") or [0, 0, 0]
+        self.hint_label.text = f"SPECTATING — series {t[0]}-{t[1]}-{t[2]}. Tap SPEED to change."
+        self.play_btn.disabled = False
+        self.play_btn.text = f"SPEED\n{SPECTATE_SPEEDS[int(sp.get('speed', 0))][0]}"
+        self.play_btn.background_color = get_color_from_hex(COLOR_HEX_PLAY_ENABLED)
 
-        lbl.bind(width=refresh_wrap)
-        self.log_scroll.bind(width=lambda *_a: refresh_wrap())
-        refresh_wrap()
+    # -------------------------------------------------------------------------
+    # MATCH HISTORY & STATS
+    # -------------------------------------------------------------------------
 
-        self.log_layout.add_widget(lbl)
-        Clock.schedule_once(lambda _dt: self.log_scroll.scroll_to(lbl), 0)
+    def _history_store(self) -> HistoryStore | None:
+        if self._history is None:
+            try:
+                self._history = HistoryStore(os.path.join(self.user_data_dir, HISTORY_DB_FILENAME))
+                self._history_writer = HistoryWriter(self._history)
+            except Exception:
+                self._history = None
+                self._history_writer = None
+        return self._history
 
-    def _strip_kivy_markup(self, s: str) -> str:
+    def _record_history(self, records: list) -> None:
+        """Add finished matches to the history in one transaction."""
+        if not records or self._history_store() is None:
+            return
         try:
-            return re.sub(r"\[[^\]]+\]", "", str(s))
+            for r in records:
+                self._history_writer.add(r)
+            self._history_writer.flush()
         except Exception:
-            return str(s)
+            pass
 
-    def _export_match_log(self, _inst=None) -> None:
+    def _head_to_head(self, slug: str, opp_slug: str) -> dict | None:
+        store = self._history_store()
+        if store is None:
+            return None
         try:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
+            return store.head_to_head(slug, opp_slug)
         except Exception:
-            base_dir = os.getcwd()
+            return None
 
-        out_dir = os.path.join(base_dir, "match_logs")
-        try:
-            os.makedirs(out_dir, exist_ok=True)
-        except Exception:
-            pass
+    def _show_stats(self, _inst=None) -> None:
+        """Record, head-to-heads and per-move success rates for the highlighted wrestler."""
+        store = self._history_store()
+        if store is None:
+            return
+        stage = str(getattr(self, "_select_stage", "PLAYER"))
+        slug = str(
+            (getattr(self, "_selected_player_slug", None) if stage == "PLAYER" else getattr(self, "_selected_cpu_slug", None))
+            or getattr(self, "_selected_player_slug", None)
+            or DEFAULT_PLAYER_PROFILE
+        )
 
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        out_path = os.path.join(out_dir, f"match_log_{ts}.txt")
+        def short(s: str) -> str:
+            return self._profile_short_name(ROSTER.get(s, {}) or {})
 
         try:
-            header = []
-            header.append("WrestleText Match Log")
-            try:
-                started = getattr(self, "_match_started_at", None)
-                if started:
-                    header.append(f"Started: {started}")
-            except Exception:
-                pass
-            header.append(f"YOU vs CPU")
-            header.append("")
-
-            lines = [self._strip_kivy_markup(x) for x in (self._log_lines or [])]
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(header + ["> " + ln for ln in lines]))
-            self._log(f"Log exported to: {out_path}")
+            rec = store.record(slug)
+            lines = [f"[b]{short(slug)}[/b]   {rec['wins']}-{rec['losses']}-{rec['draws']}   ({store.match_count()} matches on file)", ""]
+            opps = store.opponents(slug)
+            if opps:
+                lines.append("[b]Head to head[/b]")
+                for o in opps:
+                    lines.append(f"  vs {short(o['opp_slug'])}: {o['wins']}-{o['losses']}-{o['draws']}")
+                lines.append("")
+            moves = store.move_stats(slug, limit=25)
+            if moves:
+                lines.append("[b]Moves[/b] (used / landed / success / dmg per landing)")
+                for m in moves:
+                    name = str(MOVES.get(m["move_slug"], {}).get("name", m["move_slug"]))
+                    per = (m["damage"] / m["landed"]) if m["landed"] else 0.0
+                    lines.append(f"  {name}: {m['attempts']} / {m['landed']} / {m['success'] * 100:.0f}% / {per:.1f}")
+            if len(lines) <= 2:
+                lines.append("No matches recorded yet.")
         except Exception:
-            self._log("Log export failed.")
+            return
 
-    def _show_rules(self, _inst=None) -> None:
         try:
             body = BoxLayout(orientation="vertical", spacing=dp(8), padding=[dp(12), dp(10), dp(12), dp(10)])
+            scroll = ScrollView(do_scroll_x=False)
+            lbl = Label(
+                text="\n".join(lines),
+                markup=True,
+                halign="left",
+                valign="top",
+                color=COLOR_TEXT_SOFT,
+                size_hint_y=None,
+            )
 
-            rules = (
-                "[b]Core Card Play[/b]\n"
-                "- Play 1 card, or 2 cards if they match [b]value[/b] (doubles) or match [b]color[/b] (same-color).\n"
-                "- Same-color 2-card play (non-gray): [b]+2[/b] to the higher card (cap 10).\n"
-                "- Move-type bonus: [b]+1[/b] if any chosen card matches the move type. [b]Yellow[/b] counts as any type.\n\n"
-                "[b]Rest / Defensive[/b]\n"
-                "- [b]Rest[/b]: no cards needed; press PLAY.\n"
-                "- If you Rest and get hit, your Rest recovery is interrupted.\n"
-                "- When hit while Resting: [b]25%[/b] chance the hit becomes a [b]CRITICAL[/b] (150% damage).\n"
-                "- [b]Defensive[/b]: discard 0–2 cards (value ≤ 5). If you discard doubles, your block gets [b]+5[/b].\n\n"
-                "[b]Groggy[/b]\n"
-                "- While GROGGY, only Groggy Recovery is allowed. Scoring caps card value at 7.\n\n"
-                "[b]Momentum Gates[/b]\n"
-                "- Moves with asterisks need that much momentum advantage to use.\n\n"
+            def _refresh(*_a) -> None:
+                w = max(120, int(scroll.width) - 16)
+                lbl.text_size = (w, None)
+                lbl.texture_update()
+                lbl.height = max(dp(220), int(lbl.texture_size[1]) + dp(6))
 
-                "[b]Impact Moves[/b]\n"
-                "- Moves marked with a gold * require at least one matching-type (or Yellow) card in your play.\n\n"
+            lbl.bind(width=_refresh)
+            scroll.bind(width=lambda *_a: _refresh())
+            _refresh()
+            scroll.add_widget(lbl)
 
-                "[b]Stale Moves[/b]\n"
-                "- Repeating the same attack within your last few attacks applies a [b][color=AAAAAA][STALE][/color][/b] penalty to clash score.\n\n"
+            close_btn = Button(text="CLOSE", background_normal="", background_color=COLOR_BTN_BASE, size_hint_y=None, height=dp(46))
+            body.add_widget(scroll)
+            body.add_widget(close_btn)
+
+            pop = Popup(title="Stats", content=body, size_hint=(0.92, 0.72), auto_dismiss=True)
+            close_btn.bind(on_release=lambda *_a: pop.dismiss())
+            pop.open()
+        except Exception:
+            return
+
+    # -------------------------------------------------------------------------
+    # MATCH LOG & INFO SCREENS
+    # -------------------------------------------------------------------------
+
+    def _submit_forced_rest(self) -> None:
+        if self.game_over:
+            return
+        if self._escape_mode is not None:
+            return
+        self.selected_move = MOVE_REST
+        self.selected_cards.clear()
+        self._submit_cards()
+
+    def _schedule_forced_rest(self) -> None:
+        if self._spectate is not None:
+            # The headless beat already picks an affordable play for this seat.
+            return
+        Clock.schedule_once(lambda _dt: self._submit_forced_rest(), 0.6)
+
+    def _log(self, text: str):
+        super()._log(text)
+        if self._spectate_quiet():
+            return
+        # Appended (and scrolled to) in one batch by _flush_ui.
+        self._log_pending.append(str(text))
+        self._ui_flush_trigger()
+
+    def _flush_log(self) -> None:
+        if not self._log_pending:
+            return
+        pending, self._log_pending = self._log_pending, []
+        pad = 16
+
+        def refresh_wrap(lbl, *_a) -> None:
+            w = max(120, int(self.log_scroll.width) - pad)
+            lbl.text_size = (w, None)
+            lbl.texture_update()
+            lbl.height = max(26, int(lbl.texture_size[1]) + 6)
+
+        lbl = None
+        for text in pending:
+            lbl = Label(
+                text=f"> {text}",
+                markup=True,
+                size_hint_x=1,
+                size_hint_y=None,
+                halign="left",
+                valign="top",
+                color=COLOR_TEXT_MAIN,
+            )
+            # Label width follows log_layout, which _sync_log_width keeps at the scroll width.
+            lbl.bind(width=refresh_wrap)
+            refresh_wrap(lbl)
+            self.log_layout.add_widget(lbl)
+
+        last = lbl
+        Clock.schedule_once(lambda _dt: self.log_scroll.scroll_to(last), 0)
+
+    def _export_match_log(self, _inst=None) -> None:
+        try:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+        except Exception:
+            base_dir = os.getcwd()
+
+        out_dir = os.path.join(base_dir, "match_logs")
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+        except Exception:
+            pass
+
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out_path = os.path.join(out_dir, f"match_log_{ts}.txt")
+
+        try:
+            header = []
+            header.append("WrestleText Match Log")
+            try:
+                started = getattr(self, "_match_started_at", None)
+                if started:
+                    header.append(f"Started: {started}")
+            except Exception:
+                pass
+            header.append(f"YOU vs CPU")
+            # Roster slugs, so match_log.py can import the log without guessing corners.
+            p_slug, c_slug = self._match_slugs
+            header.append(f"Player: {p_slug}")
+            header.append(f"CPU: {c_slug}")
+            header.append("")
+
+            lines = [self._strip_kivy_markup(x) for x in (self._log_lines or [])]
+            with open(out_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(header + ["> " + ln for ln in lines]))
+            self._log(f"Log exported to: {out_path}")
+        except Exception:
+            self._log("Log export failed.")
+
+    def _show_rules(self, _inst=None) -> None:
+        try:
+            body = BoxLayout(orientation="vertical", spacing=dp(8), padding=[dp(12), dp(10), dp(12), dp(10)])
+
+            rules = (
+                "[b]Core Card Play[/b]\n"
+                "- Play 1 card, or 2 cards if they match [b]value[/b] (doubles) or match [b]color[/b] (same-color).\n"
+                "- Same-color 2-card play (non-gray): [b]+2[/b] to the higher card (cap 10).\n"
+                "- Move-type bonus: [b]+1[/b] if any chosen card matches the move type. [b]Yellow[/b] counts as any type.\n\n"
+                "[b]Rest / Defensive[/b]\n"
+                "- [b]Rest[/b]: no cards needed; press PLAY.\n"
+                "- If you Rest and get hit, your Rest recovery is interrupted.\n"
+                "- When hit while Resting: [b]25%[/b] chance the hit becomes a [b]CRITICAL[/b] (150% damage).\n"
+                "- [b]Defensive[/b]: discard 0–2 cards (value ≤ 5). If you discard doubles, your block gets [b]+5[/b].\n\n"
+                "[b]Groggy[/b]\n"
+                "- While GROGGY, only Groggy Recovery is allowed. Scoring caps card value at 7.\n\n"
+                "[b]Momentum Gates[/b]\n"
+                "- Moves with asterisks need that much momentum advantage to use.\n\n"
+
+                "[b]Impact Moves[/b]\n"
+                "- Moves marked with a gold * require at least one matching-type (or Yellow) card in your play.\n\n"
+
+                "[b]Stale Moves[/b]\n"
+                "- Repeating the same attack within your last few attacks applies a [b][color=AAAAAA][STALE][/color][/b] penalty to clash score.\n\n"
 
                 "[b]Margin of Victory (Damage Tiers)[/b]\n"
                 "- Damage scales by the clash margin (winner score - loser score):\n"
@@ -1761,2692 +2337,273 @@ class WrestleApp(App):
         lines.append(f"Set you: {_fmt_state(set_user_state)}")
         lines.append(f"Set opp: {_fmt_state(set_target_state)}")
         if grounds:
-            lines.append("Grounds opp: yes")
-        lines.append("")
-
-        if (on_loss_set_user_state is not None) or (on_loss_set_target_state is not None):
-            lines.append("[b]On Loss[/b]")
-            lines.append(f"Set you: {_fmt_state(on_loss_set_user_state)}")
-            lines.append(f"Set opp: {_fmt_state(on_loss_set_target_state)}")
-            lines.append("")
-
-        lines.append("[b]Special[/b]")
-        lines.append(f"Can daze: {'yes' if can_daze else 'no'}")
-        lines.append(f"Lift: {'yes' if is_lift else 'no'}")
-        try:
-            if self._would_be_stale(self.player, slug):
-                lines.append(f"Stale right now: yes (-{int(STALE_CLASH_SCORE_PENALTY)} to clash score)")
-        except Exception:
-            pass
-        if clash_mod is not None:
-            lines.append(f"Clash mod: {_fmt_num(clash_mod)}")
-        lines.append(f"Chain next: {_fmt_list(chain_next)}")
-
-        if flavor:
-            lines.append("")
-            lines.append("[b]Flavor[/b]")
-            lines.append(flavor)
-
-        text = "\n".join(lines)
-
-        body = BoxLayout(orientation="vertical", spacing=dp(8), padding=[dp(12), dp(10), dp(12), dp(10)])
-        scroll = ScrollView(do_scroll_x=False)
-        lbl = Label(
-            text=text,
-            markup=True,
-            halign="left",
-            valign="top",
-            color=COLOR_TEXT_SOFT,
-            size_hint_y=None,
-        )
-
-        def _refresh(*_a) -> None:
-            pad = 16
-            w = max(120, int(scroll.width) - pad)
-            lbl.text_size = (w, None)
-            lbl.texture_update()
-            lbl.height = max(dp(240), int(lbl.texture_size[1]) + dp(6))
-
-        lbl.bind(width=_refresh)
-        scroll.bind(width=lambda *_a: _refresh())
-        _refresh()
-        scroll.add_widget(lbl)
-
-        close_btn = Button(text="CLOSE", background_normal="", background_color=COLOR_BTN_BASE, size_hint_y=None, height=dp(46))
-        body.add_widget(scroll)
-        body.add_widget(close_btn)
-
-        pop = Popup(title="Move Info", content=body, size_hint=(0.92, 0.72), auto_dismiss=True)
-        close_btn.bind(on_release=lambda *_a: pop.dismiss())
-        pop.open()
-
-    def _log_separator(self) -> None:
-        self._log(LOG_EXCHANGE_SEPARATOR)
-
-    def _c(self, text: str, hex_color: str) -> str:
-        return f"[color={hex_color}]{text}[/color]"
-
-    def _fmt_name(self, w: Wrestler) -> str:
-        if bool(getattr(w, "is_player", False)):
-            return self._c(str(w.name), COLOR_HEX_NAME_YOU)
-        return self._c(str(w.name), COLOR_HEX_NAME_CPU)
-
-    def _calc_daze_application(self, target: Wrestler, move_data: dict) -> int:
-        if not bool(move_data.get("can_daze", False)):
-            return 0
-        try:
-            hp_pct = float(target.hp_pct()) * 100.0
-        except Exception:
-            return 0
-
-        thr = float(TUNING_DAZE_HP_THRESHOLD)
-        if hp_pct > thr:
-            return 0
-
-        diff = max(0.0, thr - hp_pct)
-        chance = float(diff) * float(TUNING_DAZE_CHANCE_SCALAR)
-        if float(random.uniform(0.0, 100.0)) >= float(chance):
-            return 0
-
-        max_turns = max(1, int(TUNING_DAZE_MAX_TURNS))
-        severity = 0.0 if thr <= 0 else max(0.0, min(1.0, diff / thr))
-        if max_turns == 1:
-            return 1
-        if max_turns == 2:
-            return 2 if random.random() < (0.25 + 0.55 * severity) else 1
-
-        p3 = max(0.0, min(0.60, 0.10 + 0.45 * severity))
-        p2 = max(0.0, min(0.75, 0.30 + 0.40 * severity))
-        r = random.random()
-        if r < p3:
-            return 3
-        if r < (p3 + p2):
-            return 2
-        return 1
-
-    def _fmt_damage(self, amount: int) -> str:
-        return self._c(f"{int(amount)} dmg", COLOR_HEX_DAMAGE)
-
-    def _fmt_move(self, move_name: str) -> str:
-        mv = MOVES.get(move_name, {})
-        disp = str(mv.get("name", move_name))
-        t = str(mv.get("type", "Setup"))
-        if move_name == MOVE_DEFENSIVE or t == "Defensive":
-            return self._c(disp, COLOR_HEX_DEFENSIVE_LOG)
-        if t == "Strike":
-            return self._c(disp, COLOR_HEX_STRIKE_LOG)
-        if t in {"Grapple", "Pin", "Submission"}:
-            return self._c(disp, COLOR_HEX_GRAPPLE_LOG)
-        return self._c(disp, COLOR_HEX_SETUP_LOG)
-
-    def _fmt_cards(self, cards: list | None) -> str:
-        if not cards:
-            return "Cards: -"
-        vals = ", ".join(str(int(c.value)) for c in cards)
-        return f"Cards: {vals}"
-
-    def _get_hp_status(self, current_hp: int) -> str:
-        pct = 0.0
-        try:
-            pct = (float(current_hp) / float(MAX_HEALTH)) * 100.0
-        except Exception:
-            pct = 0.0
-
-        if pct >= 80.0:
-            return self._c("OPTIMAL", COLOR_HEX_HP_OPTIMAL)
-        if pct >= 60.0:
-            return self._c("STABLE", COLOR_HEX_HP_STABLE)
-        if pct >= 40.0:
-            return self._c("STRAINED", COLOR_HEX_HP_STRAINED)
-        if pct >= 20.0:
-            return self._c("EXHAUSTED", COLOR_HEX_HP_EXHAUSTED)
-        return self._c("CRITICAL", COLOR_HEX_HP_CRITICAL)
-
-    # -------------------------------------------------------------------------
-    # Shared mechanics (ported from main.py)
-    # -------------------------------------------------------------------------
-
-    def _render_flavor_text(self, text: str, *, attacker: Wrestler, defender: Wrestler) -> str:
-        if not text:
-            return ""
-        attacker_ref = "You" if attacker.is_player else attacker.name
-        attacker_poss = "your" if attacker.is_player else f"{attacker.name}'s"
-        defender_ref = "you" if defender.is_player else defender.name
-        defender_ref_cap = "You" if defender.is_player else defender.name
-        defender_poss = "your" if defender.is_player else f"{defender.name}'s"
-
-        out = str(text)
-        out = out.replace("You're", f"{attacker_ref} are")
-        # Replace reflexives before possessives so we don't corrupt words like "yourself".
-        if attacker.is_player:
-            out = out.replace("Yourself", "Yourself")
-            out = out.replace("yourself", "yourself")
-        else:
-            out = out.replace("Yourself", "Themselves")
-            out = out.replace("yourself", "themselves")
-        # Order matters: handle possessives before plain "You" to avoid corrupting "Your".
-        out = out.replace("Your", attacker_poss.capitalize())
-        out = out.replace("your", attacker_poss)
-        out = out.replace("You", attacker_ref)
-        out = out.replace("They", attacker_ref)
-        out = out.replace("Their", attacker_poss.capitalize())
-        out = out.replace(" them ", f" {defender_ref} ")
-        out = out.replace(" Them ", f" {defender_ref_cap} ")
-        out = out.replace(" their ", f" {defender_poss} ")
-        out = out.replace(" Their ", f" {defender_poss.capitalize()} ")
-        return out
-
-    def _momentum_advantage_for(self, wrestler: Wrestler) -> int:
-        """Return signed momentum advantage from the wrestler's perspective.
-
-        Global momentum is stored as player-favoring (positive => player advantage).
-        """
-        m = int(getattr(self, "momentum", 0) or 0)
-        if wrestler is self.player:
-            return m
-        return -m
-
-    def _move_req_momentum_min(self, move_name: str) -> int:
-        try:
-            return max(0, int(MOVES.get(str(move_name), {}).get("req_momentum_min", 0) or 0))
-        except Exception:
-            return 0
-
-    def _has_momentum_for_move(self, wrestler: Wrestler, move_name: str) -> bool:
-        req = int(self._move_req_momentum_min(move_name))
-        if req <= 0:
-            return True
-        return int(self._momentum_advantage_for(wrestler)) >= int(req)
-
-    def _move_display_name(self, move_name: str) -> str:
-        mv = MOVES.get(str(move_name), {})
-        disp = str(mv.get("name", move_name))
-        req = int(self._move_req_momentum_min(move_name))
-        if req > 0:
-            disp = f"{disp}{'*' * req}"
-        return disp
-
-    def _move_is_legal(
-        self,
-        move_name: str,
-        user: Wrestler,
-        target: Wrestler,
-        *,
-        ignore_momentum_gate: bool = False,
-        ignore_weight_gate: bool = False,
-    ) -> bool:
-        if str(move_name) not in MOVES:
-            return False
-        mv = MOVES[move_name]
-        ru = str(mv.get("req_user_state", "ANY"))
-        rt = str(mv.get("req_target_state", "ANY"))
-
-        # --- 0) Groggy gating ---
-        user_groggy = bool(getattr(user, "is_groggy", False))
-        if user_groggy and move_name != MOVE_GROGGY_RECOVERY:
-            return False
-        if (not user_groggy) and move_name == MOVE_GROGGY_RECOVERY:
-            return False
-
-        # --- 0b) Limb gating (hobbled: no running/aerial) ---
-        try:
-            user_hobbled = bool(user.is_hobbled())
-        except Exception:
-            user_hobbled = False
-        if user_hobbled and move_name not in {MOVE_STOP_SHORT, MOVE_CLIMB_DOWN, MOVE_GROGGY_RECOVERY, MOVE_DEFENSIVE, MOVE_REST}:
-            mtype = str(mv.get("type", "Setup"))
-            if mtype == "Aerial" or ru in {"RUNNING", "TOP_ROPE"}:
-                return False
-
-        # --- 0c) Weight physics (lift gating) ---
-        if not bool(ignore_weight_gate):
-            try:
-                if bool(mv.get("is_lift", False)):
-                    weights = {"CRUISER": 1, "HEAVY": 2, "SUPER HEAVY": 3, "SUPERHEAVY": 3}
-                    u_wc = str(getattr(user, "weight_class", "Heavy") or "Heavy").upper().strip()
-                    t_wc = str(getattr(target, "weight_class", "Heavy") or "Heavy").upper().strip()
-                    u_wt = int(weights.get(u_wc, 2))
-                    t_wt = int(weights.get(t_wc, 2))
-                    if u_wt < t_wt and float(target.hp_pct()) > 0.50:
-                        return False
-            except Exception:
-                pass
-
-        # Taunt: allow while you have offensive control in a grapple.
-        try:
-            if move_name == MOVE_TAUNT and user.is_in_grapple() and user.grapple_role == GrappleRole.OFFENSE:
-                return True
-        except Exception:
-            pass
-
-        # --- 1) User requirement (state + grapple role) ---
-        if ru == "GRAPPLE_DEFENSE":
-            if not (user.is_in_grapple() and user.grapple_role == GrappleRole.DEFENSE):
-                return False
-        elif ru == "GRAPPLE_OFFENSE":
-            if not (user.is_in_grapple() and user.grapple_role == GrappleRole.OFFENSE):
-                return False
-        elif ru != "ANY":
-            if ru in {"GRAPPLED", "GRAPPLE_ANY"}:
-                if not user.is_in_grapple():
-                    return False
-            elif ru == "GRAPPLE_WEAK":
-                # Allow certain "weak" grapple moves in STRONG as well.
-                if user.state not in {WrestlerState.GRAPPLE_WEAK, WrestlerState.GRAPPLE_STRONG}:
-                    return False
-            elif user.state.value != ru:
-                return False
-
-        # --- 2) Target requirement ---
-        if rt != "ANY":
-            if rt in {"GRAPPLED", "GRAPPLE_ANY"}:
-                if not target.is_in_grapple():
-                    return False
-            elif target.state.value != rt:
-                return False
-
-        user_adv = user.is_in_grapple() and (user.grapple_role == GrappleRole.OFFENSE)
-        user_dis = user.is_in_grapple() and (user.grapple_role == GrappleRole.DEFENSE)
-
-        if user_dis:
-            baseline = {
-                MOVE_FIGHT_FOR_CONTROL,
-                MOVE_DEFENSIVE,
-                MOVE_REST,
-                MOVE_SHOVE_OFF,
-                MOVE_DESPERATION_PUNCH,
-                MOVE_BITE,
-                MOVE_EAR_CLAP,
-                MOVE_GUT_PUNCH,
-                MOVE_FOREARM_CLUB,
-                MOVE_KNEE_TO_GUT,
-                "grap_wrist_escape",
-            }
-            if move_name not in baseline:
-                t = str(mv.get("type", "Setup"))
-                if not (
-                    str(ru) in {"GRAPPLE_DEFENSE", "GRAPPLE_ANY", "GRAPPLE_WEAK"}
-                    and t in {"Strike", "Setup"}
-                ):
-                    return False
-
-        if move_name == MOVE_DEFENSIVE:
-            if user_adv:
-                return False
-            neutral_ok = (user.state == WrestlerState.STANDING and target.state == WrestlerState.STANDING)
-            tossed_ok = (user.state == WrestlerState.TOSSED)
-            grounded_ok = (user.state == WrestlerState.GROUNDED)
-            if not (neutral_ok or user_dis or tossed_ok or grounded_ok):
-                return False
-
-        # --- Momentum gating ---
-        if not bool(ignore_momentum_gate):
-            if not self._has_momentum_for_move(user, move_name):
-                return False
-
-        return True
-
-    def _auto_move_cost(self, move_name: str) -> int:
-        # Never add hidden costs to core system/utility actions.
-        if str(move_name) in {MOVE_LOCK_UP, MOVE_REST, MOVE_TAUNT, MOVE_DEFENSIVE, MOVE_FIGHT_FOR_CONTROL}:
-            return 0
-        if not bool(TUNING_AUTO_GRIT_ON_DAMAGE):
-            return 0
-        mv = MOVES.get(str(move_name), {})
-        base_cost = int(mv.get("cost", 0))
-        if bool(AUTO_GRIT_ONLY_WHEN_BASE_COST_ZERO) and base_cost != 0:
-            return 0
-        dmg = int(mv.get("damage", 0))
-        if dmg < int(AUTO_GRIT_DAMAGE_THRESHOLD):
-            return 0
-        step = max(1, int(AUTO_GRIT_DAMAGE_STEP))
-        per = max(0, int(AUTO_GRIT_PER_STEP))
-        # threshold..(threshold+step-1) => +per, then +per each additional step.
-        tiers = int(math.ceil(float(dmg - int(AUTO_GRIT_DAMAGE_THRESHOLD) + 1) / float(step)))
-        return max(0, int(tiers) * int(per))
-
-    def _move_base_cost(self, move_name: str) -> int:
-        mv = MOVES.get(str(move_name), {})
-        return int(mv.get("cost", 0)) + int(self._auto_move_cost(move_name))
-
-    def _passes_moveset(self, wrestler: Wrestler, move_name: str) -> bool:
-        # Keep parity with Tk version: universal safety options always allowed.
-        universal = {
-            MOVE_DEFENSIVE,
-            MOVE_REST,
-            MOVE_GROGGY_RECOVERY,
-            MOVE_TAUNT,
-            MOVE_LOCK_UP,
-            MOVE_SHOVE_OFF,
-            MOVE_SLOW_STAND_UP,
-            MOVE_KIP_UP,
-            MOVE_GROUND_ROLL,
-            MOVE_CLIMB_DOWN,
-            MOVE_STOP_SHORT,
-            MOVE_REGAIN_BALANCE,
-            # Universal "cheap kit" per major state (prevents empty move menus).
-            MOVE_LIGHT_JAB,  # STANDING vs STANDING
-            MOVE_HEADBUTT,  # GRAPPLE_WEAK cheap hit
-            MOVE_DESPERATION_PUNCH,  # GRAPPLE_DEFENSE cheap strike
-            MOVE_UPKICK,  # GROUNDED cheap offense vs STANDING
-            # Universal running coverage (prevents RUNNING soft-locks).
-            MOVE_RUNNING_CLOTHESLINE,
-            MOVE_BRACE_CLOTHESLINE,
-            MOVE_RUNNING_COLLISION,
-            # Universal win-condition access.
-            MOVE_PIN,
-            # Universal high-risk takedown shortcut.
-            MOVE_DOUBLE_LEG_TAKEDOWN,
-        }
-        if move_name in universal:
-            return True
-        if wrestler.moveset is None:
-            return True
-        return move_name in set(wrestler.moveset)
-
-    def _available_moves(
-        self,
-        user: Wrestler,
-        target: Wrestler,
-        *,
-        ignore_momentum_gate: bool = False,
-        ignore_weight_gate: bool = False,
-    ) -> list[str]:
-        # Safety: if we ever get into a broken grapple state (only one wrestler
-        # thinks they're in a grapple), silently break it so menus never empty.
-        try:
-            self._repair_grapple_desync()
-        except Exception:
-            pass
-
-        names = [
-            n
-            for n in MOVES.keys()
-            if self._move_is_legal(
-                n,
-                user,
-                target,
-                ignore_momentum_gate=ignore_momentum_gate,
-                ignore_weight_gate=ignore_weight_gate,
-            )
-            and self._passes_moveset(user, n)
-        ]
-
-        if user.state == WrestlerState.STANDING and target.state == WrestlerState.STANDING:
-            allowed_names = {MOVE_LOCK_UP, MOVE_TAUNT, MOVE_DEFENSIVE}
-
-            def neutral_ok(n: str) -> bool:
-                mv = MOVES.get(n, {})
-                t = str(mv.get("type", "Setup"))
-                su = str(mv.get("set_user_state", ""))
-                if bool(mv.get("allow_neutral", False)):
-                    return True
-                return (t == "Strike") or (n in allowed_names) or (t == "Setup" and su in {"RUNNING", "TOP_ROPE"})
-
-            names = [n for n in names if neutral_ok(n)]
-            if (
-                MOVE_REST not in names
-                and self._move_is_legal(MOVE_REST, user, target, ignore_momentum_gate=ignore_momentum_gate)
-                and self._passes_moveset(user, MOVE_REST)
-            ):
-                names.append(MOVE_REST)
-
-        def key(n: str) -> tuple[int, int, str]:
-            t = str(MOVES[n].get("type", "Setup"))
-            type_order = {"Defensive": 0, "Setup": 1, "Strike": 2, "Grapple": 3, "Aerial": 4, "Submission": 5, "Pin": 6}
-            return (type_order.get(t, 99), int(self._move_base_cost(n)), n)
-
-        return sorted(names, key=key)
-
-    def _calc_clash_score(self, move_name: str, cards: list, *, card_bonus: int = 0) -> int:
-        if move_name == MOVE_DEFENSIVE:
-            return -1
-        if not cards:
-            return 0
-
-        mv = MOVES.get(str(move_name), {})
-        is_technical = bool(mv.get("is_technical", False))
-        try:
-            tech_thr = int(mv.get("tech_threshold", 11) or 11)
-        except Exception:
-            tech_thr = 11
-        tech_thr = max(2, int(tech_thr))
-
-        # Groggy Recovery: card values are capped at 7 for scoring (but you may discard any card).
-        clamp7 = (str(move_name) == MOVE_GROGGY_RECOVERY)
-
-        def v(c) -> int:
-            try:
-                raw = int(c.value)
-            except Exception:
-                raw = 0
-            raw = min(7, raw) if clamp7 else raw
-            if is_technical:
-                return max(0, int(tech_thr) - int(raw))
-            return int(raw)
-
-        doubles = bool(len(cards) == 2 and int(cards[0].value) == int(cards[1].value))
-        same_color = bool(
-            len(cards) == 2
-            and (not doubles)
-            and str(cards[0].color) == str(cards[1].color)
-            and str(cards[0].color) != "GRAY"
-        )
-
-        if doubles:
-            base = int(v(cards[0])) + 5
-        elif same_color:
-            hi = max(int(v(cards[0])), int(v(cards[1])))
-            # Technical moves intentionally reward low cards; do not cap same-color plays.
-            base = int(hi) + 2 if is_technical else min(10, int(hi) + 2)
-        else:
-            base = sum(int(v(c)) for c in cards)
-
-        move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
-        if doubles or same_color:
-            base += max(int(cards[0].color_bonus(move_type)), int(cards[1].color_bonus(move_type)))
-        else:
-            base += sum(int(c.color_bonus(move_type)) for c in cards)
-
-        base += int(card_bonus)
-        base += int(MOVES.get(move_name, {}).get("clash_mod", 0))
-        return int(base)
-
-    def _damage_tier_from_margin(self, diff: int) -> tuple[float, str, bool]:
-        """Return (multiplier, label, force_daze) from winner-vs-loser score margin."""
-        try:
-            d = int(diff)
-        except Exception:
-            d = 0
-
-        # Treat 0/negative as a "clean" connection (tie-breaks, botches, etc.).
-        if d <= 0:
-            return (1.0, "Clean hit", False)
-        if d == 1:
-            return (0.50, "Light contact", False)
-        if 2 <= d <= 3:
-            return (0.75, "Glancing blow", False)
-        if 4 <= d <= 7:
-            return (1.00, "Clean hit", False)
-        return (1.50, "Critical hit", True)
-
-    def _move_requires_type_card(self, move_name: str) -> bool:
-        try:
-            return bool(MOVES.get(str(move_name), {}).get("requires_type_card", False))
-        except Exception:
-            return False
-
-    def _cards_satisfy_type_requirement(self, move_name: str, cards: list) -> bool:
-        if not self._move_requires_type_card(move_name):
-            return True
-        if not cards:
-            return False
-        move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
-        try:
-            return any(int(c.color_bonus(move_type)) > 0 for c in (cards or []))
-        except Exception:
-            return False
-
-    def _wrestler_has_type_card_for_move(self, wrestler: Wrestler, move_name: str) -> bool:
-        if not self._move_requires_type_card(move_name):
-            return True
-        try:
-            hand = list(getattr(wrestler, "hand", None) or [])
-        except Exception:
-            hand = []
-        move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
-        try:
-            return any(int(c.color_bonus(move_type)) > 0 for c in hand)
-        except Exception:
-            return False
-
-    def _is_stale_applicable_attack(self, move_name: str) -> bool:
-        try:
-            if str(move_name) == str(MOVE_PIN):
-                return False
-        except Exception:
-            pass
-        t = str(MOVES.get(str(move_name), {}).get("type", "Setup"))
-        return t in {"Strike", "Grapple", "Aerial", "Submission"}
-
-    def _would_be_stale(self, wrestler: Wrestler, move_name: str) -> bool:
-        if not self._is_stale_applicable_attack(move_name):
-            return False
-        win = max(1, int(STALE_WINDOW_ATTACK_MOVES))
-        thr = max(2, int(STALE_REPEAT_THRESHOLD))
-        lookback = max(0, int(win) - 1)
-        try:
-            recent = list(getattr(wrestler, "recent_attack_moves", None) or [])
-        except Exception:
-            recent = []
-        recent = recent[-lookback:] if lookback else []
-        return recent.count(str(move_name)) >= (int(thr) - 1)
-
-    def _record_attack_move_for_stale(self, wrestler: Wrestler, move_name: str) -> None:
-        if not self._is_stale_applicable_attack(move_name):
-            return
-        win = max(1, int(STALE_WINDOW_ATTACK_MOVES))
-        keep = max(0, int(win) - 1)
-        try:
-            recent = list(getattr(wrestler, "recent_attack_moves", None) or [])
-        except Exception:
-            recent = []
-        recent.append(str(move_name))
-        if keep <= 0:
-            recent = []
-        else:
-            recent = recent[-keep:]
-        try:
-            wrestler.recent_attack_moves = recent
-        except Exception:
-            pass
-
-    def _selected_player_cards(self) -> list:
-        hand = list(self.player.hand or [])
-        idxs = sorted(self.selected_cards)
-        cards = [hand[i] for i in idxs if 0 <= i < len(hand)]
-
-        if self.selected_move == MOVE_REST:
-            return []
-
-        if self.selected_move == MOVE_DEFENSIVE:
-            if any(int(c.value) > 5 for c in cards):
-                return []
-            return cards
-
-        if self.selected_move == MOVE_GROGGY_RECOVERY:
-            # Value cap is applied in scoring/progress; do not hard-reject high cards.
-            pass
-
-        if len(cards) == 2:
-            same_val = (int(cards[0].value) == int(cards[1].value))
-            same_col = (str(cards[0].color) == str(cards[1].color)) and (str(cards[0].color) != "GRAY")
-            if not (same_val or same_col):
-                return []
-        return cards
-
-    def _effective_cost(self, wrestler: Wrestler, move_name: str, cards: list) -> int:
-        mv_cost = int(self._move_base_cost(move_name))
-        # Momentum economy: when the player is "on fire", move costs flow more cheaply.
-        try:
-            if wrestler is self.player and int(getattr(self, "momentum", 0)) >= 2:
-                mv_cost = max(0, int(mv_cost) - 2)
-        except Exception:
-            pass
-        ignore_cards = (move_name == MOVE_REST)
-        card_cost = 0 if ignore_cards else sum(int(c.grit_cost()) for c in (cards or []))
-        return int(mv_cost) + int(card_cost)
-
-    def _resolve_clash(self, p_move: str, p_cards: list, c_move: str, c_cards: list) -> None:
-        if self.game_over:
-            return
-
-        self._log_separator()
-
-        # Track pre-exchange TOSSED so a newly-created toss (e.g., Irish Whip)
-        # persists into the next beat.
-        p_was_tossed = (self.player.state == WrestlerState.TOSSED)
-        c_was_tossed = (self.cpu.state == WrestlerState.TOSSED)
-
-        p_move_cost = int(self._move_base_cost(p_move))
-        c_move_cost = int(self._move_base_cost(c_move))
-
-        # Safety: if a move is selected that can't be afforded, auto-convert it to Rest.
-        if int(self.player.grit) < int(p_move_cost):
-            self._log(f"{self._fmt_name(self.player)} can't afford {self._fmt_move(str(p_move))} — forced Rest.")
-            p_move = MOVE_REST
-            p_move_cost = int(self._move_base_cost(p_move))
-            p_cards = []
-        if int(self.cpu.grit) < int(c_move_cost):
-            self._log(f"{self._fmt_name(self.cpu)} can't afford {self._fmt_move(str(c_move))} — forced Rest.")
-            c_move = MOVE_REST
-            c_move_cost = int(self._move_base_cost(c_move))
-            c_cards = []
-
-        p_ignore_cards = (p_move == MOVE_REST)
-        c_ignore_cards = (c_move == MOVE_REST)
-
-        # Rest is a "quiet" action: it should never use cards to outscore an attack.
-        if p_ignore_cards:
-            p_cards = []
-        if c_ignore_cards:
-            c_cards = []
-
-        p_card_spent = 0 if p_ignore_cards else sum(int(c.grit_cost()) for c in (p_cards or []))
-        c_card_spent = 0 if c_ignore_cards else sum(int(c.grit_cost()) for c in (c_cards or []))
-        p_total_spent = int(p_move_cost) + int(p_card_spent)
-        c_total_spent = int(c_move_cost) + int(c_card_spent)
-
-        p_card_value_sum = 0 if p_ignore_cards else sum(int(c.value) for c in (p_cards or []))
-        c_card_value_sum = 0 if c_ignore_cards else sum(int(c.value) for c in (c_cards or []))
-
-        p_fired = int(getattr(self.player, "fired_up_turns_remaining", 0) or 0) > 0
-        c_fired = int(getattr(self.cpu, "fired_up_turns_remaining", 0) or 0) > 0
-        p_fired_card_bonus = int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) if p_fired else 0
-        c_fired_card_bonus = int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) if c_fired else 0
-        if p_fired_card_bonus and (not p_ignore_cards):
-            p_card_value_sum += int(p_fired_card_bonus) * int(len(p_cards or []))
-        if c_fired_card_bonus and (not c_ignore_cards):
-            c_card_value_sum += int(c_fired_card_bonus) * int(len(c_cards or []))
-
-        p_bonus = int(self.player.next_card_bonus) + int(p_fired_card_bonus) * int(len(p_cards or []))
-        c_bonus = int(self.cpu.next_card_bonus) + int(c_fired_card_bonus) * int(len(c_cards or []))
-
-        p_score = -1 if p_move == MOVE_DEFENSIVE else self._calc_clash_score(p_move, p_cards, card_bonus=p_bonus)
-        c_score = -1 if c_move == MOVE_DEFENSIVE else self._calc_clash_score(c_move, c_cards, card_bonus=c_bonus)
-
-        # Stale move penalty: repeating the same attack within a short window hurts your clash score.
-        p_stale_pen = 0
-        c_stale_pen = 0
-        try:
-            if p_move != MOVE_DEFENSIVE and self._would_be_stale(self.player, p_move):
-                p_stale_pen = int(STALE_CLASH_SCORE_PENALTY)
-                p_score -= int(p_stale_pen)
-        except Exception:
-            p_stale_pen = 0
-        try:
-            if c_move != MOVE_DEFENSIVE and self._would_be_stale(self.cpu, c_move):
-                c_stale_pen = int(STALE_CLASH_SCORE_PENALTY)
-                c_score -= int(c_stale_pen)
-        except Exception:
-            c_stale_pen = 0
-
-        # Note: we intentionally don't emit a separate "repeats X" log line here.
-        # The stale penalty is already visible in the score breakdown (-staleN) and via the [STALE] tag in the move list.
-
-        # Rest can never prevent pins/subs/attacks; make it always lose to them.
-        def _is_attack_for_rest(move_name: str) -> bool:
-            t = str(MOVES.get(str(move_name), {}).get("type", "Setup"))
-            return t in {"Strike", "Grapple", "Aerial", "Pin", "Submission"}
-
-        if str(p_move) == MOVE_REST and _is_attack_for_rest(c_move):
-            p_score = -999
-        if str(c_move) == MOVE_REST and _is_attack_for_rest(p_move):
-            c_score = -999
-
-        # Apply combo-chain bonuses (one-turn window).
-        p_chain_add = 0
-        c_chain_add = 0
-        if p_move != MOVE_DEFENSIVE and getattr(self.player, "chain_window", None) == p_move and int(getattr(self.player, "chain_turns_remaining", 0)) > 0:
-            p_chain_add = int(getattr(self.player, "chain_potency", 0))
-            p_score += int(p_chain_add)
-            self.player.chain_turns_remaining = 0
-            self.player.chain_window = None
-            self.player.chain_potency = 0
-            self._log(f"{self._fmt_name(self.player)}: Combo bonus applied!")
-        if c_move != MOVE_DEFENSIVE and getattr(self.cpu, "chain_window", None) == c_move and int(getattr(self.cpu, "chain_turns_remaining", 0)) > 0:
-            c_chain_add = int(getattr(self.cpu, "chain_potency", 0))
-            c_score += int(c_chain_add)
-            self.cpu.chain_turns_remaining = 0
-            self.cpu.chain_window = None
-            self.cpu.chain_potency = 0
-            self._log(f"{self._fmt_name(self.cpu)}: Combo bonus applied!")
-
-        # Momentum modifier (scaled): 1-3 => ±1, 4-5 => ±2.
-        mom = int(getattr(self, "momentum", 0))
-        mom = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), mom))
-        mag = abs(int(mom))
-        if mag == 0:
-            mom_scaled = 0
-        elif mag <= int(MOMENTUM_SCORE_TIER1_MAX):
-            mom_scaled = int(MOMENTUM_SCORE_TIER1_BONUS)
-        else:
-            mom_scaled = int(MOMENTUM_SCORE_TIER2_BONUS)
-        if mom < 0:
-            mom_scaled = -int(mom_scaled)
-        p_mom_add = int(mom_scaled) if int(mom_scaled) > 0 else 0
-        c_mom_add = int(-mom_scaled) if int(mom_scaled) < 0 else 0
-        if p_move != MOVE_DEFENSIVE:
-            p_score += int(p_mom_add)
-        if c_move != MOVE_DEFENSIVE:
-            c_score += int(c_mom_add)
-
-        if bool(REVEAL_SCORE_BREAKDOWN):
-            def _breakdown(move_name: str, cards: list, card_bonus: int, chain_add: int, mom_add: int, stale_pen: int) -> str:
-                if move_name == MOVE_DEFENSIVE:
-                    pool = sum(int(c.value) for c in (cards or []))
-                    if cards and len(cards) == 2 and int(cards[0].value) == int(cards[1].value):
-                        pool += 5
-                    return f"DEF {pool}"
-                if not cards:
-                    base = 0 + int(chain_add) + int(mom_add) - int(stale_pen)
-                    return f"0+chain{int(chain_add)}+mom{int(mom_add)}-stale{int(stale_pen)}={int(base)}"
-
-                mv = MOVES.get(str(move_name), {})
-                is_technical = bool(mv.get("is_technical", False))
-                try:
-                    tech_thr = int(mv.get("tech_threshold", 11) or 11)
-                except Exception:
-                    tech_thr = 11
-                tech_thr = max(2, int(tech_thr))
-
-                def v(c) -> int:
-                    try:
-                        raw = int(c.value)
-                    except Exception:
-                        raw = 0
-                    if str(move_name) == MOVE_GROGGY_RECOVERY:
-                        raw = min(7, raw)
-                    if is_technical:
-                        return max(0, int(tech_thr) - int(raw))
-                    return int(raw)
-
-                move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
-                clash_mod = int(MOVES.get(move_name, {}).get("clash_mod", 0))
-                doubles = bool(len(cards) == 2 and int(cards[0].value) == int(cards[1].value))
-                same_color = bool(
-                    len(cards) == 2
-                    and (not doubles)
-                    and str(cards[0].color) == str(cards[1].color)
-                    and str(cards[0].color) != "GRAY"
-                )
-
-                if doubles:
-                    val = int(v(cards[0]))
-                    dbl = 5
-                    col = max(int(cards[0].color_bonus(move_type)), int(cards[1].color_bonus(move_type)))
-                    base = int(val) + int(dbl) + int(col) + int(card_bonus) + int(clash_mod)
-                elif same_color:
-                    hi = max(int(v(cards[0])), int(v(cards[1])))
-                    val = int(hi)
-                    dbl = 0
-                    col = max(int(cards[0].color_bonus(move_type)), int(cards[1].color_bonus(move_type)))
-                    pool = int(val) + 2
-                    if not bool(is_technical):
-                        pool = min(10, int(pool))
-                    base = int(pool) + int(col) + int(card_bonus) + int(clash_mod)
-                else:
-                    val = sum(int(v(c)) for c in cards)
-                    dbl = 0
-                    col = sum(int(c.color_bonus(move_type)) for c in cards)
-                    base = int(val) + int(dbl) + int(col) + int(card_bonus) + int(clash_mod)
-
-                total = int(base) + int(chain_add) + int(mom_add) - int(stale_pen)
-                tech_tag = f"TECH{int(tech_thr)}" if is_technical else ""
-                lead = (tech_tag + ":") if tech_tag else ""
-                return f"{lead}{val}+dbl{dbl}+col{col}+bon{int(card_bonus)}+mod{clash_mod}+chain{int(chain_add)}+mom{int(mom_add)}-stale{int(stale_pen)}={int(total)}"
-
-            self._log(
-                f"Score: YOU {_breakdown(p_move, p_cards or [], p_bonus, p_chain_add, p_mom_add, p_stale_pen)} | "
-                f"CPU {_breakdown(c_move, c_cards or [], c_bonus, c_chain_add, c_mom_add, c_stale_pen)}"
-            )
-
-        # Record attempted attack moves for stale tracking (attempts count as "played" for predictability).
-        try:
-            self._record_attack_move_for_stale(self.player, p_move)
-        except Exception:
-            pass
-        try:
-            self._record_attack_move_for_stale(self.cpu, c_move)
-        except Exception:
-            pass
-
-        def is_simultaneous_nonconflicting(name: str) -> bool:
-            mv = MOVES.get(name, {})
-            t = str(mv.get("type", "Setup"))
-            dmg = int(mv.get("damage", 0))
-            if name in {MOVE_DEFENSIVE, MOVE_LOCK_UP, MOVE_FIGHT_FOR_CONTROL}:
-                return False
-            if t in {"Pin", "Submission"}:
-                return False
-            return (t == "Setup" and dmg == 0) or name in {MOVE_TAUNT, MOVE_REST, MOVE_SLOW_STAND_UP, MOVE_KIP_UP}
-
-        simultaneous = bool(is_simultaneous_nonconflicting(p_move) and is_simultaneous_nonconflicting(c_move))
-        defensive_vs_passive = bool(
-            (p_move == MOVE_DEFENSIVE and is_simultaneous_nonconflicting(c_move))
-            or (c_move == MOVE_DEFENSIVE and is_simultaneous_nonconflicting(p_move))
-        )
-        if defensive_vs_passive:
-            simultaneous = True
-
-        # Used by _execute_move to scale VFX by actual damage.
-        self._last_clash_winner = None
-        self._last_clash_flashed = False
-
-        p_name = self._fmt_name(self.player)
-        c_name = self._fmt_name(self.cpu)
-        p_cards_txt = self._fmt_cards(p_cards)
-        c_cards_txt = self._fmt_cards(c_cards)
-
-        def cpu_mode_label() -> str:
-            mode = str(getattr(self, "_last_cpu_mode", None) or "RND").upper()
-            if mode == "GREED":
-                return "Greed"
-            if mode == "GOOD":
-                return "GoodCard"
-            if mode == "BAD":
-                return "BadCard"
-            return "Random"
-
-        # Winner-focused reveal happens after the clash resolves.
-
-        winner = loser = None
-        w_move = None
-        w_score = None
-        skip_winner_botch_check = False
-        force_winner_execute = False
-
-        if simultaneous:
-            if defensive_vs_passive:
-                self._log("Quiet beat: Defense meets a non-attack — both actions resolve.")
-            else:
-                self._log("Simultaneous Action! Both wrestlers focus on their strategy.")
-            self._flash_clash(outcome="neutral", damage=0)
-        elif p_move == MOVE_DEFENSIVE and c_move == MOVE_DEFENSIVE:
-            self._log("Both fighters play it safe—no clean opening this beat.")
-            self._flash_clash(outcome="neutral", damage=0)
-        elif (p_move != MOVE_DEFENSIVE) and (c_move != MOVE_DEFENSIVE) and (p_score == c_score):
-            # Botch edge case: in a tie, a botch can break the stalemate.
-
-            # FIRE UP!: if exactly one side is fired up, they win ties outright.
-            if bool(p_fired) != bool(c_fired):
-                winner, loser = (self.player, self.cpu) if p_fired else (self.cpu, self.player)
-                w_move, w_score = (p_move, p_score) if winner is self.player else (c_move, c_score)
-                force_winner_execute = True
-                skip_winner_botch_check = True
-                self._log(f"FIRE UP! {self._fmt_name(winner)} wins the tie!")
-            else:
-                def is_attack(move_name: str) -> bool:
-                    t = str(MOVES.get(move_name, {}).get("type", "Setup"))
-                    return t not in {"Setup", "Defensive"}
-
-                def botch_roll(w: Wrestler, move_name: str) -> bool:
-                    # FIRE UP!: cannot botch.
-                    try:
-                        if int(getattr(w, "fired_up_turns_remaining", 0) or 0) > 0:
-                            return False
-                    except Exception:
-                        pass
-                    if not is_attack(move_name):
-                        return False
-                    missing = max(0.0, float(MAX_HEALTH) - float(getattr(w, "hp", 0)))
-                    divisor = max(1.0, float(TUNING_BOTCH_DIVISOR))
-                    chance = max(0.0, min(100.0, missing / divisor))
-                    return float(random.uniform(0.0, 100.0)) < chance
-
-                p_botch = botch_roll(self.player, p_move)
-                c_botch = botch_roll(self.cpu, c_move)
-
-                # If any botch is involved in breaking the tie, don't re-roll botch later.
-                skip_winner_botch_check = bool(p_botch or c_botch)
-
-                if p_botch and (not c_botch):
-                    self._log(f"BOTCH! {self._fmt_name(self.player)} stumbles due to injury!")
-                    winner, loser = self.cpu, self.player
-                    w_move, w_score = c_move, c_score
-                elif c_botch and (not p_botch):
-                    self._log(f"BOTCH! {self._fmt_name(self.cpu)} stumbles due to injury!")
-                    winner, loser = self.player, self.cpu
-                    w_move, w_score = p_move, p_score
-                elif p_botch and c_botch:
-                    # Double botch: healthier wrestler still lands their move.
-                    self._log("DOUBLE BOTCH! Both stumble — the healthier fighter capitalizes!")
-                    force_winner_execute = True
-                    if int(self.player.hp) > int(self.cpu.hp):
-                        winner, loser = self.player, self.cpu
-                        w_move, w_score = p_move, p_score
-                    elif int(self.cpu.hp) > int(self.player.hp):
-                        winner, loser = self.cpu, self.player
-                        w_move, w_score = c_move, c_score
-                    else:
-                        if random.random() < 0.5:
-                            winner, loser = self.player, self.cpu
-                            w_move, w_score = p_move, p_score
-                        else:
-                            winner, loser = self.cpu, self.player
-                            w_move, w_score = c_move, c_score
-                else:
-                    # No botch: break ties by Strength (remaining deck + hand).
-                    try:
-                        p_str = int(self.player.strength_current())
-                    except Exception:
-                        p_str = 0
-                    try:
-                        c_str = int(self.cpu.strength_current())
-                    except Exception:
-                        c_str = 0
-
-                    if p_str > c_str:
-                        winner, loser = self.player, self.cpu
-                        w_move, w_score = p_move, p_score
-                        force_winner_execute = True
-                        self._log(f"TIE BREAK! {self._fmt_name(self.player)} muscles through on Strength.")
-                    elif c_str > p_str:
-                        winner, loser = self.cpu, self.player
-                        w_move, w_score = c_move, c_score
-                        force_winner_execute = True
-                        self._log(f"TIE BREAK! {self._fmt_name(self.cpu)} muscles through on Strength.")
-                    else:
-                        # True tie: usually coin toss, occasionally double-down.
-                        if random.random() < float(TUNING_DOUBLE_DOWN_ON_TRUE_TIE_CHANCE):
-                            self._log("DOUBLE DOWN! Both crash into the mat — 5 damage each. Both are GROUNDED.")
-                            self.player.take_damage(5)
-                            self.cpu.take_damage(5)
-                            self.player.clear_grapple()
-                            self.cpu.clear_grapple()
-                            self.player.set_state(WrestlerState.GROUNDED)
-                            self.cpu.set_state(WrestlerState.GROUNDED)
-                        else:
-                            if random.random() < 0.5:
-                                winner, loser = self.player, self.cpu
-                                w_move, w_score = p_move, p_score
-                            else:
-                                winner, loser = self.cpu, self.player
-                                w_move, w_score = c_move, c_score
-                            force_winner_execute = True
-                            self._log("TIE! A split-second edge decides it.")
-        elif p_score > c_score:
-            winner, loser = self.player, self.cpu
-            w_move, w_score = p_move, p_score
-        else:
-            winner, loser = self.cpu, self.player
-            w_move, w_score = c_move, c_score
-
-        # Better feedback: make the clash winner obvious in the log.
-        if (not simultaneous) and (winner is not None) and (loser is not None):
-            winner_move = p_move if winner is self.player else c_move
-            loser_move = c_move if winner is self.player else p_move
-            winner_score = int(p_score) if winner is self.player else int(c_score)
-            loser_score = int(c_score) if winner is self.player else int(p_score)
-            winner_cards = p_cards if winner is self.player else c_cards
-            loser_cards = c_cards if winner is self.player else p_cards
-
-            def score_txt(move_name: str, score: int, cards: list) -> str:
-                if move_name == MOVE_DEFENSIVE:
-                    pool = sum(int(c.value) for c in (cards or []))
-                    if cards and len(cards) == 2 and int(cards[0].value) == int(cards[1].value):
-                        pool += 5
-                    return f"DEF {pool}"
-                if move_name == MOVE_REST:
-                    return "0"
-                if int(score) < 0:
-                    return "0"
-                return str(int(score))
-
-            w_txt = score_txt(str(winner_move), winner_score, winner_cards)
-            l_txt = score_txt(str(loser_move), loser_score, loser_cards)
-            w_cards_txt = self._fmt_cards(winner_cards)
-            l_cards_txt = self._fmt_cards(loser_cards)
-
-            extra = ""
-            if winner is self.cpu:
-                extra = f" [{cpu_mode_label()}]"
-
-            # Example style:
-            # "CPU was going for Chokeslam (7), but YOU beat him to the punch with Lock Up (9) (Cards: 4, 5)!"
-            if REVEAL_LOSER_MOVE_NAME:
-                if REVEAL_LOSER_CARDS:
-                    loser_bits = f"{self._fmt_move(str(loser_move))} ({l_txt}) ({l_cards_txt})"
-                else:
-                    loser_bits = f"{self._fmt_move(str(loser_move))} ({l_txt})"
-                self._log(
-                    f"[b]{self._fmt_name(winner)} wins the clash![/b] "
-                    f"{self._fmt_name(loser)} was going for {loser_bits}, "
-                    f"but {self._fmt_name(winner)} beats them to it with {self._fmt_move(str(winner_move))} ({w_txt}) ({w_cards_txt})!{extra}"
-                )
-            else:
-                self._log(
-                    f"[b]{self._fmt_name(winner)} wins the clash![/b] "
-                    f"{self._fmt_move(str(winner_move))} ({w_txt}) ({w_cards_txt})!{extra}"
-                )
-
-            # Defer VFX until after botch check so botches don't flash winner colors.
-
-        # --- Botch check happens before criticals (so a botch can't "critical") ---
-        rest_interrupted_player = False
-        rest_interrupted_cpu = False
-        caught_napping_player = False
-        caught_napping_cpu = False
-        critical_damage_override: int | None = None
-
-        if (not simultaneous) and (winner is not None) and (w_move is not None):
-            if (not skip_winner_botch_check) and (not force_winner_execute):
-                fired_no_botch = False
-                try:
-                    fired_no_botch = int(getattr(winner, "fired_up_turns_remaining", 0) or 0) > 0
-                except Exception:
-                    fired_no_botch = False
-
-                if fired_no_botch:
-                    # FIRE UP!: cannot botch.
-                    skip_winner_botch_check = True
-                else:
-                    w_type = str(MOVES.get(str(w_move), {}).get("type", "Setup"))
-                    is_attack = (w_type in {"Strike", "Grapple", "Aerial"})
-                    if is_attack:
-                        missing = max(0.0, float(MAX_HEALTH) - float(getattr(winner, "hp", 0)))
-                        divisor = max(1.0, float(TUNING_BOTCH_DIVISOR))
-                        botch_chance = max(0.0, min(100.0, missing / divisor))
-                        if float(random.uniform(0.0, 100.0)) < botch_chance:
-                            self._log(f"BOTCH! {self._fmt_name(winner)} stumbles due to injury!")
-                            winner = None
-
-        # Apply clash flash only if a move will actually execute.
-        self._last_clash_winner = winner
-        if (not simultaneous) and (winner is not None) and (loser is not None):
-            # Base flash on clash result; damage (if any) will override in _execute_move.
-            self._flash_clash(outcome=("player" if winner is self.player else "cpu"), damage=0)
-
-        # --- "Caught Napping" criticals (Rest punish) ---
-        if (not simultaneous) and (winner is not None) and (loser is not None) and (w_move is not None):
-            loser_move = c_move if winner is self.player else p_move
-            w_type = str(MOVES.get(str(w_move), {}).get("type", "Setup"))
-            is_attack = w_type in {"Strike", "Grapple", "Aerial", "Pin", "Submission"}
-            if (str(loser_move) == MOVE_REST) and is_attack:
-                rest_interrupted_player = bool(loser is self.player)
-                rest_interrupted_cpu = bool(loser is self.cpu)
-
-                # 25% chance to become a critical when hit while resting.
-                if float(random.random()) < float(TUNING_CAUGHT_RESTING_CRIT_CHANCE):
-                    caught_napping_player = bool(loser is self.player)
-                    caught_napping_cpu = bool(loser is self.cpu)
-
-                    raw = int(MOVES.get(str(w_move), {}).get("damage", 0))
-                    if raw > 0:
-                        critical_damage_override = int(round(float(raw) * 1.5))
-                    self._log(f"CRITICAL! {self._fmt_name(winner)} catches {self._fmt_name(loser)} resting!")
-
-        # Passive regen text: show it early in the log stack.
-        def _apply_passive_regen(w: Wrestler, total_spent: int, *, blocked: bool) -> None:
-            if not TUNING_ENABLE_PASSIVE_REGEN:
-                return
-            if int(total_spent) != 0:
-                return
-            if bool(blocked):
-                return
-            before = int(w.grit)
-            regen = int(TUNING_GRIT_PASSIVE_REGEN)
-            try:
-                if bool(w.is_winded()):
-                    regen = max(0, int(regen // 2))
-            except Exception:
-                pass
-            w.grit = min(w.max_grit, int(w.grit) + int(regen))
-            gained = int(w.grit) - before
-            if gained > 0:
-                self._log(f"{self._fmt_name(w)}: Passive Regen (+{gained} Grit).")
-
-        _apply_passive_regen(self.player, p_total_spent, blocked=bool(rest_interrupted_player and p_move == MOVE_REST))
-        _apply_passive_regen(self.cpu, c_total_spent, blocked=bool(rest_interrupted_cpu and c_move == MOVE_REST))
-
-        # Spend grit + apply card-driven economy + discard + redraw (both sides pay their attempt).
-        self.player.spend_grit(p_move_cost)
-        # If the player got hit while Resting, cancel all Rest regen (including card-regen).
-        if not (rest_interrupted_player and p_move == MOVE_REST):
-            self.player.apply_grit_from_cards(p_cards, ignore_cost=p_ignore_cards)
-        self.player.discard_cards(p_cards)
-        self.player.draw_to_full()
-
-        self.cpu.spend_grit(c_move_cost)
-        # If the CPU got hit while Resting, cancel all Rest regen (including card-regen).
-        if not (rest_interrupted_cpu and c_move == MOVE_REST):
-            self.cpu.apply_grit_from_cards(c_cards, ignore_cost=c_ignore_cards)
-        self.cpu.discard_cards(c_cards)
-        self.cpu.draw_to_full()
-
-        self.player.next_card_bonus = 0
-        self.cpu.next_card_bonus = 0
-
-        # Grapple-break strikes: defender breaks free on a decisive win.
-        if (not simultaneous) and (winner is not None) and (loser is not None) and (w_move is not None):
-            try:
-                mv = MOVES.get(str(w_move), {})
-                if str(mv.get("type", "Setup")) == "Strike":
-                    w_score_val = int(p_score) if winner is self.player else int(c_score)
-                    l_score_val = int(c_score) if winner is self.player else int(p_score)
-                    margin = int(w_score_val - l_score_val)
-                    if (
-                        margin >= int(GRAPPLE_BREAK_STRIKE_VALUE)
-                        and bool(winner.is_in_grapple())
-                        and bool(loser.is_in_grapple())
-                        and getattr(winner, "grapple_role", None) == GrappleRole.DEFENSE
-                        and getattr(loser, "grapple_role", None) == GrappleRole.OFFENSE
-                    ):
-                        winner.clear_grapple()
-                        loser.clear_grapple()
-                        winner.set_state(WrestlerState.STANDING)
-                        loser.set_state(WrestlerState.STANDING)
-                        self._log(f"BREAK! {self._fmt_name(winner)} cracks {self._fmt_name(loser)} and slips free of the hold!")
-            except Exception:
-                pass
-
-        if simultaneous:
-            self._execute_move(attacker=self.player, defender=self.cpu, move_name=p_move, clash_score=p_score, card_value_sum=p_card_value_sum, cards=p_cards)
-            self._execute_move(attacker=self.cpu, defender=self.player, move_name=c_move, clash_score=c_score, card_value_sum=c_card_value_sum, cards=c_cards)
-        elif (winner is not None) and (w_move is not None):
-            loser_move = c_move if winner is self.player else p_move
-            loser_type = str(MOVES.get(loser_move, {}).get("type", "Setup"))
-            if str(w_move) in {MOVE_TAUNT, MOVE_REST} and loser_type not in {"Setup", "Defensive"}:
-                self._log(f"{self._fmt_name(winner)} dodges effortlessly while {self._fmt_name(loser)} wastes the beat.")
-
-            passive_winner = str(w_move) in {MOVE_TAUNT, MOVE_REST}
-            positioning_loser = str(loser_move) in {MOVE_SLOW_STAND_UP, MOVE_KIP_UP, MOVE_CLIMB_DOWN, MOVE_STOP_SHORT, MOVE_SHOVE_OFF}
-            run_loser_after = bool(passive_winner and positioning_loser)
-
-            # Defensive cancel/soften
-            if (p_move == MOVE_DEFENSIVE and winner is self.cpu) or (c_move == MOVE_DEFENSIVE and winner is self.player):
-                defender_cards = p_cards if p_move == MOVE_DEFENSIVE else c_cards
-                pool = sum(int(c.value) for c in (defender_cards or []))
-                if defender_cards and len(defender_cards) == 2 and int(defender_cards[0].value) == int(defender_cards[1].value):
-                    pool += 5
-                try:
-                    defender = self.player if p_move == MOVE_DEFENSIVE else self.cpu
-                    if int(getattr(defender, "fired_up_turns_remaining", 0) or 0) > 0:
-                        pool += int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) * int(len(defender_cards or []))
-                except Exception:
-                    pass
-                opp_score = int(w_score or 0)
-                raw_dmg = int(MOVES.get(w_move, {}).get("damage", 0))
-
-                # Active Defense: perfect-guard reversal if you barely lose (<=2).
-                margin = int(opp_score) - int(pool)
-                if 0 <= int(margin) <= 2:
-                    defender = self.player if p_move == MOVE_DEFENSIVE else self.cpu
-                    attacker = winner
-                    self._log(f"PERFECT GUARD! {self._fmt_name(defender)} reverses the momentum at the last second!")
-                    dealt = attacker.take_damage(5, target_part="BODY")
-                    self._log(f"{self._fmt_name(attacker)} takes {self._fmt_damage(dealt)} on the counter!")
-                    try:
-                        delta = 2 if defender is self.player else -2
-                        cur = int(getattr(self, "momentum", 0))
-                        self.momentum = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), int(cur + delta)))
-                    except Exception:
-                        pass
-                    try:
-                        self._flash_clash(outcome=("player" if defender is self.player else "cpu"), damage=int(dealt))
-                    except Exception:
-                        pass
-                    # Do not execute the original attacker's move.
-                else:
-                    avoid_ok = (opp_score <= 10 and pool >= opp_score)
-                    suppress_states = (opp_score <= 10 and pool >= max(1, opp_score - 2))
-                    if avoid_ok:
-                        self._log(f"Defensive ({pool}): slip away from the attack!")
-                    else:
-                        reduction = pool if opp_score <= 10 else (pool // 2)
-                        boosted_raw = int(raw_dmg)
-                        w_cards = p_cards if winner is self.player else c_cards
-                        try:
-                            if boosted_raw > 0 and w_cards and len(w_cards) == 2 and int(w_cards[0].value) == int(w_cards[1].value):
-                                w_type = str(MOVES.get(w_move, {}).get("type", "Setup"))
-                                if w_type in {"Strike", "Grapple", "Aerial"}:
-                                    boosted_raw = int(math.ceil(float(boosted_raw) * float(DOUBLES_DAMAGE_MODIFIER)))
-                        except Exception:
-                            pass
-
-                        dmg_override = max(0, int(boosted_raw) - max(0, reduction))
-                        if int(raw_dmg) > 0 and int(dmg_override) < int(boosted_raw):
-                            self._log(f"Defensive ({pool}): soften the blow ({int(boosted_raw)}->{int(dmg_override)}).")
-                        w_val = p_card_value_sum if winner is self.player else c_card_value_sum
-                        self._execute_move(attacker=winner, defender=loser, move_name=w_move, clash_score=w_score, damage_override=dmg_override, suppress_state_changes=bool(suppress_states), card_value_sum=w_val, cards=w_cards, apply_doubles_bonus=False)
-            else:
-                w_cards = p_cards if winner is self.player else c_cards
-                w_val = p_card_value_sum if winner is self.player else c_card_value_sum
-                # Margin-of-victory damage scaling: use the score difference between winner and loser.
-                try:
-                    w_score_val = int(p_score) if winner is self.player else int(c_score)
-                    l_score_val = int(c_score) if winner is self.player else int(p_score)
-                except Exception:
-                    w_score_val = int(w_score or 0)
-                    l_score_val = 0
-                # Clamp loser score to avoid Rest (-999) creating guaranteed crits.
-                margin = max(0, max(0, int(w_score_val)) - max(0, int(l_score_val)))
-                mult, tier_label, force_daze = self._damage_tier_from_margin(int(margin))
-                self._execute_move(
-                    attacker=winner,
-                    defender=loser,
-                    move_name=w_move,
-                    clash_score=w_score,
-                    damage_override=critical_damage_override,
-                    card_value_sum=w_val,
-                    cards=w_cards,
-                    margin_diff=int(margin),
-                    margin_mult=float(mult),
-                    margin_label=str(tier_label),
-                    margin_force_daze=bool(force_daze),
-                )
-
-            if run_loser_after:
-                self._execute_move(attacker=loser, defender=winner, move_name=str(loser_move), damage_override=0)
-
-        # High-risk "shoot" moves: on loss, you can end up GROUNDED (sprawled on / stuffed).
-        if (not simultaneous) and (winner is not None) and (loser is not None):
-            try:
-                loser_move_name = str(c_move) if winner is self.player else str(p_move)
-                lm = MOVES.get(loser_move_name, {})
-                on_loss_state = str(lm.get("on_loss_set_user_state", "") or "").strip()
-                if on_loss_state:
-                    try:
-                        loser.clear_grapple()
-                    except Exception:
-                        pass
-                    loser.set_state(WrestlerState(on_loss_state))
-                    try:
-                        self._repair_grapple_desync()
-                    except Exception:
-                        pass
-                    self._log(f"SPRAWL! {self._fmt_name(loser)} shoots in and gets stuffed — they're {on_loss_state}.")
-            except Exception:
-                pass
-
-        # Irish whip window: if a wrestler STARTED this exchange as TOSSED and the opponent
-        # doesn't capitalize with a TOSSED-targeting attack, they recover.
-        def _capitalized_on_tossed(attacker_move: str) -> bool:
-            mv = MOVES.get(str(attacker_move), {})
-
-            # If you used this beat to build a RUNNING follow-up (e.g., Charge),
-            # keep the tossed window open so rebound attacks can happen next.
-            try:
-                if str(mv.get("set_user_state", "")) == "RUNNING":
-                    return True
-            except Exception:
-                pass
-
-            if str(mv.get("req_target_state", "ANY")) != "TOSSED":
-                return False
-            t = str(mv.get("type", "Setup"))
-            dmg = int(mv.get("damage", 0))
-            return (t not in {"Setup", "Defensive"}) or dmg > 0
-
-        try:
-            if bool(p_was_tossed) and self.player.state == WrestlerState.TOSSED and not _capitalized_on_tossed(str(c_move)):
-                self.player.set_state(WrestlerState.STANDING)
-            if bool(c_was_tossed) and self.cpu.state == WrestlerState.TOSSED and not _capitalized_on_tossed(str(p_move)):
-                self.cpu.set_state(WrestlerState.STANDING)
-        except Exception:
-            pass
-
-        # Groggy recovery: apply progress regardless of clash outcome.
-        if str(p_move) == MOVE_GROGGY_RECOVERY:
-            self._apply_groggy_recovery_attempt(self.player, list(p_cards or []))
-        if str(c_move) == MOVE_GROGGY_RECOVERY:
-            self._apply_groggy_recovery_attempt(self.cpu, list(c_cards or []))
-
-        # Momentum update (after resolution): winning shifts MOM; big reversals reset toward center.
-        if (not simultaneous) and (winner is not None) and (w_move is not None):
-            delta = 0
-            if str(w_move) != MOVE_DEFENSIVE:
-                if bool(MOMENTUM_GAIN_ON_ATTACKS_ONLY):
-                    w_type = str(MOVES.get(str(w_move), {}).get("type", "Setup"))
-                    is_attack = w_type not in {"Setup", "Defensive"}
-                    if is_attack:
-                        delta = int(MOMENTUM_WIN_DELTA) if (winner is self.player) else -int(MOMENTUM_WIN_DELTA)
-                else:
-                    delta = int(MOMENTUM_WIN_DELTA) if (winner is self.player) else -int(MOMENTUM_WIN_DELTA)
-
-            if delta != 0:
-                cur = int(getattr(self, "momentum", 0))
-                cur = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), cur))
-                if abs(cur) >= int(MOMENTUM_REVERSAL_RESET_THRESHOLD) and (cur * delta) < 0:
-                    self._log("Momentum swing! The match flow resets.")
-                    cur = 0
-                self.momentum = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), int(cur + delta)))
-
-        self._update_hud()
-
-        # No HP-based KO ending; clamp at 0 and keep going.
-        self.player.hp = max(0, int(self.player.hp))
-        self.cpu.hp = max(0, int(self.cpu.hp))
-
-        if self._escape_mode:
-            self._render_escape_ui()
-            self._update_control_bar()
-        else:
-            self._start_turn("player")
-
-    def _escape_threshold(self, victim_hp_pct: float) -> int:
-        pct = max(0.0, min(1.0, float(victim_hp_pct)))
-        v = 1 + int(25.0 * (1.0 - pct))
-        return max(1, min(26, int(v)))
-
-    def _seed_groggy_meter(self, victim: Wrestler) -> int:
-        """HP-scaled groggy recovery threshold.
-
-        Lower HP => higher meter => more recovery plays needed.
-        """
-        try:
-            hp_pct = float(victim.hp_pct())
-        except Exception:
-            hp_pct = 1.0
-        missing = max(0.0, min(1.0, 1.0 - float(hp_pct)))
-        base = 8
-        scale = 16
-        meter = int(base + round(scale * missing))
-
-        # If already DAZED, make the groggy a bit stickier.
-        try:
-            if int(getattr(victim, "daze_turns", 0) or 0) > 0:
-                meter += 2
-        except Exception:
-            pass
-
-        return max(8, min(26, int(meter)))
-
-    def _recover_pin_escape_mult_from_damage(self, defender: Wrestler, dealt: int) -> None:
-        """Recover the defender's pin escape multiplier back toward 1.0.
-
-        Each successful kickout reduces `pin_escape_threshold_mult`, making future pins easier to escape.
-        This recovery nudges it back up as the defender takes damage, so repeated beatdowns restore
-        meaningful pin thresholds.
-        """
-        try:
-            dmg = max(0, int(dealt))
-        except Exception:
-            return
-        if dmg <= 0:
-            return
-
-        try:
-            cur = float(getattr(defender, "pin_escape_threshold_mult", 1.0) or 1.0)
-        except Exception:
-            return
-        cur = max(0.0, min(1.0, float(cur)))
-        if cur >= 1.0:
-            return
-
-        # Scale recovery: the more hurt they are, the faster pins become viable again.
-        try:
-            hp_pct = float(defender.hp_pct())
-        except Exception:
-            hp_pct = 1.0
-        missing = max(0.0, min(1.0, 1.0 - float(hp_pct)))
-        scale = 0.75 + 0.75 * float(missing)  # 0.75..1.5
-
-        inc = float(dmg) * float(TUNING_PIN_ESCAPE_THRESHOLD_MULT_RECOVER_PER_DAMAGE) * float(scale)
-        defender.pin_escape_threshold_mult = min(1.0, float(cur) + float(inc))
-
-    def _groggy_progress_from_cards(self, cards: list) -> int:
-        if not cards:
-            return 0
-
-        def v(c) -> int:
-            try:
-                return min(7, int(c.value))
-            except Exception:
-                return 0
-
-        if len(cards) == 2:
-            same_val = (int(cards[0].value) == int(cards[1].value))
-            same_col = (str(cards[0].color) == str(cards[1].color)) and (str(cards[0].color) != "GRAY")
-            if same_val:
-                return int(v(cards[0])) + 5
-            if same_col:
-                hi = max(int(v(cards[0])), int(v(cards[1])))
-                return int(min(10, int(hi) + 2))
-        return int(sum(int(v(c)) for c in cards))
-
-    def _apply_groggy_recovery_attempt(self, who: Wrestler, cards: list) -> None:
-        if not bool(getattr(who, "is_groggy", False)):
-            return
-
-        # While recovering, you're still a little vulnerable.
-        try:
-            who.next_damage_taken_multiplier = max(float(getattr(who, "next_damage_taken_multiplier", 1.0)), 1.25)
-        except Exception:
-            pass
-
-        before = int(getattr(who, "groggy_meter", 0) or 0)
-        if before <= 0:
-            who.is_groggy = False
-            who.groggy_meter = 0
-            return
-
-        progress = int(self._groggy_progress_from_cards(list(cards or [])))
-        who.groggy_meter = max(0, int(before) - int(progress))
-
-        if int(who.groggy_meter) <= 0:
-            who.is_groggy = False
-            who.groggy_meter = 0
-            try:
-                who.daze_turns = 0
-                who.daze_cooldown_turns = max(int(getattr(who, "daze_cooldown_turns", 0) or 0), int(TUNING_DAZE_COOLDOWN_TURNS))
-            except Exception:
-                pass
-            self._log(f"{self._fmt_name(who)} shakes off the stun!")
-        else:
-            self._log(f"Stunned... (Groggy: {int(who.groggy_meter)} left)")
-
-    def _begin_escape(self, *, attacker: Wrestler, defender: Wrestler, kind: str, move_name: str | None = None) -> None:
-        # Escape sequences are their own interaction; don't overlap with Groggy.
-        # (Being pinned/caught in a hold should not also force Groggy Recovery.)
-        try:
-            if bool(getattr(defender, "is_groggy", False)):
-                defender.is_groggy = False
-                defender.groggy_meter = 0
-        except Exception:
-            pass
-
-        # Ensure the defender can actually perform the 3-card escape interaction.
-        # "No redraw" means no redraw DURING the attempt, not "you might have 0 cards".
-        try:
-            if int(len(list(defender.hand or []))) < 3:
-                defender.draw_to_full()
-        except Exception:
-            pass
-
-        threshold = self._escape_threshold(defender.hp_pct())
-        try:
-            if str(kind).upper() == "PINFALL":
-                mult = float(getattr(defender, "pin_escape_threshold_mult", 1.0) or 1.0)
-                mult = max(0.0, min(1.0, mult))
-                threshold = int(math.ceil(float(threshold) * float(mult)))
-        except Exception:
-            pass
-        self._escape_mode = {
-            "kind": str(kind),
-            "threshold": int(threshold),
-            "total": 0,
-            "plays_left": 3,
-            "move_name": str(move_name) if move_name else None,
-            "attacker_is_player": bool(attacker.is_player),
-            "defender_is_player": bool(defender.is_player),
-            "attacker": attacker,
-            "defender": defender,
-        }
-        self._menu_stage = "ESCAPE"
-        self._selected_category = None
-        self.selected_move = None
-        self.selected_cards.clear()
-
-        if defender.is_player:
-            self._log(f"{kind}! Tap 3 cards to escape (no redraw).")
-            self._render_moves_ui()
-            self._render_hand()
-            self._update_control_bar()
-            return
-
-        # CPU defending: stepwise, greedy discards; user presses CONTINUE between beats.
-        self._log(f"{self._fmt_name(attacker)} attempts a {str(kind).lower()}!")
-        self._render_moves_ui()
-        self._render_hand()
-        self._update_control_bar()
-
-    def _escape_continue_cpu(self, _inst=None) -> None:
-        if self.game_over or not self._escape_mode:
-            return
-        if bool(self._escape_mode.get("defender_is_player")):
-            return
-
-        attacker = self._escape_mode.get("attacker")
-        defender = self._escape_mode.get("defender")
-        if not isinstance(attacker, Wrestler) or not isinstance(defender, Wrestler):
-            return
-
-        plays_before = int(self._escape_mode.get("plays_left", 0))
-        if plays_before <= 0:
-            return
-        count_no = max(1, 4 - int(plays_before))
-
-        hand = list(defender.hand or [])
-        if not hand:
-            self._escape_mode["plays_left"] = 0
-        else:
-            best = max(hand, key=lambda c: int(c.value))
-            gained = int(best.value)
-            defender.discard_cards([best])
-            self._escape_mode["total"] = int(self._escape_mode.get("total", 0)) + gained
-            self._escape_mode["plays_left"] = int(self._escape_mode.get("plays_left", 0)) - 1
-
-            total = int(self._escape_mode.get("total", 0))
-            threshold = int(self._escape_mode.get("threshold", 1))
-            kind = str(self._escape_mode.get("kind", "ESCAPE"))
-
-            if kind.upper() == "PINFALL":
-                if count_no == 1:
-                    self._log(f"ONE! {self._fmt_name(defender)} fights out using a {gained}. (total {total}/{threshold})")
-                elif count_no == 2:
-                    self._log(f"TWO! {self._fmt_name(defender)} kicks out using a {gained}. (total {total}/{threshold})")
-                else:
-                    self._log(f"THREE...?! {self._fmt_name(defender)} strains with a {gained}. (total {total}/{threshold})")
-            else:
-                self._log(f"Escape attempt: {self._fmt_name(defender)} discards {gained} (total {total}/{threshold})")
-
-            if total >= threshold:
-                if kind.upper() == "PINFALL":
-                    if count_no == 1:
-                        self._log(f"KICKOUT AT ONE! {self._fmt_name(defender)} escapes!")
-                    elif count_no == 2:
-                        self._log(f"KICKOUT AT TWO! {self._fmt_name(defender)} escapes!")
-                    else:
-                        self._log(f"JUST IN TIME! {self._fmt_name(defender)} escapes!")
-                else:
-                    self._log(f"{self._fmt_name(defender)} escapes the {str(kind).lower()} attempt!")
-                self._end_escape(success=True)
-                return
-
-            if kind.upper() == "SUBMISSION":
-                tick = int(SUBMISSION_TICK_DAMAGE)
-                try:
-                    move_name = str(self._escape_mode.get("move_name") or "")
-                    mv = MOVES.get(move_name, {}) if move_name else {}
-                    tick = int(mv.get("tick_damage", tick))
-                except Exception:
-                    tick = int(SUBMISSION_TICK_DAMAGE)
-                dealt = defender.take_damage(int(tick), target_part="BODY")
-                self._log(f"{self._fmt_name(attacker)} cranks it! {self._fmt_name(defender)} takes {self._fmt_damage(dealt)}.")
-
-        if int(self._escape_mode.get("plays_left", 0)) <= 0:
-            kind = str(self._escape_mode.get("kind", "ESCAPE"))
-            winner = self._fmt_name(attacker)
-            self.game_over = True
-            if kind.upper() == "PINFALL":
-                self._log(f"THREE! {kind}! Escape failed — {winner} wins.")
-            else:
-                self._log(f"{kind}! Escape failed — {winner} wins.")
-            self._update_control_bar()
-            return
-
-        self._render_moves_ui()
-        self._update_control_bar()
-
-    def _escape_play_card(self, index: int) -> None:
-        if self.game_over or not self._escape_mode:
-            return
-        if not bool(self._escape_mode.get("defender_is_player")):
-            return
-        hand = list(self.player.hand or [])
-        if index < 0 or index >= len(hand):
-            return
-        card = hand[index]
-        gained = int(card.value)
-        self.player.discard_cards([card])
-
-        plays_before = int(self._escape_mode.get("plays_left", 0))
-        count_no = max(1, 4 - int(plays_before))
-
-        self._escape_mode["total"] = int(self._escape_mode.get("total", 0)) + gained
-        self._escape_mode["plays_left"] = int(self._escape_mode.get("plays_left", 0)) - 1
-
-        total = int(self._escape_mode.get("total", 0))
-        threshold = int(self._escape_mode.get("threshold", 1))
-        kind = str(self._escape_mode.get("kind", "ESCAPE"))
-
-        if kind.upper() == "PINFALL":
-            if count_no == 1:
-                self._log(f"ONE! Escape attempt: discard {gained}.")
-            elif count_no == 2:
-                self._log(f"TWO! Escape attempt: discard {gained}.")
-            else:
-                self._log(f"THREE... Escape attempt: discard {gained}.")
-        else:
-            self._log(f"Escape discard: {gained}.")
-        self._render_hand()
-        self._render_moves_ui()
-        self._update_control_bar()
-
-        if total >= threshold:
-            if kind.upper() == "PINFALL":
-                if count_no == 1:
-                    self._log("KICKOUT AT ONE!")
-                elif count_no == 2:
-                    self._log("KICKOUT AT TWO!")
-                else:
-                    self._log("JUST IN TIME! KICKOUT!")
-            self._log(f"You escape the {kind.lower()} attempt!")
-            self._end_escape(success=True)
-            return
-
-        if kind.upper() == "SUBMISSION":
-            try:
-                attacker = self._escape_mode.get("attacker")
-                defender = self._escape_mode.get("defender")
-                if isinstance(attacker, Wrestler) and isinstance(defender, Wrestler):
-                    tick = int(SUBMISSION_TICK_DAMAGE)
-                    try:
-                        move_name = str(self._escape_mode.get("move_name") or "")
-                        mv = MOVES.get(move_name, {}) if move_name else {}
-                        tick = int(mv.get("tick_damage", tick))
-                    except Exception:
-                        tick = int(SUBMISSION_TICK_DAMAGE)
-                    dealt = defender.take_damage(int(tick), target_part="BODY")
-                    self._log(f"{self._fmt_name(attacker)} cranks it! {self._fmt_name(defender)} takes {self._fmt_damage(dealt)}.")
-            except Exception:
-                pass
-
-        if int(self._escape_mode.get("plays_left", 0)) <= 0:
-            winner = "YOU" if bool(self._escape_mode.get("attacker_is_player")) else "CPU"
-            self.game_over = True
-            if kind.upper() == "PINFALL":
-                self._log(f"THREE! {kind}! Escape failed — {winner} wins.")
-            else:
-                self._log(f"{kind}! Escape failed — {winner} wins.")
-            self._update_control_bar()
-            return
-
-    def _end_escape(self, *, success: bool) -> None:
-        if not self._escape_mode:
-            return
-        attacker = self._escape_mode.get("attacker")
-        defender = self._escape_mode.get("defender")
-        kind = str(self._escape_mode.get("kind", "ESCAPE"))
-
-        # Pin anti-spam: each successful kickout makes future pins easier to escape.
-        if success and isinstance(defender, Wrestler) and kind.upper() == "PINFALL":
-            try:
-                cur = float(getattr(defender, "pin_escape_threshold_mult", 1.0) or 1.0)
-                defender.pin_escape_threshold_mult = float(cur) * float(TUNING_PIN_ESCAPE_THRESHOLD_MULT_ON_SUCCESS)
-            except Exception:
-                pass
-        if success and isinstance(attacker, Wrestler) and isinstance(defender, Wrestler):
-            attacker.clear_grapple()
-            defender.clear_grapple()
-            attacker.set_state(WrestlerState.STANDING)
-            defender.set_state(WrestlerState.STANDING)
-            attacker.draw_to_full()
-            defender.draw_to_full()
-
-        self._escape_mode = None
-        self._menu_stage = "CATEGORIES"
-        self._selected_category = None
-        self.selected_move = None
-        self.selected_cards.clear()
-        self._render_hand()
-        self._render_moves_ui()
-        self._update_hud()
-        self._update_control_bar()
-
-    def _execute_move(
-        self,
-        *,
-        attacker: Wrestler,
-        defender: Wrestler,
-        move_name: str,
-        clash_score: int | None = None,
-        damage_override: int | None = None,
-        suppress_state_changes: bool = False,
-        card_value_sum: int = 0,
-        cards: list | None = None,
-        apply_doubles_bonus: bool = True,
-        margin_diff: int | None = None,
-        margin_mult: float | None = None,
-        margin_label: str | None = None,
-        margin_force_daze: bool = False,
-    ) -> None:
-        # card_value_sum/cards are optional extras used by Taunt + Stand Up systems.
-
-        move = MOVES[move_name]
-        mtype = str(move.get("type", "Setup"))
-
-        pre_hp_pct = 1.0
-        try:
-            pre_hp_pct = float(defender.hp_pct())
-        except Exception:
-            pre_hp_pct = 1.0
-
-        was_dazed = False
-        try:
-            was_dazed = int(getattr(defender, "daze_turns", 0) or 0) > 0
-        except Exception:
-            was_dazed = False
-
-        flavor = self._render_flavor_text(str(move.get("flavor_text", "")), attacker=attacker, defender=defender)
-        self._log(f"{self._fmt_name(attacker)} uses {self._fmt_move(move_name)}! {flavor}")
-
-        # AI memory: track what was just executed to avoid repetition.
-        try:
-            attacker.last_move_name = str(move_name)
-        except Exception:
-            pass
-
-        # Anti-turtle helper: executing Defensive starts a short cooldown window.
-        try:
-            if str(move_name) == MOVE_DEFENSIVE:
-                attacker.defensive_cooldown_turns = max(
-                    int(getattr(attacker, "defensive_cooldown_turns", 0) or 0),
-                    int(CPU_DEFENSIVE_COOLDOWN_TURNS),
-                )
-        except Exception:
-            pass
-
-        if move_name == MOVE_REST:
-            before = attacker.grit
-            attacker.grit = min(attacker.max_grit, attacker.grit + 3)
-            gained = attacker.grit - before
-            self._log(f"{self._fmt_name(attacker)} recovers (+{gained} Grit).")
-            return
-
-        if move_name == MOVE_GROGGY_RECOVERY:
-            # Recovery progress is applied after the beat resolves (even if you lose the clash).
-            # This hook only sets the vulnerability tag.
-            attacker.next_damage_taken_multiplier = max(float(getattr(attacker, "next_damage_taken_multiplier", 1.0)), 1.25)
-            return
-
-        if move_name == MOVE_TAUNT:
-            base = int(TUNING_TAUNT_HYPE_BASE)
-            bonus = int(card_value_sum) * int(TUNING_TAUNT_HYPE_PER_CARD_VALUE)
-            gained = min(int(TUNING_TAUNT_HYPE_MAX), int(base) + int(bonus))
-            attacker.add_hype(gained)
-            self._log(f"{self._fmt_name(attacker)} gets fired up! (+{gained} Hype)")
-            return
-
-        if move_name in {MOVE_SLOW_STAND_UP, MOVE_KIP_UP}:
-            # Cumulative stand-up: reduce stun_meter instead of instantly standing.
-            if attacker.state != WrestlerState.GROUNDED:
-                self._log(f"{self._fmt_name(attacker)} tries to stand, but isn't down.")
-                return
-
-            progress = int(card_value_sum)
-            if cards and len(cards) == 2 and int(cards[0].value) == int(cards[1].value):
-                progress += 5
-
-            before = int(getattr(attacker, "stun_meter", 0))
-            attacker.stun_meter = int(before) - int(progress)
-            attacker.add_hype(int(move.get("hype_gain", 0)))
-
-            if int(attacker.stun_meter) <= 0:
-                attacker.stun_meter = 0
-                attacker.set_state(WrestlerState.STANDING)
-                self._log(f"{self._fmt_name(attacker)} fights to their feet!")
-            else:
-                self._log(f"Struggling to rise... (Stun: {attacker.stun_meter} left)")
-            return
-
-        if move_name == MOVE_SHOVE_OFF:
-            if attacker.is_in_grapple() or defender.is_in_grapple():
-                attacker.clear_grapple()
-                defender.clear_grapple()
-                attacker.set_state(WrestlerState.STANDING)
-                defender.set_state(WrestlerState.STANDING)
-                self._log(f"{self._fmt_name(attacker)} shoves free and resets to neutral!")
-            else:
-                self._log(f"{self._fmt_name(attacker)} pushes empty air — {self._fmt_name(defender)} was already gone!")
-            return
-
-        # Pin/Submission start escape
-        if mtype in {"Pin", "Submission"}:
-            kind = "PINFALL" if mtype == "Pin" else "SUBMISSION"
-            self._begin_escape(attacker=attacker, defender=defender, kind=kind, move_name=move_name)
-            return
-
-        raw_damage = int(move.get("damage", 0)) if damage_override is None else int(damage_override)
-
-        # Doubles bonus damage: if doubles were used for a successful attack, boost by 25%.
-        try:
-            if bool(apply_doubles_bonus) and raw_damage > 0 and cards and len(cards) == 2 and int(cards[0].value) == int(cards[1].value):
-                if mtype in {"Strike", "Grapple", "Aerial"}:
-                    raw_damage = int(math.ceil(float(raw_damage) * float(DOUBLES_DAMAGE_MODIFIER)))
-                    self._log("Doubles hit! Damage boosted.")
-        except Exception:
-            pass
-
-        # Margin-of-victory scaling: stronger wins hit harder.
-        try:
-            if raw_damage > 0 and margin_mult is not None:
-                raw_damage = int(max(0, int(math.ceil(float(raw_damage) * float(margin_mult)))))
-        except Exception:
-            pass
-
-        dealt = 0
-        if raw_damage > 0:
-            target_part = move.get("target_part", None)
-            dealt = defender.take_damage(raw_damage, target_part=str(target_part) if target_part else None)
-
-            tier_txt = ""
-            try:
-                if margin_label and (margin_mult is not None):
-                    tier_txt = f" ({str(margin_label)})"
-            except Exception:
-                tier_txt = ""
-            self._log(f"{self._fmt_name(defender)} takes {self._fmt_damage(dealt)}{tier_txt}.")
-
-            # Pin anti-spam recovery: damage restores pin viability over time.
-            try:
-                self._recover_pin_escape_mult_from_damage(defender, int(dealt))
-            except Exception:
-                pass
-
-            # Apply DAZED probabilistically (HP-based).
-            try:
-                # Crit-tier can force DAZE, but only for moves explicitly flagged to daze (or finishers).
-                forced = bool(margin_force_daze) and (bool(move.get("can_daze", False)) or bool(move.get("is_finisher", False)))
-                if (not bool(was_dazed)):
-                    cd = int(getattr(defender, "daze_cooldown_turns", 0) or 0)
-                    if cd <= 0:
-                        turns = 0
-                        if forced:
-                            turns = 2
-                        else:
-                            turns = int(self._calc_daze_application(defender, move))
-                        if turns > 0 and int(getattr(defender, "hp", 0)) > 0:
-                            defender.daze_turns = max(int(getattr(defender, "daze_turns", 0) or 0), int(turns))
-                            try:
-                                defender.is_groggy = True
-                                seed = int(self._seed_groggy_meter(defender))
-                                cur = int(getattr(defender, "groggy_meter", 0) or 0)
-                                defender.groggy_meter = max(int(cur), int(seed))
-                                defender.daze_cooldown_turns = 0
-                            except Exception:
-                                pass
-                            if forced:
-                                self._log(f"{self._fmt_name(defender)} is DAZED! (CRITICAL)")
-                            else:
-                                self._log(f"{self._fmt_name(defender)} is DAZED! ({int(defender.daze_turns)})")
-            except Exception:
-                pass
-
-            # Anti-infinite safety: hitting a dazed opponent wakes them up over time,
-            # or instantly if you hit too hard.
-            try:
-                if bool(was_dazed) and mtype in {"Strike", "Grapple", "Aerial"}:
-                    before = int(getattr(defender, "daze_turns", 0) or 0)
-                    if int(dealt) >= int(TUNING_DAZE_WAKE_DAMAGE):
-                        defender.daze_turns = 0
-                        if before > 0:
-                            self._log(f"{self._fmt_name(defender)} snaps back to reality from the shock!")
-                        try:
-                            defender.is_groggy = False
-                            defender.groggy_meter = 0
-                            defender.daze_cooldown_turns = max(int(getattr(defender, "daze_cooldown_turns", 0) or 0), int(TUNING_DAZE_COOLDOWN_TURNS))
-                        except Exception:
-                            pass
-                    else:
-                        defender.daze_turns = max(0, int(before) - 1)
-                        if before > 0 and int(defender.daze_turns) == 0:
-                            self._log(f"{self._fmt_name(defender)} is shaken awake by the impact!")
-                            try:
-                                defender.is_groggy = False
-                                defender.groggy_meter = 0
-                                defender.daze_cooldown_turns = max(int(getattr(defender, "daze_cooldown_turns", 0) or 0), int(TUNING_DAZE_COOLDOWN_TURNS))
-                            except Exception:
-                                pass
-            except Exception:
-                pass
-
-            # Clash overlay VFX: scale by actual dealt damage.
-            try:
-                if (not bool(getattr(self, "_last_clash_flashed", False))) and (getattr(self, "_last_clash_winner", None) is attacker):
-                    outcome = "player" if attacker is self.player else "cpu"
-                    self._flash_clash(outcome=outcome, damage=int(dealt))
-                    self._last_clash_flashed = True
-            except Exception:
-                pass
-
-            # (Groggy system remains available for special moves; heavy-hit stun is now handled by DAZED.)
-
-        attacker.add_hype(int(move.get("hype_gain", 0)))
-
-        if not suppress_state_changes:
-            if "set_user_state" in move:
-                attacker.set_state(WrestlerState(str(move["set_user_state"])))
-            if "set_target_state" in move:
-                tgt = str(move["set_target_state"])
-                # Strike knockdowns: guaranteed if damage meets the defender's HP-scaled threshold.
-                if (
-                    tgt == "GROUNDED"
-                    and str(mtype) == "Strike"
-                    and defender.state in {WrestlerState.STANDING, WrestlerState.RUNNING}
-                    and (not bool(move.get("knockdown_always", False)))
-                ):
-                    try:
-                        mn = int(getattr(defender, "knockdown_thresh_min", 5) or 5)
-                        mx = int(getattr(defender, "knockdown_thresh_max", 15) or 15)
-                        mx = max(mn, mx)
-                        hp = max(0.0, min(1.0, float(pre_hp_pct)))
-                        thr = float(mn) + (float(mx) - float(mn)) * float(hp)
-                        if int(dealt) >= int(math.ceil(float(thr))):
-                            defender.set_state(WrestlerState.GROUNDED)
-                        else:
-                            self._log(f"{self._fmt_name(defender)} stays on their feet!")
-                    except Exception:
-                        defender.set_state(WrestlerState.GROUNDED)
-                else:
-                    defender.set_state(WrestlerState(tgt))
-
-        if attacker.is_in_grapple() and defender.is_in_grapple():
-            attacker.grapple_role = GrappleRole.OFFENSE
-            defender.grapple_role = GrappleRole.DEFENSE
-
-        # Safety: prevent illegal grapple/grounded desync states.
-        try:
-            self._repair_grapple_desync()
-        except Exception:
-            pass
-
-        # Combo chains: after a successful execution, open the follow-up window.
-        chain_next = move.get("chain_next")
-        if chain_next:
-            attacker.chain_window = str(chain_next)
-            attacker.chain_potency = int(move.get("chain_bonus", 0))
-            # Stored as 2 because the next _start_turn() immediately decrements by 1.
-            attacker.chain_turns_remaining = 2
-            self._log(f"{self._fmt_name(attacker)} has a combo opening! (+{attacker.chain_potency} on {attacker.chain_window})")
-
-    # -------------------------------------------------------------------------
-    # HELPER LOGIC
-    # -------------------------------------------------------------------------
-
-    def _repair_grapple_desync(self) -> None:
-        """Ensure grapple state is consistent (both in grapple or neither).
-
-        Safety net against edge-cases where one wrestler leaves a grapple via a
-        special transition but the other remains in a grapple tier/role.
-        """
-        try:
-            p = self.player
-            c = self.cpu
-        except Exception:
-            return
-        if not isinstance(p, Wrestler) or not isinstance(c, Wrestler):
-            return
-
-        # Clear stale roles if a wrestler isn't actually in a grapple tier.
-        for w in (p, c):
-            try:
-                if (not bool(w.is_in_grapple())) and getattr(w, "grapple_role", None) is not None:
-                    w.grapple_role = None
-            except Exception:
-                pass
-
-        try:
-            p_in = bool(p.is_in_grapple())
-            c_in = bool(c.is_in_grapple())
-        except Exception:
-            return
-
-        if p_in == c_in:
-            return
-
-        # If only one side is in a grapple tier, break the grapple.
-        try:
-            if p_in:
-                p.clear_grapple()
-                p.set_state(WrestlerState.STANDING)
-            if c_in:
-                c.clear_grapple()
-                c.set_state(WrestlerState.STANDING)
-        except Exception:
-            pass
-
-    def _cpu_buy_buffs(self) -> None:
-        """Spend CPU hype on buffs before selecting a move."""
-        if self.game_over:
-            return
-        if int(self.cpu.hype) < 25:
-            return
-
-        # Simple parity behavior: occasionally buy a grit refill (if low), otherwise
-        # choose between Pump (+1) and Adrenaline (+2).
-        # Kept probabilistic so CPU doesn't always auto-buy.
-
-        if int(self.cpu.hype) >= int(TUNING_HYPE_SHOP_GRIT_REFILL_COST) and int(self.cpu.grit) <= 1 and random.random() < 0.35:
-            self.cpu.hype -= int(TUNING_HYPE_SHOP_GRIT_REFILL_COST)
-            before = int(self.cpu.grit)
-            self.cpu.grit = min(self.cpu.max_grit, int(self.cpu.grit) + int(TUNING_HYPE_SHOP_GRIT_REFILL_AMOUNT))
-            gained = int(self.cpu.grit) - before
-            self._log(f"{self._fmt_name(self.cpu)} rallies! (+{gained} Grit)")
-            return
-
-        # Lock Up Edge (non-stacking): only relevant if a lock up can happen soon.
-        if (
-            int(self.cpu.hype) >= 50
-            and (not bool(getattr(self.cpu, "lockup_edge_ready", False)))
-            and self.cpu.state == WrestlerState.STANDING
-            and self.player.state == WrestlerState.STANDING
-            and random.random() < 0.10
-        ):
-            self.cpu.hype -= 50
-            self.cpu.lockup_edge_ready = True
-            self._log(f"{self._fmt_name(self.cpu)} buys an edge for the next lock up!")
-            return
-
-        if int(self.cpu.hype) >= 50 and random.random() < 0.15:
-            self.cpu.hype -= 50
-            self.cpu.next_card_bonus = max(int(self.cpu.next_card_bonus), 2)
-            self._log(f"{self._fmt_name(self.cpu)} uses the crowd energy! (Adrenaline +2 next card)")
-            return
+            lines.append("Grounds opp: yes")
+        lines.append("")
 
-        if int(self.cpu.hype) >= 25 and random.random() < 0.20:
-            self.cpu.hype -= 25
-            self.cpu.next_card_bonus = max(int(self.cpu.next_card_bonus), 1)
-            self._log(f"{self._fmt_name(self.cpu)} digs deep! (Pump Up +1 next card)")
-            return
+        if (on_loss_set_user_state is not None) or (on_loss_set_target_state is not None):
+            lines.append("[b]On Loss[/b]")
+            lines.append(f"Set you: {_fmt_state(on_loss_set_user_state)}")
+            lines.append(f"Set opp: {_fmt_state(on_loss_set_target_state)}")
+            lines.append("")
 
-    def _cpu_ai_mode(self) -> str:
-        traits = {}
-        try:
-            traits = dict(getattr(self.cpu, "profile", None) or {})
-        except Exception:
-            traits = {}
-        weights = {}
+        lines.append("[b]Special[/b]")
+        lines.append(f"Can daze: {'yes' if can_daze else 'no'}")
+        lines.append(f"Lift: {'yes' if is_lift else 'no'}")
         try:
-            weights = dict(traits.get("ai_traits") or {})
+            if self._would_be_stale(self.player, slug):
+                lines.append(f"Stale right now: yes (-{int(STALE_CLASH_SCORE_PENALTY)} to clash score)")
         except Exception:
-            weights = {}
+            pass
+        if clash_mod is not None:
+            lines.append(f"Clash mod: {_fmt_num(clash_mod)}")
+        lines.append(f"Chain next: {_fmt_list(chain_next)}")
 
-        def w(key: str) -> int:
-            try:
-                return max(0, int(weights.get(key, 0)))
-            except Exception:
-                return 0
+        if flavor:
+            lines.append("")
+            lines.append("[b]Flavor[/b]")
+            lines.append(flavor)
 
-        opts = [("GREED", w("GREED")), ("GOOD", w("GOOD")), ("BAD", w("BAD")), ("RND", w("RND"))]
-        total = sum(v for _k, v in opts)
-        if total <= 0:
-            return "RND"
+        text = "\n".join(lines)
 
-        roll = random.randint(1, total)
-        acc = 0
-        for k, v in opts:
-            acc += v
-            if roll <= acc:
-                return k
-        return "RND"
+        body = BoxLayout(orientation="vertical", spacing=dp(8), padding=[dp(12), dp(10), dp(12), dp(10)])
+        scroll = ScrollView(do_scroll_x=False)
+        lbl = Label(
+            text=text,
+            markup=True,
+            halign="left",
+            valign="top",
+            color=COLOR_TEXT_SOFT,
+            size_hint_y=None,
+        )
 
-    def _cpu_card_candidates_for_move(self, move_name: str) -> list[dict]:
-        """Generate all affordable CPU card-play candidates for a move.
+        def _refresh(*_a) -> None:
+            pad = 16
+            w = max(120, int(scroll.width) - pad)
+            lbl.text_size = (w, None)
+            lbl.texture_update()
+            lbl.height = max(dp(240), int(lbl.texture_size[1]) + dp(6))
 
-        Returns a list of dicts: {"cards": [Card...], "score": int}
-        """
-        if str(move_name) == MOVE_REST:
-            return [{"cards": [], "score": 0}]
-
-        hand = list(self.cpu.hand or [])
-        if not hand:
-            # Defensive can legally discard 0.
-            if str(move_name) == MOVE_DEFENSIVE:
-                return [{"cards": [], "score": 0}]
-            return []
+        lbl.bind(width=_refresh)
+        scroll.bind(width=lambda *_a: _refresh())
+        _refresh()
+        scroll.add_widget(lbl)
 
-        try:
-            fired_bonus = int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) if int(getattr(self.cpu, "fired_up_turns_remaining", 0) or 0) > 0 else 0
-        except Exception:
-            fired_bonus = 0
+        close_btn = Button(text="CLOSE", background_normal="", background_color=COLOR_BTN_BASE, size_hint_y=None, height=dp(46))
+        body.add_widget(scroll)
+        body.add_widget(close_btn)
 
-        is_finisher = bool(MOVES.get(move_name, {}).get("is_finisher"))
-        move_cost = int(MOVES.get(move_name, {}).get("cost", 0))
+        pop = Popup(title="Move Info", content=body, size_hint=(0.92, 0.72), auto_dismiss=True)
+        close_btn.bind(on_release=lambda *_a: pop.dismiss())
+        pop.open()
 
-        defensive_only_small = (str(move_name) == MOVE_DEFENSIVE)
-        groggy_only_small = (str(move_name) == MOVE_GROGGY_RECOVERY)
+    # -------------------------------------------------------------------------
+    # PLAYER CARD SELECTION
+    # -------------------------------------------------------------------------
 
-        def _passes_small(cs: list) -> bool:
-            if defensive_only_small:
-                return all(int(c.value) <= 5 for c in cs)
-            if groggy_only_small:
-                return all(int(c.value) <= 7 for c in cs)
-            return True
+    def _selected_player_cards(self) -> list:
+        hand = list(self.player.hand or [])
+        idxs = sorted(self.selected_cards)
+        cards = [hand[i] for i in idxs if 0 <= i < len(hand)]
 
-        def _affordable(cs: list) -> bool:
-            try:
-                card_cost = sum(int(c.grit_cost()) for c in cs)
-            except Exception:
-                card_cost = 0
-            return int(self.cpu.grit) >= int(move_cost) + int(card_cost)
-
-        candidates: list[dict] = []
-
-        # Defensive: explicitly allow 0-card discard.
-        if defensive_only_small:
-            candidates.append({"cards": []})
-
-        # Singles
-        if not is_finisher:
-            for c in hand:
-                cs = [c]
-                if not _passes_small(cs):
-                    continue
-                if _affordable(cs):
-                    candidates.append({"cards": cs})
-
-        # Doubles
-        by_val: dict[int, list] = {}
-        for c in hand:
-            by_val.setdefault(int(c.value), []).append(c)
-        for _v, cs in by_val.items():
-            if len(cs) >= 2:
-                pair = [cs[0], cs[1]]
-                if not _passes_small(pair):
-                    continue
-                if _affordable(pair):
-                    candidates.append({"cards": pair})
-
-        # Same-color pairs: enumerate all distinct-value pairs.
-        # (Not allowed for finishers.)
-        if not is_finisher:
-            by_col: dict[str, list] = {}
-            for c in hand:
-                by_col.setdefault(str(c.color), []).append(c)
-            for col, cs in by_col.items():
-                if str(col) == "GRAY":
-                    continue
-                if len(cs) < 2:
-                    continue
-                cs_sorted = sorted(cs, key=lambda x: int(x.value))
-                for i in range(len(cs_sorted)):
-                    for j in range(i + 1, len(cs_sorted)):
-                        a = cs_sorted[i]
-                        b = cs_sorted[j]
-                        if int(a.value) == int(b.value):
-                            # Doubles already covered.
-                            continue
-                        pair = [a, b]
-                        if not _passes_small(pair):
-                            continue
-                        if _affordable(pair):
-                            candidates.append({"cards": pair})
-
-        if not candidates:
+        if self.selected_move == MOVE_REST:
             return []
 
-        # Impact moves: require at least one matching-type (or Yellow) card.
-        if self._move_requires_type_card(move_name) and str(move_name) not in {MOVE_DEFENSIVE, MOVE_GROGGY_RECOVERY}:
-            try:
-                move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
-                candidates = [d for d in candidates if any(int(c.color_bonus(move_type)) > 0 for c in (d.get("cards") or []))]
-            except Exception:
-                candidates = []
-            if not candidates:
+        if self.selected_move == MOVE_DEFENSIVE:
+            if any(int(c.value) > 5 for c in cards):
                 return []
+            return cards
 
-        # Score using actual clash scoring rules.
-        scored: list[dict] = []
-        for d in candidates:
-            cs = list(d.get("cards") or [])
-            card_bonus = int(getattr(self.cpu, "next_card_bonus", 0) or 0) + int(fired_bonus) * int(len(cs))
-
-            if str(move_name) == MOVE_DEFENSIVE:
-                pool = sum(int(c.value) for c in cs)
-                if len(cs) == 2 and int(cs[0].value) == int(cs[1].value):
-                    pool += 5
-                pool += int(card_bonus)
-                d["score"] = int(pool)
-            elif str(move_name) == MOVE_GROGGY_RECOVERY:
-                pool = sum(min(7, int(c.value)) for c in cs)
-                if len(cs) == 2 and int(cs[0].value) == int(cs[1].value):
-                    pool += 5
-                pool += int(card_bonus)
-                d["score"] = int(pool)
-            else:
-                # For normal moves, score includes TECH inversion, color/doubles bonuses, etc.
-                d["score"] = int(self._calc_clash_score(str(move_name), cs, card_bonus=int(card_bonus)))
-
-            scored.append(d)
-
-        scored.sort(key=lambda d: int(d.get("score", 0)), reverse=True)
-        return scored
-
-    def _cpu_choose_action(self, *, mode: str | None = None) -> tuple[str, list]:
-        """Choose the CPU's move AND cards together (executable joint optimum)."""
-        mode = str(mode or self._cpu_ai_mode())
-
-        # Groggy override: if groggy recovery is legal, take it.
-        if bool(getattr(self.cpu, "is_groggy", False)):
-            if self._move_is_legal(MOVE_GROGGY_RECOVERY, self.cpu, self.player) and self._passes_moveset(self.cpu, MOVE_GROGGY_RECOVERY):
-                cand = self._cpu_card_candidates_for_move(MOVE_GROGGY_RECOVERY)
-                if cand:
-                    return (MOVE_GROGGY_RECOVERY, list(cand[0].get("cards") or []))
-                return (MOVE_GROGGY_RECOVERY, [])
-
-        valid = self._available_moves(self.cpu, self.player)
-        if not valid:
-            return (MOVE_REST, [])
+        if self.selected_move == MOVE_GROGGY_RECOVERY:
+            # Value cap is applied in scoring/progress; do not hard-reject high cards.
+            pass
 
-        # Parity with the player's UI: finishers require doubles.
-        has_doubles = self.cpu.has_doubles_in_hand()
-        filtered = [m for m in valid if not (bool(MOVES.get(m, {}).get("is_finisher")) and (not has_doubles))]
-        if filtered:
-            valid = filtered
+        if len(cards) == 2:
+            same_val = (int(cards[0].value) == int(cards[1].value))
+            same_col = (str(cards[0].color) == str(cards[1].color)) and (str(cards[0].color) != "GRAY")
+            if not (same_val or same_col):
+                return []
+        return cards
 
-        # Impact moves require at least one matching-type (or Yellow) card to be playable.
-        try:
-            filtered = [m for m in valid if self._wrestler_has_type_card_for_move(self.cpu, m)]
-            if filtered:
-                valid = filtered
-        except Exception:
-            pass
+    # -------------------------------------------------------------------------
+    # CPU THINKING (worker thread)
+    # -------------------------------------------------------------------------
 
-        def type_bonus_for(name: str, mv: dict) -> int:
-            # Smart defaults ONLY when ai_score is missing.
-            if "ai_score" in mv:
-                return 0
+    def _cancel_cpu_think(self) -> None:
+        """Discard any in-flight CPU decision and pending submit."""
+        self._cpu_think_gen = int(getattr(self, "_cpu_think_gen", 0) or 0) + 1
+        self._cpu_pending_submit = None
+        self._invalidate_cpu_plan(respeculate=False)
+
+    def _cpu_plan_key(self) -> tuple:
+        """Fingerprint of everything the CPU decision reads."""
+
+        def w_key(w: Wrestler) -> tuple:
+            role = getattr(w, "grapple_role", None)
+            return (
+                str(w.state.value),
+                str(getattr(role, "value", role)),
+                int(w.hp),
+                int(w.grit),
+                int(w.max_grit),
+                int(w.hype),
+                tuple(sorted(dict(w.body_parts).items())),
+                bool(getattr(w, "is_groggy", False)),
+                int(getattr(w, "groggy_meter", 0) or 0),
+                int(getattr(w, "daze_turns", 0) or 0),
+                int(getattr(w, "fired_up_turns_remaining", 0) or 0),
+                int(getattr(w, "flow_turns_remaining", 0) or 0),
+                int(getattr(w, "next_card_bonus", 0) or 0),
+                str(getattr(w, "last_move_name", "") or ""),
+                int(getattr(w, "defensive_cooldown_turns", 0) or 0),
+                tuple(getattr(w, "recent_attack_moves", []) or []),
+                bool(getattr(w, "lockup_edge_ready", False)),
+                tuple((int(c.value), str(c.color), c.uid) for c in list(w.hand or [])),
+            )
 
-            raw_damage = int(mv.get("damage", 0))
-            mtype = str(mv.get("type", "Setup"))
-
-            if mtype == "Pin":
-                return 6
-            if mtype == "Submission":
-                return 8
-            if mtype == "Grapple" and raw_damage == 0:
-                return 12
-            if mtype == "Aerial" and raw_damage == 0:
-                return 10
-            if mtype == "Setup":
-                return 5
-            return 0
-
-        def move_value(name: str) -> float:
-            mv = MOVES.get(name, {})
-            dmg = int(mv.get("damage", 0))
-            manual = int(mv.get("ai_score", 0))
-            bonus = int(type_bonus_for(name, mv))
-            score = float(dmg + manual + bonus)
-
-            # Pin/submission context: avoid early pin spam; ramp up as HP drops.
-            try:
-                mtype = str(mv.get("type", "Setup"))
-                opp_hp = float(self.player.hp_pct())
-                if mtype == "Pin":
-                    if opp_hp >= 0.70:
-                        score -= 28.0
-                    elif opp_hp >= 0.50:
-                        score -= 16.0
-                    elif opp_hp >= 0.35:
-                        score -= 6.0
-                    elif opp_hp >= 0.20:
-                        score += 4.0
-                    else:
-                        score += 14.0
-                    if bool(getattr(self.player, "is_groggy", False)) or int(getattr(self.player, "daze_turns", 0) or 0) > 0:
-                        score += 8.0
-                elif mtype == "Submission":
-                    if opp_hp >= 0.70:
-                        score -= 10.0
-                    elif opp_hp <= 0.25:
-                        score += 8.0
-            except Exception:
-                pass
+        return (
+            int(getattr(self, "_cpu_think_gen", 0) or 0),
+            int(getattr(self, "momentum", 0) or 0),
+            w_key(self.player),
+            w_key(self.cpu),
+        )
 
-            # Top rope: prefer climbing when the opponent is down (safer).
+    def _schedule_cpu_speculation(self) -> None:
+        """Start thinking about the CPU's action on the next idle frame."""
+        if self._spectate is not None:
+            # Spectated beats pick both actions inline (_headless_beat).
+            return
+        if self._cpu_plan_ev is not None:
             try:
-                if str(mv.get("set_user_state", "")) == "TOP_ROPE":
-                    if getattr(self.player, "state", None) == WrestlerState.GROUNDED:
-                        score += 12.0
-                    else:
-                        score -= 8.0
+                self._cpu_plan_ev.cancel()
             except Exception:
                 pass
+        self._cpu_plan_ev = Clock.schedule_once(lambda _dt: self._speculate_cpu_action(), 0)
 
-            # Anti-turtle: Defensive should be situational, not a default action.
-            try:
-                if str(name) == MOVE_DEFENSIVE:
-                    score -= float(CPU_DEFENSIVE_BASE_PENALTY)
-                    cd = int(getattr(self.cpu, "defensive_cooldown_turns", 0) or 0)
-                    if cd > 0:
-                        score -= float(CPU_DEFENSIVE_COOLDOWN_SCORE_PENALTY)
-                    if str(getattr(self.cpu, "last_move_name", "") or "") == str(MOVE_DEFENSIVE):
-                        score -= float(CPU_DEFENSIVE_REPEAT_EXTRA_PENALTY)
-                    if float(self.cpu.hp_pct()) <= float(CPU_DEFENSIVE_EMERGENCY_HP_PCT) or int(self.cpu.grit) <= 1:
-                        score += float(CPU_DEFENSIVE_EMERGENCY_BONUS)
-            except Exception:
-                pass
+    def _speculate_cpu_action(self) -> None:
+        self._cpu_plan_ev = None
+        if self.game_over or self._escape_mode is not None or self._cpu_pending_submit is not None:
+            return
+        key = self._cpu_plan_key()
+        plan = self._cpu_plan
+        if plan is not None and plan.get("key") == key:
+            return
+        self._cpu_plan = {"key": key, "result": None}
+        self._start_cpu_think(lambda mode, move, cards: self._on_cpu_plan_ready(key, mode, move, cards))
 
-            # Grounded realism: prioritize standing up when healthy.
-            try:
-                cpu_state = getattr(self.cpu, "state", None)
-                cpu_hp = float(self.cpu.hp_pct())
-                is_grounded = (cpu_state == WrestlerState.GROUNDED)
-                wants_up = bool(is_grounded and cpu_hp >= float(CPU_GETUP_HEALTHY_PCT))
-                set_user = str(mv.get("set_user_state", ""))
-                is_getup = bool(is_grounded and set_user == "STANDING")
-                if wants_up and is_getup:
-                    score += float(CPU_GETUP_BONUS_HEALTHY)
-                if wants_up and str(mv.get("type", "Setup")) == "Strike" and (not is_getup):
-                    score -= float(CPU_UPKICK_PENALTY_WHEN_HEALTHY)
-                if is_grounded and str(name) == MOVE_REST:
-                    if cpu_hp <= float(CPU_REST_HURT_PCT) or int(self.cpu.grit) <= 1:
-                        score += float(CPU_REST_BONUS_WHEN_HURT)
-            except Exception:
-                pass
+    def _on_cpu_plan_ready(self, key: tuple, mode: str, move: str, cards: list) -> None:
+        plan = self._cpu_plan
+        if plan is None or plan.get("key") != key:
+            return
+        plan["result"] = (mode, move, cards)
+        if self._cpu_pending_submit is not None and self._cpu_plan_key() == key:
+            self._cpu_plan = None
+            self._finish_submit(mode, move, cards)
 
-            # Repetition penalty to prevent spamming.
-            if str(getattr(self.cpu, "last_move_name", None) or "") == str(name):
-                score -= 15.0
+    def _invalidate_cpu_plan(self, *, respeculate: bool = True) -> None:
+        """Drop the speculative CPU action (state it was based on has changed)."""
+        self._cpu_plan = None
+        if (not respeculate) or self.game_over:
+            return
+        if self._cpu_pending_submit is not None:
+            # PLAY is already waiting on the CPU: rethink against the new state.
+            self._cpu_think_gen = int(getattr(self, "_cpu_think_gen", 0) or 0) + 1
+            self._start_cpu_think(self._finish_submit)
+            return
+        self._schedule_cpu_speculation()
 
-            # Stale avoidance.
-            try:
-                if self._would_be_stale(self.cpu, str(name)):
-                    score -= float(int(STALE_CLASH_SCORE_PENALTY)) * 8.0
-            except Exception:
-                pass
+    def _start_cpu_think(self, on_done) -> None:
+        """Pick the CPU action on a snapshot; on_done(mode, move, cards) runs on the main thread."""
+        gen = int(getattr(self, "_cpu_think_gen", 0) or 0)
+        snap = self._snapshot()
 
-            # Low-HP behavior: avoid random panic; just slightly bias toward cheaper actions.
+        def think() -> tuple[str, str, list]:
             try:
-                if float(self.cpu.hp_pct()) < 0.30 and int(mv.get("cost", 0)) == 0:
-                    score += 6.0
+                mode = snap._cpu_ai_mode()
+                move, cards = snap._cpu_choose_action(mode=mode)
+                pos = {id(c): i for i, c in enumerate(list(snap.cpu.hand or []))}
+                return (str(mode), str(move), [pos[id(c)] for c in cards if id(c) in pos])
             except Exception:
-                pass
+                return ("RND", MOVE_REST, [])
 
-            score += float(random.randint(0, 4))
-            return score
+        def deliver(result: tuple[str, str, list]) -> None:
+            if gen != int(getattr(self, "_cpu_think_gen", 0) or 0) or self.game_over:
+                return
+            mode, move, idxs = result
+            on_done(mode, move, self._cards_by_index(self.cpu, idxs))
 
-        # Evaluate joint move+cards options.
-        scored_moves: list[tuple[float, str, list[dict]]] = []
-        for m in valid:
-            cands = self._cpu_card_candidates_for_move(str(m))
-            if str(m) == MOVE_REST:
-                best = 0
-            else:
-                if not cands:
-                    continue
-                best = int(cands[0].get("score", 0))
-
-            action_score = float(move_value(str(m))) + float(best)
-            scored_moves.append((action_score, str(m), cands))
-
-        if not scored_moves:
-            return (MOVE_REST, [])
-
-        scored_moves.sort(key=lambda t: float(t[0]), reverse=True)
-        ordered = scored_moves
-
-        if mode == "GREED":
-            pick = ordered[0]
-        elif mode == "GOOD":
-            pick = random.choice(ordered[: min(3, len(ordered))])
-        elif mode == "BAD":
-            tail = ordered[max(0, len(ordered) - 3) :]
-            pick = random.choice(tail or ordered)
-        else:
-            top_n = max(1, min(int(CPU_RND_PICK_FROM_TOP_N), len(ordered)))
-            pick = random.choice(ordered[:top_n])
-
-        _score, move, cands = pick
-        if str(move) == MOVE_REST:
-            return (MOVE_REST, [])
-        if str(move) == MOVE_DEFENSIVE and not cands:
-            return (MOVE_DEFENSIVE, [])
-        if not cands:
-            return (MOVE_REST, [])
-
-        # Pick cards (mode influences greediness).
-        if mode == "GREED":
-            cards = list(cands[0].get("cards") or [])
-        elif mode == "GOOD":
-            pool = cands[: min(3, len(cands))]
-            cards = list(random.choice(pool).get("cards") or [])
-        elif mode == "BAD":
-            pool = cands[max(0, len(cands) - 3) :]
-            cards = list(random.choice(pool or cands).get("cards") or [])
-        else:
-            top_n = max(1, min(int(CPU_RND_PICK_FROM_TOP_N), len(cands)))
-            cards = list(random.choice(cands[:top_n]).get("cards") or [])
-
-        return (str(move), cards)
-
-    def _cpu_choose_move(self, *, mode: str | None = None):
-        if bool(getattr(self.cpu, "is_groggy", False)):
-            if self._move_is_legal(MOVE_GROGGY_RECOVERY, self.cpu, self.player) and self._passes_moveset(self.cpu, MOVE_GROGGY_RECOVERY):
-                return MOVE_GROGGY_RECOVERY
-        valid = self._available_moves(self.cpu, self.player)
-        if not valid:
-            return MOVE_REST
-
-        # Parity with the player's UI: finishers require doubles.
-        has_doubles = self.cpu.has_doubles_in_hand()
-        filtered = [m for m in valid if not (bool(MOVES.get(m, {}).get("is_finisher")) and (not has_doubles))]
-        if filtered:
-            valid = filtered
-
-        # Impact moves require at least one matching-type (or Yellow) card to be playable.
-        try:
-            filtered = [m for m in valid if self._wrestler_has_type_card_for_move(self.cpu, m)]
-            if filtered:
-                valid = filtered
-        except Exception:
-            pass
+        if not bool(CPU_THINK_ASYNC):
+            deliver(think())
+            return
 
-        mode = str(mode or self._cpu_ai_mode())
+        def finished(result: tuple[str, str, list]) -> None:
+            self._cpu_think_live -= 1
+            deliver(result)
 
-        def type_bonus_for(name: str, mv: dict) -> int:
-            # Smart defaults ONLY when ai_score is missing.
-            if "ai_score" in mv:
-                return 0
+        def work() -> None:
+            result = think()
+            Clock.schedule_once(lambda _dt: finished(result), 0)
 
-            raw_damage = int(mv.get("damage", 0))
-            mtype = str(mv.get("type", "Setup"))
-
-            if mtype == "Pin":
-                return 6
-            if mtype == "Submission":
-                return 8
-            if mtype == "Grapple" and raw_damage == 0:
-                return 12
-            if mtype == "Aerial" and raw_damage == 0:
-                return 10
-            if mtype == "Setup":
-                return 5
-            return 0
-
-        def move_value(name: str) -> float:
-            mv = MOVES.get(name, {})
-            dmg = int(mv.get("damage", 0))
-            manual = int(mv.get("ai_score", 0))
-            bonus = int(type_bonus_for(name, mv))
-            score = float(dmg + manual + bonus)
-
-            # Pin/submission context: avoid early pin spam; ramp up as HP drops.
-            try:
-                mtype = str(mv.get("type", "Setup"))
-                opp_hp = float(self.player.hp_pct())
-                if mtype == "Pin":
-                    if opp_hp >= 0.70:
-                        score -= 28.0
-                    elif opp_hp >= 0.50:
-                        score -= 16.0
-                    elif opp_hp >= 0.35:
-                        score -= 6.0
-                    elif opp_hp >= 0.20:
-                        score += 4.0
-                    else:
-                        score += 14.0
-                    if bool(getattr(self.player, "is_groggy", False)) or int(getattr(self.player, "daze_turns", 0) or 0) > 0:
-                        score += 8.0
-                elif mtype == "Submission":
-                    if opp_hp >= 0.70:
-                        score -= 10.0
-                    elif opp_hp <= 0.25:
-                        score += 8.0
-            except Exception:
-                pass
+        self._cpu_think_live += 1
+        threading.Thread(target=work, name="cpu-think", daemon=True).start()
 
-            # Top rope: prefer climbing when the opponent is down (safer).
-            try:
-                if str(mv.get("set_user_state", "")) == "TOP_ROPE":
-                    if getattr(self.player, "state", None) == WrestlerState.GROUNDED:
-                        score += 12.0
-                    else:
-                        score -= 8.0
-            except Exception:
-                pass
+    def _cards_by_index(self, wrestler: Wrestler, idxs: list) -> list:
+        """Map snapshot hand positions back to the live hand's cards."""
+        hand = list(getattr(wrestler, "hand", []) or [])
+        return [hand[i] for i in idxs if 0 <= int(i) < len(hand)]
 
-            # Anti-turtle: Defensive should be situational, not a default action.
-            try:
-                if str(name) == MOVE_DEFENSIVE:
-                    score -= float(CPU_DEFENSIVE_BASE_PENALTY)
-                    cd = int(getattr(self.cpu, "defensive_cooldown_turns", 0) or 0)
-                    if cd > 0:
-                        score -= float(CPU_DEFENSIVE_COOLDOWN_SCORE_PENALTY)
-                    if str(getattr(self.cpu, "last_move_name", "") or "") == str(MOVE_DEFENSIVE):
-                        score -= float(CPU_DEFENSIVE_REPEAT_EXTRA_PENALTY)
-                    if float(self.cpu.hp_pct()) <= float(CPU_DEFENSIVE_EMERGENCY_HP_PCT) or int(self.cpu.grit) <= 1:
-                        score += float(CPU_DEFENSIVE_EMERGENCY_BONUS)
-            except Exception:
-                pass
+    # -------------------------------------------------------------------------
+    # DEV HOT RELOAD
+    # -------------------------------------------------------------------------
 
-            # Grounded realism: prioritize standing up when healthy.
+    def _poll_hot_reload(self, _dt) -> None:
+        # Clock callbacks run between beats; a CPU worker may still be reading
+        # MOVES though, so wait for it (the change is picked up next poll).
+        if self._reload_watcher is None or self._cpu_think_live > 0:
+            return
+        changed = self._reload_watcher.changed()
+        if "moves_db" in changed:
             try:
-                cpu_state = getattr(self.cpu, "state", None)
-                cpu_hp = float(self.cpu.hp_pct())
-                is_grounded = (cpu_state == WrestlerState.GROUNDED)
-                wants_up = bool(is_grounded and cpu_hp >= float(CPU_GETUP_HEALTHY_PCT))
-                set_user = str(mv.get("set_user_state", ""))
-                is_getup = bool(is_grounded and set_user == "STANDING")
-                if wants_up and is_getup:
-                    score += float(CPU_GETUP_BONUS_HEALTHY)
-                # If healthy, discourage repeated ground strikes (e.g., Upkick) instead of standing.
-                if wants_up and str(mv.get("type", "Setup")) == "Strike" and (not is_getup):
-                    score -= float(CPU_UPKICK_PENALTY_WHEN_HEALTHY)
-                # If hurt, resting from the mat becomes more appealing.
-                if is_grounded and str(name) == MOVE_REST:
-                    if cpu_hp <= float(CPU_REST_HURT_PCT) or int(self.cpu.grit) <= 1:
-                        score += float(CPU_REST_BONUS_WHEN_HURT)
-            except Exception:
-                pass
-
-            # Repetition penalty to prevent spamming
-            if str(getattr(self.cpu, "last_move_name", None) or "") == str(name):
-                score -= 15.0
-
-            # Stale avoidance: don't willingly take the stale clash penalty.
+                diff = reload_moves()
+            except Exception as e:
+                self._log(f"[dev] moves_db reload failed, keeping the old moves: {e}")
+            else:
+                if diff:
+                    self._apply_moves_reload(diff)
+        if "wrestler_roster" in changed:
             try:
-                if self._would_be_stale(self.cpu, str(name)):
-                    # The actual penalty is -STALE_CLASH_SCORE_PENALTY, but taking it
-                    # also tends to widen margin tiers and lose tempo. Treat it as a
-                    # much bigger strategic downside.
-                    score -= float(int(STALE_CLASH_SCORE_PENALTY)) * 8.0
-            except Exception:
-                pass
+                slugs = reload_roster()
+            except Exception as e:
+                self._log(f"[dev] wrestler_roster reload failed, keeping the old roster: {e}")
+            else:
+                if slugs:
+                    self._apply_roster_reload(slugs)
 
-            # Fuzzing noise to avoid deterministic "robot" behavior
-            score += float(random.randint(0, 4))
-            return score
-
-        # Finisher priority: if a finisher is available, try to end it.
-        finishers = [m for m in valid if bool(MOVES.get(m, {}).get("is_finisher"))]
-        if finishers:
-            if (mode != "RND") or (random.random() >= 0.25):
-                finishers.sort(key=move_value, reverse=True)
-                return finishers[0]
-
-        scored = [(move_value(m), m) for m in valid]
-        scored.sort(key=lambda t: float(t[0]), reverse=True)
-        ordered = [m for _s, m in scored]
-
-        if mode == "GREED":
-            return ordered[0]
-        if mode == "GOOD":
-            return random.choice(ordered[: min(3, len(ordered))])
-        if mode == "BAD":
-            tail = ordered[max(0, len(ordered) - 3) :]
-            return random.choice(tail or ordered)
-        top_n = max(1, min(int(CPU_RND_PICK_FROM_TOP_N), len(ordered)))
-        return random.choice(ordered[:top_n])
-
-    def _cpu_choose_cards(self, move_name, *, mode: str | None = None):
-        if str(move_name) == MOVE_REST:
-            return []
-        hand = list(self.cpu.hand or [])
-        if not hand:
-            return []
+    def _apply_moves_reload(self, diff) -> None:
+        self._refresh_move_tables(diff)
+        # A selected move that no longer exists goes back to the category menu.
+        if self.selected_move and self.selected_move not in MOVES:
+            self.selected_move = None
+            self.selected_cards.clear()
+            if self._menu_stage == "MOVES":
+                self._menu_stage = "CATEGORIES"
+                self._selected_category = None
+            self._render_hand()
+        self._invalidate_cpu_plan()
+        self._render_moves_ui()
+        self._update_control_bar()
+        self._update_hud(force=True)
+        rebuilt = " (legality index rebuilt)" if diff.legality_changed else ""
+        self._log(f"[dev] moves reloaded: {diff.summary()}{rebuilt}")
 
+    def _apply_roster_reload(self, slugs: frozenset) -> None:
+        # Profiles apply from the next match; the wrestlers in this one keep theirs.
         try:
-            fired_bonus = int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) if int(getattr(self.cpu, "fired_up_turns_remaining", 0) or 0) > 0 else 0
+            if not bool(self._select_overlay.disabled):
+                self._render_character_list()
+                self._update_character_select_ui()
         except Exception:
-            fired_bonus = 0
-
-        # Finishers require doubles.
-        is_finisher = bool(MOVES.get(move_name, {}).get("is_finisher"))
-
-        ignore_card_cost = (move_name == MOVE_REST)
-        move_cost = int(MOVES.get(move_name, {}).get("cost", 0))
-
-        defensive_only_small = (move_name == MOVE_DEFENSIVE)
-        groggy_only_small = (move_name == MOVE_GROGGY_RECOVERY)
-
-        candidates: list[dict] = []
-
-        # Singles
-        if not is_finisher:
-            for c in hand:
-                if defensive_only_small and int(c.value) > 5:
-                    continue
-                if groggy_only_small and int(c.value) > 7:
-                    continue
-                card_cost = 0 if ignore_card_cost else int(c.grit_cost())
-                if int(self.cpu.grit) >= int(move_cost) + int(card_cost):
-                    candidates.append({"cards": [c]})
-
-        # Doubles
-        by_val: dict[int, list] = {}
-        for c in hand:
-            by_val.setdefault(int(c.value), []).append(c)
-        for _v, cs in by_val.items():
-            if len(cs) >= 2:
-                if defensive_only_small and int(cs[0].value) > 5:
-                    continue
-                if groggy_only_small and int(cs[0].value) > 7:
-                    continue
-                pair = [cs[0], cs[1]]
-                card_cost = 0 if ignore_card_cost else sum(int(x.grit_cost()) for x in pair)
-                if int(self.cpu.grit) >= int(move_cost) + int(card_cost):
-                    candidates.append({"cards": pair})
-
-        # Same-color pair: high card +2 (capped at 10). (Not allowed for finishers.)
-        if not is_finisher:
-            by_col: dict[str, list] = {}
-            for c in hand:
-                by_col.setdefault(str(c.color), []).append(c)
-            for col, cs in by_col.items():
-                if str(col) == "GRAY":
-                    continue
-                if len(cs) < 2:
-                    continue
-                # If there is a doubles pair in this color, it's already covered above.
-                cs_sorted = sorted(cs, key=lambda x: int(x.value), reverse=True)
-                a = cs_sorted[0]
-                b = next((x for x in cs_sorted[1:] if int(x.value) != int(a.value)), None)
-                if b is None:
-                    continue
-                if defensive_only_small and (int(a.value) > 5 or int(b.value) > 5):
-                    continue
-                if groggy_only_small and (int(a.value) > 7 or int(b.value) > 7):
-                    continue
-                pair = [a, b]
-                card_cost = 0 if ignore_card_cost else sum(int(x.grit_cost()) for x in pair)
-                if int(self.cpu.grit) >= int(move_cost) + int(card_cost):
-                    candidates.append({"cards": pair})
-
-        if not candidates:
-            return []
-
-        # Impact moves: require at least one matching-type (or Yellow) card.
-        if self._move_requires_type_card(move_name):
-            try:
-                move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
-                candidates = [d for d in candidates if any(int(c.color_bonus(move_type)) > 0 for c in (d.get("cards") or []))]
-            except Exception:
-                candidates = []
-            if not candidates:
-                return []
-
-        # Score candidates using the actual clash scoring rules.
-        scored: list[dict] = []
-        for d in candidates:
-            cs = list(d.get("cards") or [])
-            card_bonus = int(getattr(self.cpu, "next_card_bonus", 0) or 0) + int(fired_bonus) * int(len(cs))
-
-            # Defensive uses a separate pool rule.
-            if str(move_name) == MOVE_DEFENSIVE:
-                pool = sum(int(c.value) for c in cs)
-                if len(cs) == 2 and int(cs[0].value) == int(cs[1].value):
-                    pool += 5
-                pool += int(card_bonus)
-                d["score"] = int(pool)
-            elif str(move_name) == MOVE_GROGGY_RECOVERY:
-                # Groggy progress is effectively based on card value; keep it simple.
-                pool = sum(min(7, int(c.value)) for c in cs)
-                if len(cs) == 2 and int(cs[0].value) == int(cs[1].value):
-                    pool += 5
-                pool += int(card_bonus)
-                d["score"] = int(pool)
-            else:
-                d["score"] = int(self._calc_clash_score(str(move_name), cs, card_bonus=int(card_bonus)))
-
-            scored.append(d)
-
-        candidates = scored
-
-        candidates.sort(key=lambda d: int(d.get("score", 0)), reverse=True)
-        mode = str(mode or self._cpu_ai_mode())
-        if mode == "GREED":
-            return list(candidates[0]["cards"])
-        if mode == "GOOD":
-            pool = candidates[: min(3, len(candidates))]
-            return list(random.choice(pool)["cards"])
-        if mode == "BAD":
-            pool = candidates[max(0, len(candidates) - 3) :]
-            return list(random.choice(pool or candidates)["cards"])
-        return list(random.choice(candidates)["cards"])
+            pass
+        self._log(f"[dev] roster reloaded: {len(slugs)} profile(s) changed (next match)")
 
     # -------------------------------------------------------------------------
     # UI EVENT HANDLERS
@@ -4464,203 +2621,306 @@ class WrestleApp(App):
             return
 
         self._activate_fire_up(self.player)
+        self._invalidate_cpu_plan()
         self._update_hud()
         self._render_moves_ui()
         self._update_control_bar()
 
-    def _fire_up_duration_from_advantage(self, adv: int) -> int:
-        """Map momentum advantage magnitude to FIRE UP duration.
+    # -------------------------------------------------------------------------
+    # UI INVALIDATION
+    # -------------------------------------------------------------------------
+    # The engine calls _update_hud / _render_hand / _render_moves_ui /
+    # _update_control_bar many times per beat. Here they only mark a region
+    # dirty; _flush_ui paints each dirty region once, before the next frame.
 
-        Player-facing mapping:
-        1-2 => 1 turn, 3-4 => 2 turns, 5 => 3 turns.
-        """
-        mag = max(0, min(int(MOMENTUM_MAX_ABS), abs(int(adv))))
-        if mag <= 0:
-            return 0
-        if mag <= 2:
-            return 1
-        if mag <= 4:
-            return 2
-        return 3
-
-    def _activate_fire_up(self, who: Wrestler) -> None:
-        if self.game_over:
-            return
-        if self._escape_mode is not None:
-            return
+    def _invalidate_ui(self, *regions: str) -> None:
+        self._ui_dirty.update(regions)
+        self._ui_flush_trigger()
 
-        adv = int(self._momentum_advantage_for(who))
-        if adv <= 0:
-            return
+    def _update_hud(self, *, force: bool = False):
+        if force:
+            self._ui_hud_force = True
+        self._invalidate_ui("hud")
 
-        dur = int(self._fire_up_duration_from_advantage(adv))
-        if dur <= 0:
-            return
+    def _render_hand(self):
+        self._invalidate_ui("hand")
 
-        who.fired_up_turns_remaining = int(dur)
-        self.momentum = 0
-        self._log(
-            f"FIRE UP! {self._fmt_name(who)} ignites ({dur} turns): +{int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD)} to each card, no botches, wins ties."
-        )
-    
-    def _update_hud(self):
-        def state_name(w: Wrestler) -> str:
-            st = getattr(w, "state", None)
-            return str(getattr(st, "name", st))
+    def _render_moves_ui(self) -> None:
+        self._invalidate_ui("moves")
 
-        def role_name(w: Wrestler) -> str:
+    def _update_control_bar(self) -> None:
+        self._invalidate_ui("control")
+
+    def _flush_ui(self, *_dt) -> None:
+        """Paint every dirty region once and append pending log lines."""
+        # A painter may invalidate another region; pick that up in the same frame.
+        for _ in range(3):
+            if not self._ui_dirty:
+                break
+            dirty, self._ui_dirty = self._ui_dirty, set()
+            if "hand" in dirty:
+                self._paint_hand()
+            if "moves" in dirty:
+                self._paint_moves_ui()
+            if "control" in dirty:
+                self._paint_control_bar()
+            if "hud" in dirty:
+                force, self._ui_hud_force = self._ui_hud_force, False
+                self._paint_hud(force=force)
+        self._flush_log()
+
+    def _hud_fields(self) -> dict[tuple[str, str], tuple]:
+        """Raw values behind each HUD widget group, keyed by (side, group)."""
+        fields: dict[tuple[str, str], tuple] = {}
+        for side, w in (("player", self.player), ("cpu", self.cpu)):
+            st = getattr(w, "state", None)
             gr = getattr(w, "grapple_role", None)
-            return str(getattr(gr, "name", "NEUTRAL")) if gr is not None else "NEUTRAL"
-
-        def flow(w: Wrestler) -> str:
-            if not w.is_flow():
-                return ""
-            return f" [FLOW {w.flow_turns_remaining}]"
-
-        def fired(w: Wrestler) -> str:
             try:
-                t = int(getattr(w, "fired_up_turns_remaining", 0) or 0)
+                hand_max = int(w.check_limb_penalties().get("max_hand_size", 5))
             except Exception:
-                t = 0
-            return f" [FIRED UP {t}]" if t > 0 else ""
-
-        def grog(w: Wrestler) -> str:
-            if bool(getattr(w, "is_groggy", False)):
-                try:
-                    gm = int(getattr(w, "groggy_meter", 0) or 0)
-                except Exception:
-                    gm = 0
-                return f" [GROGGY {gm}]" if gm > 0 else " [GROGGY]"
-            return ""
-
-        def dazed(w: Wrestler) -> str:
-            dt = int(getattr(w, "daze_turns", 0) or 0)
-            return f" [DAZED {dt}]" if dt > 0 else ""
-
-        p_state = state_name(self.player)
-        c_state = state_name(self.cpu)
-        p_role = role_name(self.player)
-        c_role = role_name(self.cpu)
-        self.state_label.text = (
-            f"[b]{p_state}[/b] ({p_role}){flow(self.player)}{fired(self.player)}{grog(self.player)}{dazed(self.player)}"
-            f"  |  CPU: {c_state} ({c_role}){flow(self.cpu)}{fired(self.cpu)}{grog(self.cpu)}{dazed(self.cpu)}"
+                hand_max = 5
+            try:
+                limbs = (
+                    int(w.body_parts.get("HEAD", 100)),
+                    int(w.body_parts.get("BODY", 100)),
+                    int(w.body_parts.get("LEGS", 100)),
+                )
+            except Exception:
+                limbs = (100, 100, 100)
+            fields[(side, "state")] = (
+                str(getattr(st, "name", st)),
+                str(getattr(gr, "name", "NEUTRAL")) if gr is not None else "NEUTRAL",
+                int(w.flow_turns_remaining) if w.is_flow() else 0,
+                int(getattr(w, "fired_up_turns_remaining", 0) or 0),
+                bool(getattr(w, "is_groggy", False)),
+                int(getattr(w, "groggy_meter", 0) or 0),
+                int(getattr(w, "daze_turns", 0) or 0),
+            )
+            fields[(side, "hp")] = (str(w.name), int(w.hp))
+            fields[(side, "grit")] = (int(w.grit), int(w.max_grit))
+            fields[(side, "hype")] = (int(w.hype),)
+            fields[(side, "nums")] = (
+                int(w.strength_current()),
+                int(w.strength_max()),
+                len(list(getattr(w, "hand", []) or [])),
+                hand_max,
+            )
+            fields[(side, "limbs")] = limbs
+        fields[("match", "momentum")] = (
+            int(getattr(self, "momentum", 0) or 0),
+            int(getattr(self.player, "fired_up_turns_remaining", 0) or 0) > 0,
         )
-
-        # Always-visible per-wrestler state lines under names.
-        try:
-            if hasattr(self, "player_state_small"):
-                self.player_state_small.text = f"STATE: {p_state}" if p_role == "NEUTRAL" else f"STATE: {p_state} ({p_role})"
-            if hasattr(self, "cpu_state_small"):
-                self.cpu_state_small.text = f"STATE: {c_state}" if c_role == "NEUTRAL" else f"STATE: {c_state} ({c_role})"
-
-            # Compact DAZED flags (additive status, not a position).
-            if hasattr(self, "player_dazed_small"):
-                pd = int(getattr(self.player, "daze_turns", 0) or 0)
-                self.player_dazed_small.text = "*DAZED*" if pd > 0 else ""
-                self.player_dazed_small.opacity = 1.0 if pd > 0 else 0.0
-            if hasattr(self, "cpu_dazed_small"):
-                cd = int(getattr(self.cpu, "daze_turns", 0) or 0)
-                self.cpu_dazed_small.text = "*DAZED*" if cd > 0 else ""
-                self.cpu_dazed_small.opacity = 1.0 if cd > 0 else 0.0
-        except Exception:
-            pass
-
-        # Momentum
-        mom = int(getattr(self, "momentum", 0))
-        mom = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), mom))
-        if mom > 0:
-            hexc = COLOR_HEX_MOMENTUM_POS
-        elif mom < 0:
-            hexc = COLOR_HEX_MOMENTUM_NEG
+        # Shown in 5% steps so the label only repaints on a visible change.
+        wp = self.win_probability()
+        fields[("match", "winprob")] = (None if wp is None else int(round(wp * 20)) * 5,)
+        return fields
+
+    def _hud_change_set(self, *, force: bool = False) -> set[tuple[str, str]]:
+        """Diff the HUD fields against the last paint and return the dirty groups."""
+        fields = self._hud_fields()
+        prev = getattr(self, "_hud_prev", None) or {}
+        if force or not prev:
+            dirty = set(fields)
         else:
-            hexc = COLOR_HEX_MOMENTUM_NEU
-        self.momentum_label.text = f"[color={hexc}]MOMENTUM {mom:+d}[/color]"
-        self.momentum_bar.max_abs = int(MOMENTUM_MAX_ABS)
-        self.momentum_bar.value_signed = int(mom)
-        self.momentum_bar.bar_color = get_color_from_hex(COLOR_HEX_MOMENTUM_POS if mom >= 0 else COLOR_HEX_MOMENTUM_NEG)
-
-        try:
-            if hasattr(self, "fire_up_btn"):
-                already = int(getattr(self.player, "fired_up_turns_remaining", 0) or 0) > 0
-                self.fire_up_btn.disabled = (int(mom) <= 0) or bool(already)
-        except Exception:
-            pass
+            dirty = {k for k, v in fields.items() if prev.get(k) != v}
+        self._hud_prev = fields
+        return dirty
 
-        # HP Fog-of-War: show only status bands, not exact numbers.
-        self.player_hp_label.text = f"{self.player.name}: {self._get_hp_status(self.player.hp)}"
-        self.cpu_hp_label.text = f"{self.cpu.name}: {self._get_hp_status(self.cpu.hp)}"
-        self.player_hp_bar.value = int(self.player.hp)
-        self.cpu_hp_bar.value = int(self.cpu.hp)
-
-        # Grit/Hype meters
-        self.p_grit_label.text = f"[color={COLOR_HEX_GRIT}]GRIT {self.player.grit}/{self.player.max_grit}[/color]"
-        self.c_grit_label.text = f"[color={COLOR_HEX_GRIT}]GRIT {self.cpu.grit}/{self.cpu.max_grit}[/color]"
-        self.p_hype_label.text = f"[color={COLOR_HEX_HYPE}]HYPE {self.player.hype}/100[/color]"
-        self.c_hype_label.text = f"[color={COLOR_HEX_HYPE}]HYPE {self.cpu.hype}/100[/color]"
-
-        self.p_grit_bar.max_value = int(self.player.max_grit)
-        self.c_grit_bar.max_value = int(self.cpu.max_grit)
-        self.p_grit_bar.value = int(self.player.grit)
-        self.c_grit_bar.value = int(self.cpu.grit)
-
-        self.p_hype_bar.max_value = 100
-        self.c_hype_bar.max_value = 100
-        self.p_hype_bar.value = int(self.player.hype)
-        self.c_hype_bar.value = int(self.cpu.hype)
-
-        # Strength + hand size + limbs
-        try:
-            p_hand_max = int(self.player.check_limb_penalties().get("max_hand_size", 5))
-        except Exception:
-            p_hand_max = 5
-        try:
-            c_hand_max = int(self.cpu.check_limb_penalties().get("max_hand_size", 5))
-        except Exception:
-            c_hand_max = 5
-        p_hand = len(list(getattr(self.player, "hand", []) or []))
-        c_hand = len(list(getattr(self.cpu, "hand", []) or []))
+    def _paint_hud(self, *, force: bool = False):
+        dirty = self._hud_change_set(force=force)
+        if not dirty:
+            return
 
-        p_str = f"Str {self.player.strength_current()}/{self.player.strength_max()}  Hand {p_hand}/{p_hand_max}"
-        c_str = f"Str {self.cpu.strength_current()}/{self.cpu.strength_max()}  Hand {c_hand}/{c_hand_max}"
-        self.p_nums.text = p_str
-        self.c_nums.text = c_str
+        def status(side: str) -> tuple[str, str, str]:
+            st, role, flow_t, fired_t, groggy, gm, daze_t = self._hud_prev[(side, "state")]
+            extra = ""
+            if flow_t > 0:
+                extra += f" [FLOW {flow_t}]"
+            if fired_t > 0:
+                extra += f" [FIRED UP {fired_t}]"
+            if groggy:
+                extra += f" [GROGGY {gm}]" if gm > 0 else " [GROGGY]"
+            if daze_t > 0:
+                extra += f" [DAZED {daze_t}]"
+            return st, role, extra
+
+        if ("player", "state") in dirty or ("cpu", "state") in dirty:
+            p_state, p_role, p_extra = status("player")
+            c_state, c_role, c_extra = status("cpu")
+            self.state_label.text = (
+                f"[b]{p_state}[/b] ({p_role}){p_extra}"
+                f"  |  CPU: {c_state} ({c_role}){c_extra}"
+            )
 
-        def _limb_line(w: Wrestler) -> str:
+            # Always-visible per-wrestler state lines under names.
             try:
-                head = int(w.body_parts.get("HEAD", 100))
-                body = int(w.body_parts.get("BODY", 100))
-                legs = int(w.body_parts.get("LEGS", 100))
+                if hasattr(self, "player_state_small"):
+                    self.player_state_small.text = f"STATE: {p_state}" if p_role == "NEUTRAL" else f"STATE: {p_state} ({p_role})"
+                if hasattr(self, "cpu_state_small"):
+                    self.cpu_state_small.text = f"STATE: {c_state}" if c_role == "NEUTRAL" else f"STATE: {c_state} ({c_role})"
+
+                # Compact DAZED flags (additive status, not a position).
+                if hasattr(self, "player_dazed_small"):
+                    pd = int(self._hud_prev[("player", "state")][6])
+                    self.player_dazed_small.text = "*DAZED*" if pd > 0 else ""
+                    self.player_dazed_small.opacity = 1.0 if pd > 0 else 0.0
+                if hasattr(self, "cpu_dazed_small"):
+                    cd = int(self._hud_prev[("cpu", "state")][6])
+                    self.cpu_dazed_small.text = "*DAZED*" if cd > 0 else ""
+                    self.cpu_dazed_small.opacity = 1.0 if cd > 0 else 0.0
             except Exception:
-                head, body, legs = 100, 100, 100
+                pass
 
-            def seg(tag: str, v: int, *, blink: bool) -> str:
-                if blink:
-                    return f"[color={COLOR_HEX_HP_CRITICAL}]{tag}:{v}[/color]"
-                return f"{tag}:{v}"
+        # Momentum (+ win probability on the same line)
+        if ("match", "momentum") in dirty or ("match", "winprob") in dirty:
+            mom = int(getattr(self, "momentum", 0))
+            mom = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), mom))
+            if mom > 0:
+                hexc = COLOR_HEX_MOMENTUM_POS
+            elif mom < 0:
+                hexc = COLOR_HEX_MOMENTUM_NEG
+            else:
+                hexc = COLOR_HEX_MOMENTUM_NEU
+            self.momentum_label.text = f"[color={hexc}]MOMENTUM {mom:+d}[/color]"
+            win_pct = self._hud_prev[("match", "winprob")][0]
+            if win_pct is not None:
+                self.momentum_label.text += f"   WIN {win_pct}%"
+            self.momentum_bar.max_abs = int(MOMENTUM_MAX_ABS)
+            self.momentum_bar.value_signed = int(mom)
+            self.momentum_bar.bar_color = get_color_from_hex(COLOR_HEX_MOMENTUM_POS if mom >= 0 else COLOR_HEX_MOMENTUM_NEG)
 
-            blink_head = bool(head < 30 and self._limb_blink_on)
-            blink_body = bool(body < 30 and self._limb_blink_on)
-            blink_legs = bool(legs < 30 and self._limb_blink_on)
+            try:
+                if hasattr(self, "fire_up_btn"):
+                    already = bool(self._hud_prev[("match", "momentum")][1])
+                    self.fire_up_btn.disabled = (int(mom) <= 0) or bool(already)
+            except Exception:
+                pass
 
-            return f"{seg('H', head, blink=blink_head)}  {seg('B', body, blink=blink_body)}  {seg('L', legs, blink=blink_legs)}"
+        # A limb crossing the critical line starts or stops the limb blink.
+        if ("player", "limbs") in dirty or ("cpu", "limbs") in dirty:
+            self._sync_intervals()
 
-        self.p_limbs.text = _limb_line(self.player)
-        self.c_limbs.text = _limb_line(self.cpu)
+        # HP Fog-of-War: show only status bands, not exact numbers.
+        if ("player", "hp") in dirty:
+            self.player_hp_label.text = f"{self.player.name}: {self._get_hp_status(self.player.hp)}"
+            self.player_hp_bar.value = int(self.player.hp)
+        if ("cpu", "hp") in dirty:
+            self.cpu_hp_label.text = f"{self.cpu.name}: {self._get_hp_status(self.cpu.hp)}"
+            self.cpu_hp_bar.value = int(self.cpu.hp)
+
+        # Grit/Hype meters + strength/hand + limbs
+        for side, w, grit_label, grit_bar, hype_label, hype_bar, nums, limbs in (
+            ("player", self.player, self.p_grit_label, self.p_grit_bar, self.p_hype_label, self.p_hype_bar, self.p_nums, self.p_limbs),
+            ("cpu", self.cpu, self.c_grit_label, self.c_grit_bar, self.c_hype_label, self.c_hype_bar, self.c_nums, self.c_limbs),
+        ):
+            if (side, "grit") in dirty:
+                grit_label.text = f"[color={COLOR_HEX_GRIT}]GRIT {w.grit}/{w.max_grit}[/color]"
+                grit_bar.max_value = int(w.max_grit)
+                grit_bar.value = int(w.grit)
+            if (side, "hype") in dirty:
+                hype_label.text = f"[color={COLOR_HEX_HYPE}]HYPE {w.hype}/100[/color]"
+                hype_bar.max_value = 100
+                hype_bar.value = int(w.hype)
+            if (side, "nums") in dirty:
+                str_cur, str_max, hand, hand_max = self._hud_prev[(side, "nums")]
+                nums.text = f"Str {str_cur}/{str_max}  Hand {hand}/{hand_max}"
+            if (side, "limbs") in dirty:
+                limbs.text = self._limb_line(*self._hud_prev[(side, "limbs")])
+                self._apply_limb_blink(limbs, self._hud_prev[(side, "limbs")])
+
+    @staticmethod
+    def _limb_line(head: int, body: int, legs: int) -> str:
+        def seg(tag: str, v: int) -> str:
+            if v < LIMB_CRITICAL:
+                return f"[color={COLOR_HEX_HP_CRITICAL}]{tag}:{v}[/color]"
+            return f"{tag}:{v}"
+
+        return f"{seg('H', head)}  {seg('B', body)}  {seg('L', legs)}"
+
+    def _apply_limb_blink(self, widget, limbs: tuple) -> None:
+        critical = any(int(v) < LIMB_CRITICAL for v in limbs)
+        dim = critical and not bool(getattr(self, "_limb_blink_on", True))
+        widget.opacity = float(LIMB_BLINK_DIM_OPACITY) if dim else 1.0
 
     def _tick_limb_blink(self, _dt: float) -> None:
         try:
             self._limb_blink_on = not bool(getattr(self, "_limb_blink_on", True))
         except Exception:
             self._limb_blink_on = True
-        # Only affects HUD rendering; safe to no-op if UI not ready.
+        self._apply_limb_blinks()
+
+    def _apply_limb_blinks(self) -> None:
+        # Only the limb widgets' opacity changes; the rest of the HUD is untouched.
         try:
-            self._update_hud()
+            prev = getattr(self, "_hud_prev", None) or {}
+            self._apply_limb_blink(self.p_limbs, prev.get(("player", "limbs"), (100, 100, 100)))
+            self._apply_limb_blink(self.c_limbs, prev.get(("cpu", "limbs"), (100, 100, 100)))
         except Exception:
             return
 
-    def _render_hand(self):
-        self.hand_layout.clear_widgets()
+    # -------------------------------------------------------------------------
+    # POWER SAVING
+    # -------------------------------------------------------------------------
+    # Our only repeating callbacks are the limb blink and spectator beats.
+    # The blink is scheduled only while a limb is critical and the app is
+    # neither paused nor idle (IDLE_AFTER_S without input). Pausing also stops
+    # spectating and any flash fade. With nothing animating, none of our
+    # callbacks wake the app; the next touch, key or resume brings them back.
+
+    def _on_user_input(self, *_args) -> bool:
+        self._idle_trigger.cancel()
+        self._idle_trigger()
+        if self._power_idle:
+            self._power_idle = False
+            self._sync_intervals()
+        return False  # never consume the event
+
+    def _enter_idle(self, _dt=None) -> None:
+        if self._spectate is not None:
+            # Spectating is watched, not touched.
+            self._idle_trigger()
+            return
+        self._power_idle = True
+        self._sync_intervals()
+
+    def _set_power_paused(self, paused: bool) -> None:
+        self._power_paused = bool(paused)
+        sp = self._spectate
+        if paused:
+            self._idle_trigger.cancel()
+            try:
+                self._flash._stop()
+            except Exception:
+                pass
+            if sp is not None and sp["ev"] is not None:
+                sp["ev"].cancel()
+                sp["ev"] = None
+        else:
+            self._power_idle = False
+            self._idle_trigger()
+            if sp is not None:
+                self._spectate_set_speed(int(sp["speed"]))
+        self._sync_intervals()
+
+    def _limbs_critical(self) -> bool:
+        prev = getattr(self, "_hud_prev", None) or {}
+        return any(int(v) < LIMB_CRITICAL for side in ("player", "cpu") for v in prev.get((side, "limbs"), ()))
+
+    def _sync_intervals(self) -> None:
+        """Schedule or cancel the limb blink to match whether it is needed."""
+        want = not self._power_paused and not self._power_idle and self._limbs_critical()
+        if want == (self._blink_ev is not None):
+            return
+        if want:
+            self._blink_ev = Clock.schedule_interval(self._tick_limb_blink, LIMB_BLINK_INTERVAL_S)
+            return
+        self._blink_ev.cancel()
+        self._blink_ev = None
+        # Park on the "on" phase so no limb line is left dimmed.
+        self._limb_blink_on = True
+        self._apply_limb_blinks()
 
+    def _paint_hand(self):
         def move_type_for_selected() -> str | None:
             if not self.selected_move:
                 return None
@@ -4724,53 +2984,34 @@ class WrestleApp(App):
             total = sum(int(a) for a, _t in parts)
             return [f"+{int(total)}"]
 
-        for i, card in enumerate(self.player.hand):
-            # Color logic
-            bg = COLOR_BTN_BASE
-            if card.color == "RED":
-                bg = COLOR_STRIKE
-            elif card.color == "BLUE":
-                bg = COLOR_GRAPPLE
-            elif card.color == "GREEN":
-                bg = COLOR_SUBMIT
-            elif card.color == "YELLOW":
-                bg = COLOR_AERIAL
-
-            selected = (i in self.selected_cards)
+        if self._card_atlas is None:
+            self._card_atlas = CardAtlas()
+        atlas = self._card_atlas
 
+        # Card widgets are reused; they are only re-added when the hand size changes.
+        hand = list(self.player.hand or [])
+        while len(self._hand_faces) < len(hand):
+            face = CardFace(card_index=len(self._hand_faces))
+            face.bind(on_release=self._on_card_click)
+            self._hand_faces.append(face)
+        if len(self.hand_layout.children) != len(hand):
+            self.hand_layout.clear_widgets()
+            for face in self._hand_faces[: len(hand)]:
+                self.hand_layout.add_widget(face)
+
+        for i, card in enumerate(hand):
             parts = pending_mod_parts(card)
             mods_txt = " ".join(str(p) for p in (parts or []))
             # Mobile: keep value always visible; show modifiers on a second line.
             # (Manually truncate modifier line to avoid layout-dependent clipping.)
             if len(mods_txt) > 16:
                 mods_txt = mods_txt[:13] + "..."
-            if not mods_txt:
-                mods_txt = " "
-            text = f"[b]{int(card.value)}[/b]\n[size=12sp]{mods_txt}[/size]"
-            markup = True
-
-            btn = BorderedButton(
-                text=text,
-                markup=markup,
-                background_color=bg, background_normal="",
-                font_size='24sp', bold=True
+            self._hand_faces[i].show(
+                bg=CARD_FACE_COLORS.get(str(card.color), COLOR_BTN_BASE),
+                face=atlas.face(int(card.value), str(card.color)),
+                caption=atlas.caption(mods_txt),
+                selected=(i in self.selected_cards),
             )
-            # Hand cards should center cleanly and avoid awkward wrapping/clipping.
-            try:
-                btn.auto_wrap = False
-                btn.halign = "center"
-                btn.valign = "middle"
-                btn.padding = [dp(2), dp(2)]
-                btn.shorten = False
-                btn.max_lines = 2
-            except Exception:
-                pass
-            btn.border_color = list(COLOR_CARD_SELECTED)
-            btn.border_width = float(dp(2))
-            btn.show_border = bool(selected)
-            btn.card_index = i 
-            btn.bind(on_release=self._on_card_click)
-            self.hand_layout.add_widget(btn)
         self._update_play_button()
 
     def _set_menu_stage(self, stage: str, *, category: str | None = None) -> None:
@@ -4825,8 +3066,11 @@ class WrestleApp(App):
             return any(is_utility(m) for m in moves)
         return True
 
-    def _render_moves_ui(self) -> None:
+    def _paint_moves_ui(self) -> None:
         self.move_list_layout.clear_widgets()
+        if self._spectate is not None:
+            self._paint_spectate_panel()
+            return
         # Default columns vary by stage; ESCAPE overrides to 1 below.
         try:
             self.move_list_layout.cols = 2 if self._menu_stage == "MOVES" else 3
@@ -5026,6 +3270,7 @@ class WrestleApp(App):
                 self.player.hype -= 25
                 self.player.next_card_bonus = max(int(self.player.next_card_bonus), 1)
                 self._log("Hype Shop: Pump Up purchased (+1 to next played card).")
+                self._invalidate_cpu_plan()
                 self._update_hud()
                 self._render_moves_ui()
                 self._update_control_bar()
@@ -5036,6 +3281,7 @@ class WrestleApp(App):
                 self.player.hype -= 50
                 self.player.next_card_bonus = max(int(self.player.next_card_bonus), 2)
                 self._log("Hype Shop: Adrenaline purchased (+2 to next played card).")
+                self._invalidate_cpu_plan()
                 self._update_hud()
                 self._render_moves_ui()
                 self._update_control_bar()
@@ -5046,6 +3292,7 @@ class WrestleApp(App):
                 self.player.hype -= 80
                 self.player.hp = min(MAX_HEALTH, self.player.hp + 15)
                 self._log("Hype Shop: Second Wind! (+15 HP)")
+                self._invalidate_cpu_plan()
                 self._update_hud()
                 self._render_moves_ui()
                 self._update_control_bar()
@@ -5060,6 +3307,7 @@ class WrestleApp(App):
                 self.player.grit = min(self.player.max_grit, int(self.player.grit) + int(TUNING_HYPE_SHOP_GRIT_REFILL_AMOUNT))
                 gained = int(self.player.grit) - before
                 self._log(f"Hype Shop: Grit Refill! (+{gained} Grit)")
+                self._invalidate_cpu_plan()
                 self._update_hud()
                 self._render_moves_ui()
                 self._update_control_bar()
@@ -5072,6 +3320,7 @@ class WrestleApp(App):
                 self.player.hype -= 50
                 self.player.lockup_edge_ready = True
                 self._log("Hype Shop: Lock Up Edge purchased (next Lock Up you initiate auto-wins).")
+                self._invalidate_cpu_plan()
                 self._update_hud()
                 self._render_moves_ui()
                 self._update_control_bar()
@@ -5509,6 +3758,8 @@ class WrestleApp(App):
         pop.open()
 
     def _on_card_click(self, instance):
+        if self._spectate is not None:
+            return
         idx = int(getattr(instance, "card_index", -1))
         if idx < 0:
             return
@@ -5571,7 +3822,10 @@ class WrestleApp(App):
     def _update_play_button(self):
         self._update_control_bar()
 
-    def _update_control_bar(self) -> None:
+    def _paint_control_bar(self) -> None:
+        if self._spectate is not None:
+            self._paint_spectate_controls()
+            return
         # Return visibility
         show_return = self._menu_stage in {"MOVES", "HYPE_SHOP"}
         self.return_btn.disabled = not show_return
@@ -5623,6 +3877,8 @@ class WrestleApp(App):
 
         if self.game_over:
             enabled = False
+        elif getattr(self, "_cpu_pending_submit", None) is not None:
+            enabled = False
         elif self._menu_stage == "ESCAPE":
             enabled = bool(self._escape_mode is not None) and bool(self._escape_mode.get("defender_is_player")) and (len(self.selected_cards) == 1)
         elif self._menu_stage != "MOVES":
@@ -5672,6 +3928,9 @@ class WrestleApp(App):
             self.play_btn.background_color = get_color_from_hex(COLOR_HEX_PLAY_DISABLED)
 
     def _on_play_click(self, instance):
+        if self._spectate is not None:
+            self._on_spectate_speed()
+            return
         if self._escape_mode is not None and bool(self._escape_mode.get("defender_is_player")) and self._menu_stage == "ESCAPE":
             self._submit_escape_card()
         else:
@@ -5695,6 +3954,8 @@ class WrestleApp(App):
     def _submit_cards(self) -> None:
         if self.game_over:
             return
+        if self._cpu_pending_submit is not None:
+            return
         if self._menu_stage != "MOVES":
             return
         if not self.selected_move:
@@ -5734,18 +3995,31 @@ class WrestleApp(App):
             return
 
         self._cpu_buy_buffs()
-        cpu_mode = self._cpu_ai_mode()
+        self._cpu_pending_submit = (str(self.selected_move), list(p_cards))
+        self._update_control_bar()
+
+        # Consume the speculative CPU action if it still matches the live state.
+        plan = self._cpu_plan
+        if plan is not None and plan.get("key") == self._cpu_plan_key():
+            if plan.get("result") is not None:
+                self._cpu_plan = None
+                self._finish_submit(*plan["result"])
+            # Otherwise it's still thinking; _on_cpu_plan_ready finishes the submit.
+            return
+        self._invalidate_cpu_plan(respeculate=False)
+        self._start_cpu_think(self._finish_submit)
+
+    def _finish_submit(self, cpu_mode: str, c_move: str, c_cards: list) -> None:
+        pending = self._cpu_pending_submit
+        self._cpu_pending_submit = None
+        if pending is None or self.game_over:
+            return
+        p_move, p_cards = pending
+
         self._last_cpu_mode = str(cpu_mode)
-        c_move, c_cards = self._cpu_choose_action(mode=cpu_mode)
-        # Safety fallback: if something goes sideways, guarantee a legal/affordable action.
-        try:
-            c_total = self._effective_cost(self.cpu, c_move, c_cards)
-            if int(self.cpu.grit) < int(c_total):
-                c_move, c_cards = (MOVE_REST, [])
-        except Exception:
-            c_move, c_cards = (MOVE_REST, [])
+        c_move, c_cards = self._affordable_action(self.cpu, c_move, c_cards)
 
-        self._resolve_clash(self.selected_move, p_cards, c_move, c_cards)
+        self._resolve_clash(p_move, p_cards, c_move, c_cards)
 
     def _on_return_click(self, instance):
         self.selected_move = None
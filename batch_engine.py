@@ -0,0 +1,853 @@
+"""Lockstep batch simulator: many matches advanced together as NumPy arrays.
+
+For large tuning sweeps the per-match Python overhead of MatchEngine
+dominates, so this module stores N concurrent matches as struct-of-arrays
+(HP, limbs, position, grit, hype, momentum, decks and hands per seat) and
+advances all of them one beat at a time.
+
+It is a reduced model of engine.MatchEngine, not a replacement:
+
+- exact: clash scoring (clash_scores == MatchEngine._calc_clash_score),
+  damage tiers (damage_tiers == MatchEngine._damage_tier_from_margin),
+  static legality and move costs (from move_index / _move_base_cost),
+  position changes (move_graph edges, incl. desync repair), momentum score
+  tiers, doubles damage, pin/submission escape thresholds;
+- modelled as in the engine: ties (a one-sided injury botch, then
+  Strength, then a double-down or coin toss), the clash winner's injury
+  botch, stale-move penalties, Rest losing to attacks, simultaneous
+  non-conflicting actions, Defensive guards (perfect guard, slip, soften),
+  and escapes played one card at a time, highest first (no redraw unless
+  the hand is under three; each failed submission play is a tick of
+  damage; only the cards played are spent);
+- simplified: no daze/groggy/stun meters, no chains, no grapple breaks, no
+  Hype Shop or FIRE UP, no criticals;
+- policy: the engine's CPU for both seats (MatchEngine._cpu_choose_action):
+  cpu_scoring move values with each profile's ai_weights plus the best
+  card play, fuzzed, then a GREED/GOOD/BAD/RND pick rolled from ai_traits.
+  Like a headless MatchEngine it has no endgame table; the Defensive
+  cooldown term is left out.
+
+tools/batch_parity.py checks the exact parts against MatchEngine on shared
+seeds and gates match-level stats (finish mix, win rate, length) against
+the reference engine.
+
+numpy is optional for the game itself; only this module needs it.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+try:
+    import numpy as np
+except Exception:  # optional dependency (batch sims only)
+    np = None
+
+from cards import COLORS, DECK_COLOR_POOL, DECK_COLOR_WEIGHTS, DECK_GRAY_CHANCE, Card, deck_distribution
+from cpu_scoring import TERM_NAMES, TERMS, ScoreTable, weight_vector
+from engine import (
+    CPU_DEFENSIVE_EMERGENCY_HP_PCT,
+    CPU_GETUP_HEALTHY_PCT,
+    CPU_PLAN_PIN_HP_PCT,
+    CPU_PLAN_PROGRESS_MAX_BEATS,
+    CPU_REST_HURT_PCT,
+    CPU_RND_PICK_FROM_TOP_N,
+    CPU_SCORE_LOW_HP_PCT,
+    CPU_SCORE_OPP_FRESH_HP_PCT,
+    CPU_SCORE_OPP_HALF_HP_PCT,
+    CPU_SCORE_OPP_LOW_HP_PCT,
+    CPU_SCORE_OPP_SUB_HP_PCT,
+    CPU_SCORE_OPP_WORN_HP_PCT,
+    DOUBLES_DAMAGE_MODIFIER,
+    HEADLESS_MAX_BEATS,
+    MOMENTUM_MAX_ABS,
+    MOMENTUM_SCORE_TIER1_BONUS,
+    MOMENTUM_SCORE_TIER1_MAX,
+    MOMENTUM_SCORE_TIER2_BONUS,
+    MOMENTUM_WIN_DELTA,
+    STALE_CLASH_SCORE_PENALTY,
+    STALE_REPEAT_THRESHOLD,
+    STALE_WINDOW_ATTACK_MOVES,
+    SUBMISSION_TICK_DAMAGE,
+    TUNING_BOTCH_DIVISOR,
+    TUNING_DOUBLE_DOWN_ON_TRUE_TIE_CHANCE,
+    TUNING_ENABLE_PASSIVE_REGEN,
+    TUNING_GRIT_PASSIVE_REGEN,
+    TUNING_PIN_ESCAPE_THRESHOLD_MULT_ON_SUCCESS,
+    TUNING_PIN_ESCAPE_THRESHOLD_MULT_RECOVER_PER_DAMAGE,
+    MatchEngine,
+    cpu_score_weights,
+)
+from move_graph import NEUTRAL, UNREACHABLE, TransitionGraph, all_nodes, flip
+from move_ids import (
+    MOVE_DEFENSIVE,
+    MOVE_FIGHT_FOR_CONTROL,
+    MOVE_GROGGY_RECOVERY,
+    MOVE_KIP_UP,
+    MOVE_LOCK_UP,
+    MOVE_PIN,
+    MOVE_REST,
+    MOVE_SLOW_STAND_UP,
+    MOVE_TAUNT,
+)
+from moves_db import MOVES
+from wrestler import MAX_HEALTH, Wrestler, WrestlerState
+from wrestler_roster import ROSTER
+
+
+MOVE_TYPES: tuple[str, ...] = ("Setup", "Strike", "Grapple", "Aerial", "Submission", "Pin", "Defensive")
+ATTACK_TYPES = frozenset({"Strike", "Grapple", "Aerial", "Submission", "Pin"})
+# Types whose clash winner can botch from injury (MatchEngine._resolve_clash).
+BOTCH_TYPES = frozenset({"Strike", "Grapple", "Aerial"})
+DOUBLE_DOWN_DAMAGE = 5
+PERFECT_GUARD_DAMAGE = 5
+REST_SCORE = -999
+PARTS: tuple[str, ...] = ("HEAD", "BODY", "LEGS")
+GRAY = COLORS.index("GRAY")
+
+HAND_SIZE = 5
+DECK_SIZE = 50
+
+# Card plays considered by the policy: 5 singles + 10 pairs (second index -1 = single).
+_PLAYS: tuple[tuple[int, int], ...] = tuple((i, -1) for i in range(HAND_SIZE)) + tuple(
+    (i, j) for i in range(HAND_SIZE) for j in range(i + 1, HAND_SIZE)
+)
+
+# ai_traits keys, in MatchEngine._cpu_ai_mode's roll order.
+AI_MODES: tuple[str, ...] = ("GREED", "GOOD", "BAD", "RND")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("batch_engine needs numpy (pip install numpy)")
+
+
+class BatchTables:
+    """Per-move and per-position arrays compiled from MOVES and the move graph."""
+
+    def __init__(self, moves: Mapping[str, Mapping] = MOVES) -> None:
+        _require_numpy()
+        eng = MatchEngine()
+        self.index = eng._legality_index()
+        slugs = self.index.slugs
+        self.slugs = slugs
+        M = len(slugs)
+
+        self.mtype = np.array([MOVE_TYPES.index(str(moves[s].get("type", "Setup"))) for s in slugs], dtype=np.int8)
+        self.damage = np.array([int(moves[s].get("damage", 0)) for s in slugs], dtype=np.int32)
+        self.cost = np.array([int(eng._move_base_cost(s)) for s in slugs], dtype=np.int32)
+        self.clash_mod = np.array([int(moves[s].get("clash_mod", 0)) for s in slugs], dtype=np.int32)
+        self.hype_gain = np.array([int(moves[s].get("hype_gain", 0) or 0) for s in slugs], dtype=np.int32)
+        self.req_mom = np.array([int(moves[s].get("req_momentum_min", 0) or 0) for s in slugs], dtype=np.int32)
+        self.is_tech = np.array([bool(moves[s].get("is_technical", False)) for s in slugs], dtype=bool)
+        self.tech_thr = np.array([max(2, int(moves[s].get("tech_threshold", 11) or 11)) for s in slugs], dtype=np.int32)
+        self.clamp7 = np.array([s == MOVE_GROGGY_RECOVERY for s in slugs], dtype=bool)
+        self.defensive = np.array([s == MOVE_DEFENSIVE for s in slugs], dtype=bool)
+        self.part = np.array(
+            [PARTS.index(p) if (p := str(moves[s].get("target_part", "NONE"))) in PARTS else -1 for s in slugs],
+            dtype=np.int8,
+        )
+        self.is_attack = np.isin(self.mtype, [MOVE_TYPES.index(t) for t in ATTACK_TYPES])
+        self.is_pin = self.mtype == MOVE_TYPES.index("Pin")
+        self.is_sub = self.mtype == MOVE_TYPES.index("Submission")
+        self.can_botch = np.isin(self.mtype, [MOVE_TYPES.index(t) for t in BOTCH_TYPES])
+        self.tick = np.array([int(moves[s].get("tick_damage", SUBMISSION_TICK_DAMAGE)) for s in slugs], dtype=np.int32)
+        self.is_finisher = np.array([bool(moves[s].get("is_finisher")) for s in slugs], dtype=bool)
+        self.needs_type = np.array([bool(moves[s].get("requires_type_card", False)) for s in slugs], dtype=bool)
+        self.defensive_id = int(self.index.index[MOVE_DEFENSIVE])
+        # Attacks that go stale when repeated (MatchEngine._is_stale_applicable_attack).
+        self.stales = np.isin(self.mtype, [MOVE_TYPES.index(t) for t in ("Strike", "Grapple", "Aerial", "Submission")])
+        self.stales &= np.array([s != MOVE_PIN for s in slugs], dtype=bool)
+        self.is_rest = np.array([s == MOVE_REST for s in slugs], dtype=bool)
+        # MatchEngine._resolve_clash's is_simultaneous_nonconflicting.
+        self.nonconflicting = np.array(
+            [
+                s not in (MOVE_DEFENSIVE, MOVE_LOCK_UP, MOVE_FIGHT_FOR_CONTROL)
+                and str(moves[s].get("type", "Setup")) not in ("Pin", "Submission")
+                and (
+                    (str(moves[s].get("type", "Setup")) == "Setup" and int(moves[s].get("damage", 0)) == 0)
+                    or s in (MOVE_TAUNT, MOVE_REST, MOVE_SLOW_STAND_UP, MOVE_KIP_UP)
+                )
+                for s in slugs
+            ],
+            dtype=bool,
+        )
+        self.doubles_boost = np.isin(self.mtype, [MOVE_TYPES.index(t) for t in ("Strike", "Grapple", "Aerial")])
+
+        # color_bonus[move, color] == Card(color=...).color_bonus(move_type)
+        self.color_bonus = np.array(
+            [[Card(1, c, 0).color_bonus(str(moves[s].get("type", "Setup"))) for c in COLORS] for s in slugs],
+            dtype=np.int32,
+        )
+
+        # Moves that score and cost card plays alike share one column in the
+        # policy's [match, group, play] card-score table.
+        sig = [
+            (int(self.mtype[i]), bool(self.is_tech[i]), int(self.tech_thr[i]) if self.is_tech[i] else 0,
+             bool(self.clamp7[i]), int(self.clash_mod[i]), bool(self.defensive[i]), int(self.cost[i]))
+            for i in range(M)
+        ]
+        groups = list(dict.fromkeys(sig))
+        self.card_group = np.array([groups.index(k) for k in sig], dtype=np.int32)
+        self.group_move = np.array([sig.index(k) for k in groups], dtype=np.int32)
+
+        # CPU scoring features [move, term] (cpu_scoring.TERMS); plan progress
+        # and repeat are filled in per beat.
+        self.score_feats = ScoreTable(moves, defensive_move=MOVE_DEFENSIVE, rest_move=MOVE_REST).features(
+            slugs, [1.0] * len(TERM_NAMES)
+        )
+        self.term_col = {name: i for i, name in enumerate(TERM_NAMES)}
+
+        # Positions (acting wrestler's view) and transitions.
+        self.nodes = all_nodes()
+        self.node_id = {n: i for i, n in enumerate(self.nodes)}
+        self.grounded = np.array([n[0] == WrestlerState.GROUNDED.value for n in self.nodes], dtype=bool)
+        K = len(self.nodes)
+        self.neutral = self.node_id[NEUTRAL]
+        self.both_down = self.node_id[("GROUNDED", None, "GROUNDED")]
+        self.flip = np.array([self.node_id[flip(n)] for n in self.nodes], dtype=np.int32)
+        everyone = TransitionGraph(moves, self.index, moveset=None)
+        self.legal = np.zeros((K, M), dtype=bool)
+        self.next_node = np.full((K, M), -1, dtype=np.int32)
+        for k, node in enumerate(self.nodes):
+            mask = everyone.legal[node]
+            for slug, nxt in everyone.edges[node].items():
+                m = self.index.index[slug]
+                self.legal[k, m] = bool(mask >> m & 1)
+                self.next_node[k, m] = self.node_id[nxt]
+        self.graph = everyone
+        self.plays = np.array(_PLAYS, dtype=np.int32)
+
+    def moveset_row(self, moveset: Iterable[str] | None) -> "np.ndarray":
+        mask = self.index.moveset_mask(moveset)
+        return np.array([bool(mask >> i & 1) for i in range(len(self.slugs))], dtype=bool)
+
+    def goal_progress(self, moveset: Iterable[str] | None, finisher: str | None, goal: str) -> "np.ndarray":
+        """[node, move] beats gained toward `goal`, clamped (MatchEngine._cpu_plan_progress_fn).
+
+        "finisher" falls back to the pin spot at nodes the finisher can't be
+        reached from.
+        """
+        g = TransitionGraph(MOVES, self.index, moveset=moveset, finisher=finisher)
+        cap = int(CPU_PLAN_PROGRESS_MAX_BEATS)
+        out = np.zeros(self.legal.shape, dtype=np.float32)
+        for k, node in enumerate(self.nodes):
+            here = goal
+            if here == "finisher" and g.distance_to(node, "finisher") >= UNREACHABLE:
+                here = "pin"
+            for slug, gained in g.progress_map(node, here).items():
+                out[k, self.index.index[slug]] = max(-cap, min(cap, gained))
+        return out
+
+
+# -----------------------------------------------------------------------------
+# Scoring kernels (exact ports; see tools/batch_parity.py)
+# -----------------------------------------------------------------------------
+
+
+def clash_scores(tables: BatchTables, move, v0, c0, v1, c1, n_cards, card_bonus=0) -> "np.ndarray":
+    """Vectorized MatchEngine._calc_clash_score for 0-2 cards.
+
+    move: move indices; v*/c*: card values / color indices (card 1 ignored
+    when n_cards < 2); n_cards: 0, 1 or 2.
+    """
+    move = np.asarray(move)
+    v0 = np.asarray(v0, dtype=np.int32)
+    v1 = np.asarray(v1, dtype=np.int32)
+    c0 = np.asarray(c0)
+    c1 = np.asarray(c1)
+    n_cards = np.asarray(n_cards)
+    two = n_cards >= 2
+
+    tech = tables.is_tech[move]
+    thr = tables.tech_thr[move]
+    clamp = tables.clamp7[move]
+
+    def v(raw):
+        raw = np.where(clamp, np.minimum(7, raw), raw)
+        return np.where(tech, np.maximum(0, thr - raw), raw)
+
+    e0 = v(v0)
+    e1 = v(v1)
+    doubles = two & (v0 == v1)
+    same_color = two & ~doubles & (c0 == c1) & (c0 != GRAY)
+
+    hi = np.maximum(e0, e1)
+    base = np.where(two, e0 + e1, e0)
+    base = np.where(same_color, np.where(tech, hi + 2, np.minimum(10, hi + 2)), base)
+    base = np.where(doubles, e0 + 5, base)
+
+    cb0 = tables.color_bonus[move, c0]
+    cb1 = np.where(two, tables.color_bonus[move, c1], 0)
+    base = base + np.where(doubles | same_color, np.maximum(cb0, cb1), cb0 + cb1)
+
+    base = base + np.asarray(card_bonus, dtype=np.int32) + tables.clash_mod[move]
+    base = np.where(n_cards <= 0, 0, base)
+    return np.where(tables.defensive[move], -1, base).astype(np.int32)
+
+
+def damage_tiers(diff) -> tuple["np.ndarray", "np.ndarray"]:
+    """Vectorized MatchEngine._damage_tier_from_margin -> (multiplier, force_daze)."""
+    d = np.asarray(diff, dtype=np.int32)
+    mult = np.select([d <= 0, d == 1, d <= 3, d <= 7], [1.0, 0.50, 0.75, 1.00], 1.50)
+    return mult, d >= 8
+
+
+def momentum_bonus(adv) -> "np.ndarray":
+    """Signed clash modifier for a momentum advantage (engine tier mapping)."""
+    a = np.asarray(adv, dtype=np.int32)
+    mag = np.abs(a)
+    bonus = np.select(
+        [mag == 0, mag <= int(MOMENTUM_SCORE_TIER1_MAX)],
+        [0, int(MOMENTUM_SCORE_TIER1_BONUS)],
+        int(MOMENTUM_SCORE_TIER2_BONUS),
+    )
+    return np.sign(a) * bonus
+
+
+def escape_threshold(hp_pct) -> "np.ndarray":
+    """Vectorized MatchEngine._escape_threshold."""
+    pct = np.clip(np.asarray(hp_pct, dtype=np.float64), 0.0, 1.0)
+    return np.clip(1 + (25.0 * (1.0 - pct)).astype(np.int32), 1, 26)
+
+
+# -----------------------------------------------------------------------------
+# Batch state
+# -----------------------------------------------------------------------------
+
+
+class BatchMatches:
+    """N matches in lockstep. Seat 0 = player, seat 1 = CPU.
+
+    `pairs` is a list of (player_slug, cpu_slug), one per match.
+    """
+
+    def __init__(self, pairs: list[tuple[str, str]], *, seed: int | None = None, tables: BatchTables | None = None) -> None:
+        _require_numpy()
+        self.t = tables or BatchTables()
+        self.rng = np.random.default_rng(seed)
+        t = self.t
+        N = len(pairs)
+        self.n = N
+
+        # Per-wrestler profile tables (deduplicated by slug).
+        slugs = sorted({s for pair in pairs for s in pair})
+        self.slugs = slugs
+        sid = {s: i for i, s in enumerate(slugs)}
+        W = len(slugs)
+        M = len(t.slugs)
+        weights = cpu_score_weights()
+        self.moveset = np.zeros((W, M), dtype=bool)
+        self.plan_finisher = np.zeros((W,) + t.legal.shape, dtype=np.float32)
+        self.plan_pin = np.zeros((W,) + t.legal.shape, dtype=np.float32)
+        self.weights = np.zeros((W, len(TERM_NAMES)), dtype=np.float64)
+        self.mode_w = np.zeros((W, len(AI_MODES)), dtype=np.float64)
+        self.max_grit = np.zeros(W, dtype=np.int32)
+        arch = []
+        for s in slugs:
+            w = Wrestler("CPU", False, profile=dict(ROSTER.get(s, {}) or {}))
+            self.moveset[sid[s]] = t.moveset_row(w.moveset)
+            self.plan_finisher[sid[s]] = t.goal_progress(w.moveset, w.finisher, "finisher")
+            self.plan_pin[sid[s]] = t.goal_progress(w.moveset, w.finisher, "pin")
+            self.weights[sid[s]] = weight_vector(weights, dict(w.profile.get("ai_weights") or {}))
+            traits = dict(w.ai_traits or {})
+            self.mode_w[sid[s]] = [max(0, int(traits.get(m, 0))) for m in AI_MODES]
+            self.max_grit[sid[s]] = int(w.max_grit)
+            arch.append(str(w.archetype or "BALANCED").upper())
+
+        # Struct-of-arrays match state. Index [match, seat].
+        self.who = np.array([[sid[p], sid[c]] for p, c in pairs], dtype=np.int32).reshape(N, 2)
+        self.hp = np.full((N, 2), int(MAX_HEALTH), dtype=np.int32)
+        self.limbs = np.full((N, 2, len(PARTS)), 100, dtype=np.int32)
+        self.grit = self.max_grit[self.who].copy()
+        self.hype = np.zeros((N, 2), dtype=np.int32)
+        self.pin_mult = np.ones((N, 2), dtype=np.float64)
+        self.momentum = np.zeros(N, dtype=np.int32)  # positive favors seat 0
+        self.node = np.full(N, t.neutral, dtype=np.int32)  # seat 0's view
+        self.done = np.zeros(N, dtype=bool)
+        self.winner = np.full(N, -1, dtype=np.int8)
+        self.kind = np.zeros(N, dtype=np.int8)  # 0 none, 1 pinfall, 2 submission
+        self.beats = np.zeros(N, dtype=np.int32)
+        self.last_move = np.full((N, 2), -1, dtype=np.int32)  # last move landed
+        # Attack attempts in the stale window, oldest first (-1 = empty).
+        self.recent = np.full((N, 2, max(1, int(STALE_WINDOW_ATTACK_MOVES) - 1)), -1, dtype=np.int32)
+
+        # Decks: [match, seat, card] value/color, drawn from a pointer.
+        self.deck_val = np.zeros((N, 2, DECK_SIZE), dtype=np.int32)
+        self.deck_col = np.zeros((N, 2, DECK_SIZE), dtype=np.int32)
+        for seat in (0, 1):
+            for a in set(arch):
+                rows = np.array([arch[w] == a for w in self.who[:, seat]])
+                if rows.any():
+                    v, c = self._build_decks(a, int(rows.sum()))
+                    self.deck_val[rows, seat] = v
+                    self.deck_col[rows, seat] = c
+        self.ptr = np.zeros((N, 2), dtype=np.int32)
+        self.hand_val = np.zeros((N, 2, HAND_SIZE), dtype=np.int32)
+        self.hand_col = np.zeros((N, 2, HAND_SIZE), dtype=np.int32)
+        self.hand_ok = np.zeros((N, 2, HAND_SIZE), dtype=bool)
+        self._draw_to_full(np.ones(N, dtype=bool))
+
+    # --- decks ---
+    def _build_decks(self, archetype: str, k: int) -> tuple["np.ndarray", "np.ndarray"]:
+        # Same recipe as cards.Deck._build.
+        dist = deck_distribution(archetype)
+        gray_chance = DECK_GRAY_CHANCE.get(archetype, DECK_GRAY_CHANCE["BALANCED"])
+        values = np.repeat(np.array(list(dist.keys())), list(dist.values()))[:DECK_SIZE]
+        vals = np.tile(values, (k, 1))
+        pool = np.array([COLORS.index(c) for c in DECK_COLOR_POOL])
+        p = np.array(DECK_COLOR_WEIGHTS, dtype=np.float64)
+        cols = pool[self.rng.choice(len(pool), size=vals.shape, p=p / p.sum())]
+        cols = np.where(self.rng.random(vals.shape) < gray_chance, GRAY, cols)
+        perm = self.rng.permuted(np.tile(np.arange(DECK_SIZE), (k, 1)), axis=1)
+        return np.take_along_axis(vals, perm, 1), np.take_along_axis(cols, perm, 1)
+
+    def _draw_to_full(self, rows) -> None:
+        for seat in (0, 1):
+            for slot in range(HAND_SIZE):
+                need = rows & ~self.hand_ok[:, seat, slot]
+                if not need.any():
+                    continue
+                empty = need & (self.ptr[:, seat] >= DECK_SIZE)
+                if empty.any():
+                    idx = np.flatnonzero(empty)
+                    perm = self.rng.permuted(np.tile(np.arange(DECK_SIZE), (len(idx), 1)), axis=1)
+                    self.deck_val[idx, seat] = np.take_along_axis(self.deck_val[idx, seat], perm, 1)
+                    self.deck_col[idx, seat] = np.take_along_axis(self.deck_col[idx, seat], perm, 1)
+                    self.ptr[idx, seat] = 0
+                idx = np.flatnonzero(need)
+                p = self.ptr[idx, seat]
+                self.hand_val[idx, seat, slot] = self.deck_val[idx, seat, p]
+                self.hand_col[idx, seat, slot] = self.deck_col[idx, seat, p]
+                self.hand_ok[idx, seat, slot] = True
+                self.ptr[idx, seat] = p + 1
+
+    # --- policy ---
+    def _seat_view(self, seat: int) -> "np.ndarray":
+        return self.node if seat == 0 else self.t.flip[self.node]
+
+    def _score_context(self, seat: int, r) -> "np.ndarray":
+        """[match, term] context gates (MatchEngine._cpu_score_context) for `seat` in matches `r`."""
+        t = self.t
+        own = self.hp[r, seat] / float(MAX_HEALTH)
+        opp = self.hp[r, 1 - seat] / float(MAX_HEALTH)
+        grounded = t.grounded[self._seat_view(seat)[r]]
+        low_grit = self.grit[r, seat] <= 1
+        gates = {
+            "always": np.ones(len(r), dtype=bool),
+            "opp_hp_70": opp >= CPU_SCORE_OPP_FRESH_HP_PCT,
+            "opp_hp_50": (opp >= CPU_SCORE_OPP_HALF_HP_PCT) & (opp < CPU_SCORE_OPP_FRESH_HP_PCT),
+            "opp_hp_35": (opp >= CPU_SCORE_OPP_WORN_HP_PCT) & (opp < CPU_SCORE_OPP_HALF_HP_PCT),
+            "opp_hp_20": (opp >= CPU_SCORE_OPP_LOW_HP_PCT) & (opp < CPU_SCORE_OPP_WORN_HP_PCT),
+            "opp_hp_low": opp < CPU_SCORE_OPP_LOW_HP_PCT,
+            "opp_hp_25": opp <= CPU_SCORE_OPP_SUB_HP_PCT,
+            "last_was_defensive": self.last_move[r, seat] == t.defensive_id,
+            "emergency": (own <= float(CPU_DEFENSIVE_EMERGENCY_HP_PCT)) | low_grit,
+            "wants_up": grounded & (own >= float(CPU_GETUP_HEALTHY_PCT)),
+            "grounded_hurt": grounded & ((own <= float(CPU_REST_HURT_PCT)) | low_grit),
+            "low_hp": own < CPU_SCORE_LOW_HP_PCT,
+        }
+        none = np.zeros(len(r), dtype=bool)
+        return np.stack([gates.get(g, none) for _t, _f, g in TERMS], axis=1).astype(np.float64)
+
+    def _choose(self, seat: int, live) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """(move, play index, clash score) per match, as MatchEngine._cpu_choose_action.
+
+        Only `live` matches are scored; the rest get Rest with no cards.
+        """
+        t = self.t
+        r = np.flatnonzero(live)
+        N = len(r)
+        rows = np.arange(N)
+        who = self.who[r, seat]
+        view = self._seat_view(seat)[r]
+        adv = (self.momentum if seat == 0 else -self.momentum)[r]
+        grit = self.grit[r, seat]
+
+        legal = t.legal[view] & self.moveset[who]
+        legal &= t.cost[None, :] <= grit[:, None]
+        legal &= t.req_mom[None, :] <= np.maximum(adv, 0)[:, None]
+
+        # Card plays: [match, play] cards and costs, then [match, move, play] scores.
+        i0 = t.plays[:, 0]
+        i1 = t.plays[:, 1]
+        two = i1 >= 0
+        hv = self.hand_val[r, seat]
+        hc = self.hand_col[r, seat]
+        ok = self.hand_ok[r, seat]
+        v0 = hv[:, i0]
+        c0 = hc[:, i0]
+        v1 = np.where(two[None, :], hv[:, np.maximum(i1, 0)], 0)
+        c1 = np.where(two[None, :], hc[:, np.maximum(i1, 0)], GRAY)
+        valid = ok[:, i0] & np.where(two[None, :], ok[:, np.maximum(i1, 0)], True)
+        doubles = two[None, :] & (v0 == v1)
+        pair_ok = doubles | ((c0 == c1) & (c0 != GRAY))
+        valid &= np.where(two[None, :], pair_ok, True)
+        card_cost = (v0 > 5).astype(np.int32) + np.where(two[None, :], (v1 > 5).astype(np.int32), 0)
+        M = len(t.slugs)
+        gm = t.group_move
+        score = clash_scores(
+            t,
+            gm[None, :, None],
+            v0[:, None, :],
+            c0[:, None, :],
+            v1[:, None, :],
+            c1[:, None, :],
+            np.where(two, 2, 1)[None, None, :],
+        )
+        fits = valid[:, None, :] & ((t.cost[gm][None, :, None] + card_cost[:, None, :]) <= grit[:, None, None])
+
+        # The engine's filters, each kept only if something survives it:
+        # finishers need doubles in hand, typed moves a card of their type.
+        def narrow(mask):
+            return np.where(mask.any(axis=1)[:, None], mask, legal)
+
+        legal = narrow(legal & ~(t.is_finisher[None, :] & ~(valid & doubles).any(axis=1)[:, None]))
+        typed = (t.color_bonus[:, hc] > 0) & ok[None, :, :]  # [move, match, card]
+        legal = narrow(legal & (~t.needs_type[None, :] | typed.any(axis=2).T))
+
+        # Joint value: CPU move value (cpu_scoring terms) + best card play.
+        cw = self._score_context(seat, r) * self.weights[who]
+        value = cw @ t.score_feats.T
+        opp_pct = self.hp[r, 1 - seat] / float(MAX_HEALTH)
+        plan = np.where((opp_pct < float(CPU_PLAN_PIN_HP_PCT))[:, None], self.plan_pin[who, view], self.plan_finisher[who, view])
+        value += plan * cw[:, t.term_col["plan_progress"]][:, None]
+        repeat = np.arange(M)[None, :] == self.last_move[r, seat][:, None]
+        value += repeat * cw[:, t.term_col["repeat"]][:, None]
+        value += self._stale(seat, r) * cw[:, t.term_col["stale"]][:, None]
+        value += self.rng.integers(0, 5, size=(N, M))
+        best = np.where(fits, score, np.iinfo(np.int32).min).max(axis=2)[:, t.card_group]
+        rest = int(t.index.index[MOVE_REST])
+        best[:, rest] = 0
+        cand = legal & (fits.any(axis=2)[:, t.card_group] | (np.arange(M) == rest)[None, :])
+        value = np.where(cand, value + best, -np.inf)
+
+        # Mode roll (ai_traits), then a pick from the ranked options.
+        mode = self._roll_mode(who)
+        order = np.argsort(-value, axis=1, kind="stable")
+        k = cand.sum(axis=1)
+        rank = self._pick_rank(mode, k)
+        move = np.where(k > 0, order[rows, np.minimum(rank, M - 1)], rest)
+
+        # Cards for the chosen move, ranked by clash score the same way.
+        g = t.card_group[move]
+        sc_all = np.where(fits[rows, g], score[rows, g].astype(np.float64), -np.inf)
+        porder = np.argsort(-sc_all, axis=1, kind="stable")
+        pk = fits[rows, g].sum(axis=1)
+        play = porder[rows, np.minimum(self._pick_rank(mode, pk), len(t.plays) - 1)]
+        has_play = pk > 0
+        # Rest, or nothing affordable: no cards, score 0.
+        move = np.where(has_play | (move == rest), move, rest)
+        play = np.where(has_play & (move != rest), play, -1)
+        sc = np.where(play >= 0, score[rows, t.card_group[move], np.maximum(play, 0)], 0)
+        sc = np.where(t.defensive[move], -1, sc)
+        out_move = np.full(self.n, rest, dtype=move.dtype)
+        out_play = np.full(self.n, -1, dtype=play.dtype)
+        out_sc = np.zeros(self.n, dtype=np.int32)
+        out_move[r] = move
+        out_play[r] = play
+        out_sc[r] = sc
+        return out_move, out_play, out_sc
+
+    def _stale(self, seat: int, r) -> "np.ndarray":
+        """[match, move] True where the move would be stale for `seat` (MatchEngine._would_be_stale)."""
+        t = self.t
+        seen = (self.recent[r, seat][:, :, None] == np.arange(len(t.slugs))[None, None, :]).sum(axis=1)
+        return t.stales[None, :] & (seen >= max(2, int(STALE_REPEAT_THRESHOLD)) - 1)
+
+    def _record_attempt(self, seat: int, move, live) -> None:
+        """Push attack attempts into the stale window."""
+        rows = live & self.t.stales[move]
+        if rows.any():
+            self.recent[rows, seat] = np.concatenate([self.recent[rows, seat, 1:], move[rows, None]], axis=1)
+
+    def _roll_mode(self, who) -> "np.ndarray":
+        """Index into AI_MODES per match, weighted by ai_traits (RND if none)."""
+        w = self.mode_w[who]
+        total = w.sum(axis=1)
+        cum = np.cumsum(w, axis=1)
+        roll = self.rng.random(len(who)) * np.maximum(total, 1.0)
+        mode = (roll[:, None] >= cum).sum(axis=1)
+        return np.where(total > 0, np.minimum(mode, len(AI_MODES) - 1), AI_MODES.index("RND"))
+
+    def _pick_rank(self, mode, k) -> "np.ndarray":
+        """Rank picked from k ranked options: GREED best, GOOD top 3, BAD bottom 3, RND top N."""
+        k = np.maximum(k, 1)
+        u = self.rng.random(len(k))
+        top3 = (u * np.minimum(3, k)).astype(np.int64)
+        top_n = (u * np.minimum(max(1, int(CPU_RND_PICK_FROM_TOP_N)), k)).astype(np.int64)
+        return np.select(
+            [mode == AI_MODES.index("GREED"), mode == AI_MODES.index("GOOD"), mode == AI_MODES.index("BAD")],
+            [np.zeros_like(k), top3, k - 1 - top3],
+            top_n,
+        )
+
+    # --- beat ---
+    def _spend(self, seat: int, move, play, active) -> None:
+        """Move + card grit costs, card regen, passive regen on a 0-grit beat, discard."""
+        t = self.t
+        rows = np.flatnonzero(active)
+        p = play[rows]
+        has = p >= 0
+        pp = np.maximum(p, 0)
+        i0 = t.plays[pp, 0]
+        i1 = t.plays[pp, 1]
+        two = has & (i1 >= 0)
+        v0 = np.where(has, self.hand_val[rows, seat, i0], 0)
+        v1 = np.where(two, self.hand_val[rows, seat, np.maximum(i1, 0)], 0)
+        cost = t.cost[move[rows]] + (has & (v0 > 5)) + (two & (v1 > 5))
+        regen = (has & (v0 <= 5)).astype(np.int32) + (two & (v1 <= 5))
+        if bool(TUNING_ENABLE_PASSIVE_REGEN):
+            regen = regen + np.where(cost == 0, int(TUNING_GRIT_PASSIVE_REGEN), 0)
+        cap = self.max_grit[self.who[rows, seat]]
+        self.grit[rows, seat] = np.clip(self.grit[rows, seat] - cost + regen, 0, cap)
+        self.hand_ok[rows[has], seat, i0[has]] = False
+        self.hand_ok[rows[two], seat, i1[two]] = False
+
+    def _boosted(self, move, doubles) -> "np.ndarray":
+        """Raw move damage with the doubles boost (Strike/Grapple/Aerial)."""
+        t = self.t
+        dmg = t.damage[move].astype(np.float64)
+        return np.where(doubles & t.doubles_boost[move] & (dmg > 0), np.ceil(dmg * float(DOUBLES_DAMAGE_MODIFIER)), dmg)
+
+    def _land(self, seat: int, move, doubles, mult, rows, *, softened=None, held=None) -> None:
+        """Winner `seat` lands `move` in matches `rows`.
+
+        softened: damage that got past a Defensive (replaces the margin
+        tier) where >= 0; held: no position change in those matches.
+        """
+        t = self.t
+        if not rows.any():
+            return
+        d = 1 - seat
+        m = move
+        dmg = self._boosted(m, doubles)
+        dmg = np.where(dmg > 0, np.ceil(dmg * mult), 0).astype(np.int32)
+        if softened is not None:
+            dmg = np.where(softened >= 0, softened, dmg)
+        escape = rows & (t.is_pin[m] | t.is_sub[m])
+        hit = rows & ~escape
+        self.hp[hit, d] = np.maximum(0, self.hp[hit, d] - dmg[hit])
+        # Damage restores pin viability (MatchEngine._recover_pin_escape_mult_from_damage).
+        missing = 1.0 - self.hp[:, d] / float(MAX_HEALTH)
+        inc = dmg * float(TUNING_PIN_ESCAPE_THRESHOLD_MULT_RECOVER_PER_DAMAGE) * (0.75 + 0.75 * missing)
+        self.pin_mult[:, d] = np.where(hit, np.minimum(1.0, self.pin_mult[:, d] + inc), self.pin_mult[:, d])
+        part = t.part[m]
+        for p in range(len(PARTS)):
+            r = hit & (part == p) & (dmg > 0)
+            self.limbs[r, d, p] = np.maximum(0, self.limbs[r, d, p] - np.round(dmg[r] * 2.0).astype(np.int32))
+        self.hype[rows, seat] = np.minimum(100, self.hype[rows, seat] + t.hype_gain[m][rows])
+        self.last_move[rows, seat] = m[rows]
+
+        # Position change, from the winner's view.
+        view = self._seat_view(seat)
+        nxt = t.next_node[view, m]
+        moved = hit & (nxt >= 0)
+        if held is not None:
+            moved &= ~held
+        new_view = np.where(moved, nxt, view)
+        self.node = np.where(moved, new_view if seat == 0 else t.flip[np.maximum(new_view, 0)], self.node)
+
+        # Momentum for winning with an attack.
+        delta = int(MOMENTUM_WIN_DELTA) if seat == 0 else -int(MOMENTUM_WIN_DELTA)
+        gain = rows & t.is_attack[m]
+        self.momentum = np.where(gain, np.clip(self.momentum + delta, -int(MOMENTUM_MAX_ABS), int(MOMENTUM_MAX_ABS)), self.momentum)
+
+        if escape.any():
+            self._escape(seat, m, escape)
+
+    def _escape(self, seat: int, move, rows) -> None:
+        """Defender discards its highest card until the total reaches the threshold (3 plays)."""
+        t = self.t
+        d = 1 - seat
+        # _begin_escape only redraws a hand that can't make three plays.
+        short = rows & (self.hand_ok[:, d].sum(axis=1) < 3)
+        self._draw_to_full(short)
+        thr = escape_threshold(self.hp[:, d] / float(MAX_HEALTH))
+        pin = t.is_pin[move]
+        thr = np.where(pin, np.ceil(thr * np.clip(self.pin_mult[:, d], 0.0, 1.0)), thr).astype(np.int32)
+        vals = np.where(self.hand_ok[:, d], self.hand_val[:, d], 0)
+        order = np.argsort(-vals, axis=1, kind="stable")[:, :3]
+        total = np.cumsum(np.take_along_axis(vals, order, 1), axis=1)
+        reached = total >= thr[:, None]
+        ok = rows & reached[:, 2]
+        fail = rows & ~ok
+        self.done |= fail
+        self.winner = np.where(fail, seat, self.winner).astype(np.int8)
+        self.kind = np.where(fail, np.where(pin, 1, 2), self.kind).astype(np.int8)
+        # Kickout after `plays` cards: only those are spent.
+        plays = np.argmax(reached, axis=1) + 1
+        r = np.flatnonzero(ok)
+        for j in range(3):
+            used = r[plays[r] > j]
+            self.hand_ok[used, d, order[used, j]] = False
+        # Each submission play that didn't escape cranks the hold (BODY).
+        ticks = np.where(ok & t.is_sub[move], plays - 1, 0)
+        tick = t.tick[move]
+        for j in range(2):
+            hit = ticks > j
+            self.hp[hit, d] = np.maximum(0, self.hp[hit, d] - tick[hit])
+            body = PARTS.index("BODY")
+            self.limbs[hit, d, body] = np.maximum(0, self.limbs[hit, d, body] - np.round(tick[hit] * 2.0).astype(np.int32))
+        self.node = np.where(ok, t.neutral, self.node)
+        self.pin_mult[:, d] = np.where(ok & pin, self.pin_mult[:, d] * float(TUNING_PIN_ESCAPE_THRESHOLD_MULT_ON_SUCCESS), self.pin_mult[:, d])
+        self._draw_to_full(ok)
+
+    def _guard(self, seat: int, rows, move, score, doubles, pool) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Winner `seat` against a Defensive card pool (MatchEngine._resolve_clash).
+
+        Within 2 of the pool is a perfect guard (the winner takes the
+        counter, nothing lands); at clash score 10 or less a pool that covers
+        it slips the attack; otherwise the pool (halved above 10) comes off
+        the damage. Returns (lands, softened damage or -1, held in place).
+        """
+        d = 1 - seat
+        margin = score - pool
+        perfect = rows & (margin >= 0) & (margin <= 2)
+        small = score <= 10
+        slip = rows & ~perfect & small & (pool >= score)
+        lands = rows & ~perfect & ~slip
+        if perfect.any():
+            body = PARTS.index("BODY")
+            self.hp[perfect, seat] = np.maximum(0, self.hp[perfect, seat] - PERFECT_GUARD_DAMAGE)
+            self.limbs[perfect, seat, body] = np.maximum(0, self.limbs[perfect, seat, body] - 2 * PERFECT_GUARD_DAMAGE)
+            swing = 2 if d == 0 else -2
+            self.momentum = np.where(perfect, np.clip(self.momentum + swing, -int(MOMENTUM_MAX_ABS), int(MOMENTUM_MAX_ABS)), self.momentum)
+        reduction = np.maximum(0, np.where(small, pool, pool // 2))
+        softened = np.where(lands, np.maximum(0, self._boosted(move, doubles) - reduction), -1).astype(np.int32)
+        held = lands & small & (pool >= np.maximum(1, score - 2))
+        return lands, softened, held
+
+    def _strength(self, seat: int) -> "np.ndarray":
+        """Wrestler.strength_current: undealt deck + hand."""
+        undealt = np.arange(DECK_SIZE)[None, :] >= self.ptr[:, seat][:, None]
+        return (self.deck_val[:, seat] * undealt).sum(axis=1) + (self.hand_val[:, seat] * self.hand_ok[:, seat]).sum(axis=1)
+
+    def _botch(self, seat: int, move, types) -> "np.ndarray":
+        """Injury botch roll: (missing HP / TUNING_BOTCH_DIVISOR)% for moves of `types`."""
+        missing = float(MAX_HEALTH) - self.hp[:, seat]
+        chance = np.clip(missing / max(1.0, float(TUNING_BOTCH_DIVISOR)), 0.0, 100.0)
+        return types[move] & (self.rng.random(self.n) * 100.0 < chance)
+
+    def _winners(self, p_move, c_move, p_score, c_score, contested) -> tuple["np.ndarray", "np.ndarray"]:
+        """Clash winners (player, cpu) as MatchEngine._resolve_clash picks them."""
+        t = self.t
+        tie = contested & (p_score == c_score)
+        p_wins = contested & ~tie & (p_score > c_score)
+        c_wins = contested & ~tie & (p_score < c_score)
+        # An injured clash winner can still botch (ties below are exempt).
+        p_wins &= ~self._botch(0, p_move, t.can_botch)
+        c_wins &= ~self._botch(1, c_move, t.can_botch)
+
+        # Ties: a one-sided botch loses; double botch goes to the healthier side.
+        pb = tie & self._botch(0, p_move, t.is_attack)
+        cb = tie & self._botch(1, c_move, t.is_attack)
+        coin = self.rng.random(self.n) < 0.5
+        healthier = np.where(self.hp[:, 0] == self.hp[:, 1], coin, self.hp[:, 0] > self.hp[:, 1])
+        p_wins |= (cb & ~pb) | (pb & cb & healthier)
+        c_wins |= (pb & ~cb) | (pb & cb & ~healthier)
+        # No botch: Strength, then a double-down or a coin toss.
+        clean = tie & ~pb & ~cb
+        p_str = self._strength(0)
+        c_str = self._strength(1)
+        p_wins |= clean & (p_str > c_str)
+        c_wins |= clean & (p_str < c_str)
+        even = clean & (p_str == c_str)
+        crash = even & (self.rng.random(self.n) < float(TUNING_DOUBLE_DOWN_ON_TRUE_TIE_CHANCE))
+        coin = self.rng.random(self.n) < 0.5
+        p_wins |= even & ~crash & coin
+        c_wins |= even & ~crash & ~coin
+        if crash.any():
+            self.hp[crash] = np.maximum(0, self.hp[crash] - DOUBLE_DOWN_DAMAGE)
+            self.node = np.where(crash, t.both_down, self.node)
+        return p_wins, c_wins
+
+    def step(self) -> None:
+        """Advance every live match by one beat."""
+        t = self.t
+        live = ~self.done
+        if not live.any():
+            return
+        self._draw_to_full(live)
+        p_move, p_play, p_score = self._choose(0, live)
+        c_move, c_play, c_score = self._choose(1, live)
+        p_score = p_score + momentum_bonus(self.momentum)
+        c_score = c_score + momentum_bonus(-self.momentum)
+
+        def cards_of(seat, play):
+            """(summed card values, doubles) of each match's play."""
+            p = np.maximum(play, 0)
+            i0 = t.plays[p, 0]
+            i1 = t.plays[p, 1]
+            rows = np.arange(self.n)
+            has = play >= 0
+            two = has & (i1 >= 0)
+            v0 = np.where(has, self.hand_val[rows, seat, i0], 0)
+            v1 = np.where(two, self.hand_val[rows, seat, np.maximum(i1, 0)], 0)
+            return v0 + v1, two & (v0 == v1)
+
+        p_sum, p_dbl = cards_of(0, p_play)
+        c_sum, c_dbl = cards_of(1, c_play)
+        rows = np.arange(self.n)
+        p_score = p_score - np.where(live & self._stale(0, rows)[rows, p_move], int(STALE_CLASH_SCORE_PENALTY), 0)
+        c_score = c_score - np.where(live & self._stale(1, rows)[rows, c_move], int(STALE_CLASH_SCORE_PENALTY), 0)
+        self._record_attempt(0, p_move, live)
+        self._record_attempt(1, c_move, live)
+        # Rest always loses to an attack.
+        p_score = np.where(t.is_rest[p_move] & t.is_attack[c_move], REST_SCORE, p_score)
+        c_score = np.where(t.is_rest[c_move] & t.is_attack[p_move], REST_SCORE, c_score)
+        self._spend(0, p_move, p_play, live)
+        self._spend(1, c_move, c_play, live)
+
+        # Non-conflicting actions (or Defensive against one) all resolve,
+        # player first; two Defensives cancel out; anything else clashes.
+        nc = t.nonconflicting
+        simultaneous = live & ((nc[p_move] & nc[c_move]) | (t.defensive[p_move] & nc[c_move]) | (t.defensive[c_move] & nc[p_move]))
+        contested = live & ~simultaneous & ~(t.defensive[p_move] & t.defensive[c_move])
+        p_wins, c_wins = self._winners(p_move, c_move, p_score, c_score, contested)
+
+        # Margin tier, with the loser's score floored at 0 (Rest, Defensive).
+        p_pos = np.maximum(0, p_score)
+        c_pos = np.maximum(0, c_score)
+        mult, _daze = damage_tiers(np.maximum(0, np.where(p_wins, p_pos - c_pos, c_pos - p_pos)))
+
+        # A win against Defensive goes through the guard instead.
+        p_guarded = p_wins & t.defensive[c_move]
+        c_guarded = c_wins & t.defensive[p_move]
+        p_go, p_soft, p_held = self._guard(0, p_guarded, p_move, p_score, p_dbl, c_sum + np.where(c_dbl, 5, 0))
+        c_go, c_soft, c_held = self._guard(1, c_guarded, c_move, c_score, c_dbl, p_sum + np.where(p_dbl, 5, 0))
+        self._land(0, p_move, p_dbl, mult, (p_wins & ~p_guarded) | p_go | simultaneous, softened=p_soft, held=p_held)
+        self._land(1, c_move, c_dbl, mult, ((c_wins & ~c_guarded) | c_go | simultaneous) & ~self.done, softened=c_soft, held=c_held)
+
+        self.beats[live] += 1
+
+    def run(self, *, max_beats: int = HEADLESS_MAX_BEATS) -> "BatchMatches":
+        for _ in range(int(max_beats)):
+            if self.done.all():
+                break
+            self.step()
+        return self
+
+    # --- results ---
+    def summary(self) -> dict:
+        done = self.done
+        return {
+            "matches": int(self.n),
+            "finished": int(done.sum()),
+            "player_wins": int((self.winner == 0).sum()),
+            "cpu_wins": int((self.winner == 1).sum()),
+            "pinfalls": int((self.kind == 1).sum()),
+            "submissions": int((self.kind == 2).sum()),
+            "mean_beats": float(self.beats[done].mean()) if done.any() else 0.0,
+        }
+
+
+def simulate_batch(
+    pairs: list[tuple[str, str]],
+    *,
+    seed: int | None = None,
+    max_beats: int = HEADLESS_MAX_BEATS,
+    tables: BatchTables | None = None,
+) -> BatchMatches:
+    """Run all `pairs` (player_slug, cpu_slug) to completion in lockstep."""
+    return BatchMatches(pairs, seed=seed, tables=tables).run(max_beats=max_beats)
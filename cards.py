@@ -3,6 +3,8 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass, field
 
+import rng
+
 # Card Colors / Suits
 # GRAY: Neutral (no bonus)
 # RED: Strike
@@ -54,6 +56,23 @@ class Card:
         return 1 if mapping.get(move_type) == self.color else 0
 
 
+# Value distribution per archetype (50 cards total; anything else is BALANCED).
+DECK_DISTRIBUTIONS: dict[str, dict[int, int]] = {
+    "JOBBER": {1: 8, 2: 8, 3: 8, 4: 6, 5: 6, 6: 5, 7: 4, 8: 2, 9: 2, 10: 1},
+    "SUPERSTAR": {1: 3, 2: 3, 3: 4, 4: 5, 5: 6, 6: 6, 7: 6, 8: 6, 9: 6, 10: 5},
+    "BALANCED": {1: 5, 2: 5, 3: 5, 4: 5, 5: 5, 6: 5, 7: 5, 8: 5, 9: 5, 10: 5},
+}
+DECK_GRAY_CHANCE: dict[str, float] = {"JOBBER": 0.55, "SUPERSTAR": 0.20, "BALANCED": 0.40}
+
+# Colors of non-GRAY cards; wild (YELLOW) is rarer than the main type colors.
+DECK_COLOR_POOL: tuple[str, ...] = ("RED", "BLUE", "GREEN", "YELLOW")
+DECK_COLOR_WEIGHTS: tuple[int, ...] = (40, 40, 40, 8)
+
+
+def deck_distribution(archetype: str) -> dict[int, int]:
+    return DECK_DISTRIBUTIONS.get(str(archetype), DECK_DISTRIBUTIONS["BALANCED"])
+
+
 class Deck:
     def __init__(self, archetype: str = "BALANCED"):
         self.cards: list[Card] = []
@@ -64,41 +83,30 @@ class Deck:
         self.shuffle()
 
     def _build(self, archetype: str) -> None:
-        # Value distribution (50 cards total)
-        if archetype == "JOBBER":
-            dist = {1: 8, 2: 8, 3: 8, 4: 6, 5: 6, 6: 5, 7: 4, 8: 2, 9: 2, 10: 1}
-            gray_chance = 0.55
-        elif archetype == "SUPERSTAR":
-            dist = {1: 3, 2: 3, 3: 4, 4: 5, 5: 6, 6: 6, 7: 6, 8: 6, 9: 6, 10: 5}
-            gray_chance = 0.20
-        else:  # BALANCED
-            dist = {1: 5, 2: 5, 3: 5, 4: 5, 5: 5, 6: 5, 7: 5, 8: 5, 9: 5, 10: 5}
-            gray_chance = 0.40
+        dist = deck_distribution(archetype)
+        gray_chance = DECK_GRAY_CHANCE.get(archetype, DECK_GRAY_CHANCE["BALANCED"])
 
         cards: list[Card] = []
         for val, count in dist.items():
             for _ in range(count):
-                if random.random() < gray_chance:
+                if rng.deck.random() < gray_chance:
                     color = "GRAY"
                 else:
-                    # Make wild (YELLOW) rarer than the main type colors.
-                    pool = ["RED", "BLUE", "GREEN", "YELLOW"]
-                    weights = [40, 40, 40, 8]
-                    color = random.choices(pool, weights=weights, k=1)[0]
+                    color = rng.deck.choices(DECK_COLOR_POOL, weights=DECK_COLOR_WEIGHTS, k=1)[0]
                 cards.append(Card(value=int(val), color=color))
 
         # Ensure exactly 50 cards.
         while len(cards) > 50:
             cards.pop()
         while len(cards) < 50:
-            cards.append(Card(value=random.randint(1, 5), color="GRAY"))
+            cards.append(Card(value=rng.deck.randint(1, 5), color="GRAY"))
 
         self.cards = cards
 
     def shuffle(self) -> None:
         self.cards.extend(self.discards)
         self.discards.clear()
-        random.shuffle(self.cards)
+        rng.deck.shuffle(self.cards)
 
     def draw(self, amount: int = 1) -> list[Card]:
         drawn: list[Card] = []
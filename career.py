@@ -0,0 +1,385 @@
+"""Career mode: weekly cards, background simulation and a SQLite save.
+
+Every week the roster is paired into a card. The player's match is played
+live in the app; every other match is simulated headless (engine.simulate_match)
+in a process pool while the player is still in the ring. When the week is
+complete the results are written in one transaction: match rows, Elo ratings
+and limb damage, which carries over into later weeks (up to a cap per match)
+and heals by a share of what is missing each week.
+
+The store and the simulator are UI-free; the Kivy app delivers pool results
+back to the main thread itself. Where worker processes can't run (or a
+worker dies), play_card_match plays a card match in-process from the same
+seed and limbs instead. tools/career_sim.py plays whole seasons headless.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+import random
+import sqlite3
+import time
+
+from engine import HEADLESS_MAX_BEATS, simulate_match
+from history import HistoryWriter, MatchRecord
+
+
+# =============================================================================
+# 🎛️ CAREER TUNING
+# =============================================================================
+CAREER_DB_FILENAME = "career.sqlite3"
+CAREER_START_RATING = 1500.0
+CAREER_ELO_K = 32.0
+# Share of a limb's missing HP healed per week since a wrestler's last match
+# (limbs are 0..100).
+CAREER_LIMB_RECOVERY_SHARE = 0.5
+# Most limb HP one match takes off for the weeks after it. With a match every
+# week a limb settles no lower than 60 going into the next one.
+CAREER_LIMB_CARRY_MAX_DAMAGE = 40
+LIMB_PARTS = ("HEAD", "BODY", "LEGS")
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS career (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    player_slug TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS wrestlers (
+    slug TEXT PRIMARY KEY,
+    rating REAL NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    head INTEGER NOT NULL DEFAULT 100,
+    body INTEGER NOT NULL DEFAULT 100,
+    legs INTEGER NOT NULL DEFAULT 100,
+    last_week INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    week INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    red_slug TEXT NOT NULL,
+    blue_slug TEXT NOT NULL,
+    winner_slug TEXT,
+    kind TEXT,
+    beats INTEGER NOT NULL,
+    live INTEGER NOT NULL DEFAULT 0,
+    seed INTEGER NOT NULL,
+    UNIQUE (week, slot)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_red ON matches (red_slug, week);
+CREATE INDEX IF NOT EXISTS idx_matches_blue ON matches (blue_slug, week);
+CREATE INDEX IF NOT EXISTS idx_matches_winner ON matches (winner_slug);
+CREATE INDEX IF NOT EXISTS idx_wrestlers_rating ON wrestlers (rating DESC);
+"""
+
+
+@dataclass(frozen=True)
+class CardMatch:
+    """One match on a weekly card. Red is the player seat."""
+
+    week: int
+    slot: int
+    red: str
+    blue: str
+    seed: int
+    live: bool = False
+
+
+def elo_update(ra: float, rb: float, score_a: float, k: float = CAREER_ELO_K) -> tuple[float, float]:
+    """New (ra, rb) after A scores `score_a` (1 win, 0.5 draw, 0 loss) against B."""
+    expected = 1.0 / (1.0 + 10.0 ** ((float(rb) - float(ra)) / 400.0))
+    delta = float(k) * (float(score_a) - expected)
+    return float(ra) + delta, float(rb) - delta
+
+
+def match_seed(career_seed: int, week: int, slot: int) -> int:
+    return (int(career_seed) * 1_000_003 + int(week) * 1_009 + int(slot)) & 0x7FFFFFFF
+
+
+class CareerStore:
+    """SQLite-backed career save. Use from one thread (the app's main thread)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.DatabaseError:
+            pass
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    # --- career row ---
+    def _career(self):
+        return self.conn.execute("SELECT player_slug, seed, week FROM career WHERE id = 1").fetchone()
+
+    @property
+    def active(self) -> bool:
+        return self._career() is not None
+
+    @property
+    def player_slug(self) -> str | None:
+        row = self._career()
+        return str(row["player_slug"]) if row else None
+
+    @property
+    def seed(self) -> int:
+        row = self._career()
+        return int(row["seed"]) if row else 0
+
+    @property
+    def week(self) -> int:
+        """The week currently being played (1-based)."""
+        row = self._career()
+        return int(row["week"]) if row else 0
+
+    def new_career(self, player_slug: str, slugs: list[str], *, seed: int | None = None) -> None:
+        """Wipe the save and start week 1 with fresh ratings and limbs."""
+        if seed is None:
+            seed = random.SystemRandom().randrange(1, 2**31)
+        with self.conn:
+            self.conn.execute("DELETE FROM matches")
+            self.conn.execute("DELETE FROM wrestlers")
+            self.conn.execute("DELETE FROM career")
+            self.conn.execute(
+                "INSERT INTO career (id, player_slug, seed, week, created_at) VALUES (1, ?, ?, 1, ?)",
+                (str(player_slug), int(seed), time.time()),
+            )
+            self.conn.executemany(
+                "INSERT INTO wrestlers (slug, rating) VALUES (?, ?)",
+                [(str(s), float(CAREER_START_RATING)) for s in slugs],
+            )
+
+    # --- wrestlers ---
+    def slugs(self) -> list[str]:
+        return [str(r["slug"]) for r in self.conn.execute("SELECT slug FROM wrestlers ORDER BY slug")]
+
+    def standings(self) -> list[dict]:
+        rows = self.conn.execute(
+            "SELECT slug, rating, wins, losses, draws, head, body, legs, last_week FROM wrestlers ORDER BY rating DESC"
+        )
+        return [dict(r) for r in rows]
+
+    def limbs_for(self, slug: str, week: int | None = None) -> dict[str, int]:
+        """Carried-over limb HP for `slug` going into `week`, after weekly healing."""
+        row = self.conn.execute("SELECT head, body, legs, last_week FROM wrestlers WHERE slug = ?", (str(slug),)).fetchone()
+        if row is None:
+            return {p: 100 for p in LIMB_PARTS}
+        week = self.week if week is None else int(week)
+        weeks_off = max(0, int(week) - int(row["last_week"]))
+        keep = (1.0 - float(CAREER_LIMB_RECOVERY_SHARE)) ** weeks_off
+        vals = (row["head"], row["body"], row["legs"])
+        return {p: 100 - int(round((100 - min(100, int(v))) * keep)) for p, v in zip(LIMB_PARTS, vals)}
+
+    # --- cards ---
+    def card(self, week: int | None = None) -> list[CardMatch]:
+        """Deterministic card for a week: the player's match (slot 0, live) first."""
+        week = self.week if week is None else int(week)
+        player = self.player_slug
+        rng = random.Random(f"{self.seed}:{week}")
+        others = [s for s in self.slugs() if s != player]
+        rng.shuffle(others)
+        out: list[CardMatch] = []
+        if player and others:
+            opp = others.pop(0)
+            out.append(CardMatch(week, 0, player, opp, match_seed(self.seed, week, 0), live=True))
+        for i in range(0, len(others) - 1, 2):
+            slot = len(out)
+            out.append(CardMatch(week, slot, others[i], others[i + 1], match_seed(self.seed, week, slot)))
+        return out
+
+    def results(self, week: int) -> list[dict]:
+        rows = self.conn.execute("SELECT * FROM matches WHERE week = ? ORDER BY slot", (int(week),))
+        return [dict(r) for r in rows]
+
+    def history(self, slug: str, limit: int = 20) -> list[dict]:
+        """Most recent matches for a wrestler (either corner)."""
+        rows = self.conn.execute(
+            "SELECT * FROM matches WHERE red_slug = ? "
+            "UNION ALL SELECT * FROM matches WHERE blue_slug = ? "
+            "ORDER BY week DESC, slot LIMIT ?",
+            (str(slug), str(slug), int(limit)),
+        )
+        return [dict(r) for r in rows]
+
+    # --- results ---
+    def record_week(self, week: int, results: list[dict]) -> None:
+        """Write a completed week in one transaction and advance the career.
+
+        Each result has week/slot/red/blue/seed/live/winner ('red'|'blue'|None),
+        kind, beats, red_limbs and blue_limbs. Ratings update in slot order so
+        the outcome doesn't depend on which simulation finished first.
+        """
+        results = sorted(results, key=lambda r: int(r["slot"]))
+        with self.conn:
+            ratings = {str(r["slug"]): float(r["rating"]) for r in self.conn.execute("SELECT slug, rating FROM wrestlers")}
+            for r in results:
+                red, blue = str(r["red"]), str(r["blue"])
+                winner = r.get("winner")
+                winner_slug = red if winner == "red" else (blue if winner == "blue" else None)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO matches (week, slot, red_slug, blue_slug, winner_slug, kind, beats, live, seed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (int(week), int(r["slot"]), red, blue, winner_slug, r.get("kind"), int(r.get("beats", 0)), int(bool(r.get("live"))), int(r["seed"])),
+                )
+                score = 1.0 if winner == "red" else (0.0 if winner == "blue" else 0.5)
+                ra, rb = elo_update(ratings.get(red, CAREER_START_RATING), ratings.get(blue, CAREER_START_RATING), score)
+                ratings[red], ratings[blue] = ra, rb
+                for slug, limbs, res in ((red, r.get("red_limbs"), score), (blue, r.get("blue_limbs"), 1.0 - score)):
+                    limbs = limbs or {}
+                    before = self.limbs_for(slug, week)
+                    carried = {p: max(int(limbs.get(p, 100)), before[p] - int(CAREER_LIMB_CARRY_MAX_DAMAGE)) for p in LIMB_PARTS}
+                    col = "wins" if res == 1.0 else ("losses" if res == 0.0 else "draws")
+                    self.conn.execute(
+                        f"UPDATE wrestlers SET rating = ?, {col} = {col} + 1, head = ?, body = ?, legs = ?, last_week = ? WHERE slug = ?",
+                        (
+                            ratings[slug],
+                            carried["HEAD"],
+                            carried["BODY"],
+                            carried["LEGS"],
+                            int(week),
+                            slug,
+                        ),
+                    )
+            self.conn.execute("UPDATE career SET week = ? WHERE id = 1 AND week = ?", (int(week) + 1, int(week)))
+
+
+# =============================================================================
+# SIMULATION
+# =============================================================================
+
+
+def _play_card_match(m: CardMatch, red_limbs: dict, blue_limbs: dict, max_beats: int) -> dict:
+    r = simulate_match(
+        m.red,
+        m.blue,
+        seed=m.seed,
+        max_beats=max_beats,
+        player_limbs=red_limbs,
+        cpu_limbs=blue_limbs,
+    )
+    return {
+        "week": m.week,
+        "slot": m.slot,
+        "red": m.red,
+        "blue": m.blue,
+        "seed": m.seed,
+        "live": False,
+        "winner": {"player": "red", "cpu": "blue"}.get(str(r.winner)),
+        "kind": r.kind,
+        "beats": int(r.beats),
+        "red_limbs": dict(r.player_limbs),
+        "blue_limbs": dict(r.cpu_limbs),
+        "clashes": int(r.clashes),
+        "red_hp": int(r.player_hp),
+        "blue_hp": int(r.cpu_hp),
+        "moves": {"red": r.move_usage.get("player", {}), "blue": r.move_usage.get("cpu", {})},
+    }
+
+
+def history_record(res: dict) -> MatchRecord:
+    """Match-history row for a career result (see _play_card_match)."""
+    return MatchRecord(
+        red=str(res["red"]),
+        blue=str(res["blue"]),
+        winner=res.get("winner"),
+        kind=res.get("kind"),
+        beats=int(res.get("beats", 0)),
+        source="career",
+        clashes=int(res.get("clashes", res.get("beats", 0)) or 0),
+        red_hp=res.get("red_hp"),
+        blue_hp=res.get("blue_hp"),
+        seed=res.get("seed"),
+        moves=dict(res.get("moves") or {}),
+    )
+
+
+def play_card_match(store: CareerStore, m: CardMatch, *, max_beats: int = HEADLESS_MAX_BEATS) -> dict:
+    """Simulate one card match in this process (blocking); same result as CareerSimulator.submit.
+
+    simulate_match reseeds the global `random`; its state is put back, so a
+    caller between matches doesn't see its own stream change.
+    """
+    state = random.getstate()
+    try:
+        return _play_card_match(m, store.limbs_for(m.red, m.week), store.limbs_for(m.blue, m.week), int(max_beats))
+    finally:
+        random.setstate(state)
+
+
+class CareerSimulator:
+    """Process pool for a week's CPU-only matches (the engine uses global RNG,
+    so matches can't share a process concurrently)."""
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+
+    def submit(self, store: CareerStore, matches: list[CardMatch], *, max_beats: int = HEADLESS_MAX_BEATS) -> list[Future]:
+        """Start simulating `matches`; limbs are read from the store now, on the caller's thread."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        futs = []
+        for m in matches:
+            futs.append(
+                self._pool.submit(
+                    _play_card_match,
+                    m,
+                    store.limbs_for(m.red, m.week),
+                    store.limbs_for(m.blue, m.week),
+                    int(max_beats),
+                )
+            )
+        return futs
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def simulate_weeks(
+    store: CareerStore,
+    weeks: int,
+    *,
+    workers: int | None = None,
+    history: HistoryWriter | None = None,
+    progress=None,
+) -> None:
+    """Play `weeks` whole weeks headless, the player's match included (blocking).
+
+    With a HistoryWriter every match is also added to the match history.
+    """
+    sim = CareerSimulator(workers)
+    try:
+        for _ in range(int(weeks)):
+            week = store.week
+            card = store.card(week)
+            try:
+                results = [f.result() for f in sim.submit(store, card)]
+            except Exception:
+                # No worker processes here (or the pool broke): play the week in-process.
+                sim.shutdown()
+                results = [play_card_match(store, m) for m in card]
+            store.record_week(week, results)
+            if history is not None:
+                for res in results:
+                    history.add(history_record(res))
+            if progress is not None:
+                progress(week, results)
+    finally:
+        sim.shutdown()
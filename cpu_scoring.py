@@ -0,0 +1,253 @@
+"""Linear CPU move scoring: per-move features x per-beat context x weights.
+
+    score(move) = sum over terms t of  F[move, t] * C[t] * W[t]
+
+- F (ScoreTable): one row per move. Static features (damage, ai_score, is it
+  a Pin, does it stand the user up, ...) are filled once per MOVES; the
+  per-decision ones (plan progress, repeat, stale) are written into the rows
+  being scored.
+- C (context): one vector per decision, mostly 0/1 gates such as "opponent
+  HP is in the 50-70% bracket" or "CPU is grounded and healthy".
+- W (weights): defaults come from the engine's CPU tuning constants; a ROSTER
+  entry may override any term by name under "ai_weights", e.g.
+  {"pin_opp_hp_70": -40, "getup_healthy": 20}.
+
+All legal moves are scored with one matrix-vector product (numpy when it is
+installed, a plain loop otherwise). features() returns F * C, so weights can
+also be fitted from simulated matches against the same term names.
+
+UI-free; the engine passes in its own move ids, like move_index does.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable, Mapping, Sequence
+
+try:
+    import numpy as np
+except Exception:  # optional dependency (falls back to a plain loop)
+    np = None
+
+
+# (term, move feature, context gate). The term name is the weight key.
+TERMS: tuple[tuple[str, str, str], ...] = (
+    ("damage", "damage", "always"),
+    ("ai_score", "ai_score", "always"),
+    ("type_default", "type_default", "always"),
+    # Pin/submission context: avoid early pin spam; ramp up as HP drops.
+    ("pin_opp_hp_70", "pin", "opp_hp_70"),
+    ("pin_opp_hp_50", "pin", "opp_hp_50"),
+    ("pin_opp_hp_35", "pin", "opp_hp_35"),
+    ("pin_opp_hp_20", "pin", "opp_hp_20"),
+    ("pin_opp_hp_low", "pin", "opp_hp_low"),
+    ("pin_opp_hurt", "pin", "opp_hurt"),
+    # Endgame table (endgame.py): pin now, or keep up the offense first.
+    ("pin_endgame", "pin", "endgame_pin"),
+    ("pin_endgame_press", "pin", "endgame_press"),
+    ("sub_opp_fresh", "sub", "opp_hp_70"),
+    ("sub_opp_low", "sub", "opp_hp_25"),
+    # Planning: beats gained toward a finisher/pin-ready spot.
+    ("plan_progress", "plan_progress", "always"),
+    # Anti-turtle: Defensive should be situational, not a default action.
+    ("defensive", "defensive", "always"),
+    ("defensive_cooldown", "defensive", "defensive_cooldown"),
+    ("defensive_repeat", "defensive", "last_was_defensive"),
+    ("defensive_emergency", "defensive", "emergency"),
+    # Grounded realism: stand up when healthy, rest from the mat when hurt.
+    ("getup_healthy", "getup", "wants_up"),
+    ("ground_strike_healthy", "ground_strike", "wants_up"),
+    ("rest_hurt", "rest", "grounded_hurt"),
+    # Anti-spam.
+    ("repeat", "repeat", "always"),
+    ("stale", "stale", "always"),
+    # Low HP: slightly bias toward free actions.
+    ("low_hp_free", "free", "low_hp"),
+)
+
+TERM_NAMES: tuple[str, ...] = tuple(t for t, _f, _g in TERMS)
+_TERM_INDEX: dict[str, int] = {t: i for i, t in enumerate(TERM_NAMES)}
+
+# Features that depend on the decision, not on the move data.
+DYNAMIC_FEATURES: frozenset[str] = frozenset({"plan_progress", "repeat", "stale"})
+
+_N = len(TERMS)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("cpu_scoring needs numpy for this (pip install numpy)")
+
+
+def _type_default(mv: Mapping) -> int:
+    # Smart defaults ONLY when ai_score is missing.
+    if "ai_score" in mv:
+        return 0
+    raw_damage = int(mv.get("damage", 0))
+    mtype = str(mv.get("type", "Setup"))
+    if mtype == "Pin":
+        return 6
+    if mtype == "Submission":
+        return 8
+    if mtype == "Grapple" and raw_damage == 0:
+        return 12
+    if mtype == "Aerial" and raw_damage == 0:
+        return 10
+    if mtype == "Setup":
+        return 5
+    return 0
+
+
+def move_features(slug: str, mv: Mapping, *, defensive_move: str, rest_move: str) -> dict[str, float]:
+    """Static features of one move (the dynamic ones are 0 here)."""
+    mtype = str(mv.get("type", "Setup"))
+    stands_up = str(mv.get("set_user_state", "")) == "STANDING"
+    try:
+        free = int(mv.get("cost", 0)) == 0
+    except Exception:
+        free = False
+    return {
+        "damage": float(int(mv.get("damage", 0))),
+        "ai_score": float(int(mv.get("ai_score", 0))),
+        "type_default": float(_type_default(mv)),
+        "pin": float(mtype == "Pin"),
+        "sub": float(mtype == "Submission"),
+        "defensive": float(str(slug) == defensive_move),
+        "rest": float(str(slug) == rest_move),
+        "getup": float(stands_up),
+        "ground_strike": float(mtype == "Strike" and not stands_up),
+        "free": float(free),
+    }
+
+
+def _row(feats: Mapping[str, float]) -> list[float]:
+    return [float(feats.get(f, 0.0)) for _t, f, _g in TERMS]
+
+
+class ScoreTable:
+    """Per-move feature rows over a moves mapping.
+
+    Read-only once built (safe to share with CPU worker threads); rebuild it
+    when the moves mapping changes.
+    """
+
+    def __init__(self, moves: Mapping[str, Mapping], *, defensive_move: str, rest_move: str) -> None:
+        self._moves = moves
+        self._defensive_move = str(defensive_move)
+        self._rest_move = str(rest_move)
+        self.slugs: tuple[str, ...] = tuple(moves.keys())
+        self.index: dict[str, int] = {s: i for i, s in enumerate(self.slugs)}
+        rows = [
+            _row(move_features(s, moves[s], defensive_move=self._defensive_move, rest_move=self._rest_move))
+            for s in self.slugs
+        ]
+        self._rows = rows
+        self._matrix = np.asarray(rows, dtype=np.float64).reshape(len(rows), _N) if np is not None else None
+        self._dynamic_cols = {f: [i for i, (_t, ff, _g) in enumerate(TERMS) if ff == f] for f in DYNAMIC_FEATURES}
+
+    def _static_row(self, name: str) -> list[float]:
+        i = self.index.get(name)
+        if i is not None:
+            return self._rows[i]
+        mv = self._moves.get(name, {})
+        return _row(move_features(name, mv, defensive_move=self._defensive_move, rest_move=self._rest_move))
+
+    def _dynamic(
+        self,
+        names: Sequence[str],
+        plan_progress: Callable[[str], float] | None,
+        last_move: str,
+        is_stale: Callable[[str], bool] | None,
+    ) -> dict[str, list[float]]:
+        stale = []
+        for n in names:
+            try:
+                stale.append(1.0 if is_stale is not None and is_stale(n) else 0.0)
+            except Exception:
+                stale.append(0.0)
+        return {
+            "plan_progress": [float(plan_progress(n)) for n in names] if plan_progress else [0.0] * len(names),
+            "repeat": [1.0 if n == last_move else 0.0 for n in names],
+            "stale": stale,
+        }
+
+    def _feature_rows(self, names, plan_progress, last_move, is_stale):
+        names = [str(n) for n in names]
+        dyn = self._dynamic(names, plan_progress, str(last_move or ""), is_stale)
+        if np is not None:
+            idx = [self.index.get(n, -1) for n in names]
+            if min(idx, default=0) >= 0:
+                feats = self._matrix[idx]  # fancy indexing copies
+            else:
+                feats = np.asarray([self._static_row(n) for n in names], dtype=np.float64).reshape(len(names), _N)
+            for f, cols in self._dynamic_cols.items():
+                if cols:
+                    feats[:, cols] = np.asarray(dyn[f], dtype=np.float64)[:, None]
+            return feats
+        feats = [list(self._static_row(n)) for n in names]
+        for f, cols in self._dynamic_cols.items():
+            vals = dyn[f]
+            for r, v in enumerate(vals):
+                for c in cols:
+                    feats[r][c] = v
+        return feats
+
+    def features(
+        self,
+        names: Sequence[str],
+        context: Sequence[float],
+        *,
+        plan_progress: Callable[[str], float] | None = None,
+        last_move: str = "",
+        is_stale: Callable[[str], bool] | None = None,
+    ):
+        """F * C as a (len(names), len(TERMS)) numpy array: the regressors for fitting weights."""
+        _require_numpy()
+        feats = self._feature_rows(names, plan_progress, last_move, is_stale)
+        return feats * np.asarray(context, dtype=np.float64)
+
+    def score(
+        self,
+        names: Sequence[str],
+        context: Sequence[float],
+        weights: Sequence[float],
+        *,
+        plan_progress: Callable[[str], float] | None = None,
+        last_move: str = "",
+        is_stale: Callable[[str], bool] | None = None,
+    ) -> list[float]:
+        """Scores for `names` (same order), without noise."""
+        if not names:
+            return []
+        feats = self._feature_rows(names, plan_progress, last_move, is_stale)
+        cw = [float(c) * float(w) for c, w in zip(context, weights)]
+        if np is not None:
+            return (feats @ np.asarray(cw, dtype=np.float64)).tolist()
+        return [sum(f * k for f, k in zip(row, cw) if f) for row in feats]
+
+
+def context_vector(gates: Mapping[str, bool | float]) -> list[float]:
+    """Per-term context values from gate values (missing gates are 0; "always" is 1)."""
+    values = dict(gates)
+    values["always"] = 1.0
+    return [float(values.get(g, 0.0) or 0.0) for _t, _f, g in TERMS]
+
+
+@lru_cache(maxsize=64)
+def _weights(defaults: tuple[tuple[str, float], ...], overrides: tuple[tuple[str, float], ...]) -> tuple[float, ...]:
+    w = dict(defaults)
+    w.update(overrides)
+    return tuple(float(w.get(t, 0.0)) for t in TERM_NAMES)
+
+
+def weight_vector(defaults: Mapping[str, float], overrides: Mapping | None = None) -> tuple[float, ...]:
+    """Weights in TERMS order. Unknown or non-numeric overrides are ignored."""
+    ov = []
+    for k, v in (overrides or {}).items():
+        if str(k) not in _TERM_INDEX:
+            continue
+        try:
+            ov.append((str(k), float(v)))
+        except Exception:
+            continue
+    return _weights(tuple(defaults.items()), tuple(sorted(ov)))
@@ -0,0 +1,382 @@
+"""Endgame tablebase: exact best play for pin / submission finishes.
+
+Late in a match the finish comes down to a handful of numbers: the
+defender's HP, their pin escape multiplier, how many cards they hold and
+which deck those cards come from. Grit and card colors don't enter the
+escape rules (escapes add card values), so they aren't dimensions here.
+Everything is solved offline by tools/build_endgame_table.py and shipped as
+one small binary file; every lookup is index arithmetic.
+
+Two tables:
+
+- escape play (the defender): for (deck, kind, plays left, points still
+  needed, hand) the card to discard next. Best play escapes if any <= 3
+  cards can; then, in a submission, takes the fewest cranks (each play that
+  doesn't escape is a tick of damage); then spends the least card value
+  over what a redraw from that deck is worth, since both sides draw back to
+  full after an escape. There is no redraw during an escape, so this is a
+  plain search over the hand.
+
+- pin or press (the attacker): the chance a pin sticks against an unseen
+  hand of n cards drawn from the defender's deck (exact, hypergeometric),
+  and V(hp, kickouts), the chance of eventually winning by pinfall when the
+  attacker plays it perfectly in this model:
+
+      pin:   the pin sticks, or on a kickout (multiplier x MULT_STEP) the
+             next opening comes with probability `keep`, `press_damage`
+             HP later;
+      press: skip the pin; the next opening comes with probability `keep`,
+             `press_damage` HP later, multiplier unchanged.
+
+  keep and press_damage are generator arguments (their defaults were
+  measured from headless sims: a grounded defender under 50% HP is grounded
+  again later in about 80% of matches, around 6 HP lighter). The small
+  recovery of the multiplier as the defender takes damage is left out.
+
+The threshold rules (escape_threshold, pin_threshold) live here and the
+engine calls them, so the table and the match can't disagree.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import math
+import os
+import struct
+import zlib
+
+from cards import deck_distribution
+
+
+ENDGAME_TABLE_FILENAME = "endgame_table.bin"
+ENDGAME_TABLE_MAGIC = b"WTEG"
+ENDGAME_TABLE_VERSION = 1
+_HEADER = struct.Struct("<4sHI")  # magic, version, crc32(payload)
+
+ARCHETYPES: tuple[str, ...] = ("BALANCED", "JOBBER", "SUPERSTAR")
+KINDS: tuple[str, ...] = ("PINFALL", "SUBMISSION")
+
+ESCAPE_PLAYS = 3
+MAX_THRESHOLD = 26
+CARD_VALUES = 10
+MAX_HAND = 5
+HAND_SIZES: tuple[int, ...] = (3, 4, 5)  # _begin_escape redraws a hand under 3 to full
+FULL_HAND_SIZES: tuple[int, ...] = (4, 5)  # concussed / healthy
+MAX_KICKOUTS = 16  # 0.85 ** 16 ~ 0.07: every threshold is 1 or 2 by then
+
+PRESS_KEEP_DEFAULT = 0.80
+PRESS_DAMAGE_DEFAULT = 6
+
+_U16 = 65535
+
+
+# --- rules -------------------------------------------------------------------------
+
+
+def escape_threshold(victim_hp_pct: float) -> int:
+    """Points needed to escape a pin / submission at this HP%."""
+    pct = max(0.0, min(1.0, float(victim_hp_pct)))
+    v = 1 + int(25.0 * (1.0 - pct))
+    return max(1, min(MAX_THRESHOLD, int(v)))
+
+
+def pin_threshold(threshold: int, mult: float) -> int:
+    """A pin's threshold after the defender's kickout multiplier."""
+    mult = max(0.0, min(1.0, float(mult)))
+    return int(math.ceil(float(threshold) * float(mult)))
+
+
+def kickouts_of(mult: float, step: float) -> int:
+    """Nearest kickout count for a pin multiplier (step ** k ~ mult)."""
+    try:
+        k = round(math.log(max(1e-9, min(1.0, float(mult)))) / math.log(float(step)))
+    except (ValueError, ZeroDivisionError):
+        return 0
+    return max(0, min(MAX_KICKOUTS, int(k)))
+
+
+# --- hands -------------------------------------------------------------------------
+
+
+def _multisets_of(k: int) -> int:
+    return math.comb(CARD_VALUES + k - 1, k)
+
+
+_HAND_OFFSET = [sum(_multisets_of(j) for j in range(k)) for k in range(MAX_HAND + 2)]
+HANDS = _HAND_OFFSET[MAX_HAND + 1]  # 3003 hands of 0..5 cards valued 1..10
+
+
+def hand_rank(values) -> int:
+    """Index of a hand (card values 1..10, any order) among all hands of <= 5 cards.
+
+    Combinatorial number system over the multiset: sorted c1 <= .. <= ck
+    maps to the strictly increasing c_i + i - 1.
+    """
+    vals = sorted(int(v) for v in values)
+    r = _HAND_OFFSET[len(vals)]
+    for i, v in enumerate(vals, 1):
+        r += math.comb(v + i - 2, i)
+    return r
+
+
+def all_hands():
+    """Every hand of 0..5 cards as a sorted tuple, in hand_rank order."""
+    out = []
+    for k in range(MAX_HAND + 1):
+        level = []
+
+        def walk(prefix: tuple[int, ...], lo: int) -> None:
+            if len(prefix) == k:
+                level.append(prefix)
+                return
+            for v in range(lo, CARD_VALUES + 1):
+                walk(prefix + (v,), v)
+
+        walk((), 1)
+        level.sort(key=hand_rank)
+        out.extend(level)
+    return out
+
+
+def _valid_hand(values) -> bool:
+    return len(values) <= MAX_HAND and all(1 <= int(v) <= CARD_VALUES for v in values)
+
+
+# --- solving -----------------------------------------------------------------------
+
+
+def solve_escape_play(kind: str, dist: dict[int, int]) -> bytes:
+    """Best card to discard for every (plays left, needed, hand); one byte each.
+
+    Layout: [plays_left - 1][needed - 1][hand_rank]. 0 means an empty hand.
+    """
+    sub = str(kind).upper() == "SUBMISSION"
+    deck_n = sum(dist.values())
+    deck_sum = sum(v * c for v, c in dist.items())
+    hands = all_hands()
+    rank = {h: i for i, h in enumerate(hands)}
+    # best[(p, need, hand)] = (escapes, -ticks, -cost); cost = value spent over a redraw (x deck size).
+    best: dict[tuple[int, int, int], tuple[int, int, int]] = {}
+    out = bytearray(ESCAPE_PLAYS * MAX_THRESHOLD * HANDS)
+    for p in range(1, ESCAPE_PLAYS + 1):
+        for need in range(1, MAX_THRESHOLD + 1):
+            base = ((p - 1) * MAX_THRESHOLD + (need - 1)) * HANDS
+            for hi, hand in enumerate(hands):
+                top = (0, 0, 0)
+                pick = hand[-1] if hand else 0
+                for v in sorted(set(hand), reverse=True):
+                    cost = v * deck_n - deck_sum
+                    if v >= need:
+                        cand = (1, 0, -cost)
+                    elif p > 1:
+                        rest = list(hand)
+                        rest.remove(v)
+                        nxt = best[(p - 1, need - v, rank[tuple(rest)])]
+                        if not nxt[0]:
+                            continue
+                        cand = (1, nxt[1] - 1, nxt[2] - cost)
+                    else:
+                        continue
+                    if not sub:
+                        cand = (cand[0], 0, cand[2])
+                    if cand > top:
+                        top, pick = cand, v
+                best[(p, need, hi)] = top
+                out[base + hi] = pick
+    return bytes(out)
+
+
+def escape_chances(dist: dict[int, int]) -> list[float]:
+    """P(an unseen hand of n cards can escape threshold t), n in HAND_SIZES, t = 1..26.
+
+    The hand is n cards dealt from the full deck; the defender escapes if its
+    three best cards reach the threshold.
+    """
+    deck_n = sum(dist.values())
+    out = []
+    for n in HAND_SIZES:
+        total = math.comb(deck_n, n)
+        by_top = [0] * (3 * CARD_VALUES + 1)
+        for hand in all_hands()[_HAND_OFFSET[n] : _HAND_OFFSET[n + 1]]:
+            ways = 1
+            for v in set(hand):
+                ways *= math.comb(int(dist.get(v, 0)), hand.count(v))
+            if ways:
+                by_top[sum(hand[-ESCAPE_PLAYS:])] += ways
+        for t in range(1, MAX_THRESHOLD + 1):
+            out.append(sum(by_top[t:]) / total)
+    return out
+
+
+def solve_pin_values(
+    chances: list[float], *, max_health: int, keep: float, press_damage: int, mult_step: float
+) -> tuple[list[float], list[bool]]:
+    """V(hp, kickouts) and the best move (True = pin) for both full hand sizes.
+
+    Layout: [full hand size][kickouts][hp], hp = 0..max_health.
+    """
+    keep = float(keep)
+    d = max(1, int(press_damage))
+    hp_n = int(max_health) + 1
+    mults = [1.0]
+    for _ in range(MAX_KICKOUTS):
+        mults.append(mults[-1] * float(mult_step))
+    values: list[float] = []
+    pins: list[bool] = []
+    for f in FULL_HAND_SIZES:
+        esc_row = chances[HAND_SIZES.index(f) * MAX_THRESHOLD :][:MAX_THRESHOLD]
+        V = [[0.0] * hp_n for _ in range(MAX_KICKOUTS + 1)]
+        P = [[True] * hp_n for _ in range(MAX_KICKOUTS + 1)]
+        for k in range(MAX_KICKOUTS, -1, -1):
+            k_next = min(MAX_KICKOUTS, k + 1)
+            for hp in range(hp_n):
+                t = max(1, pin_threshold(escape_threshold(hp / max_health), mults[k]))
+                esc = esc_row[t - 1]
+                after = max(0, hp - d)
+                if after == hp and k_next == k:
+                    # Nothing changes on a kickout: V = stick + esc * keep * V.
+                    V[k][hp] = (1.0 - esc) / (1.0 - esc * keep)
+                    continue
+                pin = (1.0 - esc) + esc * keep * V[k_next][after]
+                press = keep * V[k][after] if after < hp else 0.0
+                V[k][hp] = max(pin, press)
+                P[k][hp] = pin >= press
+        for k in range(MAX_KICKOUTS + 1):
+            values.extend(V[k])
+            pins.extend(P[k])
+    return values, pins
+
+
+# --- file --------------------------------------------------------------------------
+
+
+def _u16(xs: list[float]) -> bytes:
+    return struct.pack(f"<{len(xs)}H", *(int(round(max(0.0, min(1.0, x)) * _U16)) for x in xs))
+
+
+def shards() -> list[tuple[str, str, str]]:
+    """The independent pieces of the table: ("play", deck, kind) and ("pin", deck, "")."""
+    return [("play", a, k) for a in ARCHETYPES for k in KINDS] + [("pin", a, "") for a in ARCHETYPES]
+
+
+def build_shard(job: tuple) -> tuple[tuple[str, str, str], bytes]:
+    """Process-pool worker: (part, deck, kind, pin params) -> (shard, its bytes)."""
+    part, archetype, kind, params = job
+    dist = deck_distribution(archetype)
+    if part == "play":
+        return (part, archetype, kind), solve_escape_play(kind, dist)
+    chances = escape_chances(dist)
+    values, _pins = solve_pin_values(chances, **params)
+    return (part, archetype, kind), _u16(chances) + _u16(values)
+
+
+def pack_table(parts: dict[tuple[str, str, str], bytes], meta: dict) -> bytes:
+    """The shipped file: header, then zlib(JSON meta + every shard in shards() order)."""
+    head = json.dumps(dict(meta, archetypes=list(ARCHETYPES), kinds=list(KINDS)), sort_keys=True).encode("utf-8")
+    body = b"".join(parts[s] for s in shards())
+    payload = zlib.compress(struct.pack("<I", len(head)) + head + body, 9)
+    return _HEADER.pack(ENDGAME_TABLE_MAGIC, ENDGAME_TABLE_VERSION, zlib.crc32(payload)) + payload
+
+
+@dataclass
+class EndgameTable:
+    """O(1) lookups into a loaded table."""
+
+    play_data: bytes
+    pin_data: tuple[int, ...]  # per deck: escape chances, then pin values (uint16)
+    meta: dict = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.max_health = int(self.meta["max_health"])
+        self.keep = float(self.meta["keep"])
+        self.press_damage = max(1, int(self.meta["press_damage"]))
+        self.mult_step = float(self.meta["mult_step"])
+        self._arch = {a: i for i, a in enumerate(ARCHETYPES)}
+        self._play_size = ESCAPE_PLAYS * MAX_THRESHOLD * HANDS
+        self._chance_size = len(HAND_SIZES) * MAX_THRESHOLD
+        self._hp_n = self.max_health + 1
+        self._value_size = len(FULL_HAND_SIZES) * (MAX_KICKOUTS + 1) * self._hp_n
+        self._pin_size = self._chance_size + self._value_size
+
+    def _a(self, archetype: str) -> int:
+        return self._arch.get(str(archetype or "BALANCED").upper(), 0)
+
+    def escape_card(self, archetype: str, kind: str, needed: int, plays_left: int, values) -> int | None:
+        """Card value to discard next; None when the table doesn't cover the spot."""
+        needed, plays_left = int(needed), int(plays_left)
+        if not (1 <= needed <= MAX_THRESHOLD and 1 <= plays_left <= ESCAPE_PLAYS) or not values or not _valid_hand(values):
+            return None
+        k = 1 if str(kind).upper() == "SUBMISSION" else 0
+        block = self._a(archetype) * len(KINDS) + k
+        i = block * self._play_size + ((plays_left - 1) * MAX_THRESHOLD + (needed - 1)) * HANDS + hand_rank(values)
+        return int(self.play_data[i]) or None
+
+    def escape_chance(self, archetype: str, threshold: int, hand_size: int) -> float:
+        """P(a hand of `hand_size` unseen cards escapes `threshold`)."""
+        t = max(1, min(MAX_THRESHOLD, int(threshold)))
+        n = max(HAND_SIZES[0], min(HAND_SIZES[-1], int(hand_size)))
+        i = self._a(archetype) * self._pin_size + HAND_SIZES.index(n) * MAX_THRESHOLD + (t - 1)
+        return self.pin_data[i] / _U16
+
+    def pin_value(self, archetype: str, hp: int, kickouts: int, full_hand: int) -> float:
+        """V: chance of winning by pinfall from the next opening, with perfect play."""
+        f = FULL_HAND_SIZES.index(4 if int(full_hand) <= 4 else 5)
+        k = max(0, min(MAX_KICKOUTS, int(kickouts)))
+        hp = max(0, min(self.max_health, int(hp)))
+        i = self._a(archetype) * self._pin_size + self._chance_size + (f * (MAX_KICKOUTS + 1) + k) * self._hp_n + hp
+        return self.pin_data[i] / _U16
+
+    def pin_or_press(self, archetype: str, hp: int, mult: float, hand_size: int, full_hand: int) -> tuple[float, float]:
+        """(value of pinning now, value of one more beat of offense) for a defender."""
+        full = 4 if int(full_hand) <= 4 else 5
+        n = int(hand_size) if int(hand_size) >= HAND_SIZES[0] else full
+        t = pin_threshold(escape_threshold(int(hp) / self.max_health), mult)
+        esc = self.escape_chance(archetype, max(1, t), n)
+        k = kickouts_of(mult, self.mult_step)
+        after = max(0, int(hp) - self.press_damage)
+        pin = (1.0 - esc) + esc * self.keep * self.pin_value(archetype, after, k + 1, full)
+        press = self.keep * self.pin_value(archetype, after, k, full) if after < int(hp) else 0.0
+        return pin, press
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EndgameTable":
+        if len(data) < _HEADER.size:
+            raise ValueError("endgame table is truncated")
+        magic, version, crc = _HEADER.unpack_from(data)
+        if magic != ENDGAME_TABLE_MAGIC:
+            raise ValueError("not an endgame table")
+        if int(version) != ENDGAME_TABLE_VERSION:
+            raise ValueError(f"unsupported endgame table version: {version}")
+        payload = data[_HEADER.size :]
+        if zlib.crc32(payload) != crc:
+            raise ValueError("endgame table is corrupt")
+        raw = zlib.decompress(payload)
+        (n_head,) = struct.unpack_from("<I", raw)
+        meta = json.loads(raw[4 : 4 + n_head].decode("utf-8"))
+        if tuple(meta.get("archetypes") or ()) != ARCHETYPES or tuple(meta.get("kinds") or ()) != KINDS:
+            raise ValueError("endgame table was built for different archetypes; rebuild it")
+        pos = 4 + n_head
+        n_play = len(ARCHETYPES) * len(KINDS) * ESCAPE_PLAYS * MAX_THRESHOLD * HANDS
+        n_pin = len(ARCHETYPES) * (
+            len(HAND_SIZES) * MAX_THRESHOLD + len(FULL_HAND_SIZES) * (MAX_KICKOUTS + 1) * (int(meta["max_health"]) + 1)
+        )
+        if len(raw) != pos + n_play + 2 * n_pin:
+            raise ValueError("endgame table has the wrong size; rebuild it")
+        play = raw[pos : pos + n_play]
+        pins = struct.unpack_from(f"<{n_pin}H", raw, pos + n_play)
+        return cls(play_data=bytes(play), pin_data=pins, meta=meta)
+
+
+def default_table_path() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), ENDGAME_TABLE_FILENAME)
+
+
+def load_table(path: str | None = None) -> EndgameTable | None:
+    """Load the shipped table; None if it is missing or stale."""
+    try:
+        with open(path or default_table_path(), "rb") as f:
+            return EndgameTable.from_bytes(f.read())
+    except Exception:
+        return None
+
@@ -0,0 +1,3322 @@
+"""Headless match engine: rules, clash resolution, escapes and CPU AI.
+
+MatchEngine holds everything about a match that doesn't need a window. The
+Kivy app (Main_kivy.WrestleApp) subclasses it and overrides the UI hooks
+(_log, _update_hud, _render_hand, ...); on its own the engine runs matches
+with no display, which is what simulations and tools use.
+
+Rolls go through the named streams in rng (deck, ai, ties, rules). By default
+they are all the global `random`, so random.seed() makes a headless match
+reproducible; simulate_match(seed=...) gives each stream its own generator so
+A/B runs of the same seed stay aligned.
+"""
+
+from __future__ import annotations
+
+import copy
+from functools import lru_cache
+import math
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Callable
+
+import rng
+from wrestler import Wrestler, WrestlerState, GrappleRole, MAX_HEALTH, set_hash_hp_edges
+from moves_db import MOVES
+from move_index import MoveLegalityIndex, build_legality_index, iter_bits
+from flavor import FlavorCache, FlavorLine
+from move_graph import TransitionGraph, UNREACHABLE, node_of
+from cpu_scoring import ScoreTable, context_vector, weight_vector
+from zobrist import TT_DEFAULT_SIZE, TranspositionTable, cards_key, position_key, zkey
+from endgame import escape_threshold, pin_threshold
+from wrestler_roster import ROSTER
+
+# Stable move IDs (slugs) and special-move rule sets
+from move_ids import (
+    MOVE_DEFENSIVE,
+    MOVE_REST,
+    MOVE_GROGGY_RECOVERY,
+    MOVE_TAUNT,
+    MOVE_SLOW_STAND_UP,
+    MOVE_KIP_UP,
+    MOVE_LOCK_UP,
+    MOVE_FIGHT_FOR_CONTROL,
+    MOVE_SHOVE_OFF,
+    MOVE_STOP_SHORT,
+    MOVE_CLIMB_DOWN,
+    MOVE_PIN,
+    HOBBLED_EXEMPT_MOVES,
+    GRAPPLE_DEFENSE_BASELINE_MOVES,
+    UNIVERSAL_MOVES,
+)
+
+# ==========================================
+#  🖍️ LOG MARKUP
+# ==========================================
+# Markup/log colors (hex)
+COLOR_HEX_NAME_YOU = "00FFFF"             # Cyber Cyan
+COLOR_HEX_NAME_CPU = "FF00FF"             # Neon Magenta
+COLOR_HEX_DAMAGE = "FF0000"               # Pure Red
+COLOR_HEX_STRIKE_LOG = "FF3333"           # Bright Crimson
+COLOR_HEX_GRAPPLE_LOG = "3333FF"          # Bright Blue
+COLOR_HEX_SETUP_LOG = "FFFF00"            # Classic Yellow
+COLOR_HEX_DEFENSIVE_LOG = "AAAAAA"        # Silver
+
+# HP status colors (Fog of War)
+COLOR_HEX_HP_OPTIMAL   = "00FF00"         # Pure Green
+COLOR_HEX_HP_STABLE    = "ADFF2F"         # Green-Yellow
+COLOR_HEX_HP_STRAINED  = "FFFF00"         # Pure Yellow
+COLOR_HEX_HP_EXHAUSTED = "FF8C00"         # Dark Orange
+COLOR_HEX_HP_CRITICAL  = "FF0000"         # Pure Red
+
+# ==========================================
+#  🎛️ TUNING KNOBS
+# ==========================================
+TUNING_ENABLE_PASSIVE_REGEN = True
+TUNING_GRIT_PASSIVE_REGEN = 2  # Grit recovered if you spent 0 this turn
+
+# --- Tinker: Hype Economy (Taunt + Hype Shop) ---
+# These were previously hard-coded in execution/UI logic.
+# Goal: prevent "Hype Shop > Grit Refill" from being an unlimited grit loop.
+TUNING_TAUNT_HYPE_BASE = 20
+TUNING_TAUNT_HYPE_PER_CARD_VALUE = 2
+TUNING_TAUNT_HYPE_MAX = 45
+
+TUNING_HYPE_SHOP_GRIT_REFILL_COST = 50
+TUNING_HYPE_SHOP_GRIT_REFILL_AMOUNT = 3
+
+# Rest punish: if you get hit while Resting, your recovery is interrupted.
+# Additionally, the hit has a chance to become a "caught resting" critical (150% damage).
+TUNING_CAUGHT_RESTING_CRIT_CHANCE = 0.25
+
+# Botch mechanic: injured wrestlers may fail Attack moves.
+# Chance (%) = Missing_HP / TUNING_BOTCH_DIVISOR
+TUNING_BOTCH_DIVISOR = 4
+
+# True ties (score AND strength tied): chance of a classic double-down spot.
+TUNING_DOUBLE_DOWN_ON_TRUE_TIE_CHANCE = 0.25
+
+# True ties: if clash score and Strength are tied, sometimes both crash.
+TUNING_DOUBLE_DOWN_ON_TRUE_TIE_CHANCE = 0.25
+
+# Grapple-break strikes: if defender wins the clash by this margin while using a
+# grapple-defense Strike, the grapple breaks and both reset to STANDING.
+GRAPPLE_BREAK_STRIKE_VALUE = 3
+
+# Log readability
+LOG_EXCHANGE_SEPARATOR = "────────────────────────"
+
+# Clash reveal tuning
+REVEAL_LOSER_MOVE_NAME = True
+REVEAL_LOSER_CARDS = False
+
+# Optional debugging: show score math in the log
+REVEAL_SCORE_BREAKDOWN = True
+
+# Damage tuning
+DOUBLES_DAMAGE_MODIFIER = 1.25
+SUBMISSION_TICK_DAMAGE = 4
+
+# Pin anti-spam: when a defender escapes a pin, future pin escapes get easier.
+# (Threshold is multiplied by this factor each successful pin escape.)
+TUNING_PIN_ESCAPE_THRESHOLD_MULT_ON_SUCCESS = 0.85
+
+# Pin anti-spam recovery: taking damage makes future pin escapes harder again
+# by slowly recovering the pin escape multiplier back toward 1.0.
+# This fixes the "threshold keeps going net negative" feel after repeated kickouts.
+TUNING_PIN_ESCAPE_THRESHOLD_MULT_RECOVER_PER_DAMAGE = 0.0025
+
+# FIRE UP!: cash in momentum to enter a short buff state.
+# - +2 bonus to each played card for a few turns (duration based on momentum tier)
+# - cannot botch while active
+# - wins clash ties while only one side is fired up
+TUNING_FIRED_UP_CARD_BONUS_PER_CARD = 2
+TUNING_CPU_FIRE_UP_CHANCE_PER_MOM = 0.10
+
+# AKI-style DAZED tuning (probabilistic, HP-based)
+TUNING_DAZE_HP_THRESHOLD = 80       # HP% above this = immune to Daze
+TUNING_DAZE_CHANCE_SCALAR = 1.5     # Lower HP => higher chance
+TUNING_DAZE_MAX_TURNS = 3           # Max duration applied
+TUNING_DAZE_WAKE_DAMAGE = 15        # If hit this hard while dazed, wake up instantly
+
+# Daze death-spiral protection: after clearing groggy/daze, grant brief immunity
+# to re-applying DAZED so a wrestler can re-stabilize.
+TUNING_DAZE_COOLDOWN_TURNS = 2
+
+# Strike knockdowns: for strike moves that *can* ground a standing/running opponent,
+# chance = missing_hp_pct * 100 * scalar (clamped to 0..100).
+TUNING_STRIKE_KNOCKDOWN_CHANCE_SCALAR = 1.0
+
+# Momentum tuning
+MOMENTUM_MAX_ABS = 5
+MOMENTUM_WIN_DELTA = 1
+MOMENTUM_GAIN_ON_ATTACKS_ONLY = True
+MOMENTUM_REVERSAL_RESET_THRESHOLD = 4
+
+# Momentum -> clash score modifier mapping
+# 1-3 = +1, 4-5 = +2 (signed)
+MOMENTUM_SCORE_TIER1_MAX = 3
+MOMENTUM_SCORE_TIER1_BONUS = 1
+MOMENTUM_SCORE_TIER2_MAX = 5
+MOMENTUM_SCORE_TIER2_BONUS = 2
+
+# CPU grounded behavior
+CPU_GETUP_HEALTHY_PCT = 0.60
+CPU_GETUP_BONUS_HEALTHY = 45
+CPU_UPKICK_PENALTY_WHEN_HEALTHY = 22
+CPU_REST_BONUS_WHEN_HURT = 28
+CPU_REST_HURT_PCT = 0.45
+
+# CPU anti-turtle tuning
+CPU_RND_PICK_FROM_TOP_N = 5
+CPU_DEFENSIVE_BASE_PENALTY = 18
+CPU_DEFENSIVE_EMERGENCY_HP_PCT = 0.35
+CPU_DEFENSIVE_EMERGENCY_BONUS = 14
+
+# Additional guardrails against Defensive / Reversal spam.
+CPU_DEFENSIVE_COOLDOWN_TURNS = 2
+CPU_DEFENSIVE_COOLDOWN_SCORE_PENALTY = 999
+CPU_DEFENSIVE_REPEAT_EXTRA_PENALTY = 25
+
+# CPU planning (move_graph): score per beat gained toward the goal position.
+# Goal is the finisher spot, or pin-ready once the opponent drops below the HP%.
+CPU_PLAN_PROGRESS_WEIGHT = 6.0
+CPU_PLAN_PROGRESS_MAX_BEATS = 2
+CPU_PLAN_PIN_HP_PCT = 0.35
+
+# CPU move-scoring context (_cpu_score_context): opponent HP% brackets for the
+# pin_opp_hp_* / sub_opp_* terms, and the CPU's own low-HP gate (low_hp_free).
+CPU_SCORE_OPP_FRESH_HP_PCT = 0.70
+CPU_SCORE_OPP_HALF_HP_PCT = 0.50
+CPU_SCORE_OPP_WORN_HP_PCT = 0.35
+CPU_SCORE_OPP_LOW_HP_PCT = 0.20
+CPU_SCORE_OPP_SUB_HP_PCT = 0.25
+CPU_SCORE_LOW_HP_PCT = 0.30
+
+# Weight physics: a lighter wrestler can't lift a heavier target above this HP%.
+LIFT_BLOCK_HP_PCT = 0.50
+
+# CPU dynamic difficulty (needs a win-probability model, see winprob.py; headless
+# sims never load one). 0 = off; 1 = a CPU that is sure to win plays only BAD/RND
+# and one that is sure to lose plays only GREED.
+CPU_DYNAMIC_DIFFICULTY = 0.0
+
+# Stale move tuning (discourages repeating the same attack)
+# A move becomes STALE if it's used >= STALE_REPEAT_THRESHOLD times within the
+# last STALE_WINDOW_ATTACK_MOVES attack moves (including the current attempt).
+STALE_WINDOW_ATTACK_MOVES = 4
+STALE_REPEAT_THRESHOLD = 2
+STALE_CLASH_SCORE_PENALTY = 3
+
+# CPU transposition table (zobrist.py): positions whose move values and card
+# candidates are kept for reuse. 0 = off.
+CPU_TT_SIZE = TT_DEFAULT_SIZE
+
+# CPU move scoring (cpu_scoring.TERMS): default weight per term. A ROSTER entry
+# can override any of them by name under "ai_weights". Terms that follow a
+# tuning constant above are filled in by cpu_score_weights() on each call, so
+# patching the constant (sim variants, ab_compare --tuning) reaches the AI.
+CPU_SCORE_WEIGHTS: dict[str, float] = {
+    "damage": 1.0,
+    "ai_score": 1.0,
+    "type_default": 1.0,
+    "pin_opp_hp_70": -28.0,
+    "pin_opp_hp_50": -16.0,
+    "pin_opp_hp_35": -6.0,
+    "pin_opp_hp_20": 4.0,
+    "pin_opp_hp_low": 14.0,
+    "pin_opp_hurt": 8.0,
+    "pin_endgame": 12.0,
+    "pin_endgame_press": -30.0,
+    "sub_opp_fresh": -10.0,
+    "sub_opp_low": 8.0,
+    "repeat": -15.0,
+    "low_hp_free": 6.0,
+}
+
+
+def cpu_score_weights() -> dict[str, float]:
+    """CPU_SCORE_WEIGHTS plus the terms derived from the current tuning constants."""
+    weights = dict(CPU_SCORE_WEIGHTS)
+    weights.update(
+        {
+            "plan_progress": float(CPU_PLAN_PROGRESS_WEIGHT),
+            "defensive": -float(CPU_DEFENSIVE_BASE_PENALTY),
+            "defensive_cooldown": -float(CPU_DEFENSIVE_COOLDOWN_SCORE_PENALTY),
+            "defensive_repeat": -float(CPU_DEFENSIVE_REPEAT_EXTRA_PENALTY),
+            "defensive_emergency": float(CPU_DEFENSIVE_EMERGENCY_BONUS),
+            "getup_healthy": float(CPU_GETUP_BONUS_HEALTHY),
+            "ground_strike_healthy": -float(CPU_UPKICK_PENALTY_WHEN_HEALTHY),
+            "rest_hurt": float(CPU_REST_BONUS_WHEN_HURT),
+            # Taking the stale penalty also tends to widen margin tiers and lose tempo,
+            # so treat it as a much bigger strategic downside than the clash penalty.
+            "stale": -float(STALE_CLASH_SCORE_PENALTY) * 8.0,
+        }
+    )
+    return weights
+
+
+@lru_cache(maxsize=1)
+def _cpu_hp_edge_names() -> tuple[str, ...]:
+    return tuple(k for k in globals() if k.endswith("_HP_PCT")) + ("CPU_GETUP_HEALTHY_PCT", "CPU_REST_HURT_PCT")
+
+
+def cpu_hp_edges() -> tuple[float, ...]:
+    """Every HP% cutoff the CPU's move values read, from the current tuning constants.
+
+    That is each *_HP_PCT constant plus the grounded get-up / rest gates; the
+    transposition table's HP buckets are built from them (zobrist), so a new
+    HP% gate only needs the suffix to stay exact.
+    """
+    g = globals()
+    return tuple(sorted({float(g[k]) for k in _cpu_hp_edge_names()}))
+
+
+# Auto-grit: prevent high-damage 0-cost moves from being "free".
+TUNING_AUTO_GRIT_ON_DAMAGE = True
+AUTO_GRIT_ONLY_WHEN_BASE_COST_ZERO = True
+AUTO_GRIT_DAMAGE_THRESHOLD = 6
+AUTO_GRIT_DAMAGE_STEP = 4
+AUTO_GRIT_PER_STEP = 1
+
+# Headless matches: hard stop (there is no HP-based KO, so a stalemate is possible).
+HEADLESS_MAX_BEATS = 200
+
+
+@dataclass
+class MatchResult:
+    """Outcome of a headless match."""
+
+    winner: str | None  # "player" | "cpu" | None (beat cap reached)
+    kind: str | None  # "PINFALL" | "SUBMISSION" | None
+    beats: int
+    player_hp: int
+    cpu_hp: int
+    log: list[str] = field(default_factory=list)
+    player_limbs: dict[str, int] = field(default_factory=dict)  # end-of-match HEAD/BODY/LEGS
+    cpu_limbs: dict[str, int] = field(default_factory=dict)
+    clashes: int = 0
+    move_usage: dict[str, dict[str, list[int]]] = field(default_factory=dict)  # see MatchEngine.move_usage
+
+
+class MatchEngine:
+    """Match state and rules. Subclasses provide the UI by overriding hooks."""
+
+    # winprob.WinModel (or anything with .evaluate(engine) -> player win probability).
+    win_model = None
+    # endgame.EndgameTable: CPU pin-or-press advice and escape card play (None = heuristics only).
+    endgame_table = None
+
+    # -------------------------------------------------------------------------
+    # MATCH SETUP
+    # -------------------------------------------------------------------------
+
+    def _init_match_state(self) -> None:
+        self.game_over = False
+        self._last_cpu_mode: str | None = None
+        self.turn = "player"
+        self.clash_count: int = 0  # exchanges resolved this match
+        # Per-seat move tallies: {"player"|"cpu": {slug: [attempts, landed, damage]}}
+        self.move_usage: dict[str, dict[str, list[int]]] = {"player": {}, "cpu": {}}
+        self._escape_mode: dict | None = None
+        self.selected_cards: set[int] = set()
+        self.selected_move: str | None = None
+        self._menu_stage: str = "CATEGORIES"  # CATEGORIES | MOVES | HYPE_SHOP | ESCAPE
+        self._selected_category: str | None = None
+
+        # UX: avoid confusion when cards are tapped before a move is selected.
+        self._card_tap_hint_shown: bool = False
+
+        # Log capture (exportable); None = don't keep lines.
+        self._log_lines: list[str] | None = []
+        self._flavor_cache = FlavorCache()
+
+        # Momentum: -5..+5 (positive favors the player)
+        self.momentum: int = 0
+
+    def _setup_match(self, p_prof: dict, c_prof: dict) -> None:
+        """Fresh wrestlers and match state (no UI refresh, no first turn)."""
+        self.player = Wrestler("YOU", True, profile=dict(p_prof or {}))
+        self.cpu = Wrestler("CPU", False, profile=dict(c_prof or {}))
+
+        # Per-match trackers
+        self.player.recent_attack_moves = []
+        self.cpu.recent_attack_moves = []
+
+        # Compile the state-transition graphs for both movesets up front.
+        for w in (self.player, self.cpu):
+            try:
+                self._transition_graph(w)
+            except Exception:
+                pass
+
+        # Buffs (simple flags; stored on wrestler objects)
+        self.player.lockup_edge_ready = False
+        self.cpu.lockup_edge_ready = False
+
+        self._init_match_state()
+
+    def _apply_limb_carryover(self, player_limbs: dict | None = None, cpu_limbs: dict | None = None) -> None:
+        """Start the match with limb damage carried over from earlier matches (career mode)."""
+        for w, limbs in ((self.player, player_limbs), (self.cpu, cpu_limbs)):
+            for part, hp in (limbs or {}).items():
+                if part in w.body_parts:
+                    try:
+                        w.body_parts[part] = max(0, min(100, int(hp)))
+                    except Exception:
+                        pass
+            w.refresh_hash("body_parts")
+
+    def _snapshot(self) -> "MatchEngine":
+        """Private, silent copy of the match for off-thread CPU thinking."""
+        snap = MatchEngine()
+        snap._init_match_state()
+        snap._log_lines = None
+        snap.player = copy.deepcopy(self.player)
+        snap.cpu = copy.deepcopy(self.cpu)
+        snap.momentum = int(getattr(self, "momentum", 0) or 0)
+        snap.game_over = bool(getattr(self, "game_over", False))
+        snap._move_legality_index = self._legality_index()
+        snap._move_graphs = self._move_graph_cache()
+        snap._cpu_scores = self._cpu_score_table()
+        snap._cpu_tt = self._transposition_table()
+        snap._card_sigs = self._card_sigs_cache()
+        snap.win_model = self.win_model
+        snap.endgame_table = self.endgame_table
+        return snap
+
+    def _mirror(self) -> "MatchEngine":
+        """The live match with the seats swapped, so CPU logic can act for the player.
+
+        Wrestlers are shared (not copied); momentum is negated. Call _unmirror()
+        afterwards to carry momentum changes back. win_model and endgame_table
+        come along, so both seats play the same CPU; on the mirror,
+        win_probability() is the real CPU's (it sits in the player seat there).
+        """
+        m = MatchEngine()
+        m._init_match_state()
+        m.player = self.cpu
+        m.cpu = self.player
+        m.momentum = -int(getattr(self, "momentum", 0) or 0)
+        m.game_over = bool(getattr(self, "game_over", False))
+        m._log_lines = self._log_lines
+        m._flavor_cache = self._flavor_cache
+        m._move_legality_index = self._legality_index()
+        m._move_graphs = self._move_graph_cache()
+        m._cpu_scores = self._cpu_score_table()
+        m._cpu_tt = self._transposition_table()
+        m._card_sigs = self._card_sigs_cache()
+        m.win_model = self.win_model
+        m.endgame_table = self.endgame_table
+        return m
+
+    def _unmirror(self, m: "MatchEngine") -> None:
+        self.momentum = -int(getattr(m, "momentum", 0) or 0)
+
+    # -------------------------------------------------------------------------
+    # UI HOOKS (no-ops headless; the app overrides these)
+    # -------------------------------------------------------------------------
+
+    def _log(self, text: str):
+        if self._log_lines is None:
+            return
+        try:
+            self._log_lines.append(str(text))
+        except Exception:
+            pass
+
+    def _update_hud(self, *, force: bool = False):
+        return
+
+    def _render_hand(self):
+        return
+
+    def _render_moves_ui(self) -> None:
+        return
+
+    def _render_escape_ui(self):
+        return
+
+    def _update_control_bar(self) -> None:
+        return
+
+    def _flash_clash(self, *, outcome: str, damage: int = 0) -> None:
+        return
+
+    def _schedule_cpu_speculation(self) -> None:
+        return
+
+    def _schedule_forced_rest(self) -> None:
+        """Player can't afford any play this beat; the UI auto-submits Rest."""
+        return
+
+    def _on_match_over(self) -> None:
+        """A pin or submission just ended the match (game_over is set)."""
+        return
+
+    # -------------------------------------------------------------------------
+    # CORE GAME LOOP & LOGIC
+    # -------------------------------------------------------------------------
+
+    def _start_turn(self, who):
+        if self.game_over: return
+
+        # Tick down turn-based buffs.
+        for w in (self.player, self.cpu):
+            try:
+                t = int(getattr(w, "fired_up_turns_remaining", 0) or 0)
+                if t > 0:
+                    w.fired_up_turns_remaining = max(0, t - 1)
+            except Exception:
+                pass
+
+            # Tick down daze cooldown (prevents immediate re-dazing loops).
+            try:
+                dc = int(getattr(w, "daze_cooldown_turns", 0) or 0)
+                if dc > 0:
+                    w.daze_cooldown_turns = max(0, int(dc) - 1)
+            except Exception:
+                pass
+
+            # Tick down defensive cooldown (prevents Defensive / Reversal spam by AI).
+            try:
+                dd = int(getattr(w, "defensive_cooldown_turns", 0) or 0)
+                if dd > 0:
+                    w.defensive_cooldown_turns = max(0, int(dd) - 1)
+            except Exception:
+                pass
+
+        # Reset per-beat UX hints.
+        self._card_tap_hint_shown = False
+
+        # Expire combo windows at the start of the next beat.
+        for w in (self.player, self.cpu):
+            if int(getattr(w, "chain_turns_remaining", 0)) > 0:
+                w.chain_turns_remaining -= 1
+                if int(w.chain_turns_remaining) <= 0:
+                    w.chain_turns_remaining = 0
+                    w.chain_window = None
+                    w.chain_potency = 0
+
+        # Phase 2: player always initiates the clash; CPU responds instantly.
+        self.turn = "player"
+
+        # CPU may auto-trigger FIRE UP if momentum favors them.
+        self._cpu_maybe_fire_up()
+
+        self.player.draw_to_full()
+        self.cpu.draw_to_full()
+        
+        self.selected_cards.clear()
+        self.selected_move = None
+        self._escape_mode = None
+
+        self._menu_stage = "CATEGORIES"
+        self._selected_category = None
+        
+        self._update_hud()
+        self._render_hand()
+        self._render_moves_ui()
+        self._update_control_bar()
+
+        # Think ahead: the CPU's pick doesn't depend on the player's hidden choice.
+        self._schedule_cpu_speculation()
+        
+        # Soft-lock protection: if you can't afford any play (no low cards and 0 grit), auto-rest.
+        if self.player.grit == 0 and not self.player.has_low_card(max_value=5):
+            self._log("GASSED OUT! You can’t afford any cards — auto Rest.")
+            self._schedule_forced_rest()
+
+    def _strip_kivy_markup(self, s: str) -> str:
+        try:
+            return re.sub(r"\[[^\]]+\]", "", str(s))
+        except Exception:
+            return str(s)
+
+    def _log_separator(self) -> None:
+        self._log(LOG_EXCHANGE_SEPARATOR)
+
+    def _c(self, text: str, hex_color: str) -> str:
+        return f"[color={hex_color}]{text}[/color]"
+
+    def _fmt_name(self, w: Wrestler) -> str:
+        if bool(getattr(w, "is_player", False)):
+            return self._c(str(w.name), COLOR_HEX_NAME_YOU)
+        return self._c(str(w.name), COLOR_HEX_NAME_CPU)
+
+    def _calc_daze_application(self, target: Wrestler, move_data: dict) -> int:
+        if not bool(move_data.get("can_daze", False)):
+            return 0
+        try:
+            hp_pct = float(target.hp_pct()) * 100.0
+        except Exception:
+            return 0
+
+        thr = float(TUNING_DAZE_HP_THRESHOLD)
+        if hp_pct > thr:
+            return 0
+
+        diff = max(0.0, thr - hp_pct)
+        chance = float(diff) * float(TUNING_DAZE_CHANCE_SCALAR)
+        if float(rng.rules.uniform(0.0, 100.0)) >= float(chance):
+            return 0
+
+        max_turns = max(1, int(TUNING_DAZE_MAX_TURNS))
+        severity = 0.0 if thr <= 0 else max(0.0, min(1.0, diff / thr))
+        if max_turns == 1:
+            return 1
+        if max_turns == 2:
+            return 2 if rng.rules.random() < (0.25 + 0.55 * severity) else 1
+
+        p3 = max(0.0, min(0.60, 0.10 + 0.45 * severity))
+        p2 = max(0.0, min(0.75, 0.30 + 0.40 * severity))
+        r = rng.rules.random()
+        if r < p3:
+            return 3
+        if r < (p3 + p2):
+            return 2
+        return 1
+
+    def _fmt_damage(self, amount: int) -> str:
+        return self._c(f"{int(amount)} dmg", COLOR_HEX_DAMAGE)
+
+    def _fmt_move(self, move_name: str) -> str:
+        mv = MOVES.get(move_name, {})
+        disp = str(mv.get("name", move_name))
+        t = str(mv.get("type", "Setup"))
+        if move_name == MOVE_DEFENSIVE or t == "Defensive":
+            return self._c(disp, COLOR_HEX_DEFENSIVE_LOG)
+        if t == "Strike":
+            return self._c(disp, COLOR_HEX_STRIKE_LOG)
+        if t in {"Grapple", "Pin", "Submission"}:
+            return self._c(disp, COLOR_HEX_GRAPPLE_LOG)
+        return self._c(disp, COLOR_HEX_SETUP_LOG)
+
+    def _fmt_cards(self, cards: list | None) -> str:
+        if not cards:
+            return "Cards: -"
+        vals = ", ".join(str(int(c.value)) for c in cards)
+        return f"Cards: {vals}"
+
+    def _get_hp_status(self, current_hp: int) -> str:
+        pct = 0.0
+        try:
+            pct = (float(current_hp) / float(MAX_HEALTH)) * 100.0
+        except Exception:
+            pct = 0.0
+
+        if pct >= 80.0:
+            return self._c("OPTIMAL", COLOR_HEX_HP_OPTIMAL)
+        if pct >= 60.0:
+            return self._c("STABLE", COLOR_HEX_HP_STABLE)
+        if pct >= 40.0:
+            return self._c("STRAINED", COLOR_HEX_HP_STRAINED)
+        if pct >= 20.0:
+            return self._c("EXHAUSTED", COLOR_HEX_HP_EXHAUSTED)
+        return self._c("CRITICAL", COLOR_HEX_HP_CRITICAL)
+
+    # -------------------------------------------------------------------------
+    # Shared mechanics (ported from main.py)
+    # -------------------------------------------------------------------------
+
+    def _render_flavor_text(self, text: str, *, attacker: Wrestler, defender: Wrestler) -> str:
+        if not text:
+            return ""
+        return str(self._flavor_line(str(text), str(text), attacker=attacker, defender=defender))
+
+    def _flavor_line(self, move_key: str, text: str, *, attacker: Wrestler, defender: Wrestler) -> FlavorLine:
+        """Compiled, per-match cached flavor line; renders only when str()'d."""
+        cache = getattr(self, "_flavor_cache", None)
+        if cache is None:
+            cache = FlavorCache()
+            self._flavor_cache = cache
+        return cache.line(move_key, text, attacker=attacker, defender=defender)
+
+    def _momentum_advantage_for(self, wrestler: Wrestler) -> int:
+        """Return signed momentum advantage from the wrestler's perspective.
+
+        Global momentum is stored as player-favoring (positive => player advantage).
+        """
+        m = int(getattr(self, "momentum", 0) or 0)
+        if wrestler is self.player:
+            return m
+        return -m
+
+    def _move_req_momentum_min(self, move_name: str) -> int:
+        try:
+            return max(0, int(MOVES.get(str(move_name), {}).get("req_momentum_min", 0) or 0))
+        except Exception:
+            return 0
+
+    def _has_momentum_for_move(self, wrestler: Wrestler, move_name: str) -> bool:
+        req = int(self._move_req_momentum_min(move_name))
+        if req <= 0:
+            return True
+        return int(self._momentum_advantage_for(wrestler)) >= int(req)
+
+    def _move_display_name(self, move_name: str) -> str:
+        mv = MOVES.get(str(move_name), {})
+        disp = str(mv.get("name", move_name))
+        req = int(self._move_req_momentum_min(move_name))
+        if req > 0:
+            disp = f"{disp}{'*' * req}"
+        return disp
+
+    def _move_is_legal(
+        self,
+        move_name: str,
+        user: Wrestler,
+        target: Wrestler,
+        *,
+        ignore_momentum_gate: bool = False,
+        ignore_weight_gate: bool = False,
+    ) -> bool:
+        if str(move_name) not in MOVES:
+            return False
+        mv = MOVES[move_name]
+        ru = str(mv.get("req_user_state", "ANY"))
+        rt = str(mv.get("req_target_state", "ANY"))
+
+        # --- 0) Groggy gating ---
+        user_groggy = bool(getattr(user, "is_groggy", False))
+        if user_groggy and move_name != MOVE_GROGGY_RECOVERY:
+            return False
+        if (not user_groggy) and move_name == MOVE_GROGGY_RECOVERY:
+            return False
+
+        # --- 0b) Limb gating (hobbled: no running/aerial) ---
+        try:
+            user_hobbled = bool(user.is_hobbled())
+        except Exception:
+            user_hobbled = False
+        if user_hobbled and move_name not in HOBBLED_EXEMPT_MOVES:
+            mtype = str(mv.get("type", "Setup"))
+            if mtype == "Aerial" or ru in {"RUNNING", "TOP_ROPE"}:
+                return False
+
+        # --- 0c) Weight physics (lift gating) ---
+        if not bool(ignore_weight_gate):
+            if bool(mv.get("is_lift", False)) and self._lift_blocked(user, target):
+                return False
+
+        # Taunt: allow while you have offensive control in a grapple.
+        try:
+            if move_name == MOVE_TAUNT and user.is_in_grapple() and user.grapple_role == GrappleRole.OFFENSE:
+                return True
+        except Exception:
+            pass
+
+        # --- 1) User requirement (state + grapple role) ---
+        if ru == "GRAPPLE_DEFENSE":
+            if not (user.is_in_grapple() and user.grapple_role == GrappleRole.DEFENSE):
+                return False
+        elif ru == "GRAPPLE_OFFENSE":
+            if not (user.is_in_grapple() and user.grapple_role == GrappleRole.OFFENSE):
+                return False
+        elif ru != "ANY":
+            if ru in {"GRAPPLED", "GRAPPLE_ANY"}:
+                if not user.is_in_grapple():
+                    return False
+            elif ru == "GRAPPLE_WEAK":
+                # Allow certain "weak" grapple moves in STRONG as well.
+                if user.state not in {WrestlerState.GRAPPLE_WEAK, WrestlerState.GRAPPLE_STRONG}:
+                    return False
+            elif user.state.value != ru:
+                return False
+
+        # --- 2) Target requirement ---
+        if rt != "ANY":
+            if rt in {"GRAPPLED", "GRAPPLE_ANY"}:
+                if not target.is_in_grapple():
+                    return False
+            elif target.state.value != rt:
+                return False
+
+        user_adv = user.is_in_grapple() and (user.grapple_role == GrappleRole.OFFENSE)
+        user_dis = user.is_in_grapple() and (user.grapple_role == GrappleRole.DEFENSE)
+
+        if user_dis:
+            if move_name not in GRAPPLE_DEFENSE_BASELINE_MOVES:
+                t = str(mv.get("type", "Setup"))
+                if not (
+                    str(ru) in {"GRAPPLE_DEFENSE", "GRAPPLE_ANY", "GRAPPLE_WEAK"}
+                    and t in {"Strike", "Setup"}
+                ):
+                    return False
+
+        if move_name == MOVE_DEFENSIVE:
+            if user_adv:
+                return False
+            neutral_ok = (user.state == WrestlerState.STANDING and target.state == WrestlerState.STANDING)
+            tossed_ok = (user.state == WrestlerState.TOSSED)
+            grounded_ok = (user.state == WrestlerState.GROUNDED)
+            if not (neutral_ok or user_dis or tossed_ok or grounded_ok):
+                return False
+
+        # --- Momentum gating ---
+        if not bool(ignore_momentum_gate):
+            if not self._has_momentum_for_move(user, move_name):
+                return False
+
+        return True
+
+    def _auto_move_cost(self, move_name: str) -> int:
+        # Never add hidden costs to core system/utility actions.
+        if str(move_name) in {MOVE_LOCK_UP, MOVE_REST, MOVE_TAUNT, MOVE_DEFENSIVE, MOVE_FIGHT_FOR_CONTROL}:
+            return 0
+        if not bool(TUNING_AUTO_GRIT_ON_DAMAGE):
+            return 0
+        mv = MOVES.get(str(move_name), {})
+        base_cost = int(mv.get("cost", 0))
+        if bool(AUTO_GRIT_ONLY_WHEN_BASE_COST_ZERO) and base_cost != 0:
+            return 0
+        dmg = int(mv.get("damage", 0))
+        if dmg < int(AUTO_GRIT_DAMAGE_THRESHOLD):
+            return 0
+        step = max(1, int(AUTO_GRIT_DAMAGE_STEP))
+        per = max(0, int(AUTO_GRIT_PER_STEP))
+        # threshold..(threshold+step-1) => +per, then +per each additional step.
+        tiers = int(math.ceil(float(dmg - int(AUTO_GRIT_DAMAGE_THRESHOLD) + 1) / float(step)))
+        return max(0, int(tiers) * int(per))
+
+    def _move_base_cost(self, move_name: str) -> int:
+        mv = MOVES.get(str(move_name), {})
+        return int(mv.get("cost", 0)) + int(self._auto_move_cost(move_name))
+
+    def _passes_moveset(self, wrestler: Wrestler, move_name: str) -> bool:
+        if move_name in UNIVERSAL_MOVES:
+            return True
+        if wrestler.moveset is None:
+            return True
+        return move_name in set(wrestler.moveset)
+
+    def _legality_index(self) -> MoveLegalityIndex:
+        idx = getattr(self, "_move_legality_index", None)
+        if idx is None:
+            idx = build_legality_index(MOVES)
+            self._move_legality_index = idx
+        return idx
+
+    def _move_graph_cache(self) -> dict:
+        cache = getattr(self, "_move_graphs", None)
+        if cache is None:
+            cache = {}
+            self._move_graphs = cache
+        return cache
+
+    def _transition_graph(self, wrestler: Wrestler) -> TransitionGraph:
+        """Compiled state-transition graph for a wrestler's moveset (cached)."""
+        moveset = getattr(wrestler, "moveset", None)
+        finisher = getattr(wrestler, "finisher", None)
+        key = (tuple(moveset) if moveset is not None else None, finisher)
+        cache = self._move_graph_cache()
+        graph = cache.get(key)
+        if graph is None:
+            graph = TransitionGraph(MOVES, self._legality_index(), moveset=moveset, finisher=finisher)
+            cache[key] = graph
+        return graph
+
+    def _refresh_move_tables(self, diff) -> None:
+        """Drop derived move data made stale by a MOVES reload (a hot_reload.MovesDiff)."""
+        if diff.scoring_changed:
+            self._cpu_scores = None
+        self._card_sigs = None
+        tt = getattr(self, "_cpu_tt", None)
+        if tt is not None:
+            # Cached values and candidates read MOVES.
+            tt.clear()
+        if diff.legality_changed:
+            # Bit positions or masks moved: every graph was built on the old index.
+            self._move_legality_index = None
+            self._move_graphs = None
+        else:
+            cache = self._move_graph_cache()
+            for key in [k for k in cache if diff.touches(k[0])]:
+                del cache[key]
+        if diff.flavor_slugs:
+            cache = getattr(self, "_flavor_cache", None)
+            if cache is not None:
+                cache.discard(diff.flavor_slugs)
+
+    def _cpu_score_table(self) -> ScoreTable:
+        table = getattr(self, "_cpu_scores", None)
+        if table is None:
+            table = ScoreTable(MOVES, defensive_move=MOVE_DEFENSIVE, rest_move=MOVE_REST)
+            self._cpu_scores = table
+        return table
+
+    def _transposition_table(self) -> TranspositionTable | None:
+        tt = getattr(self, "_cpu_tt", None)
+        if tt is None and int(CPU_TT_SIZE) > 0:
+            tt = TranspositionTable(int(CPU_TT_SIZE))
+            self._cpu_tt = tt
+        if tt is not None and set_hash_hp_edges(cpu_hp_edges()):
+            # HP% cutoffs were (re)tuned: positions stored under the old buckets are stale.
+            tt.clear()
+        return tt
+
+    def _cpu_tt_slot(self) -> dict | None:
+        """Transposition-table slot for the CPU's current position (None when disabled)."""
+        tt = self._transposition_table()
+        if tt is None:
+            return None
+        # Momentum is stored player-favoring; key it in the CPU's favour.
+        key = position_key(self.cpu, self.player, -int(getattr(self, "momentum", 0) or 0))
+        # Endgame advice reads exact HP and the pin multiplier, which the hashes bucket or skip.
+        advice = self._cpu_endgame_advice()
+        if advice:
+            key ^= zkey("endgame", advice)
+        return tt.entry(key)
+
+    def _cpu_endgame_advice(self) -> int:
+        """+1 if the endgame table says pin the player now, -1 if it says keep attacking, 0 without a table."""
+        table = self.endgame_table
+        if table is None:
+            return 0
+        try:
+            opp = self.player
+            pin, press = table.pin_or_press(
+                str(getattr(opp, "archetype", "BALANCED")),
+                int(opp.hp),
+                float(getattr(opp, "pin_escape_threshold_mult", 1.0) or 1.0),
+                len(list(opp.hand or [])),
+                4 if opp.is_concussed() else 5,
+            )
+        except Exception:
+            return 0
+        return 1 if pin >= press else -1
+
+    def _cpu_plan_progress_fn(self):
+        """Return name -> beats gained toward the CPU's current goal (clamped)."""
+        try:
+            graph = self._transition_graph(self.cpu)
+            node = node_of(self.cpu, self.player)
+            goal = "finisher"
+            if float(self.player.hp_pct()) < float(CPU_PLAN_PIN_HP_PCT) or graph.distance_to(node, "finisher") >= UNREACHABLE:
+                goal = "pin"
+        except Exception:
+            return lambda _name: 0
+
+        cap = int(CPU_PLAN_PROGRESS_MAX_BEATS)
+        try:
+            gained = graph.progress_map(node, goal)
+        except Exception:
+            return lambda _name: 0
+
+        def progress(name: str) -> int:
+            return max(-cap, min(cap, int(gained.get(str(name), 0))))
+
+        return progress
+
+    def _cpu_score_context(self, *, cost_bias: bool = True) -> list[float]:
+        """Context vector (cpu_scoring.TERMS order) for the CPU's current decision."""
+        g: dict[str, bool] = {}
+        try:
+            opp_hp = float(self.player.hp_pct())
+            fresh, half = float(CPU_SCORE_OPP_FRESH_HP_PCT), float(CPU_SCORE_OPP_HALF_HP_PCT)
+            worn, low = float(CPU_SCORE_OPP_WORN_HP_PCT), float(CPU_SCORE_OPP_LOW_HP_PCT)
+            g["opp_hp_70"] = opp_hp >= fresh
+            g["opp_hp_50"] = half <= opp_hp < fresh
+            g["opp_hp_35"] = worn <= opp_hp < half
+            g["opp_hp_20"] = low <= opp_hp < worn
+            g["opp_hp_low"] = opp_hp < low
+            g["opp_hp_25"] = opp_hp <= float(CPU_SCORE_OPP_SUB_HP_PCT)
+            g["opp_hurt"] = bool(getattr(self.player, "is_groggy", False)) or int(getattr(self.player, "daze_turns", 0) or 0) > 0
+        except Exception:
+            pass
+        advice = self._cpu_endgame_advice()
+        g["endgame_pin"] = advice > 0
+        g["endgame_press"] = advice < 0
+        try:
+            g["defensive_cooldown"] = int(getattr(self.cpu, "defensive_cooldown_turns", 0) or 0) > 0
+            g["last_was_defensive"] = str(getattr(self.cpu, "last_move_name", "") or "") == str(MOVE_DEFENSIVE)
+            g["emergency"] = float(self.cpu.hp_pct()) <= float(CPU_DEFENSIVE_EMERGENCY_HP_PCT) or int(self.cpu.grit) <= 1
+        except Exception:
+            pass
+        try:
+            cpu_hp = float(self.cpu.hp_pct())
+            grounded = getattr(self.cpu, "state", None) == WrestlerState.GROUNDED
+            g["wants_up"] = grounded and cpu_hp >= float(CPU_GETUP_HEALTHY_PCT)
+            g["grounded_hurt"] = grounded and (cpu_hp <= float(CPU_REST_HURT_PCT) or int(self.cpu.grit) <= 1)
+            g["low_hp"] = bool(cost_bias) and cpu_hp < float(CPU_SCORE_LOW_HP_PCT)
+        except Exception:
+            pass
+        return context_vector(g)
+
+    def _cpu_move_values(self, names: list[str], *, cost_bias: bool = True) -> list[float]:
+        """CPU desirability of each move (same order), one fuzz roll per move.
+
+        cpu_scoring does the math; the weights are cpu_score_weights() with the
+        CPU profile's "ai_weights" on top. Values before fuzz are kept in the
+        transposition table for the position.
+        """
+        names = [str(n) for n in names]
+        slot = self._cpu_tt_slot()
+        known = slot.setdefault(("values", bool(cost_bias)), {}) if slot is not None else {}
+        missing = [n for n in dict.fromkeys(names) if n not in known]
+        if missing:
+            try:
+                overrides = dict((getattr(self.cpu, "profile", None) or {}).get("ai_weights") or {})
+            except Exception:
+                overrides = {}
+            scores = self._cpu_score_table().score(
+                missing,
+                self._cpu_score_context(cost_bias=cost_bias),
+                weight_vector(cpu_score_weights(), overrides),
+                plan_progress=self._cpu_plan_progress_fn(),
+                last_move=str(getattr(self.cpu, "last_move_name", None) or ""),
+                is_stale=lambda n: self._would_be_stale(self.cpu, n),
+            )
+            known.update(zip(missing, scores))
+        if slot is not None:
+            self._cpu_tt.note(not missing)
+        # Fuzzing noise to avoid deterministic "robot" behavior.
+        return [float(known[n]) + float(rng.ai.randint(0, 4)) for n in names]
+
+    def _lift_blocked(self, user: Wrestler, target: Wrestler) -> bool:
+        """Weight physics: lighter wrestlers can't lift a healthy heavier target."""
+        try:
+            weights = {"CRUISER": 1, "HEAVY": 2, "SUPER HEAVY": 3, "SUPERHEAVY": 3}
+            u_wc = str(getattr(user, "weight_class", "Heavy") or "Heavy").upper().strip()
+            t_wc = str(getattr(target, "weight_class", "Heavy") or "Heavy").upper().strip()
+            u_wt = int(weights.get(u_wc, 2))
+            t_wt = int(weights.get(t_wc, 2))
+            return u_wt < t_wt and float(target.hp_pct()) > float(LIFT_BLOCK_HP_PCT)
+        except Exception:
+            return False
+
+    def _available_moves(
+        self,
+        user: Wrestler,
+        target: Wrestler,
+        *,
+        ignore_momentum_gate: bool = False,
+        ignore_weight_gate: bool = False,
+    ) -> list[str]:
+        # Safety: if we ever get into a broken grapple state (only one wrestler
+        # thinks they're in a grapple), silently break it so menus never empty.
+        try:
+            self._repair_grapple_desync()
+        except Exception:
+            pass
+
+        idx = self._legality_index()
+        neutral = user.state == WrestlerState.STANDING and target.state == WrestlerState.STANDING
+        mask = idx.static_mask(user, target, neutral_filter=neutral) & idx.moveset_mask(user.moveset)
+
+        # Dynamic gates only touch the survivors that can actually fail them.
+        if (not bool(ignore_weight_gate)) and (mask & idx.lift_mask) and self._lift_blocked(user, target):
+            mask &= ~idx.lift_mask
+        if (not bool(ignore_momentum_gate)) and (mask & idx.momentum_mask):
+            for i in iter_bits(mask & idx.momentum_mask):
+                if not self._has_momentum_for_move(user, idx.slugs[i]):
+                    mask &= ~(1 << i)
+
+        names = idx.slugs_of(mask)
+
+        def key(n: str) -> tuple[int, int, str]:
+            t = str(MOVES[n].get("type", "Setup"))
+            type_order = {"Defensive": 0, "Setup": 1, "Strike": 2, "Grapple": 3, "Aerial": 4, "Submission": 5, "Pin": 6}
+            return (type_order.get(t, 99), int(self._move_base_cost(n)), n)
+
+        return sorted(names, key=key)
+
+    def _calc_clash_score(self, move_name: str, cards: list, *, card_bonus: int = 0) -> int:
+        if move_name == MOVE_DEFENSIVE:
+            return -1
+        if not cards:
+            return 0
+
+        mv = MOVES.get(str(move_name), {})
+        is_technical = bool(mv.get("is_technical", False))
+        try:
+            tech_thr = int(mv.get("tech_threshold", 11) or 11)
+        except Exception:
+            tech_thr = 11
+        tech_thr = max(2, int(tech_thr))
+
+        # Groggy Recovery: card values are capped at 7 for scoring (but you may discard any card).
+        clamp7 = (str(move_name) == MOVE_GROGGY_RECOVERY)
+
+        def v(c) -> int:
+            try:
+                raw = int(c.value)
+            except Exception:
+                raw = 0
+            raw = min(7, raw) if clamp7 else raw
+            if is_technical:
+                return max(0, int(tech_thr) - int(raw))
+            return int(raw)
+
+        doubles = bool(len(cards) == 2 and int(cards[0].value) == int(cards[1].value))
+        same_color = bool(
+            len(cards) == 2
+            and (not doubles)
+            and str(cards[0].color) == str(cards[1].color)
+            and str(cards[0].color) != "GRAY"
+        )
+
+        if doubles:
+            base = int(v(cards[0])) + 5
+        elif same_color:
+            hi = max(int(v(cards[0])), int(v(cards[1])))
+            # Technical moves intentionally reward low cards; do not cap same-color plays.
+            base = int(hi) + 2 if is_technical else min(10, int(hi) + 2)
+        else:
+            base = sum(int(v(c)) for c in cards)
+
+        move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
+        if doubles or same_color:
+            base += max(int(cards[0].color_bonus(move_type)), int(cards[1].color_bonus(move_type)))
+        else:
+            base += sum(int(c.color_bonus(move_type)) for c in cards)
+
+        base += int(card_bonus)
+        base += int(MOVES.get(move_name, {}).get("clash_mod", 0))
+        return int(base)
+
+    def _damage_tier_from_margin(self, diff: int) -> tuple[float, str, bool]:
+        """Return (multiplier, label, force_daze) from winner-vs-loser score margin."""
+        try:
+            d = int(diff)
+        except Exception:
+            d = 0
+
+        # Treat 0/negative as a "clean" connection (tie-breaks, botches, etc.).
+        if d <= 0:
+            return (1.0, "Clean hit", False)
+        if d == 1:
+            return (0.50, "Light contact", False)
+        if 2 <= d <= 3:
+            return (0.75, "Glancing blow", False)
+        if 4 <= d <= 7:
+            return (1.00, "Clean hit", False)
+        return (1.50, "Critical hit", True)
+
+    def _move_requires_type_card(self, move_name: str) -> bool:
+        try:
+            return bool(MOVES.get(str(move_name), {}).get("requires_type_card", False))
+        except Exception:
+            return False
+
+    def _cards_satisfy_type_requirement(self, move_name: str, cards: list) -> bool:
+        if not self._move_requires_type_card(move_name):
+            return True
+        if not cards:
+            return False
+        move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
+        try:
+            return any(int(c.color_bonus(move_type)) > 0 for c in (cards or []))
+        except Exception:
+            return False
+
+    def _wrestler_has_type_card_for_move(self, wrestler: Wrestler, move_name: str) -> bool:
+        if not self._move_requires_type_card(move_name):
+            return True
+        try:
+            hand = list(getattr(wrestler, "hand", None) or [])
+        except Exception:
+            hand = []
+        move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
+        try:
+            return any(int(c.color_bonus(move_type)) > 0 for c in hand)
+        except Exception:
+            return False
+
+    def _is_stale_applicable_attack(self, move_name: str) -> bool:
+        try:
+            if str(move_name) == str(MOVE_PIN):
+                return False
+        except Exception:
+            pass
+        t = str(MOVES.get(str(move_name), {}).get("type", "Setup"))
+        return t in {"Strike", "Grapple", "Aerial", "Submission"}
+
+    def _would_be_stale(self, wrestler: Wrestler, move_name: str) -> bool:
+        if not self._is_stale_applicable_attack(move_name):
+            return False
+        win = max(1, int(STALE_WINDOW_ATTACK_MOVES))
+        thr = max(2, int(STALE_REPEAT_THRESHOLD))
+        lookback = max(0, int(win) - 1)
+        try:
+            recent = list(getattr(wrestler, "recent_attack_moves", None) or [])
+        except Exception:
+            recent = []
+        recent = recent[-lookback:] if lookback else []
+        return recent.count(str(move_name)) >= (int(thr) - 1)
+
+    def _record_attack_move_for_stale(self, wrestler: Wrestler, move_name: str) -> None:
+        if not self._is_stale_applicable_attack(move_name):
+            return
+        win = max(1, int(STALE_WINDOW_ATTACK_MOVES))
+        keep = max(0, int(win) - 1)
+        try:
+            recent = list(getattr(wrestler, "recent_attack_moves", None) or [])
+        except Exception:
+            recent = []
+        recent.append(str(move_name))
+        if keep <= 0:
+            recent = []
+        else:
+            recent = recent[-keep:]
+        try:
+            wrestler.recent_attack_moves = recent
+        except Exception:
+            pass
+
+    def _effective_cost(self, wrestler: Wrestler, move_name: str, cards: list) -> int:
+        mv_cost = int(self._move_base_cost(move_name))
+        # Momentum economy: when the player is "on fire", move costs flow more cheaply.
+        try:
+            if wrestler is self.player and int(getattr(self, "momentum", 0)) >= 2:
+                mv_cost = max(0, int(mv_cost) - 2)
+        except Exception:
+            pass
+        ignore_cards = (move_name == MOVE_REST)
+        card_cost = 0 if ignore_cards else sum(int(c.grit_cost()) for c in (cards or []))
+        return int(mv_cost) + int(card_cost)
+
+    def _resolve_clash(self, p_move: str, p_cards: list, c_move: str, c_cards: list) -> None:
+        if self.game_over:
+            return
+
+        self.clash_count = int(getattr(self, "clash_count", 0) or 0) + 1
+        self._tally_move(self.player, p_move, attempts=1)
+        self._tally_move(self.cpu, c_move, attempts=1)
+        self._log_separator()
+
+        # Track pre-exchange TOSSED so a newly-created toss (e.g., Irish Whip)
+        # persists into the next beat.
+        p_was_tossed = (self.player.state == WrestlerState.TOSSED)
+        c_was_tossed = (self.cpu.state == WrestlerState.TOSSED)
+
+        p_move_cost = int(self._move_base_cost(p_move))
+        c_move_cost = int(self._move_base_cost(c_move))
+
+        # Safety: if a move is selected that can't be afforded, auto-convert it to Rest.
+        if int(self.player.grit) < int(p_move_cost):
+            self._log(f"{self._fmt_name(self.player)} can't afford {self._fmt_move(str(p_move))} — forced Rest.")
+            p_move = MOVE_REST
+            p_move_cost = int(self._move_base_cost(p_move))
+            p_cards = []
+        if int(self.cpu.grit) < int(c_move_cost):
+            self._log(f"{self._fmt_name(self.cpu)} can't afford {self._fmt_move(str(c_move))} — forced Rest.")
+            c_move = MOVE_REST
+            c_move_cost = int(self._move_base_cost(c_move))
+            c_cards = []
+
+        p_ignore_cards = (p_move == MOVE_REST)
+        c_ignore_cards = (c_move == MOVE_REST)
+
+        # Rest is a "quiet" action: it should never use cards to outscore an attack.
+        if p_ignore_cards:
+            p_cards = []
+        if c_ignore_cards:
+            c_cards = []
+
+        p_card_spent = 0 if p_ignore_cards else sum(int(c.grit_cost()) for c in (p_cards or []))
+        c_card_spent = 0 if c_ignore_cards else sum(int(c.grit_cost()) for c in (c_cards or []))
+        p_total_spent = int(p_move_cost) + int(p_card_spent)
+        c_total_spent = int(c_move_cost) + int(c_card_spent)
+
+        p_card_value_sum = 0 if p_ignore_cards else sum(int(c.value) for c in (p_cards or []))
+        c_card_value_sum = 0 if c_ignore_cards else sum(int(c.value) for c in (c_cards or []))
+
+        p_fired = int(getattr(self.player, "fired_up_turns_remaining", 0) or 0) > 0
+        c_fired = int(getattr(self.cpu, "fired_up_turns_remaining", 0) or 0) > 0
+        p_fired_card_bonus = int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) if p_fired else 0
+        c_fired_card_bonus = int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) if c_fired else 0
+        if p_fired_card_bonus and (not p_ignore_cards):
+            p_card_value_sum += int(p_fired_card_bonus) * int(len(p_cards or []))
+        if c_fired_card_bonus and (not c_ignore_cards):
+            c_card_value_sum += int(c_fired_card_bonus) * int(len(c_cards or []))
+
+        p_bonus = int(self.player.next_card_bonus) + int(p_fired_card_bonus) * int(len(p_cards or []))
+        c_bonus = int(self.cpu.next_card_bonus) + int(c_fired_card_bonus) * int(len(c_cards or []))
+
+        p_score = -1 if p_move == MOVE_DEFENSIVE else self._calc_clash_score(p_move, p_cards, card_bonus=p_bonus)
+        c_score = -1 if c_move == MOVE_DEFENSIVE else self._calc_clash_score(c_move, c_cards, card_bonus=c_bonus)
+
+        # Stale move penalty: repeating the same attack within a short window hurts your clash score.
+        p_stale_pen = 0
+        c_stale_pen = 0
+        try:
+            if p_move != MOVE_DEFENSIVE and self._would_be_stale(self.player, p_move):
+                p_stale_pen = int(STALE_CLASH_SCORE_PENALTY)
+                p_score -= int(p_stale_pen)
+        except Exception:
+            p_stale_pen = 0
+        try:
+            if c_move != MOVE_DEFENSIVE and self._would_be_stale(self.cpu, c_move):
+                c_stale_pen = int(STALE_CLASH_SCORE_PENALTY)
+                c_score -= int(c_stale_pen)
+        except Exception:
+            c_stale_pen = 0
+
+        # Note: we intentionally don't emit a separate "repeats X" log line here.
+        # The stale penalty is already visible in the score breakdown (-staleN) and via the [STALE] tag in the move list.
+
+        # Rest can never prevent pins/subs/attacks; make it always lose to them.
+        def _is_attack_for_rest(move_name: str) -> bool:
+            t = str(MOVES.get(str(move_name), {}).get("type", "Setup"))
+            return t in {"Strike", "Grapple", "Aerial", "Pin", "Submission"}
+
+        if str(p_move) == MOVE_REST and _is_attack_for_rest(c_move):
+            p_score = -999
+        if str(c_move) == MOVE_REST and _is_attack_for_rest(p_move):
+            c_score = -999
+
+        # Apply combo-chain bonuses (one-turn window).
+        p_chain_add = 0
+        c_chain_add = 0
+        if p_move != MOVE_DEFENSIVE and getattr(self.player, "chain_window", None) == p_move and int(getattr(self.player, "chain_turns_remaining", 0)) > 0:
+            p_chain_add = int(getattr(self.player, "chain_potency", 0))
+            p_score += int(p_chain_add)
+            self.player.chain_turns_remaining = 0
+            self.player.chain_window = None
+            self.player.chain_potency = 0
+            self._log(f"{self._fmt_name(self.player)}: Combo bonus applied!")
+        if c_move != MOVE_DEFENSIVE and getattr(self.cpu, "chain_window", None) == c_move and int(getattr(self.cpu, "chain_turns_remaining", 0)) > 0:
+            c_chain_add = int(getattr(self.cpu, "chain_potency", 0))
+            c_score += int(c_chain_add)
+            self.cpu.chain_turns_remaining = 0
+            self.cpu.chain_window = None
+            self.cpu.chain_potency = 0
+            self._log(f"{self._fmt_name(self.cpu)}: Combo bonus applied!")
+
+        # Momentum modifier (scaled): 1-3 => ±1, 4-5 => ±2.
+        mom = int(getattr(self, "momentum", 0))
+        mom = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), mom))
+        mag = abs(int(mom))
+        if mag == 0:
+            mom_scaled = 0
+        elif mag <= int(MOMENTUM_SCORE_TIER1_MAX):
+            mom_scaled = int(MOMENTUM_SCORE_TIER1_BONUS)
+        else:
+            mom_scaled = int(MOMENTUM_SCORE_TIER2_BONUS)
+        if mom < 0:
+            mom_scaled = -int(mom_scaled)
+        p_mom_add = int(mom_scaled) if int(mom_scaled) > 0 else 0
+        c_mom_add = int(-mom_scaled) if int(mom_scaled) < 0 else 0
+        if p_move != MOVE_DEFENSIVE:
+            p_score += int(p_mom_add)
+        if c_move != MOVE_DEFENSIVE:
+            c_score += int(c_mom_add)
+
+        if bool(REVEAL_SCORE_BREAKDOWN):
+            def _breakdown(move_name: str, cards: list, card_bonus: int, chain_add: int, mom_add: int, stale_pen: int) -> str:
+                if move_name == MOVE_DEFENSIVE:
+                    pool = sum(int(c.value) for c in (cards or []))
+                    if cards and len(cards) == 2 and int(cards[0].value) == int(cards[1].value):
+                        pool += 5
+                    return f"DEF {pool}"
+                if not cards:
+                    base = 0 + int(chain_add) + int(mom_add) - int(stale_pen)
+                    return f"0+chain{int(chain_add)}+mom{int(mom_add)}-stale{int(stale_pen)}={int(base)}"
+
+                mv = MOVES.get(str(move_name), {})
+                is_technical = bool(mv.get("is_technical", False))
+                try:
+                    tech_thr = int(mv.get("tech_threshold", 11) or 11)
+                except Exception:
+                    tech_thr = 11
+                tech_thr = max(2, int(tech_thr))
+
+                def v(c) -> int:
+                    try:
+                        raw = int(c.value)
+                    except Exception:
+                        raw = 0
+                    if str(move_name) == MOVE_GROGGY_RECOVERY:
+                        raw = min(7, raw)
+                    if is_technical:
+                        return max(0, int(tech_thr) - int(raw))
+                    return int(raw)
+
+                move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
+                clash_mod = int(MOVES.get(move_name, {}).get("clash_mod", 0))
+                doubles = bool(len(cards) == 2 and int(cards[0].value) == int(cards[1].value))
+                same_color = bool(
+                    len(cards) == 2
+                    and (not doubles)
+                    and str(cards[0].color) == str(cards[1].color)
+                    and str(cards[0].color) != "GRAY"
+                )
+
+                if doubles:
+                    val = int(v(cards[0]))
+                    dbl = 5
+                    col = max(int(cards[0].color_bonus(move_type)), int(cards[1].color_bonus(move_type)))
+                    base = int(val) + int(dbl) + int(col) + int(card_bonus) + int(clash_mod)
+                elif same_color:
+                    hi = max(int(v(cards[0])), int(v(cards[1])))
+                    val = int(hi)
+                    dbl = 0
+                    col = max(int(cards[0].color_bonus(move_type)), int(cards[1].color_bonus(move_type)))
+                    pool = int(val) + 2
+                    if not bool(is_technical):
+                        pool = min(10, int(pool))
+                    base = int(pool) + int(col) + int(card_bonus) + int(clash_mod)
+                else:
+                    val = sum(int(v(c)) for c in cards)
+                    dbl = 0
+                    col = sum(int(c.color_bonus(move_type)) for c in cards)
+                    base = int(val) + int(dbl) + int(col) + int(card_bonus) + int(clash_mod)
+
+                total = int(base) + int(chain_add) + int(mom_add) - int(stale_pen)
+                tech_tag = f"TECH{int(tech_thr)}" if is_technical else ""
+                lead = (tech_tag + ":") if tech_tag else ""
+                return f"{lead}{val}+dbl{dbl}+col{col}+bon{int(card_bonus)}+mod{clash_mod}+chain{int(chain_add)}+mom{int(mom_add)}-stale{int(stale_pen)}={int(total)}"
+
+            self._log(
+                f"Score: YOU {_breakdown(p_move, p_cards or [], p_bonus, p_chain_add, p_mom_add, p_stale_pen)} | "
+                f"CPU {_breakdown(c_move, c_cards or [], c_bonus, c_chain_add, c_mom_add, c_stale_pen)}"
+            )
+
+        # Record attempted attack moves for stale tracking (attempts count as "played" for predictability).
+        try:
+            self._record_attack_move_for_stale(self.player, p_move)
+        except Exception:
+            pass
+        try:
+            self._record_attack_move_for_stale(self.cpu, c_move)
+        except Exception:
+            pass
+
+        def is_simultaneous_nonconflicting(name: str) -> bool:
+            mv = MOVES.get(name, {})
+            t = str(mv.get("type", "Setup"))
+            dmg = int(mv.get("damage", 0))
+            if name in {MOVE_DEFENSIVE, MOVE_LOCK_UP, MOVE_FIGHT_FOR_CONTROL}:
+                return False
+            if t in {"Pin", "Submission"}:
+                return False
+            return (t == "Setup" and dmg == 0) or name in {MOVE_TAUNT, MOVE_REST, MOVE_SLOW_STAND_UP, MOVE_KIP_UP}
+
+        simultaneous = bool(is_simultaneous_nonconflicting(p_move) and is_simultaneous_nonconflicting(c_move))
+        defensive_vs_passive = bool(
+            (p_move == MOVE_DEFENSIVE and is_simultaneous_nonconflicting(c_move))
+            or (c_move == MOVE_DEFENSIVE and is_simultaneous_nonconflicting(p_move))
+        )
+        if defensive_vs_passive:
+            simultaneous = True
+
+        # Used by _execute_move to scale VFX by actual damage.
+        self._last_clash_winner = None
+        self._last_clash_flashed = False
+
+        p_name = self._fmt_name(self.player)
+        c_name = self._fmt_name(self.cpu)
+        p_cards_txt = self._fmt_cards(p_cards)
+        c_cards_txt = self._fmt_cards(c_cards)
+
+        def cpu_mode_label() -> str:
+            mode = str(getattr(self, "_last_cpu_mode", None) or "RND").upper()
+            if mode == "GREED":
+                return "Greed"
+            if mode == "GOOD":
+                return "GoodCard"
+            if mode == "BAD":
+                return "BadCard"
+            return "Random"
+
+        # Winner-focused reveal happens after the clash resolves.
+
+        winner = loser = None
+        w_move = None
+        w_score = None
+        skip_winner_botch_check = False
+        force_winner_execute = False
+
+        if simultaneous:
+            if defensive_vs_passive:
+                self._log("Quiet beat: Defense meets a non-attack — both actions resolve.")
+            else:
+                self._log("Simultaneous Action! Both wrestlers focus on their strategy.")
+            self._flash_clash(outcome="neutral", damage=0)
+        elif p_move == MOVE_DEFENSIVE and c_move == MOVE_DEFENSIVE:
+            self._log("Both fighters play it safe—no clean opening this beat.")
+            self._flash_clash(outcome="neutral", damage=0)
+        elif (p_move != MOVE_DEFENSIVE) and (c_move != MOVE_DEFENSIVE) and (p_score == c_score):
+            # Botch edge case: in a tie, a botch can break the stalemate.
+
+            # FIRE UP!: if exactly one side is fired up, they win ties outright.
+            if bool(p_fired) != bool(c_fired):
+                winner, loser = (self.player, self.cpu) if p_fired else (self.cpu, self.player)
+                w_move, w_score = (p_move, p_score) if winner is self.player else (c_move, c_score)
+                force_winner_execute = True
+                skip_winner_botch_check = True
+                self._log(f"FIRE UP! {self._fmt_name(winner)} wins the tie!")
+            else:
+                def is_attack(move_name: str) -> bool:
+                    t = str(MOVES.get(move_name, {}).get("type", "Setup"))
+                    return t not in {"Setup", "Defensive"}
+
+                def botch_roll(w: Wrestler, move_name: str) -> bool:
+                    # FIRE UP!: cannot botch.
+                    try:
+                        if int(getattr(w, "fired_up_turns_remaining", 0) or 0) > 0:
+                            return False
+                    except Exception:
+                        pass
+                    if not is_attack(move_name):
+                        return False
+                    missing = max(0.0, float(MAX_HEALTH) - float(getattr(w, "hp", 0)))
+                    divisor = max(1.0, float(TUNING_BOTCH_DIVISOR))
+                    chance = max(0.0, min(100.0, missing / divisor))
+                    return float(rng.rules.uniform(0.0, 100.0)) < chance
+
+                p_botch = botch_roll(self.player, p_move)
+                c_botch = botch_roll(self.cpu, c_move)
+
+                # If any botch is involved in breaking the tie, don't re-roll botch later.
+                skip_winner_botch_check = bool(p_botch or c_botch)
+
+                if p_botch and (not c_botch):
+                    self._log(f"BOTCH! {self._fmt_name(self.player)} stumbles due to injury!")
+                    winner, loser = self.cpu, self.player
+                    w_move, w_score = c_move, c_score
+                elif c_botch and (not p_botch):
+                    self._log(f"BOTCH! {self._fmt_name(self.cpu)} stumbles due to injury!")
+                    winner, loser = self.player, self.cpu
+                    w_move, w_score = p_move, p_score
+                elif p_botch and c_botch:
+                    # Double botch: healthier wrestler still lands their move.
+                    self._log("DOUBLE BOTCH! Both stumble — the healthier fighter capitalizes!")
+                    force_winner_execute = True
+                    if int(self.player.hp) > int(self.cpu.hp):
+                        winner, loser = self.player, self.cpu
+                        w_move, w_score = p_move, p_score
+                    elif int(self.cpu.hp) > int(self.player.hp):
+                        winner, loser = self.cpu, self.player
+                        w_move, w_score = c_move, c_score
+                    else:
+                        if rng.ties.random() < 0.5:
+                            winner, loser = self.player, self.cpu
+                            w_move, w_score = p_move, p_score
+                        else:
+                            winner, loser = self.cpu, self.player
+                            w_move, w_score = c_move, c_score
+                else:
+                    # No botch: break ties by Strength (remaining deck + hand).
+                    try:
+                        p_str = int(self.player.strength_current())
+                    except Exception:
+                        p_str = 0
+                    try:
+                        c_str = int(self.cpu.strength_current())
+                    except Exception:
+                        c_str = 0
+
+                    if p_str > c_str:
+                        winner, loser = self.player, self.cpu
+                        w_move, w_score = p_move, p_score
+                        force_winner_execute = True
+                        self._log(f"TIE BREAK! {self._fmt_name(self.player)} muscles through on Strength.")
+                    elif c_str > p_str:
+                        winner, loser = self.cpu, self.player
+                        w_move, w_score = c_move, c_score
+                        force_winner_execute = True
+                        self._log(f"TIE BREAK! {self._fmt_name(self.cpu)} muscles through on Strength.")
+                    else:
+                        # True tie: usually coin toss, occasionally double-down.
+                        if rng.ties.random() < float(TUNING_DOUBLE_DOWN_ON_TRUE_TIE_CHANCE):
+                            self._log("DOUBLE DOWN! Both crash into the mat — 5 damage each. Both are GROUNDED.")
+                            self.player.take_damage(5)
+                            self.cpu.take_damage(5)
+                            self.player.clear_grapple()
+                            self.cpu.clear_grapple()
+                            self.player.set_state(WrestlerState.GROUNDED)
+                            self.cpu.set_state(WrestlerState.GROUNDED)
+                        else:
+                            if rng.ties.random() < 0.5:
+                                winner, loser = self.player, self.cpu
+                                w_move, w_score = p_move, p_score
+                            else:
+                                winner, loser = self.cpu, self.player
+                                w_move, w_score = c_move, c_score
+                            force_winner_execute = True
+                            self._log("TIE! A split-second edge decides it.")
+        elif p_score > c_score:
+            winner, loser = self.player, self.cpu
+            w_move, w_score = p_move, p_score
+        else:
+            winner, loser = self.cpu, self.player
+            w_move, w_score = c_move, c_score
+
+        # Better feedback: make the clash winner obvious in the log.
+        if (not simultaneous) and (winner is not None) and (loser is not None):
+            winner_move = p_move if winner is self.player else c_move
+            loser_move = c_move if winner is self.player else p_move
+            winner_score = int(p_score) if winner is self.player else int(c_score)
+            loser_score = int(c_score) if winner is self.player else int(p_score)
+            winner_cards = p_cards if winner is self.player else c_cards
+            loser_cards = c_cards if winner is self.player else p_cards
+
+            def score_txt(move_name: str, score: int, cards: list) -> str:
+                if move_name == MOVE_DEFENSIVE:
+                    pool = sum(int(c.value) for c in (cards or []))
+                    if cards and len(cards) == 2 and int(cards[0].value) == int(cards[1].value):
+                        pool += 5
+                    return f"DEF {pool}"
+                if move_name == MOVE_REST:
+                    return "0"
+                if int(score) < 0:
+                    return "0"
+                return str(int(score))
+
+            w_txt = score_txt(str(winner_move), winner_score, winner_cards)
+            l_txt = score_txt(str(loser_move), loser_score, loser_cards)
+            w_cards_txt = self._fmt_cards(winner_cards)
+            l_cards_txt = self._fmt_cards(loser_cards)
+
+            extra = ""
+            if winner is self.cpu:
+                extra = f" [{cpu_mode_label()}]"
+
+            # Example style:
+            # "CPU was going for Chokeslam (7), but YOU beat him to the punch with Lock Up (9) (Cards: 4, 5)!"
+            if REVEAL_LOSER_MOVE_NAME:
+                if REVEAL_LOSER_CARDS:
+                    loser_bits = f"{self._fmt_move(str(loser_move))} ({l_txt}) ({l_cards_txt})"
+                else:
+                    loser_bits = f"{self._fmt_move(str(loser_move))} ({l_txt})"
+                self._log(
+                    f"[b]{self._fmt_name(winner)} wins the clash![/b] "
+                    f"{self._fmt_name(loser)} was going for {loser_bits}, "
+                    f"but {self._fmt_name(winner)} beats them to it with {self._fmt_move(str(winner_move))} ({w_txt}) ({w_cards_txt})!{extra}"
+                )
+            else:
+                self._log(
+                    f"[b]{self._fmt_name(winner)} wins the clash![/b] "
+                    f"{self._fmt_move(str(winner_move))} ({w_txt}) ({w_cards_txt})!{extra}"
+                )
+
+            # Defer VFX until after botch check so botches don't flash winner colors.
+
+        # --- Botch check happens before criticals (so a botch can't "critical") ---
+        rest_interrupted_player = False
+        rest_interrupted_cpu = False
+        caught_napping_player = False
+        caught_napping_cpu = False
+        critical_damage_override: int | None = None
+
+        if (not simultaneous) and (winner is not None) and (w_move is not None):
+            if (not skip_winner_botch_check) and (not force_winner_execute):
+                fired_no_botch = False
+                try:
+                    fired_no_botch = int(getattr(winner, "fired_up_turns_remaining", 0) or 0) > 0
+                except Exception:
+                    fired_no_botch = False
+
+                if fired_no_botch:
+                    # FIRE UP!: cannot botch.
+                    skip_winner_botch_check = True
+                else:
+                    w_type = str(MOVES.get(str(w_move), {}).get("type", "Setup"))
+                    is_attack = (w_type in {"Strike", "Grapple", "Aerial"})
+                    if is_attack:
+                        missing = max(0.0, float(MAX_HEALTH) - float(getattr(winner, "hp", 0)))
+                        divisor = max(1.0, float(TUNING_BOTCH_DIVISOR))
+                        botch_chance = max(0.0, min(100.0, missing / divisor))
+                        if float(rng.rules.uniform(0.0, 100.0)) < botch_chance:
+                            self._log(f"BOTCH! {self._fmt_name(winner)} stumbles due to injury!")
+                            winner = None
+
+        # Apply clash flash only if a move will actually execute.
+        self._last_clash_winner = winner
+        if (not simultaneous) and (winner is not None) and (loser is not None):
+            # Base flash on clash result; damage (if any) will override in _execute_move.
+            self._flash_clash(outcome=("player" if winner is self.player else "cpu"), damage=0)
+
+        # --- "Caught Napping" criticals (Rest punish) ---
+        if (not simultaneous) and (winner is not None) and (loser is not None) and (w_move is not None):
+            loser_move = c_move if winner is self.player else p_move
+            w_type = str(MOVES.get(str(w_move), {}).get("type", "Setup"))
+            is_attack = w_type in {"Strike", "Grapple", "Aerial", "Pin", "Submission"}
+            if (str(loser_move) == MOVE_REST) and is_attack:
+                rest_interrupted_player = bool(loser is self.player)
+                rest_interrupted_cpu = bool(loser is self.cpu)
+
+                # 25% chance to become a critical when hit while resting.
+                if float(rng.rules.random()) < float(TUNING_CAUGHT_RESTING_CRIT_CHANCE):
+                    caught_napping_player = bool(loser is self.player)
+                    caught_napping_cpu = bool(loser is self.cpu)
+
+                    raw = int(MOVES.get(str(w_move), {}).get("damage", 0))
+                    if raw > 0:
+                        critical_damage_override = int(round(float(raw) * 1.5))
+                    self._log(f"CRITICAL! {self._fmt_name(winner)} catches {self._fmt_name(loser)} resting!")
+
+        # Passive regen text: show it early in the log stack.
+        def _apply_passive_regen(w: Wrestler, total_spent: int, *, blocked: bool) -> None:
+            if not TUNING_ENABLE_PASSIVE_REGEN:
+                return
+            if int(total_spent) != 0:
+                return
+            if bool(blocked):
+                return
+            before = int(w.grit)
+            regen = int(TUNING_GRIT_PASSIVE_REGEN)
+            try:
+                if bool(w.is_winded()):
+                    regen = max(0, int(regen // 2))
+            except Exception:
+                pass
+            w.grit = min(w.max_grit, int(w.grit) + int(regen))
+            gained = int(w.grit) - before
+            if gained > 0:
+                self._log(f"{self._fmt_name(w)}: Passive Regen (+{gained} Grit).")
+
+        _apply_passive_regen(self.player, p_total_spent, blocked=bool(rest_interrupted_player and p_move == MOVE_REST))
+        _apply_passive_regen(self.cpu, c_total_spent, blocked=bool(rest_interrupted_cpu and c_move == MOVE_REST))
+
+        # Spend grit + apply card-driven economy + discard + redraw (both sides pay their attempt).
+        self.player.spend_grit(p_move_cost)
+        # If the player got hit while Resting, cancel all Rest regen (including card-regen).
+        if not (rest_interrupted_player and p_move == MOVE_REST):
+            self.player.apply_grit_from_cards(p_cards, ignore_cost=p_ignore_cards)
+        self.player.discard_cards(p_cards)
+        self.player.draw_to_full()
+
+        self.cpu.spend_grit(c_move_cost)
+        # If the CPU got hit while Resting, cancel all Rest regen (including card-regen).
+        if not (rest_interrupted_cpu and c_move == MOVE_REST):
+            self.cpu.apply_grit_from_cards(c_cards, ignore_cost=c_ignore_cards)
+        self.cpu.discard_cards(c_cards)
+        self.cpu.draw_to_full()
+
+        self.player.next_card_bonus = 0
+        self.cpu.next_card_bonus = 0
+
+        # Grapple-break strikes: defender breaks free on a decisive win.
+        if (not simultaneous) and (winner is not None) and (loser is not None) and (w_move is not None):
+            try:
+                mv = MOVES.get(str(w_move), {})
+                if str(mv.get("type", "Setup")) == "Strike":
+                    w_score_val = int(p_score) if winner is self.player else int(c_score)
+                    l_score_val = int(c_score) if winner is self.player else int(p_score)
+                    margin = int(w_score_val - l_score_val)
+                    if (
+                        margin >= int(GRAPPLE_BREAK_STRIKE_VALUE)
+                        and bool(winner.is_in_grapple())
+                        and bool(loser.is_in_grapple())
+                        and getattr(winner, "grapple_role", None) == GrappleRole.DEFENSE
+                        and getattr(loser, "grapple_role", None) == GrappleRole.OFFENSE
+                    ):
+                        winner.clear_grapple()
+                        loser.clear_grapple()
+                        winner.set_state(WrestlerState.STANDING)
+                        loser.set_state(WrestlerState.STANDING)
+                        self._log(f"BREAK! {self._fmt_name(winner)} cracks {self._fmt_name(loser)} and slips free of the hold!")
+            except Exception:
+                pass
+
+        if simultaneous:
+            self._execute_move(attacker=self.player, defender=self.cpu, move_name=p_move, clash_score=p_score, card_value_sum=p_card_value_sum, cards=p_cards)
+            self._execute_move(attacker=self.cpu, defender=self.player, move_name=c_move, clash_score=c_score, card_value_sum=c_card_value_sum, cards=c_cards)
+        elif (winner is not None) and (w_move is not None):
+            loser_move = c_move if winner is self.player else p_move
+            loser_type = str(MOVES.get(loser_move, {}).get("type", "Setup"))
+            if str(w_move) in {MOVE_TAUNT, MOVE_REST} and loser_type not in {"Setup", "Defensive"}:
+                self._log(f"{self._fmt_name(winner)} dodges effortlessly while {self._fmt_name(loser)} wastes the beat.")
+
+            passive_winner = str(w_move) in {MOVE_TAUNT, MOVE_REST}
+            positioning_loser = str(loser_move) in {MOVE_SLOW_STAND_UP, MOVE_KIP_UP, MOVE_CLIMB_DOWN, MOVE_STOP_SHORT, MOVE_SHOVE_OFF}
+            run_loser_after = bool(passive_winner and positioning_loser)
+
+            # Defensive cancel/soften
+            if (p_move == MOVE_DEFENSIVE and winner is self.cpu) or (c_move == MOVE_DEFENSIVE and winner is self.player):
+                defender_cards = p_cards if p_move == MOVE_DEFENSIVE else c_cards
+                pool = sum(int(c.value) for c in (defender_cards or []))
+                if defender_cards and len(defender_cards) == 2 and int(defender_cards[0].value) == int(defender_cards[1].value):
+                    pool += 5
+                try:
+                    defender = self.player if p_move == MOVE_DEFENSIVE else self.cpu
+                    if int(getattr(defender, "fired_up_turns_remaining", 0) or 0) > 0:
+                        pool += int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) * int(len(defender_cards or []))
+                except Exception:
+                    pass
+                opp_score = int(w_score or 0)
+                raw_dmg = int(MOVES.get(w_move, {}).get("damage", 0))
+
+                # Active Defense: perfect-guard reversal if you barely lose (<=2).
+                margin = int(opp_score) - int(pool)
+                if 0 <= int(margin) <= 2:
+                    defender = self.player if p_move == MOVE_DEFENSIVE else self.cpu
+                    attacker = winner
+                    self._log(f"PERFECT GUARD! {self._fmt_name(defender)} reverses the momentum at the last second!")
+                    dealt = attacker.take_damage(5, target_part="BODY")
+                    self._log(f"{self._fmt_name(attacker)} takes {self._fmt_damage(dealt)} on the counter!")
+                    try:
+                        delta = 2 if defender is self.player else -2
+                        cur = int(getattr(self, "momentum", 0))
+                        self.momentum = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), int(cur + delta)))
+                    except Exception:
+                        pass
+                    try:
+                        self._flash_clash(outcome=("player" if defender is self.player else "cpu"), damage=int(dealt))
+                    except Exception:
+                        pass
+                    # Do not execute the original attacker's move.
+                else:
+                    avoid_ok = (opp_score <= 10 and pool >= opp_score)
+                    suppress_states = (opp_score <= 10 and pool >= max(1, opp_score - 2))
+                    if avoid_ok:
+                        self._log(f"Defensive ({pool}): slip away from the attack!")
+                    else:
+                        reduction = pool if opp_score <= 10 else (pool // 2)
+                        boosted_raw = int(raw_dmg)
+                        w_cards = p_cards if winner is self.player else c_cards
+                        try:
+                            if boosted_raw > 0 and w_cards and len(w_cards) == 2 and int(w_cards[0].value) == int(w_cards[1].value):
+                                w_type = str(MOVES.get(w_move, {}).get("type", "Setup"))
+                                if w_type in {"Strike", "Grapple", "Aerial"}:
+                                    boosted_raw = int(math.ceil(float(boosted_raw) * float(DOUBLES_DAMAGE_MODIFIER)))
+                        except Exception:
+                            pass
+
+                        dmg_override = max(0, int(boosted_raw) - max(0, reduction))
+                        if int(raw_dmg) > 0 and int(dmg_override) < int(boosted_raw):
+                            self._log(f"Defensive ({pool}): soften the blow ({int(boosted_raw)}->{int(dmg_override)}).")
+                        w_val = p_card_value_sum if winner is self.player else c_card_value_sum
+                        self._execute_move(attacker=winner, defender=loser, move_name=w_move, clash_score=w_score, damage_override=dmg_override, suppress_state_changes=bool(suppress_states), card_value_sum=w_val, cards=w_cards, apply_doubles_bonus=False)
+            else:
+                w_cards = p_cards if winner is self.player else c_cards
+                w_val = p_card_value_sum if winner is self.player else c_card_value_sum
+                # Margin-of-victory damage scaling: use the score difference between winner and loser.
+                try:
+                    w_score_val = int(p_score) if winner is self.player else int(c_score)
+                    l_score_val = int(c_score) if winner is self.player else int(p_score)
+                except Exception:
+                    w_score_val = int(w_score or 0)
+                    l_score_val = 0
+                # Clamp loser score to avoid Rest (-999) creating guaranteed crits.
+                margin = max(0, max(0, int(w_score_val)) - max(0, int(l_score_val)))
+                mult, tier_label, force_daze = self._damage_tier_from_margin(int(margin))
+                self._execute_move(
+                    attacker=winner,
+                    defender=loser,
+                    move_name=w_move,
+                    clash_score=w_score,
+                    damage_override=critical_damage_override,
+                    card_value_sum=w_val,
+                    cards=w_cards,
+                    margin_diff=int(margin),
+                    margin_mult=float(mult),
+                    margin_label=str(tier_label),
+                    margin_force_daze=bool(force_daze),
+                )
+
+            if run_loser_after:
+                self._execute_move(attacker=loser, defender=winner, move_name=str(loser_move), damage_override=0)
+
+        # High-risk "shoot" moves: on loss, you can end up GROUNDED (sprawled on / stuffed).
+        if (not simultaneous) and (winner is not None) and (loser is not None):
+            try:
+                loser_move_name = str(c_move) if winner is self.player else str(p_move)
+                lm = MOVES.get(loser_move_name, {})
+                on_loss_state = str(lm.get("on_loss_set_user_state", "") or "").strip()
+                if on_loss_state:
+                    try:
+                        loser.clear_grapple()
+                    except Exception:
+                        pass
+                    loser.set_state(WrestlerState(on_loss_state))
+                    try:
+                        self._repair_grapple_desync()
+                    except Exception:
+                        pass
+                    self._log(f"SPRAWL! {self._fmt_name(loser)} shoots in and gets stuffed — they're {on_loss_state}.")
+            except Exception:
+                pass
+
+        # Irish whip window: if a wrestler STARTED this exchange as TOSSED and the opponent
+        # doesn't capitalize with a TOSSED-targeting attack, they recover.
+        def _capitalized_on_tossed(attacker_move: str) -> bool:
+            mv = MOVES.get(str(attacker_move), {})
+
+            # If you used this beat to build a RUNNING follow-up (e.g., Charge),
+            # keep the tossed window open so rebound attacks can happen next.
+            try:
+                if str(mv.get("set_user_state", "")) == "RUNNING":
+                    return True
+            except Exception:
+                pass
+
+            if str(mv.get("req_target_state", "ANY")) != "TOSSED":
+                return False
+            t = str(mv.get("type", "Setup"))
+            dmg = int(mv.get("damage", 0))
+            return (t not in {"Setup", "Defensive"}) or dmg > 0
+
+        try:
+            if bool(p_was_tossed) and self.player.state == WrestlerState.TOSSED and not _capitalized_on_tossed(str(c_move)):
+                self.player.set_state(WrestlerState.STANDING)
+            if bool(c_was_tossed) and self.cpu.state == WrestlerState.TOSSED and not _capitalized_on_tossed(str(p_move)):
+                self.cpu.set_state(WrestlerState.STANDING)
+        except Exception:
+            pass
+
+        # Groggy recovery: apply progress regardless of clash outcome.
+        if str(p_move) == MOVE_GROGGY_RECOVERY:
+            self._apply_groggy_recovery_attempt(self.player, list(p_cards or []))
+        if str(c_move) == MOVE_GROGGY_RECOVERY:
+            self._apply_groggy_recovery_attempt(self.cpu, list(c_cards or []))
+
+        # Momentum update (after resolution): winning shifts MOM; big reversals reset toward center.
+        if (not simultaneous) and (winner is not None) and (w_move is not None):
+            delta = 0
+            if str(w_move) != MOVE_DEFENSIVE:
+                if bool(MOMENTUM_GAIN_ON_ATTACKS_ONLY):
+                    w_type = str(MOVES.get(str(w_move), {}).get("type", "Setup"))
+                    is_attack = w_type not in {"Setup", "Defensive"}
+                    if is_attack:
+                        delta = int(MOMENTUM_WIN_DELTA) if (winner is self.player) else -int(MOMENTUM_WIN_DELTA)
+                else:
+                    delta = int(MOMENTUM_WIN_DELTA) if (winner is self.player) else -int(MOMENTUM_WIN_DELTA)
+
+            if delta != 0:
+                cur = int(getattr(self, "momentum", 0))
+                cur = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), cur))
+                if abs(cur) >= int(MOMENTUM_REVERSAL_RESET_THRESHOLD) and (cur * delta) < 0:
+                    self._log("Momentum swing! The match flow resets.")
+                    cur = 0
+                self.momentum = max(-int(MOMENTUM_MAX_ABS), min(int(MOMENTUM_MAX_ABS), int(cur + delta)))
+
+        self._update_hud()
+
+        # No HP-based KO ending; clamp at 0 and keep going.
+        self.player.hp = max(0, int(self.player.hp))
+        self.cpu.hp = max(0, int(self.cpu.hp))
+
+        if self._escape_mode:
+            self._render_escape_ui()
+            self._update_control_bar()
+        else:
+            self._start_turn("player")
+
+    def _escape_threshold(self, victim_hp_pct: float) -> int:
+        return escape_threshold(victim_hp_pct)
+
+    def _seed_groggy_meter(self, victim: Wrestler) -> int:
+        """HP-scaled groggy recovery threshold.
+
+        Lower HP => higher meter => more recovery plays needed.
+        """
+        try:
+            hp_pct = float(victim.hp_pct())
+        except Exception:
+            hp_pct = 1.0
+        missing = max(0.0, min(1.0, 1.0 - float(hp_pct)))
+        base = 8
+        scale = 16
+        meter = int(base + round(scale * missing))
+
+        # If already DAZED, make the groggy a bit stickier.
+        try:
+            if int(getattr(victim, "daze_turns", 0) or 0) > 0:
+                meter += 2
+        except Exception:
+            pass
+
+        return max(8, min(26, int(meter)))
+
+    def _recover_pin_escape_mult_from_damage(self, defender: Wrestler, dealt: int) -> None:
+        """Recover the defender's pin escape multiplier back toward 1.0.
+
+        Each successful kickout reduces `pin_escape_threshold_mult`, making future pins easier to escape.
+        This recovery nudges it back up as the defender takes damage, so repeated beatdowns restore
+        meaningful pin thresholds.
+        """
+        try:
+            dmg = max(0, int(dealt))
+        except Exception:
+            return
+        if dmg <= 0:
+            return
+
+        try:
+            cur = float(getattr(defender, "pin_escape_threshold_mult", 1.0) or 1.0)
+        except Exception:
+            return
+        cur = max(0.0, min(1.0, float(cur)))
+        if cur >= 1.0:
+            return
+
+        # Scale recovery: the more hurt they are, the faster pins become viable again.
+        try:
+            hp_pct = float(defender.hp_pct())
+        except Exception:
+            hp_pct = 1.0
+        missing = max(0.0, min(1.0, 1.0 - float(hp_pct)))
+        scale = 0.75 + 0.75 * float(missing)  # 0.75..1.5
+
+        inc = float(dmg) * float(TUNING_PIN_ESCAPE_THRESHOLD_MULT_RECOVER_PER_DAMAGE) * float(scale)
+        defender.pin_escape_threshold_mult = min(1.0, float(cur) + float(inc))
+
+    def _groggy_progress_from_cards(self, cards: list) -> int:
+        if not cards:
+            return 0
+
+        def v(c) -> int:
+            try:
+                return min(7, int(c.value))
+            except Exception:
+                return 0
+
+        if len(cards) == 2:
+            same_val = (int(cards[0].value) == int(cards[1].value))
+            same_col = (str(cards[0].color) == str(cards[1].color)) and (str(cards[0].color) != "GRAY")
+            if same_val:
+                return int(v(cards[0])) + 5
+            if same_col:
+                hi = max(int(v(cards[0])), int(v(cards[1])))
+                return int(min(10, int(hi) + 2))
+        return int(sum(int(v(c)) for c in cards))
+
+    def _apply_groggy_recovery_attempt(self, who: Wrestler, cards: list) -> None:
+        if not bool(getattr(who, "is_groggy", False)):
+            return
+
+        # While recovering, you're still a little vulnerable.
+        try:
+            who.next_damage_taken_multiplier = max(float(getattr(who, "next_damage_taken_multiplier", 1.0)), 1.25)
+        except Exception:
+            pass
+
+        before = int(getattr(who, "groggy_meter", 0) or 0)
+        if before <= 0:
+            who.is_groggy = False
+            who.groggy_meter = 0
+            return
+
+        progress = int(self._groggy_progress_from_cards(list(cards or [])))
+        who.groggy_meter = max(0, int(before) - int(progress))
+
+        if int(who.groggy_meter) <= 0:
+            who.is_groggy = False
+            who.groggy_meter = 0
+            try:
+                who.daze_turns = 0
+                who.daze_cooldown_turns = max(int(getattr(who, "daze_cooldown_turns", 0) or 0), int(TUNING_DAZE_COOLDOWN_TURNS))
+            except Exception:
+                pass
+            self._log(f"{self._fmt_name(who)} shakes off the stun!")
+        else:
+            self._log(f"Stunned... (Groggy: {int(who.groggy_meter)} left)")
+
+    def _begin_escape(self, *, attacker: Wrestler, defender: Wrestler, kind: str, move_name: str | None = None) -> None:
+        # Escape sequences are their own interaction; don't overlap with Groggy.
+        # (Being pinned/caught in a hold should not also force Groggy Recovery.)
+        try:
+            if bool(getattr(defender, "is_groggy", False)):
+                defender.is_groggy = False
+                defender.groggy_meter = 0
+        except Exception:
+            pass
+
+        # Ensure the defender can actually perform the 3-card escape interaction.
+        # "No redraw" means no redraw DURING the attempt, not "you might have 0 cards".
+        try:
+            if int(len(list(defender.hand or []))) < 3:
+                defender.draw_to_full()
+        except Exception:
+            pass
+
+        threshold = self._escape_threshold(defender.hp_pct())
+        try:
+            if str(kind).upper() == "PINFALL":
+                mult = float(getattr(defender, "pin_escape_threshold_mult", 1.0) or 1.0)
+                threshold = pin_threshold(threshold, mult)
+        except Exception:
+            pass
+        self._escape_mode = {
+            "kind": str(kind),
+            "threshold": int(threshold),
+            "total": 0,
+            "plays_left": 3,
+            "move_name": str(move_name) if move_name else None,
+            "attacker_is_player": bool(attacker.is_player),
+            "defender_is_player": bool(defender.is_player),
+            "attacker": attacker,
+            "defender": defender,
+        }
+        self._menu_stage = "ESCAPE"
+        self._selected_category = None
+        self.selected_move = None
+        self.selected_cards.clear()
+
+        if defender.is_player:
+            self._log(f"{kind}! Tap 3 cards to escape (no redraw).")
+            self._render_moves_ui()
+            self._render_hand()
+            self._update_control_bar()
+            return
+
+        # CPU defending: stepwise discards (_cpu_escape_card); user presses CONTINUE between beats.
+        self._log(f"{self._fmt_name(attacker)} attempts a {str(kind).lower()}!")
+        self._render_moves_ui()
+        self._render_hand()
+        self._update_control_bar()
+
+    def _escape_continue_cpu(self, _inst=None) -> None:
+        if self.game_over or not self._escape_mode:
+            return
+        if bool(self._escape_mode.get("defender_is_player")):
+            return
+
+        attacker = self._escape_mode.get("attacker")
+        defender = self._escape_mode.get("defender")
+        if not isinstance(attacker, Wrestler) or not isinstance(defender, Wrestler):
+            return
+
+        plays_before = int(self._escape_mode.get("plays_left", 0))
+        if plays_before <= 0:
+            return
+        count_no = max(1, 4 - int(plays_before))
+
+        hand = list(defender.hand or [])
+        if not hand:
+            self._escape_mode["plays_left"] = 0
+        else:
+            best = self._cpu_escape_card(defender, hand)
+            gained = int(best.value)
+            defender.discard_cards([best])
+            self._escape_mode["total"] = int(self._escape_mode.get("total", 0)) + gained
+            self._escape_mode["plays_left"] = int(self._escape_mode.get("plays_left", 0)) - 1
+
+            total = int(self._escape_mode.get("total", 0))
+            threshold = int(self._escape_mode.get("threshold", 1))
+            kind = str(self._escape_mode.get("kind", "ESCAPE"))
+
+            if kind.upper() == "PINFALL":
+                if count_no == 1:
+                    self._log(f"ONE! {self._fmt_name(defender)} fights out using a {gained}. (total {total}/{threshold})")
+                elif count_no == 2:
+                    self._log(f"TWO! {self._fmt_name(defender)} kicks out using a {gained}. (total {total}/{threshold})")
+                else:
+                    self._log(f"THREE...?! {self._fmt_name(defender)} strains with a {gained}. (total {total}/{threshold})")
+            else:
+                self._log(f"Escape attempt: {self._fmt_name(defender)} discards {gained} (total {total}/{threshold})")
+
+            if total >= threshold:
+                if kind.upper() == "PINFALL":
+                    if count_no == 1:
+                        self._log(f"KICKOUT AT ONE! {self._fmt_name(defender)} escapes!")
+                    elif count_no == 2:
+                        self._log(f"KICKOUT AT TWO! {self._fmt_name(defender)} escapes!")
+                    else:
+                        self._log(f"JUST IN TIME! {self._fmt_name(defender)} escapes!")
+                else:
+                    self._log(f"{self._fmt_name(defender)} escapes the {str(kind).lower()} attempt!")
+                self._end_escape(success=True)
+                return
+
+            if kind.upper() == "SUBMISSION":
+                tick = int(SUBMISSION_TICK_DAMAGE)
+                try:
+                    move_name = str(self._escape_mode.get("move_name") or "")
+                    mv = MOVES.get(move_name, {}) if move_name else {}
+                    tick = int(mv.get("tick_damage", tick))
+                except Exception:
+                    tick = int(SUBMISSION_TICK_DAMAGE)
+                dealt = defender.take_damage(int(tick), target_part="BODY")
+                self._log(f"{self._fmt_name(attacker)} cranks it! {self._fmt_name(defender)} takes {self._fmt_damage(dealt)}.")
+
+        if int(self._escape_mode.get("plays_left", 0)) <= 0:
+            kind = str(self._escape_mode.get("kind", "ESCAPE"))
+            winner = self._fmt_name(attacker)
+            self.game_over = True
+            if kind.upper() == "PINFALL":
+                self._log(f"THREE! {kind}! Escape failed — {winner} wins.")
+            else:
+                self._log(f"{kind}! Escape failed — {winner} wins.")
+            self._update_control_bar()
+            self._on_match_over()
+            return
+
+        self._render_moves_ui()
+        self._update_control_bar()
+
+    def _cpu_escape_card(self, defender: Wrestler, hand: list):
+        """The card the CPU discards next in an escape: the endgame table's pick, else its highest."""
+        table = self.endgame_table
+        if table is not None and self._escape_mode:
+            try:
+                needed = int(self._escape_mode.get("threshold", 1)) - int(self._escape_mode.get("total", 0))
+                value = table.escape_card(
+                    str(getattr(defender, "archetype", "BALANCED")),
+                    str(self._escape_mode.get("kind", "ESCAPE")),
+                    needed,
+                    int(self._escape_mode.get("plays_left", 0)),
+                    [int(c.value) for c in hand],
+                )
+                for c in hand:
+                    if int(c.value) == value:
+                        return c
+            except Exception:
+                pass
+        return max(hand, key=lambda c: int(c.value))
+
+    def _escape_play_card(self, index: int) -> None:
+        if self.game_over or not self._escape_mode:
+            return
+        if not bool(self._escape_mode.get("defender_is_player")):
+            return
+        hand = list(self.player.hand or [])
+        if index < 0 or index >= len(hand):
+            return
+        card = hand[index]
+        gained = int(card.value)
+        self.player.discard_cards([card])
+
+        plays_before = int(self._escape_mode.get("plays_left", 0))
+        count_no = max(1, 4 - int(plays_before))
+
+        self._escape_mode["total"] = int(self._escape_mode.get("total", 0)) + gained
+        self._escape_mode["plays_left"] = int(self._escape_mode.get("plays_left", 0)) - 1
+
+        total = int(self._escape_mode.get("total", 0))
+        threshold = int(self._escape_mode.get("threshold", 1))
+        kind = str(self._escape_mode.get("kind", "ESCAPE"))
+
+        if kind.upper() == "PINFALL":
+            if count_no == 1:
+                self._log(f"ONE! Escape attempt: discard {gained}.")
+            elif count_no == 2:
+                self._log(f"TWO! Escape attempt: discard {gained}.")
+            else:
+                self._log(f"THREE... Escape attempt: discard {gained}.")
+        else:
+            self._log(f"Escape discard: {gained}.")
+        self._render_hand()
+        self._render_moves_ui()
+        self._update_control_bar()
+
+        if total >= threshold:
+            if kind.upper() == "PINFALL":
+                if count_no == 1:
+                    self._log("KICKOUT AT ONE!")
+                elif count_no == 2:
+                    self._log("KICKOUT AT TWO!")
+                else:
+                    self._log("JUST IN TIME! KICKOUT!")
+            self._log(f"You escape the {kind.lower()} attempt!")
+            self._end_escape(success=True)
+            return
+
+        if kind.upper() == "SUBMISSION":
+            try:
+                attacker = self._escape_mode.get("attacker")
+                defender = self._escape_mode.get("defender")
+                if isinstance(attacker, Wrestler) and isinstance(defender, Wrestler):
+                    tick = int(SUBMISSION_TICK_DAMAGE)
+                    try:
+                        move_name = str(self._escape_mode.get("move_name") or "")
+                        mv = MOVES.get(move_name, {}) if move_name else {}
+                        tick = int(mv.get("tick_damage", tick))
+                    except Exception:
+                        tick = int(SUBMISSION_TICK_DAMAGE)
+                    dealt = defender.take_damage(int(tick), target_part="BODY")
+                    self._log(f"{self._fmt_name(attacker)} cranks it! {self._fmt_name(defender)} takes {self._fmt_damage(dealt)}.")
+            except Exception:
+                pass
+
+        if int(self._escape_mode.get("plays_left", 0)) <= 0:
+            winner = "YOU" if bool(self._escape_mode.get("attacker_is_player")) else "CPU"
+            self.game_over = True
+            if kind.upper() == "PINFALL":
+                self._log(f"THREE! {kind}! Escape failed — {winner} wins.")
+            else:
+                self._log(f"{kind}! Escape failed — {winner} wins.")
+            self._update_control_bar()
+            self._on_match_over()
+            return
+
+    def _end_escape(self, *, success: bool) -> None:
+        if not self._escape_mode:
+            return
+        attacker = self._escape_mode.get("attacker")
+        defender = self._escape_mode.get("defender")
+        kind = str(self._escape_mode.get("kind", "ESCAPE"))
+
+        # Pin anti-spam: each successful kickout makes future pins easier to escape.
+        if success and isinstance(defender, Wrestler) and kind.upper() == "PINFALL":
+            try:
+                cur = float(getattr(defender, "pin_escape_threshold_mult", 1.0) or 1.0)
+                defender.pin_escape_threshold_mult = float(cur) * float(TUNING_PIN_ESCAPE_THRESHOLD_MULT_ON_SUCCESS)
+            except Exception:
+                pass
+        if success and isinstance(attacker, Wrestler) and isinstance(defender, Wrestler):
+            attacker.clear_grapple()
+            defender.clear_grapple()
+            attacker.set_state(WrestlerState.STANDING)
+            defender.set_state(WrestlerState.STANDING)
+            attacker.draw_to_full()
+            defender.draw_to_full()
+
+        self._escape_mode = None
+        self._menu_stage = "CATEGORIES"
+        self._selected_category = None
+        self.selected_move = None
+        self.selected_cards.clear()
+        self._render_hand()
+        self._render_moves_ui()
+        self._update_hud()
+        self._update_control_bar()
+
+    def _tally_move(self, who: Wrestler, move_name: str, *, attempts: int = 0, landed: int = 0, damage: int = 0) -> None:
+        try:
+            usage = getattr(self, "move_usage", None)
+            if usage is None:
+                return
+            seat = "player" if who is self.player else "cpu"
+            row = usage[seat].setdefault(str(move_name), [0, 0, 0])
+            row[0] += int(attempts)
+            row[1] += int(landed)
+            row[2] += int(damage)
+        except Exception:
+            pass
+
+    def _execute_move(self, *, attacker: Wrestler, defender: Wrestler, move_name: str, **kw) -> None:
+        """Land a move (see _apply_move) and tally it for the match stats."""
+        hp_before = int(defender.hp)
+        self._apply_move(attacker=attacker, defender=defender, move_name=move_name, **kw)
+        self._tally_move(attacker, move_name, landed=1, damage=max(0, hp_before - int(defender.hp)))
+
+    def _apply_move(
+        self,
+        *,
+        attacker: Wrestler,
+        defender: Wrestler,
+        move_name: str,
+        clash_score: int | None = None,
+        damage_override: int | None = None,
+        suppress_state_changes: bool = False,
+        card_value_sum: int = 0,
+        cards: list | None = None,
+        apply_doubles_bonus: bool = True,
+        margin_diff: int | None = None,
+        margin_mult: float | None = None,
+        margin_label: str | None = None,
+        margin_force_daze: bool = False,
+    ) -> None:
+        # card_value_sum/cards are optional extras used by Taunt + Stand Up systems.
+
+        move = MOVES[move_name]
+        mtype = str(move.get("type", "Setup"))
+
+        pre_hp_pct = 1.0
+        try:
+            pre_hp_pct = float(defender.hp_pct())
+        except Exception:
+            pre_hp_pct = 1.0
+
+        was_dazed = False
+        try:
+            was_dazed = int(getattr(defender, "daze_turns", 0) or 0) > 0
+        except Exception:
+            was_dazed = False
+
+        # Headless (no log): don't render the flavor line at all.
+        if self._log_lines is not None:
+            flavor = self._flavor_line(str(move_name), str(move.get("flavor_text", "")), attacker=attacker, defender=defender)
+            self._log(f"{self._fmt_name(attacker)} uses {self._fmt_move(move_name)}! {flavor}")
+
+        # AI memory: track what was just executed to avoid repetition.
+        try:
+            attacker.last_move_name = str(move_name)
+        except Exception:
+            pass
+
+        # Anti-turtle helper: executing Defensive starts a short cooldown window.
+        try:
+            if str(move_name) == MOVE_DEFENSIVE:
+                attacker.defensive_cooldown_turns = max(
+                    int(getattr(attacker, "defensive_cooldown_turns", 0) or 0),
+                    int(CPU_DEFENSIVE_COOLDOWN_TURNS),
+                )
+        except Exception:
+            pass
+
+        if move_name == MOVE_REST:
+            before = attacker.grit
+            attacker.grit = min(attacker.max_grit, attacker.grit + 3)
+            gained = attacker.grit - before
+            self._log(f"{self._fmt_name(attacker)} recovers (+{gained} Grit).")
+            return
+
+        if move_name == MOVE_GROGGY_RECOVERY:
+            # Recovery progress is applied after the beat resolves (even if you lose the clash).
+            # This hook only sets the vulnerability tag.
+            attacker.next_damage_taken_multiplier = max(float(getattr(attacker, "next_damage_taken_multiplier", 1.0)), 1.25)
+            return
+
+        if move_name == MOVE_TAUNT:
+            base = int(TUNING_TAUNT_HYPE_BASE)
+            bonus = int(card_value_sum) * int(TUNING_TAUNT_HYPE_PER_CARD_VALUE)
+            gained = min(int(TUNING_TAUNT_HYPE_MAX), int(base) + int(bonus))
+            attacker.add_hype(gained)
+            self._log(f"{self._fmt_name(attacker)} gets fired up! (+{gained} Hype)")
+            return
+
+        if move_name in {MOVE_SLOW_STAND_UP, MOVE_KIP_UP}:
+            # Cumulative stand-up: reduce stun_meter instead of instantly standing.
+            if attacker.state != WrestlerState.GROUNDED:
+                self._log(f"{self._fmt_name(attacker)} tries to stand, but isn't down.")
+                return
+
+            progress = int(card_value_sum)
+            if cards and len(cards) == 2 and int(cards[0].value) == int(cards[1].value):
+                progress += 5
+
+            before = int(getattr(attacker, "stun_meter", 0))
+            attacker.stun_meter = int(before) - int(progress)
+            attacker.add_hype(int(move.get("hype_gain", 0)))
+
+            if int(attacker.stun_meter) <= 0:
+                attacker.stun_meter = 0
+                attacker.set_state(WrestlerState.STANDING)
+                self._log(f"{self._fmt_name(attacker)} fights to their feet!")
+            else:
+                self._log(f"Struggling to rise... (Stun: {attacker.stun_meter} left)")
+            return
+
+        if move_name == MOVE_SHOVE_OFF:
+            if attacker.is_in_grapple() or defender.is_in_grapple():
+                attacker.clear_grapple()
+                defender.clear_grapple()
+                attacker.set_state(WrestlerState.STANDING)
+                defender.set_state(WrestlerState.STANDING)
+                self._log(f"{self._fmt_name(attacker)} shoves free and resets to neutral!")
+            else:
+                self._log(f"{self._fmt_name(attacker)} pushes empty air — {self._fmt_name(defender)} was already gone!")
+            return
+
+        # Pin/Submission start escape
+        if mtype in {"Pin", "Submission"}:
+            kind = "PINFALL" if mtype == "Pin" else "SUBMISSION"
+            self._begin_escape(attacker=attacker, defender=defender, kind=kind, move_name=move_name)
+            return
+
+        raw_damage = int(move.get("damage", 0)) if damage_override is None else int(damage_override)
+
+        # Doubles bonus damage: if doubles were used for a successful attack, boost by 25%.
+        try:
+            if bool(apply_doubles_bonus) and raw_damage > 0 and cards and len(cards) == 2 and int(cards[0].value) == int(cards[1].value):
+                if mtype in {"Strike", "Grapple", "Aerial"}:
+                    raw_damage = int(math.ceil(float(raw_damage) * float(DOUBLES_DAMAGE_MODIFIER)))
+                    self._log("Doubles hit! Damage boosted.")
+        except Exception:
+            pass
+
+        # Margin-of-victory scaling: stronger wins hit harder.
+        try:
+            if raw_damage > 0 and margin_mult is not None:
+                raw_damage = int(max(0, int(math.ceil(float(raw_damage) * float(margin_mult)))))
+        except Exception:
+            pass
+
+        dealt = 0
+        if raw_damage > 0:
+            target_part = move.get("target_part", None)
+            dealt = defender.take_damage(raw_damage, target_part=str(target_part) if target_part else None)
+
+            tier_txt = ""
+            try:
+                if margin_label and (margin_mult is not None):
+                    tier_txt = f" ({str(margin_label)})"
+            except Exception:
+                tier_txt = ""
+            self._log(f"{self._fmt_name(defender)} takes {self._fmt_damage(dealt)}{tier_txt}.")
+
+            # Pin anti-spam recovery: damage restores pin viability over time.
+            try:
+                self._recover_pin_escape_mult_from_damage(defender, int(dealt))
+            except Exception:
+                pass
+
+            # Apply DAZED probabilistically (HP-based).
+            try:
+                # Crit-tier can force DAZE, but only for moves explicitly flagged to daze (or finishers).
+                forced = bool(margin_force_daze) and (bool(move.get("can_daze", False)) or bool(move.get("is_finisher", False)))
+                if (not bool(was_dazed)):
+                    cd = int(getattr(defender, "daze_cooldown_turns", 0) or 0)
+                    if cd <= 0:
+                        turns = 0
+                        if forced:
+                            turns = 2
+                        else:
+                            turns = int(self._calc_daze_application(defender, move))
+                        if turns > 0 and int(getattr(defender, "hp", 0)) > 0:
+                            defender.daze_turns = max(int(getattr(defender, "daze_turns", 0) or 0), int(turns))
+                            try:
+                                defender.is_groggy = True
+                                seed = int(self._seed_groggy_meter(defender))
+                                cur = int(getattr(defender, "groggy_meter", 0) or 0)
+                                defender.groggy_meter = max(int(cur), int(seed))
+                                defender.daze_cooldown_turns = 0
+                            except Exception:
+                                pass
+                            if forced:
+                                self._log(f"{self._fmt_name(defender)} is DAZED! (CRITICAL)")
+                            else:
+                                self._log(f"{self._fmt_name(defender)} is DAZED! ({int(defender.daze_turns)})")
+            except Exception:
+                pass
+
+            # Anti-infinite safety: hitting a dazed opponent wakes them up over time,
+            # or instantly if you hit too hard.
+            try:
+                if bool(was_dazed) and mtype in {"Strike", "Grapple", "Aerial"}:
+                    before = int(getattr(defender, "daze_turns", 0) or 0)
+                    if int(dealt) >= int(TUNING_DAZE_WAKE_DAMAGE):
+                        defender.daze_turns = 0
+                        if before > 0:
+                            self._log(f"{self._fmt_name(defender)} snaps back to reality from the shock!")
+                        try:
+                            defender.is_groggy = False
+                            defender.groggy_meter = 0
+                            defender.daze_cooldown_turns = max(int(getattr(defender, "daze_cooldown_turns", 0) or 0), int(TUNING_DAZE_COOLDOWN_TURNS))
+                        except Exception:
+                            pass
+                    else:
+                        defender.daze_turns = max(0, int(before) - 1)
+                        if before > 0 and int(defender.daze_turns) == 0:
+                            self._log(f"{self._fmt_name(defender)} is shaken awake by the impact!")
+                            try:
+                                defender.is_groggy = False
+                                defender.groggy_meter = 0
+                                defender.daze_cooldown_turns = max(int(getattr(defender, "daze_cooldown_turns", 0) or 0), int(TUNING_DAZE_COOLDOWN_TURNS))
+                            except Exception:
+                                pass
+            except Exception:
+                pass
+
+            # Clash overlay VFX: scale by actual dealt damage.
+            try:
+                if (not bool(getattr(self, "_last_clash_flashed", False))) and (getattr(self, "_last_clash_winner", None) is attacker):
+                    outcome = "player" if attacker is self.player else "cpu"
+                    self._flash_clash(outcome=outcome, damage=int(dealt))
+                    self._last_clash_flashed = True
+            except Exception:
+                pass
+
+            # (Groggy system remains available for special moves; heavy-hit stun is now handled by DAZED.)
+
+        attacker.add_hype(int(move.get("hype_gain", 0)))
+
+        if not suppress_state_changes:
+            if "set_user_state" in move:
+                attacker.set_state(WrestlerState(str(move["set_user_state"])))
+            if "set_target_state" in move:
+                tgt = str(move["set_target_state"])
+                # Strike knockdowns: guaranteed if damage meets the defender's HP-scaled threshold.
+                if (
+                    tgt == "GROUNDED"
+                    and str(mtype) == "Strike"
+                    and defender.state in {WrestlerState.STANDING, WrestlerState.RUNNING}
+                    and (not bool(move.get("knockdown_always", False)))
+                ):
+                    try:
+                        mn = int(getattr(defender, "knockdown_thresh_min", 5) or 5)
+                        mx = int(getattr(defender, "knockdown_thresh_max", 15) or 15)
+                        mx = max(mn, mx)
+                        hp = max(0.0, min(1.0, float(pre_hp_pct)))
+                        thr = float(mn) + (float(mx) - float(mn)) * float(hp)
+                        if int(dealt) >= int(math.ceil(float(thr))):
+                            defender.set_state(WrestlerState.GROUNDED)
+                        else:
+                            self._log(f"{self._fmt_name(defender)} stays on their feet!")
+                    except Exception:
+                        defender.set_state(WrestlerState.GROUNDED)
+                else:
+                    defender.set_state(WrestlerState(tgt))
+
+        if attacker.is_in_grapple() and defender.is_in_grapple():
+            attacker.grapple_role = GrappleRole.OFFENSE
+            defender.grapple_role = GrappleRole.DEFENSE
+
+        # Safety: prevent illegal grapple/grounded desync states.
+        try:
+            self._repair_grapple_desync()
+        except Exception:
+            pass
+
+        # Combo chains: after a successful execution, open the follow-up window.
+        chain_next = move.get("chain_next")
+        if chain_next:
+            attacker.chain_window = str(chain_next)
+            attacker.chain_potency = int(move.get("chain_bonus", 0))
+            # Stored as 2 because the next _start_turn() immediately decrements by 1.
+            attacker.chain_turns_remaining = 2
+            self._log(f"{self._fmt_name(attacker)} has a combo opening! (+{attacker.chain_potency} on {attacker.chain_window})")
+
+    # -------------------------------------------------------------------------
+    # HELPER LOGIC
+    # -------------------------------------------------------------------------
+
+    def _repair_grapple_desync(self) -> None:
+        """Ensure grapple state is consistent (both in grapple or neither).
+
+        Safety net against edge-cases where one wrestler leaves a grapple via a
+        special transition but the other remains in a grapple tier/role.
+        """
+        try:
+            p = self.player
+            c = self.cpu
+        except Exception:
+            return
+        if not isinstance(p, Wrestler) or not isinstance(c, Wrestler):
+            return
+
+        # Clear stale roles if a wrestler isn't actually in a grapple tier.
+        for w in (p, c):
+            try:
+                if (not bool(w.is_in_grapple())) and getattr(w, "grapple_role", None) is not None:
+                    w.grapple_role = None
+            except Exception:
+                pass
+
+        try:
+            p_in = bool(p.is_in_grapple())
+            c_in = bool(c.is_in_grapple())
+        except Exception:
+            return
+
+        if p_in == c_in:
+            return
+
+        # If only one side is in a grapple tier, break the grapple.
+        try:
+            if p_in:
+                p.clear_grapple()
+                p.set_state(WrestlerState.STANDING)
+            if c_in:
+                c.clear_grapple()
+                c.set_state(WrestlerState.STANDING)
+        except Exception:
+            pass
+
+    def _cpu_buy_buffs(self) -> None:
+        """Spend CPU hype on buffs before selecting a move."""
+        if self.game_over:
+            return
+        if int(self.cpu.hype) < 25:
+            return
+
+        # Simple parity behavior: occasionally buy a grit refill (if low), otherwise
+        # choose between Pump (+1) and Adrenaline (+2).
+        # Kept probabilistic so CPU doesn't always auto-buy.
+
+        if int(self.cpu.hype) >= int(TUNING_HYPE_SHOP_GRIT_REFILL_COST) and int(self.cpu.grit) <= 1 and rng.ai.random() < 0.35:
+            self.cpu.hype -= int(TUNING_HYPE_SHOP_GRIT_REFILL_COST)
+            before = int(self.cpu.grit)
+            self.cpu.grit = min(self.cpu.max_grit, int(self.cpu.grit) + int(TUNING_HYPE_SHOP_GRIT_REFILL_AMOUNT))
+            gained = int(self.cpu.grit) - before
+            self._log(f"{self._fmt_name(self.cpu)} rallies! (+{gained} Grit)")
+            return
+
+        # Lock Up Edge (non-stacking): only relevant if a lock up can happen soon.
+        if (
+            int(self.cpu.hype) >= 50
+            and (not bool(getattr(self.cpu, "lockup_edge_ready", False)))
+            and self.cpu.state == WrestlerState.STANDING
+            and self.player.state == WrestlerState.STANDING
+            and rng.ai.random() < 0.10
+        ):
+            self.cpu.hype -= 50
+            self.cpu.lockup_edge_ready = True
+            self._log(f"{self._fmt_name(self.cpu)} buys an edge for the next lock up!")
+            return
+
+        if int(self.cpu.hype) >= 50 and rng.ai.random() < 0.15:
+            self.cpu.hype -= 50
+            self.cpu.next_card_bonus = max(int(self.cpu.next_card_bonus), 2)
+            self._log(f"{self._fmt_name(self.cpu)} uses the crowd energy! (Adrenaline +2 next card)")
+            return
+
+        if int(self.cpu.hype) >= 25 and rng.ai.random() < 0.20:
+            self.cpu.hype -= 25
+            self.cpu.next_card_bonus = max(int(self.cpu.next_card_bonus), 1)
+            self._log(f"{self._fmt_name(self.cpu)} digs deep! (Pump Up +1 next card)")
+            return
+
+    def _cpu_ai_mode(self) -> str:
+        traits = {}
+        try:
+            traits = dict(getattr(self.cpu, "profile", None) or {})
+        except Exception:
+            traits = {}
+        weights = {}
+        try:
+            weights = dict(traits.get("ai_traits") or {})
+        except Exception:
+            weights = {}
+
+        def w(key: str) -> int:
+            try:
+                return max(0, int(weights.get(key, 0)))
+            except Exception:
+                return 0
+
+        opts = [("GREED", w("GREED")), ("GOOD", w("GOOD")), ("BAD", w("BAD")), ("RND", w("RND"))]
+
+        # Dynamic difficulty: ease off while ahead, tighten up while behind.
+        wp = self.win_probability() if float(CPU_DYNAMIC_DIFFICULTY) > 0 else None
+        if wp is not None:
+            skew = max(-1.0, min(1.0, (1.0 - 2.0 * float(wp)) * float(CPU_DYNAMIC_DIFFICULTY)))  # >0: CPU ahead
+            scale = {"GREED": 1.0 - skew, "GOOD": 1.0 - 0.5 * skew, "BAD": 1.0 + skew, "RND": 1.0 + 0.5 * skew}
+            opts = [(k, max(0, int(round(v * 100 * scale[k])))) for k, v in opts]
+        total = sum(v for _k, v in opts)
+        if total <= 0:
+            return "RND"
+
+        roll = rng.ai.randint(1, total)
+        acc = 0
+        for k, v in opts:
+            acc += v
+            if roll <= acc:
+                return k
+        return "RND"
+
+    def _cpu_card_candidates_for_move(self, move_name: str) -> list[dict]:
+        """All affordable CPU card-play candidates for a move, best first.
+
+        Returns a list of dicts: {"cards": [Card...], "score": int}. Reused from
+        the transposition table while the CPU's card-relevant state is unchanged
+        (zobrist.cards_key; the hand is keyed in order, so cached candidates are
+        stored as hand indices).
+        """
+        tt = self._transposition_table()
+        if tt is None:
+            return self._cpu_card_candidates_search(move_name)
+        slot = tt.entry(cards_key(self.cpu))
+        sig = self._card_play_signature(str(move_name))
+        hand = list(self.cpu.hand or [])
+        cached = slot.get(sig)
+        tt.note(cached is not None)
+        if cached is not None:
+            return [{"cards": [hand[i] for i in idx], "score": score} for idx, score in cached]
+        scored = self._cpu_card_candidates_search(move_name)
+        at = {id(c): i for i, c in enumerate(hand)}
+        slot[sig] = [(tuple(at[id(c)] for c in (d.get("cards") or [])), int(d.get("score", 0))) for d in scored]
+        return scored
+
+    def _card_sigs_cache(self) -> dict:
+        sigs = getattr(self, "_card_sigs", None)
+        if sigs is None:
+            sigs = {}
+            self._card_sigs = sigs
+        return sigs
+
+    def _card_play_signature(self, move_name: str) -> tuple:
+        """Everything about a move that card candidates read; moves that share it share candidates."""
+        sigs = self._card_sigs_cache()
+        sig = sigs.get(move_name)
+        if sig is None:
+            sig = self._card_play_signature_of(move_name)
+            sigs[move_name] = sig
+        return sig
+
+    def _card_play_signature_of(self, move_name: str) -> tuple:
+        mv = MOVES.get(move_name, {})
+        special = move_name if move_name in (MOVE_REST, MOVE_DEFENSIVE, MOVE_GROGGY_RECOVERY) else None
+        technical = bool(mv.get("is_technical", False))
+        return (
+            special,
+            bool(mv.get("is_finisher")),
+            mv.get("cost", 0),
+            bool(mv.get("requires_type_card", False)),
+            str(mv.get("type", "Setup")),
+            technical,
+            mv.get("tech_threshold", 11) if technical else None,
+            mv.get("clash_mod", 0),
+        )
+
+    def _cpu_card_candidates_search(self, move_name: str) -> list[dict]:
+        """Generate all affordable CPU card-play candidates for a move (uncached)."""
+        if str(move_name) == MOVE_REST:
+            return [{"cards": [], "score": 0}]
+
+        hand = list(self.cpu.hand or [])
+        if not hand:
+            # Defensive can legally discard 0.
+            if str(move_name) == MOVE_DEFENSIVE:
+                return [{"cards": [], "score": 0}]
+            return []
+
+        try:
+            fired_bonus = int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) if int(getattr(self.cpu, "fired_up_turns_remaining", 0) or 0) > 0 else 0
+        except Exception:
+            fired_bonus = 0
+
+        is_finisher = bool(MOVES.get(move_name, {}).get("is_finisher"))
+        move_cost = int(MOVES.get(move_name, {}).get("cost", 0))
+
+        defensive_only_small = (str(move_name) == MOVE_DEFENSIVE)
+        groggy_only_small = (str(move_name) == MOVE_GROGGY_RECOVERY)
+
+        def _passes_small(cs: list) -> bool:
+            if defensive_only_small:
+                return all(int(c.value) <= 5 for c in cs)
+            if groggy_only_small:
+                return all(int(c.value) <= 7 for c in cs)
+            return True
+
+        def _affordable(cs: list) -> bool:
+            try:
+                card_cost = sum(int(c.grit_cost()) for c in cs)
+            except Exception:
+                card_cost = 0
+            return int(self.cpu.grit) >= int(move_cost) + int(card_cost)
+
+        candidates: list[dict] = []
+
+        # Defensive: explicitly allow 0-card discard.
+        if defensive_only_small:
+            candidates.append({"cards": []})
+
+        # Singles
+        if not is_finisher:
+            for c in hand:
+                cs = [c]
+                if not _passes_small(cs):
+                    continue
+                if _affordable(cs):
+                    candidates.append({"cards": cs})
+
+        # Doubles
+        by_val: dict[int, list] = {}
+        for c in hand:
+            by_val.setdefault(int(c.value), []).append(c)
+        for _v, cs in by_val.items():
+            if len(cs) >= 2:
+                pair = [cs[0], cs[1]]
+                if not _passes_small(pair):
+                    continue
+                if _affordable(pair):
+                    candidates.append({"cards": pair})
+
+        # Same-color pairs: enumerate all distinct-value pairs.
+        # (Not allowed for finishers.)
+        if not is_finisher:
+            by_col: dict[str, list] = {}
+            for c in hand:
+                by_col.setdefault(str(c.color), []).append(c)
+            for col, cs in by_col.items():
+                if str(col) == "GRAY":
+                    continue
+                if len(cs) < 2:
+                    continue
+                cs_sorted = sorted(cs, key=lambda x: int(x.value))
+                for i in range(len(cs_sorted)):
+                    for j in range(i + 1, len(cs_sorted)):
+                        a = cs_sorted[i]
+                        b = cs_sorted[j]
+                        if int(a.value) == int(b.value):
+                            # Doubles already covered.
+                            continue
+                        pair = [a, b]
+                        if not _passes_small(pair):
+                            continue
+                        if _affordable(pair):
+                            candidates.append({"cards": pair})
+
+        if not candidates:
+            return []
+
+        # Impact moves: require at least one matching-type (or Yellow) card.
+        if self._move_requires_type_card(move_name) and str(move_name) not in {MOVE_DEFENSIVE, MOVE_GROGGY_RECOVERY}:
+            try:
+                move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
+                candidates = [d for d in candidates if any(int(c.color_bonus(move_type)) > 0 for c in (d.get("cards") or []))]
+            except Exception:
+                candidates = []
+            if not candidates:
+                return []
+
+        # Score using actual clash scoring rules.
+        scored: list[dict] = []
+        for d in candidates:
+            cs = list(d.get("cards") or [])
+            card_bonus = int(getattr(self.cpu, "next_card_bonus", 0) or 0) + int(fired_bonus) * int(len(cs))
+
+            if str(move_name) == MOVE_DEFENSIVE:
+                pool = sum(int(c.value) for c in cs)
+                if len(cs) == 2 and int(cs[0].value) == int(cs[1].value):
+                    pool += 5
+                pool += int(card_bonus)
+                d["score"] = int(pool)
+            elif str(move_name) == MOVE_GROGGY_RECOVERY:
+                pool = sum(min(7, int(c.value)) for c in cs)
+                if len(cs) == 2 and int(cs[0].value) == int(cs[1].value):
+                    pool += 5
+                pool += int(card_bonus)
+                d["score"] = int(pool)
+            else:
+                # For normal moves, score includes TECH inversion, color/doubles bonuses, etc.
+                d["score"] = int(self._calc_clash_score(str(move_name), cs, card_bonus=int(card_bonus)))
+
+            scored.append(d)
+
+        scored.sort(key=lambda d: int(d.get("score", 0)), reverse=True)
+        return scored
+
+    def _cpu_choose_action(self, *, mode: str | None = None) -> tuple[str, list]:
+        """Choose the CPU's move AND cards together (executable joint optimum)."""
+        mode = str(mode or self._cpu_ai_mode())
+
+        # Groggy override: if groggy recovery is legal, take it.
+        if bool(getattr(self.cpu, "is_groggy", False)):
+            if self._move_is_legal(MOVE_GROGGY_RECOVERY, self.cpu, self.player) and self._passes_moveset(self.cpu, MOVE_GROGGY_RECOVERY):
+                cand = self._cpu_card_candidates_for_move(MOVE_GROGGY_RECOVERY)
+                if cand:
+                    return (MOVE_GROGGY_RECOVERY, list(cand[0].get("cards") or []))
+                return (MOVE_GROGGY_RECOVERY, [])
+
+        valid = self._available_moves(self.cpu, self.player)
+        if not valid:
+            return (MOVE_REST, [])
+
+        # Parity with the player's UI: finishers require doubles.
+        has_doubles = self.cpu.has_doubles_in_hand()
+        filtered = [m for m in valid if not (bool(MOVES.get(m, {}).get("is_finisher")) and (not has_doubles))]
+        if filtered:
+            valid = filtered
+
+        # Impact moves require at least one matching-type (or Yellow) card to be playable.
+        try:
+            filtered = [m for m in valid if self._wrestler_has_type_card_for_move(self.cpu, m)]
+            if filtered:
+                valid = filtered
+        except Exception:
+            pass
+
+        # Evaluate joint move+cards options.
+        options: list[tuple[str, int, list[dict]]] = []
+        for m in valid:
+            cands = self._cpu_card_candidates_for_move(str(m))
+            if str(m) == MOVE_REST:
+                best = 0
+            else:
+                if not cands:
+                    continue
+                best = int(cands[0].get("score", 0))
+            options.append((str(m), best, cands))
+
+        values = self._cpu_move_values([m for m, _b, _c in options])
+        scored_moves: list[tuple[float, str, list[dict]]] = [
+            (float(v) + float(best), m, cands) for v, (m, best, cands) in zip(values, options)
+        ]
+
+        if not scored_moves:
+            return (MOVE_REST, [])
+
+        scored_moves.sort(key=lambda t: float(t[0]), reverse=True)
+        ordered = scored_moves
+
+        if mode == "GREED":
+            pick = ordered[0]
+        elif mode == "GOOD":
+            pick = rng.ai.choice(ordered[: min(3, len(ordered))])
+        elif mode == "BAD":
+            tail = ordered[max(0, len(ordered) - 3) :]
+            pick = rng.ai.choice(tail or ordered)
+        else:
+            top_n = max(1, min(int(CPU_RND_PICK_FROM_TOP_N), len(ordered)))
+            pick = rng.ai.choice(ordered[:top_n])
+
+        _score, move, cands = pick
+        if str(move) == MOVE_REST:
+            return (MOVE_REST, [])
+        if str(move) == MOVE_DEFENSIVE and not cands:
+            return (MOVE_DEFENSIVE, [])
+        if not cands:
+            return (MOVE_REST, [])
+
+        # Pick cards (mode influences greediness).
+        if mode == "GREED":
+            cards = list(cands[0].get("cards") or [])
+        elif mode == "GOOD":
+            pool = cands[: min(3, len(cands))]
+            cards = list(rng.ai.choice(pool).get("cards") or [])
+        elif mode == "BAD":
+            pool = cands[max(0, len(cands) - 3) :]
+            cards = list(rng.ai.choice(pool or cands).get("cards") or [])
+        else:
+            top_n = max(1, min(int(CPU_RND_PICK_FROM_TOP_N), len(cands)))
+            cards = list(rng.ai.choice(cands[:top_n]).get("cards") or [])
+
+        return (str(move), cards)
+
+    def _cpu_choose_move(self, *, mode: str | None = None):
+        if bool(getattr(self.cpu, "is_groggy", False)):
+            if self._move_is_legal(MOVE_GROGGY_RECOVERY, self.cpu, self.player) and self._passes_moveset(self.cpu, MOVE_GROGGY_RECOVERY):
+                return MOVE_GROGGY_RECOVERY
+        valid = self._available_moves(self.cpu, self.player)
+        if not valid:
+            return MOVE_REST
+
+        # Parity with the player's UI: finishers require doubles.
+        has_doubles = self.cpu.has_doubles_in_hand()
+        filtered = [m for m in valid if not (bool(MOVES.get(m, {}).get("is_finisher")) and (not has_doubles))]
+        if filtered:
+            valid = filtered
+
+        # Impact moves require at least one matching-type (or Yellow) card to be playable.
+        try:
+            filtered = [m for m in valid if self._wrestler_has_type_card_for_move(self.cpu, m)]
+            if filtered:
+                valid = filtered
+        except Exception:
+            pass
+
+        mode = str(mode or self._cpu_ai_mode())
+
+        # Finisher priority: if a finisher is available, try to end it.
+        finishers = [m for m in valid if bool(MOVES.get(m, {}).get("is_finisher"))]
+        if finishers:
+            if (mode != "RND") or (rng.ai.random() >= 0.25):
+                values = self._cpu_move_values(finishers, cost_bias=False)
+                return max(zip(values, finishers), key=lambda t: t[0])[1]
+
+        scored = list(zip(self._cpu_move_values(valid, cost_bias=False), valid))
+        scored.sort(key=lambda t: float(t[0]), reverse=True)
+        ordered = [m for _s, m in scored]
+
+        if mode == "GREED":
+            return ordered[0]
+        if mode == "GOOD":
+            return rng.ai.choice(ordered[: min(3, len(ordered))])
+        if mode == "BAD":
+            tail = ordered[max(0, len(ordered) - 3) :]
+            return rng.ai.choice(tail or ordered)
+        top_n = max(1, min(int(CPU_RND_PICK_FROM_TOP_N), len(ordered)))
+        return rng.ai.choice(ordered[:top_n])
+
+    def _cpu_choose_cards(self, move_name, *, mode: str | None = None):
+        if str(move_name) == MOVE_REST:
+            return []
+        hand = list(self.cpu.hand or [])
+        if not hand:
+            return []
+
+        try:
+            fired_bonus = int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD) if int(getattr(self.cpu, "fired_up_turns_remaining", 0) or 0) > 0 else 0
+        except Exception:
+            fired_bonus = 0
+
+        # Finishers require doubles.
+        is_finisher = bool(MOVES.get(move_name, {}).get("is_finisher"))
+
+        ignore_card_cost = (move_name == MOVE_REST)
+        move_cost = int(MOVES.get(move_name, {}).get("cost", 0))
+
+        defensive_only_small = (move_name == MOVE_DEFENSIVE)
+        groggy_only_small = (move_name == MOVE_GROGGY_RECOVERY)
+
+        candidates: list[dict] = []
+
+        # Singles
+        if not is_finisher:
+            for c in hand:
+                if defensive_only_small and int(c.value) > 5:
+                    continue
+                if groggy_only_small and int(c.value) > 7:
+                    continue
+                card_cost = 0 if ignore_card_cost else int(c.grit_cost())
+                if int(self.cpu.grit) >= int(move_cost) + int(card_cost):
+                    candidates.append({"cards": [c]})
+
+        # Doubles
+        by_val: dict[int, list] = {}
+        for c in hand:
+            by_val.setdefault(int(c.value), []).append(c)
+        for _v, cs in by_val.items():
+            if len(cs) >= 2:
+                if defensive_only_small and int(cs[0].value) > 5:
+                    continue
+                if groggy_only_small and int(cs[0].value) > 7:
+                    continue
+                pair = [cs[0], cs[1]]
+                card_cost = 0 if ignore_card_cost else sum(int(x.grit_cost()) for x in pair)
+                if int(self.cpu.grit) >= int(move_cost) + int(card_cost):
+                    candidates.append({"cards": pair})
+
+        # Same-color pair: high card +2 (capped at 10). (Not allowed for finishers.)
+        if not is_finisher:
+            by_col: dict[str, list] = {}
+            for c in hand:
+                by_col.setdefault(str(c.color), []).append(c)
+            for col, cs in by_col.items():
+                if str(col) == "GRAY":
+                    continue
+                if len(cs) < 2:
+                    continue
+                # If there is a doubles pair in this color, it's already covered above.
+                cs_sorted = sorted(cs, key=lambda x: int(x.value), reverse=True)
+                a = cs_sorted[0]
+                b = next((x for x in cs_sorted[1:] if int(x.value) != int(a.value)), None)
+                if b is None:
+                    continue
+                if defensive_only_small and (int(a.value) > 5 or int(b.value) > 5):
+                    continue
+                if groggy_only_small and (int(a.value) > 7 or int(b.value) > 7):
+                    continue
+                pair = [a, b]
+                card_cost = 0 if ignore_card_cost else sum(int(x.grit_cost()) for x in pair)
+                if int(self.cpu.grit) >= int(move_cost) + int(card_cost):
+                    candidates.append({"cards": pair})
+
+        if not candidates:
+            return []
+
+        # Impact moves: require at least one matching-type (or Yellow) card.
+        if self._move_requires_type_card(move_name):
+            try:
+                move_type = str(MOVES.get(move_name, {}).get("type", "Setup"))
+                candidates = [d for d in candidates if any(int(c.color_bonus(move_type)) > 0 for c in (d.get("cards") or []))]
+            except Exception:
+                candidates = []
+            if not candidates:
+                return []
+
+        # Score candidates using the actual clash scoring rules.
+        scored: list[dict] = []
+        for d in candidates:
+            cs = list(d.get("cards") or [])
+            card_bonus = int(getattr(self.cpu, "next_card_bonus", 0) or 0) + int(fired_bonus) * int(len(cs))
+
+            # Defensive uses a separate pool rule.
+            if str(move_name) == MOVE_DEFENSIVE:
+                pool = sum(int(c.value) for c in cs)
+                if len(cs) == 2 and int(cs[0].value) == int(cs[1].value):
+                    pool += 5
+                pool += int(card_bonus)
+                d["score"] = int(pool)
+            elif str(move_name) == MOVE_GROGGY_RECOVERY:
+                # Groggy progress is effectively based on card value; keep it simple.
+                pool = sum(min(7, int(c.value)) for c in cs)
+                if len(cs) == 2 and int(cs[0].value) == int(cs[1].value):
+                    pool += 5
+                pool += int(card_bonus)
+                d["score"] = int(pool)
+            else:
+                d["score"] = int(self._calc_clash_score(str(move_name), cs, card_bonus=int(card_bonus)))
+
+            scored.append(d)
+
+        candidates = scored
+
+        candidates.sort(key=lambda d: int(d.get("score", 0)), reverse=True)
+        mode = str(mode or self._cpu_ai_mode())
+        if mode == "GREED":
+            return list(candidates[0]["cards"])
+        if mode == "GOOD":
+            pool = candidates[: min(3, len(candidates))]
+            return list(rng.ai.choice(pool)["cards"])
+        if mode == "BAD":
+            pool = candidates[max(0, len(candidates) - 3) :]
+            return list(rng.ai.choice(pool or candidates)["cards"])
+        return list(rng.ai.choice(candidates)["cards"])
+
+    def _cpu_maybe_fire_up(self) -> None:
+        """Auto FIRE UP roll for the CPU (chance scales with its momentum edge)."""
+        try:
+            mom = int(getattr(self, "momentum", 0) or 0)
+            cpu_adv = max(0, -int(mom))
+            cpu_fired = int(getattr(self.cpu, "fired_up_turns_remaining", 0) or 0) > 0
+            if (not cpu_fired) and cpu_adv > 0 and self._escape_mode is None:
+                chance = float(TUNING_CPU_FIRE_UP_CHANCE_PER_MOM) * float(min(int(MOMENTUM_MAX_ABS), int(cpu_adv)))
+                chance = max(0.0, min(0.50, float(chance)))
+                if rng.ai.random() < chance:
+                    self._activate_fire_up(self.cpu)
+        except Exception:
+            pass
+
+    def _fire_up_duration_from_advantage(self, adv: int) -> int:
+        """Map momentum advantage magnitude to FIRE UP duration.
+
+        Player-facing mapping:
+        1-2 => 1 turn, 3-4 => 2 turns, 5 => 3 turns.
+        """
+        mag = max(0, min(int(MOMENTUM_MAX_ABS), abs(int(adv))))
+        if mag <= 0:
+            return 0
+        if mag <= 2:
+            return 1
+        if mag <= 4:
+            return 2
+        return 3
+
+    def _activate_fire_up(self, who: Wrestler) -> None:
+        if self.game_over:
+            return
+        if self._escape_mode is not None:
+            return
+
+        adv = int(self._momentum_advantage_for(who))
+        if adv <= 0:
+            return
+
+        dur = int(self._fire_up_duration_from_advantage(adv))
+        if dur <= 0:
+            return
+
+        who.fired_up_turns_remaining = int(dur)
+        self.momentum = 0
+        self._log(
+            f"FIRE UP! {self._fmt_name(who)} ignites ({dur} turns): +{int(TUNING_FIRED_UP_CARD_BONUS_PER_CARD)} to each card, no botches, wins ties."
+        )
+
+    # -------------------------------------------------------------------------
+    # HEADLESS PLAY
+    # -------------------------------------------------------------------------
+
+    def _affordable_action(self, who: Wrestler, move: str, cards: list) -> tuple[str, list]:
+        """Safety fallback: if something goes sideways, guarantee a legal/affordable action."""
+        try:
+            total = self._effective_cost(who, move, cards)
+            if int(who.grit) < int(total):
+                return (MOVE_REST, [])
+        except Exception:
+            return (MOVE_REST, [])
+        return (move, cards)
+
+    def _ai_seat_action(self, who: Wrestler) -> tuple[str, str, list]:
+        """Hype Shop buys + (mode, move, cards) for either seat, using the CPU logic."""
+        if who is self.cpu:
+            self._cpu_buy_buffs()
+            mode = self._cpu_ai_mode()
+            move, cards = self._cpu_choose_action(mode=mode)
+            return (str(mode), str(move), list(cards))
+        m = self._mirror()
+        m._cpu_buy_buffs()
+        mode = m._cpu_ai_mode()
+        move, cards = m._cpu_choose_action(mode=mode)
+        self._unmirror(m)
+        return (str(mode), str(move), list(cards))
+
+    def _headless_fire_up(self) -> None:
+        """Player seat gets the same auto FIRE UP roll the CPU gets in _start_turn."""
+        m = self._mirror()
+        m._cpu_maybe_fire_up()
+        self._unmirror(m)
+
+    def _headless_escape_step(self) -> None:
+        esc = self._escape_mode or {}
+        if bool(esc.get("defender_is_player")):
+            hand = list(self.player.hand or [])
+            if not hand:
+                # Nothing to play: let the CPU path fail the escape.
+                self._escape_mode["defender_is_player"] = False
+                self._escape_continue_cpu()
+                return
+            best = max(range(len(hand)), key=lambda i: int(hand[i].value))
+            self._escape_play_card(int(best))
+        else:
+            self._escape_continue_cpu()
+
+    def _headless_beat(self) -> None:
+        self._headless_fire_up()
+        _p_mode, p_move, p_cards = self._ai_seat_action(self.player)
+        c_mode, c_move, c_cards = self._ai_seat_action(self.cpu)
+        p_move, p_cards = self._affordable_action(self.player, p_move, p_cards)
+        c_move, c_cards = self._affordable_action(self.cpu, c_move, c_cards)
+        self._last_cpu_mode = str(c_mode)
+        self._resolve_clash(p_move, p_cards, c_move, c_cards)
+
+    def win_probability(self) -> float | None:
+        """Player's win probability from win_model (None without a model)."""
+        model = self.win_model
+        if model is None:
+            return None
+        try:
+            return float(model.evaluate(self))
+        except Exception:
+            return None
+
+    def run_headless(self, *, max_beats: int = HEADLESS_MAX_BEATS, on_beat: Callable[["MatchEngine"], None] | None = None) -> MatchResult:
+        """Play the current match to the end with the CPU AI in both seats.
+
+        on_beat(engine) is called before every beat (not during escapes).
+        """
+        beats = 0
+        steps = 0
+        self._start_turn("player")
+        while not self.game_over and beats < int(max_beats) and steps < int(max_beats) * 8:
+            steps += 1
+            if self._escape_mode is not None:
+                self._headless_escape_step()
+                continue
+            beats += 1
+            if on_beat is not None:
+                on_beat(self)
+            self._headless_beat()
+
+        winner = None
+        kind = None
+        esc = self._escape_mode or {}
+        if self.game_over and esc:
+            winner = "player" if bool(esc.get("attacker_is_player")) else "cpu"
+            kind = str(esc.get("kind", "")).upper() or None
+        return MatchResult(
+            winner=winner,
+            kind=kind,
+            beats=int(beats),
+            player_hp=int(self.player.hp),
+            cpu_hp=int(self.cpu.hp),
+            log=list(self._log_lines or []),
+            player_limbs=dict(self.player.body_parts),
+            cpu_limbs=dict(self.cpu.body_parts),
+            clashes=int(self.clash_count),
+            move_usage={seat: {k: list(v) for k, v in rows.items()} for seat, rows in self.move_usage.items()},
+        )
+
+
+def simulate_match(
+    player_slug: str,
+    cpu_slug: str,
+    *,
+    seed: int | None = None,
+    max_beats: int = HEADLESS_MAX_BEATS,
+    keep_log: bool = False,
+    player_limbs: dict | None = None,
+    cpu_limbs: dict | None = None,
+    on_beat: Callable[[MatchEngine], None] | None = None,
+) -> MatchResult:
+    """Play one headless match between two roster slugs.
+
+    With a seed the match is fully reproducible: the rng streams run on
+    per-purpose generators derived from it (and the global `random` is
+    reseeded too, so don't interleave matches on threads). Limb dicts
+    (HEAD/BODY/LEGS, 0..100) start a wrestler already banged up. on_beat is
+    passed to MatchEngine.run_headless.
+    """
+    kw = dict(max_beats=max_beats, keep_log=keep_log, player_limbs=player_limbs, cpu_limbs=cpu_limbs, on_beat=on_beat)
+    if seed is None:
+        return _play_headless(player_slug, cpu_slug, **kw)
+    random.seed(int(seed))
+    with rng.seeded(int(seed)):
+        return _play_headless(player_slug, cpu_slug, **kw)
+
+
+def _play_headless(
+    player_slug: str,
+    cpu_slug: str,
+    *,
+    max_beats: int,
+    keep_log: bool,
+    player_limbs: dict | None,
+    cpu_limbs: dict | None,
+    on_beat: Callable[[MatchEngine], None] | None = None,
+) -> MatchResult:
+    eng = MatchEngine()
+    eng._setup_match(ROSTER.get(str(player_slug), {}), ROSTER.get(str(cpu_slug), {}))
+    eng._apply_limb_carryover(player_limbs, cpu_limbs)
+    if not keep_log:
+        eng._log_lines = None
+    return eng.run_headless(max_beats=max_beats, on_beat=on_beat)
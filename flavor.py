@@ -0,0 +1,147 @@
+"""Compiled move flavor-text templates.
+
+Moves DB flavor text mixes 2nd-person ("You") and 3rd-person ("They") and is
+normalized to the correct POV for the log. Rather than running the chain of
+string replacements on every execution, each text is compiled once into a
+template of literal chunks and placeholder slots, and rendered per
+(move, attacker, defender) pair from a per-match cache.
+
+Rendering is lazy: `FlavorLine` only builds the string when it is converted
+with str(), so headless simulations can carry lines around without paying for
+them unless a human-readable log is requested.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+# Replacement chain, applied in order. Each pattern maps to a named slot.
+# Order matters: reflexives before possessives, possessives before plain "You".
+FLAVOR_RULES: tuple[tuple[str, str], ...] = (
+    ("You're", "attacker_are"),
+    ("Yourself", "attacker_self_cap"),
+    ("yourself", "attacker_self"),
+    ("Your", "attacker_poss_cap"),
+    ("your", "attacker_poss"),
+    ("You", "attacker_ref"),
+    ("They", "attacker_ref"),
+    ("Their", "attacker_poss_cap"),
+    (" them ", "defender_ref_sp"),
+    (" Them ", "defender_ref_cap_sp"),
+    (" their ", "defender_poss_sp"),
+    (" Their ", "defender_poss_cap_sp"),
+)
+
+# Private-use sentinel; never appears in move text.
+_MARK = "\ue000"
+
+
+class FlavorTemplate:
+    """Literal chunks interleaved with slot names (chunks has one more entry)."""
+
+    __slots__ = ("chunks", "slots")
+
+    def __init__(self, chunks: tuple[str, ...], slots: tuple[str, ...]) -> None:
+        self.chunks = chunks
+        self.slots = slots
+
+    def render(self, values: dict[str, str]) -> str:
+        if not self.slots:
+            return self.chunks[0]
+        out = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            out.append(values[slot])
+            out.append(chunk)
+        return "".join(out)
+
+
+@lru_cache(maxsize=None)
+def compile_flavor(text: str) -> FlavorTemplate:
+    """Run the replacement chain once with sentinels, then split on them."""
+    out = str(text or "")
+    for pattern, slot in FLAVOR_RULES:
+        out = out.replace(pattern, f"{_MARK}{slot}{_MARK}")
+    parts = out.split(_MARK)
+    return FlavorTemplate(tuple(parts[0::2]), tuple(parts[1::2]))
+
+
+def pov_values(attacker, defender) -> dict[str, str]:
+    """Slot values for an attacker/defender pair."""
+    a_player = bool(getattr(attacker, "is_player", False))
+    d_player = bool(getattr(defender, "is_player", False))
+    a_name = str(getattr(attacker, "name", ""))
+    d_name = str(getattr(defender, "name", ""))
+
+    attacker_ref = "You" if a_player else a_name
+    attacker_poss = "your" if a_player else f"{a_name}'s"
+    defender_ref = "you" if d_player else d_name
+    defender_ref_cap = "You" if d_player else d_name
+    defender_poss = "your" if d_player else f"{d_name}'s"
+
+    return {
+        "attacker_are": f"{attacker_ref} are",
+        "attacker_self_cap": "Yourself" if a_player else "Themselves",
+        "attacker_self": "yourself" if a_player else "themselves",
+        "attacker_poss_cap": attacker_poss.capitalize(),
+        "attacker_poss": attacker_poss,
+        "attacker_ref": attacker_ref,
+        "defender_ref_sp": f" {defender_ref} ",
+        "defender_ref_cap_sp": f" {defender_ref_cap} ",
+        "defender_poss_sp": f" {defender_poss} ",
+        "defender_poss_cap_sp": f" {defender_poss.capitalize()} ",
+    }
+
+
+class FlavorLine:
+    """A flavor line that renders on first str() and remembers the result."""
+
+    __slots__ = ("_template", "_values", "_text")
+
+    def __init__(self, template: FlavorTemplate, values: dict[str, str]) -> None:
+        self._template = template
+        self._values = values
+        self._text: str | None = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self._template.render(self._values)
+        return self._text
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+
+class FlavorCache:
+    """Per-match cache of rendered flavor text keyed by (move, attacker, defender)."""
+
+    def __init__(self) -> None:
+        self._lines: dict[tuple, FlavorLine] = {}
+        self._values: dict[tuple, dict[str, str]] = {}
+
+    def clear(self) -> None:
+        self._lines.clear()
+        self._values.clear()
+
+    def discard(self, move_keys) -> None:
+        """Forget the lines of some moves (their flavor text changed)."""
+        keys = {str(k) for k in move_keys}
+        for key in [k for k in self._lines if k[0] in keys]:
+            del self._lines[key]
+
+    def line(self, move_key: str, text: str, *, attacker, defender) -> FlavorLine:
+        a_key = (str(getattr(attacker, "name", "")), bool(getattr(attacker, "is_player", False)))
+        d_key = (str(getattr(defender, "name", "")), bool(getattr(defender, "is_player", False)))
+        key = (str(move_key), a_key, d_key)
+        ln = self._lines.get(key)
+        if ln is None:
+            values = self._values.get((a_key, d_key))
+            if values is None:
+                values = pov_values(attacker, defender)
+                self._values[(a_key, d_key)] = values
+            ln = FlavorLine(compile_flavor(str(text or "")), values)
+            self._lines[key] = ln
+        return ln
+
+    def render(self, move_key: str, text: str, *, attacker, defender) -> str:
+        return str(self.line(move_key, text, attacker=attacker, defender=defender))
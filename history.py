@@ -0,0 +1,383 @@
+"""Match-history store (SQLite).
+
+Every completed match, live or simulated, becomes one `matches` row plus one
+`move_usage` row per (wrestler, move) with attempts, landings and damage.
+Writes go through HistoryWriter, which buffers records and commits them in
+batched transactions.
+
+Screens read from two rollup tables kept up to date in the same transaction
+as the inserts: `h2h` (per ordered wrestler pair) and `move_totals` (per
+wrestler and move). A head-to-head record or a move's success rate is a
+single primary-key lookup however many matches are stored.
+
+Matches imported from exported text logs (match_log.py) also carry an
+`events` trail: one row per clash, damage line and escape attempt.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import sqlite3
+import time
+
+
+HISTORY_DB_FILENAME = "history.sqlite3"
+HISTORY_BATCH_SIZE = 200  # records per transaction in HistoryWriter
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    source TEXT NOT NULL,
+    red_slug TEXT NOT NULL,
+    blue_slug TEXT NOT NULL,
+    winner TEXT,  -- "red" | "blue" | NULL (draw); the corner, since mirror matches share a slug
+    winner_slug TEXT,
+    kind TEXT,
+    beats INTEGER NOT NULL DEFAULT 0,
+    clashes INTEGER NOT NULL DEFAULT 0,
+    red_hp INTEGER,
+    blue_hp INTEGER,
+    red_damage INTEGER NOT NULL DEFAULT 0,
+    blue_damage INTEGER NOT NULL DEFAULT 0,
+    seed INTEGER,
+    content_hash TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS move_usage (
+    match_id INTEGER NOT NULL REFERENCES matches (id) ON DELETE CASCADE,
+    wrestler_slug TEXT NOT NULL,
+    move_slug TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    landed INTEGER NOT NULL,
+    damage INTEGER NOT NULL,
+    PRIMARY KEY (match_id, wrestler_slug, move_slug)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS h2h (
+    slug TEXT NOT NULL,
+    opp_slug TEXT NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    pinfalls INTEGER NOT NULL DEFAULT 0,
+    submissions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (slug, opp_slug)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS move_totals (
+    wrestler_slug TEXT NOT NULL,
+    move_slug TEXT NOT NULL,
+    matches INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    landed INTEGER NOT NULL DEFAULT 0,
+    damage INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (wrestler_slug, move_slug)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    match_id INTEGER NOT NULL REFERENCES matches (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    beat INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    wrestler_slug TEXT,
+    move_slug TEXT,
+    amount INTEGER,
+    detail TEXT,
+    PRIMARY KEY (match_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_matches_red ON matches (red_slug, played_at);
+CREATE INDEX IF NOT EXISTS idx_matches_blue ON matches (blue_slug, played_at);
+CREATE INDEX IF NOT EXISTS idx_matches_played_at ON matches (played_at);
+CREATE INDEX IF NOT EXISTS idx_move_usage_move ON move_usage (move_slug, wrestler_slug);
+CREATE INDEX IF NOT EXISTS idx_move_usage_wrestler ON move_usage (wrestler_slug, move_slug);
+CREATE INDEX IF NOT EXISTS idx_move_totals_move ON move_totals (move_slug);
+CREATE INDEX IF NOT EXISTS idx_events_kind ON events (kind, move_slug);
+"""
+
+
+@dataclass
+class MatchRecord:
+    """One finished match. Red is the player seat; winner is "red", "blue" or None."""
+
+    red: str
+    blue: str
+    winner: str | None
+    kind: str | None
+    beats: int
+    source: str = "live"  # live | sim | career | import | spectate
+    clashes: int = 0
+    red_hp: int | None = None
+    blue_hp: int | None = None
+    seed: int | None = None
+    played_at: float = field(default_factory=time.time)
+    content_hash: str | None = None
+    # {"red"|"blue": {move_slug: [attempts, landed, damage]}}
+    moves: dict[str, dict[str, list[int]]] = field(default_factory=dict)
+    # [(beat, kind, "red"|"blue"|None, move_slug, amount, detail)]; kind is clash | damage | escape
+    events: list[tuple] = field(default_factory=list)
+
+
+def record_from_result(red: str, blue: str, result, *, source: str = "sim", seed: int | None = None) -> MatchRecord:
+    """MatchRecord from an engine.MatchResult."""
+    usage = getattr(result, "move_usage", None) or {}
+    return MatchRecord(
+        red=str(red),
+        blue=str(blue),
+        winner={"player": "red", "cpu": "blue"}.get(str(result.winner)),
+        kind=result.kind,
+        beats=int(result.beats),
+        source=str(source),
+        clashes=int(getattr(result, "clashes", 0) or 0),
+        red_hp=int(result.player_hp),
+        blue_hp=int(result.cpu_hp),
+        seed=seed,
+        moves={"red": dict(usage.get("player") or {}), "blue": dict(usage.get("cpu") or {})},
+    )
+
+
+def record_from_engine(eng, red: str, blue: str, *, source: str = "live", seed: int | None = None) -> MatchRecord:
+    """MatchRecord from a finished MatchEngine (e.g. the live app)."""
+    esc = getattr(eng, "_escape_mode", None) or {}
+    winner = None
+    if bool(getattr(eng, "game_over", False)) and esc:
+        winner = "red" if bool(esc.get("attacker_is_player")) else "blue"
+    usage = getattr(eng, "move_usage", None) or {}
+    clashes = int(getattr(eng, "clash_count", 0) or 0)
+    return MatchRecord(
+        red=str(red),
+        blue=str(blue),
+        winner=winner,
+        kind=(str(esc.get("kind", "")).upper() or None) if winner else None,
+        beats=clashes,
+        source=str(source),
+        clashes=clashes,
+        red_hp=int(eng.player.hp),
+        blue_hp=int(eng.cpu.hp),
+        seed=seed,
+        moves={
+            "red": {k: list(v) for k, v in (usage.get("player") or {}).items()},
+            "blue": {k: list(v) for k, v in (usage.get("cpu") or {}).items()},
+        },
+    )
+
+
+class HistoryStore:
+    """Connection + schema + queries. Use from one thread."""
+
+    def __init__(self, path: str) -> None:
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+        except sqlite3.DatabaseError:
+            pass
+        self.conn.executescript(_SCHEMA)
+        cols = {str(r[1]) for r in self.conn.execute("PRAGMA table_info(matches)")}
+        if "winner" not in cols:
+            # Stores created before the winner's corner was kept.
+            self.conn.execute("ALTER TABLE matches ADD COLUMN winner TEXT")
+            self.conn.execute(
+                "UPDATE matches SET winner = CASE WHEN winner_slug = red_slug THEN 'red' WHEN winner_slug = blue_slug THEN 'blue' END "
+                "WHERE winner_slug IS NOT NULL AND red_slug != blue_slug"
+            )
+        self.conn.commit()
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    # --- writes ---
+    def add_many(self, records: list[MatchRecord]) -> int:
+        """Insert records and update the rollups in one transaction.
+
+        Records whose content_hash is already stored are skipped. Returns the
+        number inserted.
+        """
+        added = 0
+        with self.conn:
+            cur = self.conn.cursor()
+            for r in records:
+                red_dmg = sum(int(v[2]) for v in (r.moves.get("red") or {}).values())
+                blue_dmg = sum(int(v[2]) for v in (r.moves.get("blue") or {}).values())
+                winner = r.winner if r.winner in ("red", "blue") else None
+                winner_slug = r.red if winner == "red" else (r.blue if winner == "blue" else None)
+                cur.execute(
+                    "INSERT OR IGNORE INTO matches (played_at, source, red_slug, blue_slug, winner, winner_slug, kind, beats, clashes, "
+                    "red_hp, blue_hp, red_damage, blue_damage, seed, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        float(r.played_at),
+                        str(r.source),
+                        str(r.red),
+                        str(r.blue),
+                        winner,
+                        winner_slug,
+                        r.kind,
+                        int(r.beats),
+                        int(r.clashes),
+                        r.red_hp,
+                        r.blue_hp,
+                        red_dmg,
+                        blue_dmg,
+                        r.seed,
+                        r.content_hash,
+                    ),
+                )
+                if cur.rowcount == 0:
+                    continue
+                added += 1
+                match_id = cur.lastrowid
+
+                kind = str(r.kind or "").upper()
+                for me, opp, side in ((r.red, r.blue, "red"), (r.blue, r.red, "blue")):
+                    won = r.winner == side
+                    lost = r.winner is not None and not won
+                    cur.execute(
+                        "INSERT INTO h2h (slug, opp_slug, wins, losses, draws, pinfalls, submissions) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (slug, opp_slug) DO UPDATE SET wins = wins + excluded.wins, losses = losses + excluded.losses, "
+                        "draws = draws + excluded.draws, pinfalls = pinfalls + excluded.pinfalls, submissions = submissions + excluded.submissions",
+                        (
+                            str(me),
+                            str(opp),
+                            int(won),
+                            int(lost),
+                            int(r.winner is None),
+                            int(won and kind == "PINFALL"),
+                            int(won and kind == "SUBMISSION"),
+                        ),
+                    )
+
+                # One row per (wrestler, move): a mirror match (same slug in both
+                # corners) folds both sides together, so move_totals counts it once.
+                usage: dict[tuple[str, str], list[int]] = {}
+                for side, slug in (("red", r.red), ("blue", r.blue)):
+                    for move, v in (r.moves.get(side) or {}).items():
+                        row = usage.setdefault((str(slug), str(move)), [0, 0, 0])
+                        for i in range(3):
+                            row[i] += int(v[i])
+                rows = [(match_id, slug, move, *v) for (slug, move), v in usage.items()]
+                cur.executemany(
+                    "INSERT INTO move_usage (match_id, wrestler_slug, move_slug, attempts, landed, damage) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                cur.executemany(
+                    "INSERT INTO move_totals (wrestler_slug, move_slug, matches, attempts, landed, damage) VALUES (?, ?, 1, ?, ?, ?) "
+                    "ON CONFLICT (wrestler_slug, move_slug) DO UPDATE SET matches = matches + 1, attempts = attempts + excluded.attempts, "
+                    "landed = landed + excluded.landed, damage = damage + excluded.damage",
+                    [row[1:] for row in rows],
+                )
+                if r.events:
+                    side_slug = {"red": str(r.red), "blue": str(r.blue)}
+                    cur.executemany(
+                        "INSERT INTO events (match_id, seq, beat, kind, wrestler_slug, move_slug, amount, detail) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (match_id, seq, int(beat), str(kind), side_slug.get(side), move, amount, detail)
+                            for seq, (beat, kind, side, move, amount, detail) in enumerate(r.events)
+                        ],
+                    )
+        return added
+
+    def hashes(self, source: str | None = None) -> set[str]:
+        """Content hashes already stored (optionally for one source)."""
+        if source is None:
+            rows = self.conn.execute("SELECT content_hash FROM matches WHERE content_hash IS NOT NULL")
+        else:
+            rows = self.conn.execute("SELECT content_hash FROM matches WHERE content_hash IS NOT NULL AND source = ?", (str(source),))
+        return {str(r[0]) for r in rows}
+
+    def has_hash(self, content_hash: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM matches WHERE content_hash = ?", (str(content_hash),)).fetchone() is not None
+
+    # --- reads ---
+    def match_count(self) -> int:
+        return int(self.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0])
+
+    def head_to_head(self, slug: str, opp_slug: str) -> dict:
+        """W/L/D (and finish counts) for `slug` against `opp_slug`, either corner."""
+        row = self.conn.execute(
+            "SELECT wins, losses, draws, pinfalls, submissions FROM h2h WHERE slug = ? AND opp_slug = ?",
+            (str(slug), str(opp_slug)),
+        ).fetchone()
+        if row is None:
+            return {"wins": 0, "losses": 0, "draws": 0, "pinfalls": 0, "submissions": 0}
+        return dict(row)
+
+    def record(self, slug: str) -> dict:
+        """Overall W/L/D for a wrestler."""
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(wins), 0) AS wins, COALESCE(SUM(losses), 0) AS losses, COALESCE(SUM(draws), 0) AS draws "
+            "FROM h2h WHERE slug = ?",
+            (str(slug),),
+        ).fetchone()
+        return dict(row)
+
+    def opponents(self, slug: str) -> list[dict]:
+        rows = self.conn.execute(
+            "SELECT opp_slug, wins, losses, draws FROM h2h WHERE slug = ? ORDER BY wins + losses + draws DESC", (str(slug),)
+        )
+        return [dict(r) for r in rows]
+
+    def move_stats(self, slug: str, *, limit: int = 50) -> list[dict]:
+        """Per-move usage for a wrestler, most-used first, with success rate (landed / attempts)."""
+        rows = self.conn.execute(
+            "SELECT move_slug, matches, attempts, landed, damage FROM move_totals WHERE wrestler_slug = ? "
+            "ORDER BY attempts DESC LIMIT ?",
+            (str(slug), int(limit)),
+        )
+        out = []
+        for r in rows:
+            d = dict(r)
+            d["success"] = (d["landed"] / d["attempts"]) if d["attempts"] else 0.0
+            out.append(d)
+        return out
+
+    def move_overall(self, move_slug: str) -> dict:
+        """Roster-wide totals for one move."""
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(matches), 0) AS matches, COALESCE(SUM(attempts), 0) AS attempts, "
+            "COALESCE(SUM(landed), 0) AS landed, COALESCE(SUM(damage), 0) AS damage FROM move_totals WHERE move_slug = ?",
+            (str(move_slug),),
+        ).fetchone()
+        d = dict(row)
+        d["success"] = (d["landed"] / d["attempts"]) if d["attempts"] else 0.0
+        return d
+
+    def recent(self, slug: str, limit: int = 10) -> list[dict]:
+        rows = self.conn.execute(
+            "SELECT * FROM (SELECT * FROM matches WHERE red_slug = ? ORDER BY played_at DESC LIMIT ?) "
+            "UNION ALL SELECT * FROM (SELECT * FROM matches WHERE blue_slug = ? ORDER BY played_at DESC LIMIT ?) "
+            "ORDER BY played_at DESC LIMIT ?",
+            (str(slug), int(limit), str(slug), int(limit), int(limit)),
+        )
+        return [dict(r) for r in rows]
+
+
+class HistoryWriter:
+    """Buffers MatchRecords and writes them HISTORY_BATCH_SIZE at a time."""
+
+    def __init__(self, store: HistoryStore, *, batch_size: int = HISTORY_BATCH_SIZE) -> None:
+        self.store = store
+        self.batch_size = max(1, int(batch_size))
+        self._buf: list[MatchRecord] = []
+        self.written = 0
+
+    def add(self, record: MatchRecord) -> None:
+        self._buf.append(record)
+        if len(self._buf) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        if not self._buf:
+            return 0
+        buf, self._buf = self._buf, []
+        n = self.store.add_many(buf)
+        self.written += n
+        return n
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.flush()
@@ -0,0 +1,179 @@
+"""Dev-mode hot reload of moves_db.py and wrestler_roster.py.
+
+For balance iteration: edit a move or a profile, save, and the running app
+picks it up between beats instead of paying a full restart.
+
+The edited file is executed as a fresh module (sys.modules is left alone) and
+its data is swapped into the *existing* MOVES / MOVES_BY_NAME / ROSTER dicts,
+so every `from moves_db import MOVES` holder sees it. A file that fails to
+import leaves the old data in place.
+
+Derived structures are rebuilt only as far as the diff requires (see
+MatchEngine._refresh_move_tables):
+
+- legality index: only when a move is added or removed or a field it reads
+  changes (LEGALITY_FIELDS); otherwise its masks are still right;
+- move graphs (AI planning): only the movesets that contain a move whose
+  graph fields changed;
+- CPU score table: only when a move is added or removed or a field it
+  reads changes (SCORING_FIELDS);
+- flavor cache: only the lines of moves whose flavor text changed;
+- CPU transposition table (cached move values / card candidates): cleared
+  on any change.
+
+Costs are read from MOVES on every call, so they need nothing. Removed moves
+simply stop being legal; a running match keeps going.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import importlib.util
+import os
+from types import ModuleType
+from typing import Iterable, Mapping
+
+import moves_db
+import wrestler_roster
+from move_ids import UNIVERSAL_MOVES
+
+
+# Move fields read by move_index.MoveLegalityIndex.
+LEGALITY_FIELDS = frozenset(
+    {
+        "req_user_state",
+        "req_target_state",
+        "type",
+        "set_user_state",
+        "is_lift",
+        "req_momentum_min",
+        "allow_neutral",
+    }
+)
+# ... plus what move_graph.TransitionGraph reads on top of the index.
+GRAPH_FIELDS = LEGALITY_FIELDS | {"set_target_state"}
+FLAVOR_FIELDS = frozenset({"flavor_text"})
+# Move fields read by cpu_scoring.ScoreTable.
+SCORING_FIELDS = frozenset({"damage", "ai_score", "type", "set_user_state", "cost"})
+
+
+@dataclass(frozen=True)
+class MovesDiff:
+    """What a moves reload changed: slugs added / removed, and changed fields per slug."""
+
+    added: frozenset[str] = frozenset()
+    removed: frozenset[str] = frozenset()
+    changed: Mapping[str, frozenset[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def _slugs_with(self, fields: frozenset[str]) -> frozenset[str]:
+        return frozenset(s for s, f in self.changed.items() if f & fields)
+
+    @property
+    def legality_changed(self) -> bool:
+        return bool(self.added or self.removed or self._slugs_with(LEGALITY_FIELDS))
+
+    @property
+    def scoring_changed(self) -> bool:
+        return bool(self.added or self.removed or self._slugs_with(SCORING_FIELDS))
+
+    @property
+    def graph_slugs(self) -> frozenset[str]:
+        return self._slugs_with(GRAPH_FIELDS)
+
+    @property
+    def flavor_slugs(self) -> frozenset[str]:
+        return self._slugs_with(FLAVOR_FIELDS)
+
+    def touches(self, moveset: Iterable[str] | None) -> bool:
+        """True if a graph built for `moveset` (None = every move) is stale."""
+        slugs = self.graph_slugs
+        if not slugs:
+            return False
+        if moveset is None:
+            return True
+        return not slugs.isdisjoint(set(moveset) | UNIVERSAL_MOVES)
+
+    def summary(self) -> str:
+        return f"+{len(self.added)} -{len(self.removed)} ~{len(self.changed)}"
+
+
+def diff_moves(old: Mapping[str, Mapping], new: Mapping[str, Mapping]) -> MovesDiff:
+    changed = {}
+    for slug in old.keys() & new.keys():
+        a, b = old[slug], new[slug]
+        if a != b:
+            changed[slug] = frozenset(k for k in a.keys() | b.keys() if a.get(k) != b.get(k))
+    return MovesDiff(
+        added=frozenset(new.keys() - old.keys()),
+        removed=frozenset(old.keys() - new.keys()),
+        changed=changed,
+    )
+
+
+def _exec_fresh(module: ModuleType) -> ModuleType:
+    """Run a module's current source as a new module object."""
+    spec = importlib.util.spec_from_file_location(f"_hot_{module.__name__}", module.__file__)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {module.__file__}")
+    fresh = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fresh)
+    return fresh
+
+
+def _swap(target: dict, source: Mapping) -> None:
+    target.clear()
+    target.update(source)
+
+
+def reload_moves() -> MovesDiff:
+    """Re-read moves_db.py into MOVES / MOVES_BY_NAME; returns what changed."""
+    fresh = _exec_fresh(moves_db)
+    new = fresh.MOVES
+    if not isinstance(new, dict) or not all(isinstance(mv, Mapping) for mv in new.values()):
+        raise ValueError("moves_db.MOVES must map slugs to move dicts")
+    diff = diff_moves(moves_db.MOVES, new)
+    if diff:
+        _swap(moves_db.MOVES, new)
+        _swap(moves_db.MOVES_BY_NAME, fresh.MOVES_BY_NAME)
+    return diff
+
+
+def reload_roster() -> frozenset[str]:
+    """Re-read wrestler_roster.py into ROSTER; returns the slugs that changed."""
+    fresh = _exec_fresh(wrestler_roster)
+    new = fresh.ROSTER
+    if not isinstance(new, dict):
+        raise ValueError("wrestler_roster.ROSTER must be a dict")
+    old = wrestler_roster.ROSTER
+    changed = frozenset(s for s in old.keys() | new.keys() if old.get(s) != new.get(s))
+    if changed:
+        _swap(old, new)
+    return changed
+
+
+class SourceWatcher:
+    """Polls the modification times of the reloadable modules' files."""
+
+    def __init__(self, modules: Iterable[ModuleType] = (moves_db, wrestler_roster)) -> None:
+        self._paths = {m.__name__: str(m.__file__) for m in modules}
+        self._mtimes = {name: self._mtime(path) for name, path in self._paths.items()}
+
+    @staticmethod
+    def _mtime(path: str) -> int | None:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def changed(self) -> list[str]:
+        """Module names whose file changed since the last call."""
+        out = []
+        for name, path in self._paths.items():
+            mtime = self._mtime(path)
+            if mtime is not None and mtime != self._mtimes.get(name):
+                self._mtimes[name] = mtime
+                out.append(name)
+        return out
@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 
 from cards import HEX_COLORS
+from flavor import FlavorCache
 from mechanics import lockup_minigame
 from moves_db import MOVES_BY_NAME as MOVES
 from wrestler import GrappleRole, MAX_HEALTH, Wrestler, WrestlerState
@@ -75,6 +76,9 @@ class TacticalWrestlingApp:
         # Accumulative escape loop (Pin/Submission)
         self._escape_mode: dict | None = None
 
+        # Compiled flavor-text lines for this match
+        self._flavor_cache = FlavorCache()
+
         self._build_ui()
         self._log("Match start. Win only by Pinfall or Submission.")
         self._start_turn("player")
@@ -2073,33 +2077,12 @@ class TacticalWrestlingApp:
         """Best-effort POV fixups for move flavor text.
 
         Moves DB mixes 2nd-person ("You") and 3rd-person ("They").
-        This normalizes to the correct POV for the log.
+        This normalizes to the correct POV for the log via compiled templates
+        (see flavor.py), cached per (move text, attacker, defender).
         """
         if not text:
             return ""
-
-        attacker_ref = "You" if attacker.is_player else attacker.name
-        attacker_poss = "your" if attacker.is_player else f"{attacker.name}'s"
-        defender_ref = "you" if defender.is_player else defender.name
-        defender_ref_cap = "You" if defender.is_player else defender.name
-        defender_poss = "your" if defender.is_player else f"{defender.name}'s"
-
-        # Attacker placeholders.
-        out = str(text)
-        out = out.replace("You're", f"{attacker_ref} are")
-        out = out.replace("You", attacker_ref)
-        out = out.replace("Your", attacker_poss.capitalize())
-        out = out.replace("your", attacker_poss)
-        out = out.replace("They", attacker_ref)
-        out = out.replace("Their", attacker_poss.capitalize())
-
-        # Defender placeholders (most DB text uses them/their to refer to opponent).
-        out = out.replace(" them ", f" {defender_ref} ")
-        out = out.replace(" Them ", f" {defender_ref_cap} ")
-        out = out.replace(" their ", f" {defender_poss} ")
-        out = out.replace(" Their ", f" {defender_poss.capitalize()} ")
-
-        return out
+        return self._flavor_cache.render(text, text, attacker=attacker, defender=defender)
 
     # --- Core move execution ---
     def _execute_move(
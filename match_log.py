@@ -0,0 +1,415 @@
+"""Parser for exported match logs (match_logs/match_log_*.txt).
+
+The app's EXPORT LOG button writes the match log as plain prose, one "> "
+line per log entry (see WrestleApp._export_match_log). This module turns
+those files back into structured history:
+
+- tokenize() streams lines into LogEvents (separator, score, clash, uses,
+  damage, escape, finish) without loading the file;
+- parse_log() folds one file into a history.MatchRecord: who was in which
+  corner, the winner and finish, per-move attempts / landings / damage and an
+  event trail of clashes, damage and escape attempts;
+- import_logs() parses files in a process pool and writes them to a
+  HistoryStore in batched transactions. Every file is keyed by the hash of
+  its bytes, so re-running an import (or resuming an interrupted one) skips
+  files that are already stored.
+
+Names are mapped back to roster slugs and move names to moves_db keys; a
+name that is no longer in the roster or the move list is kept as a slugified
+stand-in so old logs still count towards move and matchup totals.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+import os
+import re
+from typing import Callable, Iterable, Iterator
+
+from history import HistoryStore, HistoryWriter, MatchRecord
+
+
+LOG_SOURCE = "import"
+LOG_HASH_PREFIX = "log:"  # keeps file hashes apart from other content hashes
+LOG_SEPARATOR = "────────────────────────"  # engine.LOG_EXCHANGE_SEPARATOR
+LOG_GLOB = "match_log_*.txt"
+
+
+@dataclass(frozen=True)
+class LogEvent:
+    """One interesting log line. `who`/`other` are display names as logged."""
+
+    kind: str  # separator | score | clash | uses | damage | escape | finish | header
+    beat: int
+    who: str | None = None
+    move: str | None = None
+    amount: int | None = None
+    other: str | None = None
+    other_move: str | None = None
+    other_amount: int | None = None
+    detail: str | None = None
+
+
+_RE_SCORE_TOTAL = re.compile(r"=\s*(-?\d+)\s*$")
+_RE_CLASH = re.compile(
+    r"^(?P<w>.+?) wins the clash! (?P<l>.+?) was going for (?P<lm>.+?) \((?P<ls>[^)]*)\)(?: \([^)]*\))?, "
+    r"but .+? beats them to it with (?P<wm>.+?) \((?P<ws>[^)]*)\)"
+)
+_RE_USES = re.compile(r"^(?P<n>.+?) uses (?P<m>[A-Z][^!]*)!\s*(?P<flavor>.*)$")
+_RE_CRANK = re.compile(r"^(?P<a>.+?) cranks it! (?P<n>.+?) takes (?P<d>\d+) dmg")
+_RE_DAMAGE = re.compile(r"^(?P<n>.+?) takes (?P<d>\d+) dmg(?P<rest>.*)$")
+_RE_ATTEMPT = re.compile(r"^(?P<a>.+?) attempts an? (?P<k>[a-z]+)!$")
+_RE_PLAYER_DEFENDS = re.compile(r"^(?P<k>[A-Z]+)! Tap 3 cards to escape")
+_RE_ESCAPED = re.compile(r"^(?:KICKOUT AT \w+! |JUST IN TIME! )?(?P<n>.+?) escapes(?: the (?P<k>[a-z]+) attempt)?!$")
+_RE_FINISH = re.compile(r"^(?:THREE! )?(?P<k>[A-Z]+)! Escape failed — (?P<w>.+?) wins\.$")
+_RE_SECOND_PERSON = re.compile(r"\b(?:You|you|your|Your)\b")
+
+
+def _int_or_none(text: str) -> int | None:
+    try:
+        return int(str(text).strip())
+    except Exception:
+        return None
+
+
+def _score_total(side: str) -> int | None:
+    m = _RE_SCORE_TOTAL.search(side)
+    return int(m.group(1)) if m else None
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[LogEvent]:
+    """Stream LogEvents from the lines of an exported log."""
+    beat = 0
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if not line.startswith("> "):
+            # Header: "Started: ...", "Player: slug", "CPU: slug".
+            key, sep, val = line.partition(": ")
+            if sep and key in ("Started", "Player", "CPU"):
+                yield LogEvent("header", beat, who=key, detail=val.strip())
+            continue
+        line = line[2:].strip()
+        if not line:
+            continue
+
+        if line == LOG_SEPARATOR:
+            beat += 1
+            yield LogEvent("separator", beat)
+            continue
+        if line.startswith("Score: YOU "):
+            you, _sep, cpu = line[len("Score: YOU ") :].partition(" | CPU ")
+            yield LogEvent("score", beat, amount=_score_total(you), other_amount=_score_total(cpu))
+            continue
+
+        m = _RE_CLASH.match(line)
+        if m:
+            yield LogEvent(
+                "clash",
+                beat,
+                who=m.group("w"),
+                move=m.group("wm"),
+                amount=_int_or_none(m.group("ws")),
+                other=m.group("l"),
+                other_move=m.group("lm"),
+                other_amount=_int_or_none(m.group("ls")),
+            )
+            continue
+        m = _RE_FINISH.match(line)
+        if m:
+            yield LogEvent("finish", beat, who=m.group("w"), detail=m.group("k").upper())
+            continue
+        m = _RE_CRANK.match(line)
+        if m:
+            yield LogEvent("damage", beat, who=m.group("n"), amount=int(m.group("d")), other=m.group("a"), detail="tick")
+            continue
+        m = _RE_DAMAGE.match(line)
+        if m:
+            yield LogEvent("damage", beat, who=m.group("n"), amount=int(m.group("d")), detail="counter" if "counter" in m.group("rest") else None)
+            continue
+        m = _RE_USES.match(line)
+        if m:
+            flavor = m.group("flavor")
+            yield LogEvent("uses", beat, who=m.group("n"), move=m.group("m").strip(), detail="you" if _RE_SECOND_PERSON.search(flavor) else None)
+            continue
+        m = _RE_ATTEMPT.match(line)
+        if m:
+            yield LogEvent("escape", beat, other=m.group("a"), detail=f"{m.group('k').upper()}:start")
+            continue
+        m = _RE_PLAYER_DEFENDS.match(line)
+        if m:
+            yield LogEvent("escape", beat, who="YOU", detail=f"{m.group('k').upper()}:start")
+            continue
+        m = _RE_ESCAPED.match(line)
+        if m:
+            who = m.group("n")
+            kind = (m.group("k") or "pinfall").upper()
+            yield LogEvent("escape", beat, who="YOU" if who == "You escape" else who, detail=f"{kind}:escaped")
+            continue
+        if line.startswith("You escape the ") and line.endswith(" attempt!"):
+            kind = line[len("You escape the ") : -len(" attempt!")].upper()
+            yield LogEvent("escape", beat, who="YOU", detail=f"{kind}:escaped")
+
+
+def _slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(text).lower()).strip("_") or "unknown"
+
+
+def _name_maps() -> tuple[dict[str, str], dict[str, str]]:
+    from moves_db import MOVES
+    from wrestler_roster import ROSTER
+
+    names = {str(p.get("name", slug)): str(slug) for slug, p in ROSTER.items()}
+    moves: dict[str, str] = {}
+    for slug, mv in MOVES.items():
+        moves.setdefault(str(mv.get("name", slug)), str(slug))
+    return names, moves
+
+
+def file_hash(path: str, *, block: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    return LOG_HASH_PREFIX + h.hexdigest()
+
+
+def parse_log(path: str, *, content_hash: str | None = None, maps: tuple[dict, dict] | None = None) -> MatchRecord | None:
+    """Fold one exported log into a MatchRecord (None if it holds no match).
+
+    The player's corner is read from the "Player:" header when present. Older
+    logs only say "YOU vs CPU", so the corner is inferred: the clash winner
+    whose score matches the YOU total, and second-person move flavor text
+    ("You build speed...") both vote for the player.
+    """
+    names, move_slugs = maps or _name_maps()
+    header: dict[str, str] = {}
+    seen: list[str] = []  # wrestler names, first-seen order
+    votes: dict[str, int] = {}
+    usage: dict[str, dict[str, list[int]]] = {}
+    trail: list[tuple] = []  # (beat, kind, name, move_name, amount, detail)
+    beat = 0
+    score: tuple[int | None, int | None] = (None, None)
+    attempted: dict[str, str] = {}  # name -> move attempted this beat
+    landed: tuple[str, str] | None = None  # (name, move) of the line just read, if it was a "uses" line
+    escape: tuple[str | None, str] | None = None  # (defender name or "YOU", kind)
+    finish: tuple[str, str] | None = None
+
+    def note(name: str | None) -> None:
+        if name and name not in ("YOU", "CPU") and name not in seen:
+            seen.append(name)
+
+    def tally(name: str, move: str, *, attempts: int = 0, landed: int = 0, damage: int = 0) -> None:
+        rec = usage.setdefault(name, {}).setdefault(move, [0, 0, 0])
+        rec[0] += attempts
+        rec[1] += landed
+        rec[2] += damage
+
+    def opponent(name: str) -> str | None:
+        for n in seen:
+            if n != name:
+                return n
+        return None
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for ev in tokenize(f):
+            # A damage line belongs to a move only when it directly follows that move's "uses" line.
+            hit, landed = landed, None
+            if ev.kind == "header":
+                header[str(ev.who)] = str(ev.detail)
+            elif ev.kind == "separator":
+                beat = ev.beat
+                score = (None, None)
+                attempted.clear()
+            elif ev.kind == "score":
+                score = (ev.amount, ev.other_amount)
+            elif ev.kind == "clash":
+                note(ev.who)
+                note(ev.other)
+                tally(ev.who, ev.move, attempts=1)
+                tally(ev.other, ev.other_move, attempts=1)
+                attempted[ev.who] = ev.move
+                attempted[ev.other] = ev.other_move
+                you, cpu = score
+                if you is not None and cpu is not None and you != cpu:
+                    if (ev.amount, ev.other_amount) == (you, cpu):
+                        votes[ev.who] = votes.get(ev.who, 0) + 2
+                    elif (ev.amount, ev.other_amount) == (cpu, you):
+                        votes[ev.other] = votes.get(ev.other, 0) + 2
+                trail.append((beat, "clash", ev.who, ev.move, ev.amount, ev.other_move))
+            elif ev.kind == "uses":
+                note(ev.who)
+                if attempted.get(ev.who) != ev.move:
+                    # No clash line this beat (simultaneous / quiet beat): the move was still an attempt.
+                    tally(ev.who, ev.move, attempts=1)
+                    attempted[ev.who] = ev.move
+                tally(ev.who, ev.move, landed=1)
+                landed = (ev.who, ev.move)
+                if ev.detail == "you":
+                    votes[ev.who] = votes.get(ev.who, 0) + 1
+            elif ev.kind == "damage":
+                note(ev.who)
+                dealer = ev.other or opponent(ev.who)
+                move = hit[1] if hit and hit[0] == dealer and ev.detail is None else None
+                if move is not None:
+                    tally(dealer, move, damage=int(ev.amount or 0))
+                trail.append((beat, "damage", dealer, move, ev.amount, ev.detail))
+            elif ev.kind == "escape":
+                kind, _sep, state = str(ev.detail).partition(":")
+                if state == "start":
+                    note(ev.other)
+                    defender = ev.who if ev.who else (opponent(ev.other) if ev.other else None)
+                    escape = (defender, kind)
+                else:
+                    defender = ev.who if ev.who != "YOU" else (escape[0] if escape else "YOU")
+                    trail.append((beat, "escape", defender, None, None, f"{kind}:escaped"))
+                    escape = None
+            elif ev.kind == "finish":
+                finish = (str(ev.who), str(ev.detail))
+                if escape is not None:
+                    trail.append((beat, "escape", escape[0], None, None, f"{escape[1]}:failed"))
+                    escape = None
+
+    if len(seen) < 2 or beat == 0:
+        return None
+
+    # Corners: header slugs win; otherwise the best-voted name is the player.
+    player = max(seen[:2], key=lambda n: (votes.get(n, 0), -seen.index(n)))
+    cpu = seen[1] if player == seen[0] else seen[0]
+    side = {player: "red", cpu: "blue", "YOU": "red", "CPU": "blue"}
+    red = header.get("Player") or names.get(player) or _slugify(player)
+    blue = header.get("CPU") or names.get(cpu) or _slugify(cpu)
+
+    winner = kind = None
+    if finish is not None:
+        winner = side.get(finish[0])
+        kind = finish[1] if winner else None
+
+    def mslug(name: str | None) -> str | None:
+        return None if name is None else (move_slugs.get(name) or _slugify(name))
+
+    moves = {
+        side[n]: {mslug(m): list(v) for m, v in usage.get(n, {}).items()}
+        for n in (player, cpu)
+    }
+    events = []
+    for b, k, who, mv, amount, detail in trail:
+        if k == "clash":
+            detail = mslug(detail)
+        if who in ("YOU", "CPU"):
+            who = "red" if who == "YOU" else "blue"
+        else:
+            who = side.get(who) if who else None
+        events.append((b, k, who, mslug(mv), amount, detail))
+
+    played_at = None
+    try:
+        played_at = datetime.fromisoformat(header["Started"]).timestamp()
+    except Exception:
+        try:
+            played_at = os.path.getmtime(path)
+        except Exception:
+            played_at = None
+
+    rec = MatchRecord(
+        red=str(red),
+        blue=str(blue),
+        winner=winner,
+        kind=kind,
+        beats=int(beat),
+        source=LOG_SOURCE,
+        clashes=int(beat),
+        content_hash=content_hash,
+        moves=moves,
+        events=events,
+    )
+    if played_at is not None:
+        rec.played_at = float(played_at)
+    return rec
+
+
+# --- parallel import -------------------------------------------------------------
+
+_KNOWN: frozenset[str] = frozenset()
+_MAPS: tuple[dict, dict] | None = None
+
+
+def _init_worker(known: frozenset[str]) -> None:
+    global _KNOWN, _MAPS
+    _KNOWN = known
+    _MAPS = _name_maps()
+
+
+def _import_one(path: str) -> tuple[str, str, MatchRecord | None]:
+    """(path, status, record); status is new | skipped | empty | error."""
+    try:
+        digest = file_hash(path)
+        if digest in _KNOWN:
+            return path, "skipped", None
+        rec = parse_log(path, content_hash=digest, maps=_MAPS)
+        return path, ("new" if rec is not None else "empty"), rec
+    except Exception as e:
+        return path, f"error: {e}", None
+
+
+def find_logs(paths: Iterable[str]) -> list[str]:
+    """Expand directories to their match_log_*.txt files, oldest first."""
+    import glob
+
+    out: list[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            out.extend(sorted(glob.glob(os.path.join(p, LOG_GLOB))))
+        elif os.path.isfile(p):
+            out.append(p)
+    return out
+
+
+def import_logs(
+    store: HistoryStore,
+    paths: Iterable[str],
+    *,
+    workers: int | None = None,
+    batch_size: int | None = None,
+    progress: Callable[[str, str], None] | None = None,
+) -> dict[str, int]:
+    """Parse log files in parallel and add them to `store`.
+
+    Files already imported (same bytes) are skipped before parsing. Records
+    are committed in batches as results stream back, so an interrupted import
+    keeps what it wrote and the next run picks up the rest. Returns counts by
+    status (new, skipped, empty, duplicate, error).
+    """
+    from sim import default_workers
+
+    files = find_logs(paths)
+    counts = {"new": 0, "skipped": 0, "empty": 0, "duplicate": 0, "error": 0}
+    if not files:
+        return counts
+    known = frozenset(store.hashes(LOG_SOURCE))
+    writer = HistoryWriter(store, **({"batch_size": batch_size} if batch_size else {}))
+
+    def handle(path: str, status: str, rec: MatchRecord | None) -> None:
+        counts["error" if status.startswith("error") else status] += 1
+        if rec is not None:
+            writer.add(rec)
+        if progress is not None:
+            progress(path, status)
+
+    workers = max(1, int(workers or default_workers()))
+    with writer:
+        if workers == 1 or len(files) < 4:
+            _init_worker(known)
+            for path in files:
+                handle(*_import_one(path))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(known,)) as pool:
+                chunksize = max(1, min(32, len(files) // (workers * 4)))
+                for result in pool.map(_import_one, files, chunksize=chunksize):
+                    handle(*result)
+    # Two byte-identical files in one run: the second is ignored by the store.
+    counts["duplicate"] = counts["new"] - writer.written
+    counts["new"] = writer.written
+    return counts
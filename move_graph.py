@@ -0,0 +1,225 @@
+"""State-transition graph over moves, for AI planning and content audits.
+
+Nodes are positions seen from the acting wrestler: (user_state, user_role,
+target_state). An edge is a move that is statically legal there (see
+move_index.MoveLegalityIndex) and leads to the position after it lands:
+set_user_state / set_target_state, the attacker taking grapple OFFENSE, and
+the same desync repair the engine applies (a lone grapple tier breaks back
+to STANDING).
+
+All-pairs distances are in beats, by BFS from every node (the graph is tiny).
+Dynamic gates (momentum, weight, groggy) are ignored, so distances are
+optimistic lower bounds.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Mapping
+
+from move_index import GRAPPLE_STATES, MoveLegalityIndex, iter_bits
+from wrestler import GrappleRole, WrestlerState
+
+
+Node = tuple[str, "str | None", str]
+
+NEUTRAL: Node = (WrestlerState.STANDING.value, None, WrestlerState.STANDING.value)
+
+# Distance reported when a goal can't be reached.
+UNREACHABLE = 99
+
+_OFFENSE = GrappleRole.OFFENSE.value
+_DEFENSE = GrappleRole.DEFENSE.value
+
+
+def settle(ustate: str, role: str | None, tstate: str) -> Node:
+    """Normalize a position the way the engine does after a move."""
+    u_in = ustate in GRAPPLE_STATES
+    t_in = tstate in GRAPPLE_STATES
+    if u_in != t_in:
+        # Mirrors _repair_grapple_desync: break the half-grapple.
+        return (
+            WrestlerState.STANDING.value if u_in else ustate,
+            None,
+            WrestlerState.STANDING.value if t_in else tstate,
+        )
+    if not u_in:
+        return (ustate, None, tstate)
+    return (ustate, role, tstate)
+
+
+def flip(node: Node) -> Node:
+    """The same position seen from the other wrestler."""
+    u, role, t = node
+    if role == _OFFENSE:
+        role = _DEFENSE
+    elif role == _DEFENSE:
+        role = _OFFENSE
+    return (t, role, u)
+
+
+def node_of(user, target) -> Node:
+    ustate = str(getattr(getattr(user, "state", None), "value", "STANDING"))
+    tstate = str(getattr(getattr(target, "state", None), "value", "STANDING"))
+    r = getattr(user, "grapple_role", None)
+    role = str(getattr(r, "value", r)) if r is not None else None
+    return settle(ustate, role, tstate)
+
+
+def all_nodes() -> list[Node]:
+    states = [s.value for s in WrestlerState]
+    out: list[Node] = []
+    for u in states:
+        for t in states:
+            if (u in GRAPPLE_STATES) != (t in GRAPPLE_STATES):
+                continue
+            if u in GRAPPLE_STATES:
+                out.append((u, _OFFENSE, t))
+                out.append((u, _DEFENSE, t))
+            else:
+                out.append((u, None, t))
+    return out
+
+
+class TransitionGraph:
+    """Move graph for one moveset, with all-pairs distances and goal tables."""
+
+    def __init__(
+        self,
+        moves: Mapping[str, Mapping],
+        index: MoveLegalityIndex,
+        *,
+        moveset: Iterable[str] | None = None,
+        finisher: str | None = None,
+    ) -> None:
+        self.moves = moves
+        self.index = index
+        self.moveset_mask = index.moveset_mask(moveset)
+        self.finisher = str(finisher) if finisher else None
+
+        self.nodes: list[Node] = all_nodes()
+        self.legal: dict[Node, int] = {}
+        self.edges: dict[Node, dict[str, Node]] = {}
+        for node in self.nodes:
+            u, role, t = node
+            neutral = u == "STANDING" and t == "STANDING"
+            mask = index.situation_mask(u, role, t, neutral_filter=neutral) & self.moveset_mask
+            self.legal[node] = mask
+            out: dict[str, Node] = {}
+            for i in iter_bits(mask):
+                slug = index.slugs[i]
+                mv = moves[slug]
+                su = mv.get("set_user_state") or u
+                st = mv.get("set_target_state") or t
+                out[slug] = settle(str(su), _OFFENSE, str(st))
+            self.edges[node] = out
+
+        # All-pairs shortest paths (beats).
+        self.dist: dict[Node, dict[Node, int]] = {n: self._bfs(n) for n in self.nodes}
+
+        # Goal positions.
+        pin_mask = 0
+        sub_mask = 0
+        for i, slug in enumerate(index.slugs):
+            mtype = str(moves[slug].get("type", "Setup"))
+            if mtype == "Pin":
+                pin_mask |= 1 << i
+            elif mtype == "Submission":
+                sub_mask |= 1 << i
+        fin_mask = index.bit(self.finisher) if self.finisher else 0
+        self.goals: dict[str, set[Node]] = {
+            "pin": {n for n in self.nodes if self.legal[n] & pin_mask},
+            "submission": {n for n in self.nodes if self.legal[n] & sub_mask},
+            "finisher": {n for n in self.nodes if self.legal[n] & fin_mask},
+        }
+        self.goal_dist: dict[str, dict[Node, int]] = {
+            name: {n: min((self.dist[n].get(g, UNREACHABLE) for g in goal), default=UNREACHABLE) for n in self.nodes}
+            for name, goal in self.goals.items()
+        }
+        self._progress: dict[tuple[Node, str], dict[str, int]] = {}
+
+    def _bfs(self, src: Node) -> dict[Node, int]:
+        seen = {src: 0}
+        q = deque([src])
+        while q:
+            n = q.popleft()
+            d = seen[n] + 1
+            for nxt in self.edges.get(n, {}).values():
+                if nxt not in seen:
+                    seen[nxt] = d
+                    q.append(nxt)
+        return seen
+
+    # --- lookups ---
+    def next_node(self, node: Node, slug: str) -> Node | None:
+        return self.edges.get(node, {}).get(str(slug))
+
+    def distance(self, src: Node, dst: Node) -> int:
+        return int(self.dist.get(src, {}).get(dst, UNREACHABLE))
+
+    def distance_to(self, node: Node, goal: str) -> int:
+        return int(self.goal_dist.get(goal, {}).get(node, UNREACHABLE))
+
+    def progress(self, node: Node, slug: str, goal: str) -> int:
+        """Beats gained toward `goal` by landing `slug` from `node` (negative = away)."""
+        return self.progress_map(node, goal).get(str(slug), 0)
+
+    def progress_map(self, node: Node, goal: str) -> dict[str, int]:
+        """progress() of every move legal at `node`, keyed by slug (cached; don't mutate)."""
+        key = (node, goal)
+        out = self._progress.get(key)
+        if out is None:
+            here = min(self.distance_to(node, goal), UNREACHABLE)
+            out = {
+                slug: int(here) - int(min(self.distance_to(nxt, goal), UNREACHABLE))
+                for slug, nxt in self.edges.get(node, {}).items()
+            }
+            self._progress[key] = out
+        return out
+
+    # --- audits ---
+    def reachable(self, start: Node = NEUTRAL, opponent: "TransitionGraph | None" = None) -> set[Node]:
+        """Positions reachable from start by either wrestler's moves.
+
+        The opponent defaults to one with access to every move.
+        """
+        if opponent is None:
+            opponent = TransitionGraph(self.moves, self.index, moveset=None)
+        seen = {start}
+        q = deque([start])
+        while q:
+            n = q.popleft()
+            nxts = list(self.edges.get(n, {}).values())
+            nxts += [flip(m) for m in opponent.edges.get(flip(n), {}).values()]
+            for nxt in nxts:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    q.append(nxt)
+        return seen
+
+    def unreachable_moves(self, start: Node = NEUTRAL, opponent: "TransitionGraph | None" = None) -> list[str]:
+        """Moveset moves that are never legal in any position reachable from start."""
+        # Groggy Recovery is gated by a status, not a position.
+        seen = self.index.groggy_bit
+        for n in self.reachable(start, opponent):
+            seen |= self.legal[n]
+        return self.index.slugs_of(self.moveset_mask & ~seen)
+
+    def dead_ends(self, start: Node = NEUTRAL, opponent: "TransitionGraph | None" = None) -> list[Node]:
+        """Reachable positions with an empty menu."""
+        return sorted((n for n in self.reachable(start, opponent) if not self.legal[n]), key=str)
+
+    def soft_locks(self, start: Node = NEUTRAL, opponent: "TransitionGraph | None" = None, goal: str = "pin") -> list[Node]:
+        """Reachable positions from which neither wrestler can ever get back to
+        neutral or to this wrestler's goal (the cases _repair_grapple_desync and
+        friends have to patch at runtime)."""
+        if opponent is None:
+            opponent = TransitionGraph(self.moves, self.index, moveset=None)
+        goal_nodes = self.goals.get(goal, set())
+        out = []
+        for n in self.reachable(start, opponent):
+            onward = self.reachable(n, opponent)
+            if NEUTRAL in onward or (onward & goal_nodes):
+                continue
+            out.append(n)
+        return sorted(out, key=str)
@@ -0,0 +1,93 @@
+"""Stable move IDs (slugs) and the engine's special-move rule sets.
+
+UI-free so the Kivy app, the legality index and offline tools all agree on
+which slugs are special.
+"""
+
+from __future__ import annotations
+
+MOVE_DEFENSIVE = "def_defensive"
+MOVE_REST = "util_rest"
+MOVE_GROGGY_RECOVERY = "util_groggy_recovery"
+MOVE_TAUNT = "util_taunt"
+MOVE_SLOW_STAND_UP = "util_slow_stand_up"
+MOVE_KIP_UP = "util_kip_up"
+MOVE_LOCK_UP = "grap_lock_up"
+MOVE_FIGHT_FOR_CONTROL = "grap_fight_for_control"
+MOVE_SHOVE_OFF = "grap_shove_off"
+MOVE_STOP_SHORT = "util_stop_short"
+MOVE_CLIMB_DOWN = "air_climb_down"
+MOVE_PIN = "pin_pin"
+MOVE_DOUBLE_LEG_TAKEDOWN = "grap_double_leg_takedown"
+MOVE_DESPERATION_PUNCH = "strike_desperation_punch"
+MOVE_LIGHT_JAB = "strike_light_jab"
+MOVE_HEADBUTT = "grap_headbutt"
+MOVE_UPKICK = "strike_upkick"
+MOVE_GROUND_ROLL = "util_ground_roll"
+MOVE_BITE = "strike_bite"
+MOVE_FOREARM_CLUB = "strike_forearm_club"
+MOVE_KNEE_TO_GUT = "strike_knee_to_gut"
+MOVE_EAR_CLAP = "strike_ear_clap"
+MOVE_GUT_PUNCH = "strike_gut_punch"
+MOVE_CHARGE = "util_charge"
+MOVE_RUNNING_CLOTHESLINE = "strike_running_clothesline"
+MOVE_BRACE_CLOTHESLINE = "strike_brace_clothesline"
+MOVE_RUNNING_COLLISION = "strike_running_collision"
+MOVE_TRIP = "strike_trip"
+MOVE_REGAIN_BALANCE = "util_regain_balance"
+
+# Hobbled wrestlers may still use these (no running/aerial otherwise).
+HOBBLED_EXEMPT_MOVES = frozenset(
+    {MOVE_STOP_SHORT, MOVE_CLIMB_DOWN, MOVE_GROGGY_RECOVERY, MOVE_DEFENSIVE, MOVE_REST}
+)
+
+# Always allowed while on grapple defense (plus cheap defense-side strikes/setups).
+GRAPPLE_DEFENSE_BASELINE_MOVES = frozenset(
+    {
+        MOVE_FIGHT_FOR_CONTROL,
+        MOVE_DEFENSIVE,
+        MOVE_REST,
+        MOVE_SHOVE_OFF,
+        MOVE_DESPERATION_PUNCH,
+        MOVE_BITE,
+        MOVE_EAR_CLAP,
+        MOVE_GUT_PUNCH,
+        MOVE_FOREARM_CLUB,
+        MOVE_KNEE_TO_GUT,
+        "grap_wrist_escape",
+    }
+)
+
+# Non-strike options allowed in neutral (both standing).
+NEUTRAL_ALLOWED_MOVES = frozenset({MOVE_LOCK_UP, MOVE_TAUNT, MOVE_DEFENSIVE})
+
+# Keep parity with Tk version: universal safety options always pass the moveset filter.
+UNIVERSAL_MOVES = frozenset(
+    {
+        MOVE_DEFENSIVE,
+        MOVE_REST,
+        MOVE_GROGGY_RECOVERY,
+        MOVE_TAUNT,
+        MOVE_LOCK_UP,
+        MOVE_SHOVE_OFF,
+        MOVE_SLOW_STAND_UP,
+        MOVE_KIP_UP,
+        MOVE_GROUND_ROLL,
+        MOVE_CLIMB_DOWN,
+        MOVE_STOP_SHORT,
+        MOVE_REGAIN_BALANCE,
+        # Universal "cheap kit" per major state (prevents empty move menus).
+        MOVE_LIGHT_JAB,  # STANDING vs STANDING
+        MOVE_HEADBUTT,  # GRAPPLE_WEAK cheap hit
+        MOVE_DESPERATION_PUNCH,  # GRAPPLE_DEFENSE cheap strike
+        MOVE_UPKICK,  # GROUNDED cheap offense vs STANDING
+        # Universal running coverage (prevents RUNNING soft-locks).
+        MOVE_RUNNING_CLOTHESLINE,
+        MOVE_BRACE_CLOTHESLINE,
+        MOVE_RUNNING_COLLISION,
+        # Universal win-condition access.
+        MOVE_PIN,
+        # Universal high-risk takedown shortcut.
+        MOVE_DOUBLE_LEG_TAKEDOWN,
+    }
+)
@@ -0,0 +1,281 @@
+"""Precomputed move-legality bitmasks.
+
+Every slug in MOVES gets a bit index; the static parts of the legality rules
+(user/target state, grapple role, defense baseline, neutral filter, hobbled
+filter, lift flag, moveset) become integer masks. A legality query for a
+situation is then a few AND operations, and only the survivors go through the
+dynamic checks (momentum, weight).
+
+This module is UI-free so it can be shared by the Kivy app and any headless
+tooling. The rule sets are passed in by the caller; build_legality_index()
+wires up the engine's own sets from move_ids.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Mapping
+
+from move_ids import (
+    GRAPPLE_DEFENSE_BASELINE_MOVES,
+    HOBBLED_EXEMPT_MOVES,
+    MOVE_DEFENSIVE,
+    MOVE_GROGGY_RECOVERY,
+    MOVE_REST,
+    MOVE_TAUNT,
+    NEUTRAL_ALLOWED_MOVES,
+    UNIVERSAL_MOVES,
+)
+from wrestler import GrappleRole, WrestlerState
+
+
+GRAPPLE_STATES: frozenset[str] = frozenset(
+    {
+        WrestlerState.GRAPPLE_WEAK.value,
+        WrestlerState.GRAPPLE_STRONG.value,
+        WrestlerState.GRAPPLE_BACK.value,
+    }
+)
+
+_ROLES: tuple[str | None, ...] = (None, GrappleRole.OFFENSE.value, GrappleRole.DEFENSE.value)
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the indices of set bits, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def user_key(wrestler) -> tuple[str, str | None]:
+    """(state, role) key; role is only meaningful while in a grapple."""
+    state = str(getattr(getattr(wrestler, "state", None), "value", "STANDING"))
+    role = None
+    if state in GRAPPLE_STATES:
+        r = getattr(wrestler, "grapple_role", None)
+        role = str(getattr(r, "value", r)) if r is not None else None
+    return state, role
+
+
+class MoveLegalityIndex:
+    """Bitmask view over a moves mapping.
+
+    Do not mutate the masks; rebuild the index when the moves mapping changes.
+    """
+
+    def __init__(
+        self,
+        moves: Mapping[str, Mapping],
+        *,
+        groggy_move: str,
+        taunt_move: str,
+        defensive_move: str,
+        rest_move: str,
+        hobbled_exempt: Iterable[str] = (),
+        defense_baseline: Iterable[str] = (),
+        neutral_allowed: Iterable[str] = (),
+        universal: Iterable[str] = (),
+    ) -> None:
+        self.slugs: tuple[str, ...] = tuple(moves.keys())
+        self.index: dict[str, int] = {s: i for i, s in enumerate(self.slugs)}
+        self.all_mask: int = (1 << len(self.slugs)) - 1
+
+        self.groggy_bit = self.bit(groggy_move)
+        self.taunt_bit = self.bit(taunt_move)
+        self.defensive_bit = self.bit(defensive_move)
+        self.rest_bit = self.bit(rest_move)
+        self.universal_mask = self.mask_of(universal)
+
+        hobbled_exempt = set(hobbled_exempt)
+        defense_baseline = set(defense_baseline)
+        neutral_allowed = set(neutral_allowed)
+
+        states = [s.value for s in WrestlerState]
+
+        # Per-move static flags.
+        self.hobbled_block_mask = 0
+        self.lift_mask = 0
+        self.momentum_mask = 0
+        self.neutral_mask = 0
+        dis_ok = 0
+        ru_by_bit: list[str] = []
+        rt_by_bit: list[str] = []
+
+        for i, slug in enumerate(self.slugs):
+            mv = moves[slug]
+            b = 1 << i
+            ru = str(mv.get("req_user_state", "ANY"))
+            rt = str(mv.get("req_target_state", "ANY"))
+            t = str(mv.get("type", "Setup"))
+            su = str(mv.get("set_user_state", ""))
+            ru_by_bit.append(ru)
+            rt_by_bit.append(rt)
+
+            if slug not in hobbled_exempt and (t == "Aerial" or ru in {"RUNNING", "TOP_ROPE"}):
+                self.hobbled_block_mask |= b
+            if bool(mv.get("is_lift", False)):
+                self.lift_mask |= b
+            try:
+                if int(mv.get("req_momentum_min", 0) or 0) > 0:
+                    self.momentum_mask |= b
+            except Exception:
+                pass
+            if (
+                bool(mv.get("allow_neutral", False))
+                or t == "Strike"
+                or slug in neutral_allowed
+                or (t == "Setup" and su in {"RUNNING", "TOP_ROPE"})
+            ):
+                self.neutral_mask |= b
+            if slug in defense_baseline or (
+                ru in {"GRAPPLE_DEFENSE", "GRAPPLE_ANY", "GRAPPLE_WEAK"} and t in {"Strike", "Setup"}
+            ):
+                dis_ok |= b
+
+        # User-side mask per (state, role): requirement + defense baseline + Defensive rules.
+        self.user_masks: dict[tuple[str, str | None], int] = {}
+        for state in states:
+            in_grapple = state in GRAPPLE_STATES
+            for role in _ROLES if in_grapple else (None,):
+                m = 0
+                for i, ru in enumerate(ru_by_bit):
+                    if ru == "ANY":
+                        ok = True
+                    elif ru == "GRAPPLE_DEFENSE":
+                        ok = in_grapple and role == GrappleRole.DEFENSE.value
+                    elif ru == "GRAPPLE_OFFENSE":
+                        ok = in_grapple and role == GrappleRole.OFFENSE.value
+                    elif ru in {"GRAPPLED", "GRAPPLE_ANY"}:
+                        ok = in_grapple
+                    elif ru == "GRAPPLE_WEAK":
+                        ok = state in {WrestlerState.GRAPPLE_WEAK.value, WrestlerState.GRAPPLE_STRONG.value}
+                    else:
+                        ok = ru == state
+                    if ok:
+                        m |= 1 << i
+                if role == GrappleRole.DEFENSE.value:
+                    m &= dis_ok
+                if role == GrappleRole.OFFENSE.value:
+                    m &= ~self.defensive_bit
+                self.user_masks[(state, role)] = m
+
+        # Target-side mask per state.
+        self.target_masks: dict[str, int] = {}
+        for state in states:
+            m = 0
+            for i, rt in enumerate(rt_by_bit):
+                if rt == "ANY":
+                    ok = True
+                elif rt in {"GRAPPLED", "GRAPPLE_ANY"}:
+                    ok = state in GRAPPLE_STATES
+                else:
+                    ok = rt == state
+                if ok:
+                    m |= 1 << i
+            self.target_masks[state] = m
+
+        self._situation_cache: dict[tuple, int] = {}
+        self._moveset_cache: dict[tuple[str, ...], int] = {}
+
+    # --- helpers ---
+    def bit(self, slug: str) -> int:
+        i = self.index.get(str(slug))
+        return 0 if i is None else (1 << i)
+
+    def mask_of(self, slugs: Iterable[str]) -> int:
+        m = 0
+        for s in slugs:
+            m |= self.bit(s)
+        return m
+
+    def slugs_of(self, mask: int) -> list[str]:
+        slugs = self.slugs
+        return [slugs[i] for i in iter_bits(mask)]
+
+    def moveset_mask(self, moveset: Iterable[str] | None) -> int:
+        if moveset is None:
+            return self.all_mask
+        key = tuple(moveset)
+        m = self._moveset_cache.get(key)
+        if m is None:
+            m = self.universal_mask | self.mask_of(key)
+            self._moveset_cache[key] = m
+        return m
+
+    # --- queries ---
+    def static_mask(self, user, target, *, neutral_filter: bool = False) -> int:
+        """AND of every static rule for this user/target situation.
+
+        Groggy and hobbled are folded in here too; they are per-wrestler flags
+        but do not depend on the individual move beyond a precomputed mask.
+        The Taunt-on-offense exception is included. Momentum and weight gates
+        are left to the caller.
+        """
+        ustate, role = user_key(user)
+        tstate = str(getattr(getattr(target, "state", None), "value", "STANDING"))
+        groggy = bool(getattr(user, "is_groggy", False))
+        try:
+            hobbled = bool(user.is_hobbled())
+        except Exception:
+            hobbled = False
+        return self.situation_mask(ustate, role, tstate, groggy=groggy, hobbled=hobbled, neutral_filter=neutral_filter)
+
+    def situation_mask(
+        self,
+        ustate: str,
+        role: str | None,
+        tstate: str,
+        *,
+        groggy: bool = False,
+        hobbled: bool = False,
+        neutral_filter: bool = False,
+    ) -> int:
+        """Same as static_mask, from raw state values (no Wrestler needed)."""
+        ukey = (str(ustate), role if str(ustate) in GRAPPLE_STATES else None)
+        tstate = str(tstate)
+        key = (ukey, tstate, bool(groggy), bool(hobbled), bool(neutral_filter))
+        cached = self._situation_cache.get(key)
+        if cached is not None:
+            return cached
+
+        m = self.user_masks.get(ukey, 0) & self.target_masks.get(tstate, 0)
+
+        if m & self.defensive_bit:
+            ustate, role = ukey
+            if not (
+                (ustate == "STANDING" and tstate == "STANDING")
+                or role == GrappleRole.DEFENSE.value
+                or ustate in {"TOSSED", "GROUNDED"}
+            ):
+                m &= ~self.defensive_bit
+
+        if ukey[1] == GrappleRole.OFFENSE.value:
+            m |= self.taunt_bit
+
+        if groggy:
+            m &= self.groggy_bit
+        else:
+            m &= ~self.groggy_bit
+        if hobbled:
+            m &= ~self.hobbled_block_mask
+
+        if neutral_filter:
+            m &= self.neutral_mask | self.rest_bit
+
+        self._situation_cache[key] = m
+        return m
+
+
+def build_legality_index(moves: Mapping[str, Mapping]) -> MoveLegalityIndex:
+    """Index over `moves` using the engine's special-move rule sets."""
+    return MoveLegalityIndex(
+        moves,
+        groggy_move=MOVE_GROGGY_RECOVERY,
+        taunt_move=MOVE_TAUNT,
+        defensive_move=MOVE_DEFENSIVE,
+        rest_move=MOVE_REST,
+        hobbled_exempt=HOBBLED_EXEMPT_MOVES,
+        defense_baseline=GRAPPLE_DEFENSE_BASELINE_MOVES,
+        neutral_allowed=NEUTRAL_ALLOWED_MOVES,
+        universal=UNIVERSAL_MOVES,
+    )
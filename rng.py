@@ -0,0 +1,60 @@
+"""Named random streams for the match engine.
+
+Rolls are split by purpose so that two runs of the same seed stay aligned even
+when a balance change alters how often one kind of roll happens:
+
+- deck:  deck builds and shuffles (cards.Deck)
+- ai:    CPU noise and policy picks (move_value jitter, shop rolls, ...)
+- ties:  coin tosses that break clash ties
+- rules: everything else (daze, botch, crits)
+
+By default every stream is the global `random` module, so normal play and
+random.seed() behave exactly as before. seeded() swaps in independent
+random.Random instances derived from one seed for the duration of a block.
+Callers must look streams up at call time (`rng.ai.random()`), never bind them.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+import random
+import zlib
+
+
+STREAM_NAMES: tuple[str, ...] = ("deck", "ai", "ties", "rules")
+
+deck = random
+ai = random
+ties = random
+rules = random
+
+
+def stream_seed(seed: int, name: str) -> int:
+    """Seed for one named sub-stream of `seed`."""
+    return (int(seed) * 0x9E3779B1 + zlib.crc32(name.encode("utf-8"))) & 0xFFFFFFFFFFFF
+
+
+def seed_streams(seed: int) -> None:
+    """Give every stream its own generator derived from `seed`."""
+    g = globals()
+    for name in STREAM_NAMES:
+        g[name] = random.Random(stream_seed(seed, name))
+
+
+def reset_streams() -> None:
+    """Route every stream back to the global `random` module."""
+    g = globals()
+    for name in STREAM_NAMES:
+        g[name] = random
+
+
+@contextmanager
+def seeded(seed: int):
+    """Run a block on seeded sub-streams, then restore the previous ones."""
+    g = globals()
+    saved = {name: g[name] for name in STREAM_NAMES}
+    seed_streams(seed)
+    try:
+        yield
+    finally:
+        g.update(saved)
@@ -0,0 +1,528 @@
+"""Parallel headless simulation with online statistics.
+
+Matches run through engine.simulate_match in worker processes. Results are
+streamed into online aggregators (Welford mean/variance, Wilson interval for
+the win rate) and each pair stops as soon as its question is answered:
+
+- the win-rate interval is narrower than `target_width`, or
+- the interval excludes 50% (the matchup is significantly lopsided).
+
+Freed workers go to the pairs that still need samples, widest interval
+first. Seeds are fixed per (pair, chunk) and chunks are folded in order, so
+the result doesn't depend on worker timing.
+
+run_ab() compares a baseline against a variant (patched moves, engine tuning
+constants or roster profiles) with common random numbers: both arms play the
+same seeds and report per-seed paired differences.
+
+run_adaptive() and run_ab_many() take an optional history.HistoryWriter and
+add every folded match to the match history (for A/B runs, the baseline arm
+only; variant arms play patched rules).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+import copy
+from dataclasses import dataclass, field
+import hashlib
+import json
+import math
+import os
+import zlib
+
+from engine import HEADLESS_MAX_BEATS, simulate_match
+from history import HistoryWriter, record_from_result
+
+
+# Defaults for adaptive runs.
+SIM_TARGET_WIDTH = 0.10  # stop once the 95% win-rate interval is this narrow
+SIM_Z = 1.96
+SIM_MIN_MATCHES = 20
+SIM_MAX_MATCHES = 400
+SIM_CHUNK = 10  # matches per worker task
+
+
+class Welford:
+    """Streaming mean / variance."""
+
+    __slots__ = ("n", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        d = float(x) - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (float(x) - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stderr(self) -> float:
+        return math.sqrt(self.variance / self.n) if self.n > 0 else float("inf")
+
+
+def wilson_interval(successes: float, n: int, z: float = SIM_Z) -> tuple[float, float]:
+    """Wilson score interval for a proportion (draws may count as 0.5)."""
+    if n <= 0:
+        return (0.0, 1.0)
+    p = float(successes) / float(n)
+    z2 = z * z
+    denom = 1.0 + z2 / n
+    center = (p + z2 / (2 * n)) / denom
+    half = (z / denom) * math.sqrt(max(0.0, p * (1.0 - p) / n + z2 / (4 * n * n)))
+    return (max(0.0, center - half), min(1.0, center + half))
+
+
+@dataclass
+class PairStats:
+    """Running results for one (player_slug, cpu_slug) pairing, from the player seat."""
+
+    player: str
+    cpu: str
+    wins: float = 0.0  # draws (beat cap) count half
+    n: int = 0
+    beats: Welford = field(default_factory=Welford)
+    done: bool = False
+    reason: str = ""
+
+    def add(self, winner: str | None, beats: int) -> None:
+        self.n += 1
+        self.wins += 1.0 if winner == "player" else (0.5 if winner is None else 0.0)
+        self.beats.add(beats)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.n if self.n else 0.5
+
+    def interval(self, z: float = SIM_Z) -> tuple[float, float]:
+        return wilson_interval(self.wins, self.n, z)
+
+    def width(self, z: float = SIM_Z) -> float:
+        lo, hi = self.interval(z)
+        return hi - lo
+
+
+def pair_seed(base: int, player: str, cpu: str, index: int) -> int:
+    """Deterministic per-match seed for a pairing."""
+    h = zlib.crc32(f"{player}|{cpu}".encode("utf-8"))
+    return (int(base) * 1_000_003 + h * 7_919 + int(index)) & 0x7FFFFFFF
+
+
+def score_of(winner: str | None) -> float:
+    """Player-seat score of one result: win 1, beat-cap draw 0.5, loss 0."""
+    return 1.0 if winner == "player" else (0.5 if winner is None else 0.0)
+
+
+# =============================================================================
+# VARIANTS
+# =============================================================================
+# A variant is a plain dict so it pickles to workers and round-trips JSON:
+#   {"moves":  {slug: {field: value, ...}},      patches moves_db.MOVES entries
+#    "tuning": {NAME: value, ...},               patches engine module constants
+#    "roster": {slug: {field: value, ...}}}      patches wrestler_roster.ROSTER profiles
+# None or {} is the baseline.
+
+
+def variant_key(variant: dict | None) -> str:
+    """Stable short hash of a variant (for caches and reports)."""
+    blob = json.dumps(variant or {}, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+@contextmanager
+def apply_variant(variant: dict | None):
+    """Patch moves / tuning / roster in place for a block, then restore."""
+    import engine
+    from moves_db import MOVES
+    from wrestler_roster import ROSTER
+
+    variant = variant or {}
+    undo: list = []
+    missing = object()
+    try:
+        for section, table in (("moves", MOVES), ("roster", ROSTER)):
+            for slug, fields in (variant.get(section) or {}).items():
+                if slug not in table:
+                    raise KeyError(f"{section}: unknown slug {slug!r}")
+                rec = table[slug]
+                for k, v in fields.items():
+                    undo.append((rec, k, rec.get(k, missing)))
+                    rec[k] = copy.deepcopy(v)
+        g = vars(engine)
+        for name, v in (variant.get("tuning") or {}).items():
+            if name not in g:
+                raise KeyError(f"tuning: engine has no constant {name!r}")
+            undo.append((g, name, g[name]))
+            g[name] = v
+        yield
+    finally:
+        for rec, k, old in reversed(undo):
+            if old is missing:
+                rec.pop(k, None)
+            else:
+                rec[k] = old
+
+
+# =============================================================================
+# WORKERS
+# =============================================================================
+
+
+def _play_chunk(
+    player: str, cpu: str, seeds: list[int], max_beats: int, variant: dict | None = None, record: bool = False
+) -> list[tuple]:
+    """(winner, beats) per seed, plus a history MatchRecord when `record`."""
+    out = []
+    with apply_variant(variant):
+        for s in seeds:
+            r = simulate_match(player, cpu, seed=s, max_beats=max_beats)
+            row = (r.winner, int(r.beats))
+            out.append(row + (record_from_result(player, cpu, r, seed=s),) if record else row)
+    return out
+
+
+def _play_ab_chunk(
+    player: str, cpu: str, seeds: list[int], max_beats: int, baseline: dict | None, variant: dict | None, record: bool = False
+) -> list[tuple]:
+    """(winner A, beats A, winner B, beats B) per seed, plus the baseline arm's MatchRecord when `record`."""
+    a = _play_chunk(player, cpu, seeds, max_beats, baseline, record)
+    b = _play_chunk(player, cpu, seeds, max_beats, variant)
+    return [(wa, ba, wb, bb, *rec) for (wa, ba, *rec), (wb, bb) in zip(a, b)]
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _run_chunks(pairs, *, workers, max_chunks, submit, fold, priority, progress=None) -> None:
+    """Shared scheduler: keep the pool busy, fold each pair's chunks in order.
+
+    submit(pool, pair, k) -> future for chunk k; fold(pair, result) -> True
+    once the pair is done; priority(pair) ranks live pairs for freed slots.
+    """
+    next_chunk = {p: 0 for p in pairs}  # next chunk index to hand out
+    folded = {p: 0 for p in pairs}  # chunks folded, in order
+    pending: dict = {p: {} for p in pairs}
+    done_pairs: set = set()
+    in_flight: dict = {}
+
+    def pick():
+        # Highest priority, discounted by chunks already out; fewer chunks breaks ties.
+        best = None
+        best_key = None
+        for p in pairs:
+            if p in done_pairs or next_chunk[p] >= max_chunks:
+                continue
+            outstanding = next_chunk[p] - folded[p]
+            key = (priority(p) / (1 + outstanding), -next_chunk[p])
+            if best_key is None or key > best_key:
+                best, best_key = p, key
+        return best
+
+    n_workers = int(workers or default_workers())
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        while True:
+            while len(in_flight) < n_workers * 2:
+                p = pick()
+                if p is None:
+                    break
+                k = next_chunk[p]
+                next_chunk[p] = k + 1
+                in_flight[submit(pool, p, k)] = (p, k)
+            if not in_flight:
+                break
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                p, k = in_flight.pop(fut)
+                pending[p][k] = fut.result()
+                # Fold completed chunks in order so results are timing-independent.
+                while p not in done_pairs and folded[p] in pending[p]:
+                    if fold(p, pending[p].pop(folded[p])):
+                        done_pairs.add(p)
+                    folded[p] += 1
+                if p not in done_pairs and folded[p] >= max_chunks:
+                    done_pairs.add(p)
+                if p in done_pairs:
+                    pending[p].clear()
+                if progress is not None:
+                    progress(p)
+            for fut in [f for f, (p, _k) in in_flight.items() if p in done_pairs]:
+                fut.cancel()
+
+
+# =============================================================================
+# ADAPTIVE WIN-RATE RUNS
+# =============================================================================
+
+
+def run_adaptive(
+    pairs: list[tuple[str, str]],
+    *,
+    workers: int | None = None,
+    target_width: float = SIM_TARGET_WIDTH,
+    z: float = SIM_Z,
+    min_matches: int = SIM_MIN_MATCHES,
+    max_matches: int = SIM_MAX_MATCHES,
+    chunk: int = SIM_CHUNK,
+    seed: int = 0,
+    max_beats: int = HEADLESS_MAX_BEATS,
+    variant: dict | None = None,
+    history: HistoryWriter | None = None,
+    progress=None,
+) -> dict[tuple[str, str], PairStats]:
+    """Simulate every pair until its stopping rule fires (see module docstring).
+
+    `progress(stats)` is called after each completed chunk, if given. With a
+    HistoryWriter every folded match is also added to the match history.
+    """
+    stats = {p: PairStats(p[0], p[1]) for p in pairs}
+    chunk = max(1, int(chunk))
+
+    def submit(pool, p, k):
+        seeds = [pair_seed(seed, p[0], p[1], k * chunk + i) for i in range(chunk)]
+        return pool.submit(_play_chunk, p[0], p[1], seeds, int(max_beats), variant, history is not None)
+
+    def fold(p, results) -> bool:
+        st = stats[p]
+        for winner, beats, *rec in results:
+            st.add(winner, beats)
+            if history is not None:
+                history.add(rec[0])
+        if st.n < int(min_matches):
+            return False
+        lo, hi = st.interval(z)
+        if hi - lo <= float(target_width):
+            st.done, st.reason = True, "narrow"
+        elif lo > 0.5 or hi < 0.5:
+            st.done, st.reason = True, "significant"
+        elif st.n >= int(max_matches):
+            st.done, st.reason = True, "cap"
+        return st.done
+
+    _run_chunks(
+        list(pairs),
+        workers=workers,
+        max_chunks=max(1, int(math.ceil(max_matches / chunk))),
+        submit=submit,
+        fold=fold,
+        priority=lambda p: stats[p].width(z),
+        progress=None if progress is None else (lambda _p: progress(stats)),
+    )
+    for st in stats.values():
+        if not st.done:
+            st.done, st.reason = True, "cap"
+    return stats
+
+
+def run_fixed_many(
+    pairs: list[tuple[str, str]],
+    variants: dict[str, dict | None],
+    *,
+    matches: int,
+    workers: int | None = None,
+    chunk: int = SIM_CHUNK,
+    seed: int = 0,
+    max_beats: int = HEADLESS_MAX_BEATS,
+    progress=None,
+) -> dict[tuple[str, tuple[str, str]], PairStats]:
+    """Exactly `matches` games per (variant, pair), all variants on the same seeds.
+
+    For searches that rank many candidates: equal samples and shared seeds
+    keep the comparison fair. Results are keyed by (variant name, pair).
+    """
+    keys = [(name, p) for name in variants for p in pairs]
+    stats = {k: PairStats(k[1][0], k[1][1]) for k in keys}
+    chunk = max(1, min(int(chunk), int(matches)))
+    n_chunks = max(1, int(math.ceil(int(matches) / chunk)))
+
+    def submit(pool, key, k):
+        name, p = key
+        lo = k * chunk
+        seeds = [pair_seed(seed, p[0], p[1], i) for i in range(lo, min(int(matches), lo + chunk))]
+        return pool.submit(_play_chunk, p[0], p[1], seeds, int(max_beats), variants[name])
+
+    def fold(key, results) -> bool:
+        st = stats[key]
+        for winner, beats in results:
+            st.add(winner, beats)
+        if st.n >= int(matches):
+            st.done, st.reason = True, "fixed"
+        return st.done
+
+    _run_chunks(
+        keys,
+        workers=workers,
+        max_chunks=n_chunks,
+        submit=submit,
+        fold=fold,
+        priority=lambda key: float(n_chunks - stats[key].n // chunk),
+        progress=None if progress is None else (lambda _k: progress(stats)),
+    )
+    return stats
+
+
+# =============================================================================
+# A/B (COMMON RANDOM NUMBERS)
+# =============================================================================
+
+
+@dataclass
+class ABStats:
+    """Paired baseline/variant results for one pairing, from the player seat.
+
+    Both arms play the same seeds, and each seed drives separate deck / AI /
+    tie-break / rules streams (see rng), so most of the match-to-match noise
+    cancels in the per-seed difference.
+    """
+
+    player: str
+    cpu: str
+    a: PairStats
+    b: PairStats
+    d_score: Welford = field(default_factory=Welford)  # per-seed score(B) - score(A)
+    d_beats: Welford = field(default_factory=Welford)  # per-seed beats(B) - beats(A)
+    reason: str = ""
+
+    def add(self, wa: str | None, ba: int, wb: str | None, bb: int) -> None:
+        self.a.add(wa, ba)
+        self.b.add(wb, bb)
+        self.d_score.add(score_of(wb) - score_of(wa))
+        self.d_beats.add(int(bb) - int(ba))
+
+    @property
+    def effect(self) -> float:
+        """Mean win-rate change (variant minus baseline)."""
+        return self.d_score.mean
+
+    def effect_interval(self, z: float = SIM_Z) -> tuple[float, float]:
+        half = z * self.d_score.stderr
+        return (self.effect - half, self.effect + half)
+
+    def beats_interval(self, z: float = SIM_Z) -> tuple[float, float]:
+        half = z * self.d_beats.stderr
+        return (self.d_beats.mean - half, self.d_beats.mean + half)
+
+    @property
+    def variance_reduction(self) -> float:
+        """How many times more matches independent seeds would need for the same interval."""
+        n = self.d_score.n
+        if n < 2:
+            return 1.0
+        # Unpaired: Var(A) + Var(B) from the per-arm Bernoulli-ish scores.
+        pa, pb = self.a.win_rate, self.b.win_rate
+        unpaired = pa * (1 - pa) + pb * (1 - pb)
+        paired = self.d_score.variance
+        if paired <= 0.0:
+            return float("inf") if unpaired > 0 else 1.0
+        return unpaired / paired
+
+
+def run_ab(
+    pairs: list[tuple[str, str]],
+    variant: dict | None,
+    *,
+    baseline: dict | None = None,
+    **kw,
+) -> dict[tuple[str, str], ABStats]:
+    """Run baseline and variant on identical seeds; stop per pair once the paired
+    win-rate difference is significant or its half-width is under the target.
+
+    Keyword arguments are those of run_ab_many.
+    """
+    res = run_ab_many(pairs, {"variant": variant}, baseline=baseline, **kw)
+    return {p: st for (_name, p), st in res.items()}
+
+
+def run_ab_many(
+    pairs: list[tuple[str, str]],
+    variants: dict[str, dict | None],
+    *,
+    baseline: dict | None = None,
+    pairs_by_variant: dict[str, list[tuple[str, str]]] | None = None,
+    workers: int | None = None,
+    target_halfwidth: float = 0.02,
+    z: float = SIM_Z,
+    min_matches: int = SIM_MIN_MATCHES,
+    max_matches: int = SIM_MAX_MATCHES,
+    chunk: int = SIM_CHUNK,
+    seed: int = 0,
+    max_beats: int = HEADLESS_MAX_BEATS,
+    history: HistoryWriter | None = None,
+    progress=None,
+) -> dict[tuple[str, tuple[str, str]], ABStats]:
+    """run_ab for several named variants at once, on one shared pool.
+
+    Results are keyed by (variant name, pair). Every variant sees the same
+    seeds for a pair, so variants are comparable with each other too.
+    `pairs_by_variant` narrows the pairs for individual variants. With a
+    HistoryWriter the baseline arm's matches go to the match history; with
+    several variants, only the first one listing a pair records them.
+    """
+    pairs_by_variant = pairs_by_variant or {}
+    keys = [(name, p) for name in variants for p in pairs_by_variant.get(name, pairs)]
+    stats = {k: ABStats(k[1][0], k[1][1], PairStats(k[1][0], k[1][1]), PairStats(k[1][0], k[1][1])) for k in keys}
+    chunk = max(1, int(chunk))
+    # The variant whose run records a pair's baseline matches (the first to list the pair).
+    recorder: dict[tuple[str, str], str] = {}
+    for name, p in keys:
+        recorder.setdefault(p, name)
+
+    def submit(pool, key, k):
+        name, p = key
+        seeds = [pair_seed(seed, p[0], p[1], k * chunk + i) for i in range(chunk)]
+        record = history is not None and recorder.get(p, name) == name
+        return pool.submit(_play_ab_chunk, p[0], p[1], seeds, int(max_beats), baseline, variants[name], record)
+
+    def fold(key, results) -> bool:
+        st = stats[key]
+        for wa, ba, wb, bb, *rec in results:
+            st.add(wa, ba, wb, bb)
+            if rec and history is not None:
+                history.add(rec[0])
+        n = st.d_score.n
+        if n < int(min_matches):
+            return False
+        lo, hi = st.effect_interval(z)
+        if st.d_score.variance == 0.0:
+            # Variant never changed an outcome so far; keep sampling to the cap.
+            reason = "cap" if n >= int(max_matches) else ""
+        elif (hi - lo) / 2.0 <= float(target_halfwidth):
+            reason = "narrow"
+        elif lo > 0.0 or hi < 0.0:
+            reason = "significant"
+        else:
+            reason = "cap" if n >= int(max_matches) else ""
+        st.reason = reason
+        return bool(reason)
+
+    _run_chunks(
+        keys,
+        workers=workers,
+        max_chunks=max(1, int(math.ceil(max_matches / chunk))),
+        submit=submit,
+        fold=fold,
+        priority=lambda key: stats[key].d_score.stderr if stats[key].d_score.n > 1 else 1.0,
+        progress=None if progress is None else (lambda _k: progress(stats)),
+    )
+    for st in stats.values():
+        st.reason = st.reason or "cap"
+    return stats
+
+
+def round_robin_pairs(slugs: list[str], *, both_seats: bool = False) -> list[tuple[str, str]]:
+    """Every pairing of distinct slugs (one seat order unless both_seats)."""
+    out = []
+    for i, a in enumerate(slugs):
+        for j, b in enumerate(slugs):
+            if i == j or (not both_seats and j < i):
+                continue
+            out.append((a, b))
+    return out
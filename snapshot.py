@@ -0,0 +1,277 @@
+"""Compact binary snapshot of a match in progress (suspend / resume).
+
+The app writes one on pause (Android may kill a backgrounded app) and restores
+it on the next launch. It holds everything the rules read:
+
+- both Wrestlers (every attribute, including deck order, discards and hand,
+  chain windows and the stale-move history `recent_attack_moves`);
+- the MatchEngine match state (momentum, escape mode, clash count, move usage,
+  menu stage, `_log_lines`);
+- the rng streams, so the match continues exactly as it would have;
+- a small caller `meta` dict (the app keeps slugs and career info there).
+
+Format: MAGIC, version, CRC32, then a zlib-compressed pickle of plain data
+(dicts, lists, numbers, strings, bytes) read back with a loader that refuses
+every class. Cards pack into one 32-bit word each and the Mersenne Twister
+states into raw bytes, so a mid-match snapshot is a few kilobytes and takes a
+millisecond or two either way. Caches (legality index, move graphs, CPU
+score table, transposition table, flavor text) are not saved; they rebuild
+on first use. Wrestler Zobrist hashes are recomputed on load.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+import io
+import os
+import pickle
+import random
+import struct
+import zlib
+
+import rng
+from cards import COLORS, Card, Deck
+from flavor import FlavorCache
+from wrestler import GrappleRole, Wrestler, WrestlerState
+
+
+SNAPSHOT_FILENAME = "match_snapshot.bin"
+SNAPSHOT_MAGIC = b"WTSS"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<4sHI")  # magic, version, crc32(payload)
+
+# Plain MatchEngine attributes saved as-is.
+ENGINE_FIELDS: tuple[str, ...] = (
+    "game_over",
+    "turn",
+    "clash_count",
+    "momentum",
+    "move_usage",
+    "selected_cards",
+    "selected_move",
+    "_menu_stage",
+    "_selected_category",
+    "_card_tap_hint_shown",
+    "_last_cpu_mode",
+    "_last_clash_flashed",
+    "_log_lines",
+)
+
+# Enum-valued Wrestler attributes.
+_WRESTLER_ENUMS: dict[str, type[Enum]] = {
+    "state": WrestlerState,
+    "grapple_role": GrappleRole,
+}
+
+_SEATS = ("player", "cpu")
+
+
+# --- cards & rng ---------------------------------------------------------------------
+
+
+def pack_cards(cards) -> bytes:
+    """uid << 8 | value << 3 | color index, little-endian uint32 per card."""
+    words = [(int(c.uid) << 8) | (int(c.value) << 3) | COLORS.index(c.color) for c in (cards or ())]
+    return struct.pack(f"<{len(words)}I", *words)
+
+
+def unpack_cards(data: bytes) -> list[Card]:
+    n = len(data) // 4
+    return [
+        Card(value=(w >> 3) & 0x1F, color=COLORS[w & 0x7], uid=w >> 8)
+        for w in struct.unpack(f"<{n}I", data[: n * 4])
+    ]
+
+
+def _pack_random(state: tuple) -> tuple:
+    version, internal, gauss = state
+    return (int(version), struct.pack(f"<{len(internal)}I", *internal), gauss)
+
+
+def _unpack_random(packed) -> tuple:
+    version, raw, gauss = packed
+    return (int(version), struct.unpack(f"<{len(raw) // 4}I", raw), gauss)
+
+
+def _rng_state() -> dict:
+    # A stream is either the global `random` module (normal play) or its own Random.
+    return {
+        "global": _pack_random(random.getstate()),
+        "streams": {
+            name: None if getattr(rng, name) is random else _pack_random(getattr(rng, name).getstate())
+            for name in rng.STREAM_NAMES
+        },
+    }
+
+
+def _apply_rng_state(state: dict) -> None:
+    streams = {}
+    for name in rng.STREAM_NAMES:
+        packed = (state.get("streams") or {}).get(name)
+        if packed is None:
+            streams[name] = random
+        else:
+            r = random.Random()
+            r.setstate(_unpack_random(packed))
+            streams[name] = r
+    random.setstate(_unpack_random(state["global"]))
+    for name, stream in streams.items():
+        setattr(rng, name, stream)
+
+
+# --- wrestlers & engine ----------------------------------------------------------------
+
+
+def _wrestler_state(w: Wrestler) -> dict:
+    attrs: dict = {}
+    enums: dict = {}
+    for k, v in vars(w).items():
+        if k in ("deck", "hand") or k.startswith("_z"):
+            continue
+        if isinstance(v, Enum):
+            if k not in _WRESTLER_ENUMS:
+                raise ValueError(f"cannot snapshot enum attribute {k!r}")
+            enums[k] = v.value
+        else:
+            attrs[k] = v
+    deck = w.deck
+    return {
+        "attrs": attrs,
+        "enums": enums,
+        "hand": pack_cards(w.hand),
+        "deck": pack_cards(deck.cards if deck is not None else ()),
+        "discards": pack_cards(deck.discards if deck is not None else ()),
+        "max_strength": int(getattr(deck, "max_strength", 0) or 0),
+    }
+
+
+def _build_wrestler(data: dict) -> Wrestler:
+    # Bypass __init__: it would deal a fresh deck (and consume rng) only to be overwritten.
+    w = Wrestler.__new__(Wrestler)
+    w.__dict__.update(data["attrs"])
+    for k, v in (data.get("enums") or {}).items():
+        setattr(w, k, None if v is None else _WRESTLER_ENUMS[k](v))
+    deck = Deck.__new__(Deck)
+    deck.cards = unpack_cards(data["deck"])
+    deck.discards = unpack_cards(data["discards"])
+    deck.max_strength = int(data["max_strength"])
+    w.deck = deck
+    w.hand = unpack_cards(data["hand"])
+    w.refresh_hash()
+    return w
+
+
+def _seat_of(eng, w) -> str | None:
+    if w is None:
+        return None
+    if w is eng.player:
+        return "player"
+    if w is eng.cpu:
+        return "cpu"
+    raise ValueError("reference to a wrestler outside the match")
+
+
+def capture(eng, *, meta: dict | None = None) -> dict:
+    """Plain-data state of a MatchEngine (no classes, safe to pickle and reload)."""
+    fields = {k: getattr(eng, k, None) for k in ENGINE_FIELDS}
+    esc = getattr(eng, "_escape_mode", None)
+    if esc:
+        esc = dict(esc)
+        esc["attacker"] = _seat_of(eng, esc.get("attacker"))
+        esc["defender"] = _seat_of(eng, esc.get("defender"))
+    return {
+        "player": _wrestler_state(eng.player),
+        "cpu": _wrestler_state(eng.cpu),
+        "fields": fields,
+        "escape": esc or None,
+        "last_clash_winner": _seat_of(eng, getattr(eng, "_last_clash_winner", None)),
+        "rng": _rng_state(),
+        "meta": dict(meta or {}),
+    }
+
+
+def restore(eng, state: dict) -> dict:
+    """Load a captured state into `eng`; returns its meta.
+
+    Everything is rebuilt before the engine is touched, so a bad snapshot
+    raises and leaves the current match as it was.
+    """
+    seats = {"player": _build_wrestler(state["player"]), "cpu": _build_wrestler(state["cpu"])}
+    fields = dict(state.get("fields") or {})
+    esc = state.get("escape")
+    if esc:
+        esc = dict(esc)
+        esc["attacker"] = seats[esc["attacker"]]
+        esc["defender"] = seats[esc["defender"]]
+    winner = state.get("last_clash_winner")
+    rng_state = state["rng"]
+
+    eng._init_match_state()
+    eng.player = seats["player"]
+    eng.cpu = seats["cpu"]
+    for k in ENGINE_FIELDS:
+        if k in fields:
+            setattr(eng, k, fields[k])
+    eng.selected_cards = set(eng.selected_cards or ())
+    eng._escape_mode = esc or None
+    eng._last_clash_winner = seats[winner] if winner in seats else None
+    eng._flavor_cache = FlavorCache()
+    _apply_rng_state(rng_state)
+    return dict(state.get("meta") or {})
+
+
+# --- bytes & files -------------------------------------------------------------------
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"snapshot may not reference {module}.{name}")
+
+
+def dumps(eng, *, meta: dict | None = None) -> bytes:
+    payload = zlib.compress(pickle.dumps(capture(eng, meta=meta), protocol=pickle.HIGHEST_PROTOCOL), 1)
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(payload)) + payload
+
+
+def loads(data: bytes) -> dict:
+    """Decode and check a snapshot; raises ValueError if it is foreign, stale or corrupt."""
+    if len(data) < _HEADER.size:
+        raise ValueError("snapshot is truncated")
+    magic, version, crc = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a match snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version: {version}")
+    payload = data[_HEADER.size :]
+    if zlib.crc32(payload) != crc:
+        raise ValueError("snapshot is corrupt")
+    try:
+        return _PlainUnpickler(io.BytesIO(zlib.decompress(payload))).load()
+    except Exception as e:
+        raise ValueError(f"snapshot is corrupt: {e}") from e
+
+
+def save_snapshot(path: str, eng, *, meta: dict | None = None) -> int:
+    """Write atomically (temp file + rename); returns the size in bytes."""
+    data = dumps(eng, meta=meta)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def load_snapshot(path: str) -> dict | None:
+    """Decoded state, or None if there is no usable snapshot."""
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except Exception:
+        return None
+
+
+def discard_snapshot(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,152 @@
+"""A/B a balance change against baseline with common random numbers.
+
+Both arms play the same seeds, and every seed drives separate deck, AI-noise,
+tie-break and rules streams (rng), so the per-seed paired difference cancels
+most of the match-to-match noise. Each pair stops once the difference is
+significant or its interval half-width is under --halfwidth.
+
+Usage:
+    python tools/ab_compare.py --move grap_powerbomb.damage=24
+    python tools/ab_compare.py --tuning STALE_CLASH_SCORE_PENALTY=4 --only tre_legitimate,don_burner
+    python tools/ab_compare.py --variant change.json [--baseline base.json]
+
+Values are Python literals (numbers, strings, lists); a variant file is the
+JSON form described in sim.py (moves / tuning / roster sections). With
+--history the baseline arm's matches (the tree as-is, so not with
+--baseline) are also added to the match-history store.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+from pathlib import Path
+import sys
+import time
+
+
+def _literal(text: str):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def _parse_assign(spec: str, *, dotted: bool) -> tuple[list[str], object]:
+    if "=" not in spec:
+        raise ValueError(f"expected NAME=VALUE, got {spec!r}")
+    lhs, rhs = spec.split("=", 1)
+    keys = lhs.strip().split(".", 1) if dotted else [lhs.strip()]
+    if dotted and len(keys) != 2:
+        raise ValueError(f"expected slug.field=VALUE, got {spec!r}")
+    return keys, _literal(rhs.strip())
+
+
+def _load(path: str | None) -> dict:
+    if not path:
+        return {}
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import history
+    import sim
+    from wrestler_roster import ROSTER
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--move", action="append", default=[], metavar="SLUG.FIELD=VALUE")
+    ap.add_argument("--tuning", action="append", default=[], metavar="NAME=VALUE")
+    ap.add_argument("--roster", action="append", default=[], metavar="SLUG.FIELD=VALUE")
+    ap.add_argument("--variant", help="variant JSON file (merged under the flags above)")
+    ap.add_argument("--baseline", help="baseline JSON file (default: the tree as-is)")
+    ap.add_argument("--only", default="", help="comma-separated slugs (default: whole roster)")
+    ap.add_argument("--both-seats", action="store_true")
+    ap.add_argument("--halfwidth", type=float, default=0.02, help="target half-width of the win-rate difference")
+    ap.add_argument("--min", type=int, default=sim.SIM_MIN_MATCHES)
+    ap.add_argument("--max", type=int, default=sim.SIM_MAX_MATCHES)
+    ap.add_argument("--chunk", type=int, default=sim.SIM_CHUNK)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--history", help="also record the baseline arm's matches into this match-history database")
+    args = ap.parse_args(argv)
+    if args.history and args.baseline:
+        ap.error("--history records the unpatched baseline; it can't be combined with --baseline")
+
+    variant = _load(args.variant)
+    try:
+        for section, specs in (("moves", args.move), ("roster", args.roster)):
+            for spec in specs:
+                (slug, fld), value = _parse_assign(spec, dotted=True)
+                variant.setdefault(section, {}).setdefault(slug, {})[fld] = value
+        for spec in args.tuning:
+            (name,), value = _parse_assign(spec, dotted=False)
+            variant.setdefault("tuning", {})[name] = value
+    except ValueError as e:
+        ap.error(str(e))
+    if not variant:
+        ap.error("nothing to compare: give --move, --tuning, --roster or --variant")
+    baseline = _load(args.baseline) or None
+
+    # Fail fast on typos instead of inside every worker.
+    try:
+        with sim.apply_variant(baseline), sim.apply_variant(variant):
+            pass
+    except KeyError as e:
+        ap.error(str(e.args[0] if e.args else e))
+
+    slugs = [s.strip() for s in args.only.split(",") if s.strip()] or list(ROSTER)
+    unknown = [s for s in slugs if s not in ROSTER]
+    if unknown:
+        ap.error(f"unknown slugs: {', '.join(unknown)}")
+    pairs = sim.round_robin_pairs(slugs, both_seats=bool(args.both_seats))
+
+    print(f"variant {sim.variant_key(variant)}: {json.dumps(variant, sort_keys=True)}")
+    hist = history.HistoryStore(args.history) if args.history else None
+    writer = history.HistoryWriter(hist) if hist is not None else None
+    t0 = time.perf_counter()
+    try:
+        stats = sim.run_ab(
+            pairs,
+            variant,
+            baseline=baseline,
+            workers=args.workers,
+            target_halfwidth=args.halfwidth,
+            min_matches=args.min,
+            max_matches=args.max,
+            chunk=args.chunk,
+            seed=args.seed,
+            history=writer,
+        )
+        if writer is not None:
+            writer.flush()
+    finally:
+        if hist is not None:
+            hist.close()
+    dt = time.perf_counter() - t0
+
+    print(f"{'player':<20} {'cpu':<20} {'n':>4} {'A win%':>7} {'B win%':>7} {'d win% (95% CI)':>22} {'d beats':>8} {'VR':>5}  stop")
+    for (p, c), st in stats.items():
+        lo, hi = st.effect_interval()
+        vr = st.variance_reduction
+        print(
+            f"{p:<20} {c:<20} {st.d_score.n:>4} {st.a.win_rate * 100:>6.1f}% {st.b.win_rate * 100:>6.1f}% "
+            f"{st.effect * 100:>+6.1f} [{lo * 100:>+6.1f},{hi * 100:>+6.1f}] {st.d_beats.mean:>+8.1f} "
+            f"{'inf' if vr == float('inf') else f'{vr:.1f}':>5}  {st.reason}"
+        )
+
+    used = sum(st.d_score.n for st in stats.values())
+    changed = [st for st in stats.values() if st.effect_interval()[0] > 0 or st.effect_interval()[1] < 0]
+    print(f"\n{len(pairs)} pairs, {used} seeds x 2 arms in {dt:.1f}s; {len(changed)} pairs with a significant shift")
+    print("VR = variance reduction vs independent seeds (x fewer matches for the same interval)")
+    if writer is not None:
+        print(f"{writer.written} baseline matches added to {args.history}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,414 @@
+"""Simulation-driven roster auto-balancer.
+
+Searches tunable profile fields until every ROSTER matchup lands inside a
+target win-rate band (default 45-55%), then proposes the result as a diff to
+wrestler_roster.py. Nothing is applied unless --apply is given.
+
+Tuned per wrestler:
+- ai_traits weights (GREED / GOOD / BAD / RND)
+- archetype (JOBBER / BALANCED / SUPERSTAR)
+- knockdown_thresh_min / knockdown_thresh_max
+- moveset membership, with --moveset (drop a listed move, or borrow one
+  from another wrestler's list)
+
+The search is a separable CMA-style evolution strategy: each generation samples
+candidates around a mean with per-field step sizes, scores every candidate on
+the same seeds (sim.run_fixed_many, all candidates on one process pool), then
+moves the mean toward the weighted elite and adapts the step sizes to the
+elite spread. Loss is the mean squared distance of each pair's win rate
+outside the band, plus a small pull toward the current profiles so that no
+change is made without a reason. The search mean is scored alongside the
+samples every generation; the proposal is the best-scoring mean, which is
+less exposed to lucky seeds than the best single sample.
+
+State is checkpointed after each generation (--checkpoint). Rerun with
+--resume to continue from the last completed generation.
+
+Usage:
+    python tools/auto_balance.py [--band 0.45,0.55] [--gens 12] [--pop 8]
+        [--matches 24] [--tune slug,...] [--only slug,...] [--moveset]
+        [--checkpoint .sim_cache/auto_balance.json] [--resume]
+        [--out roster_balance.patch] [--apply]
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import math
+from pathlib import Path
+import random
+import re
+import sys
+import time
+
+
+ARCHETYPES = ("JOBBER", "BALANCED", "SUPERSTAR")
+TRAIT_KEYS = ("GREED", "GOOD", "BAD", "RND")
+# Per-field search ranges and initial step sizes.
+FIELD_BOUNDS = {
+    "GREED": (0, 100, 15.0),
+    "GOOD": (0, 100, 15.0),
+    "BAD": (0, 100, 8.0),
+    "RND": (0, 100, 8.0),
+    "arch": (0, len(ARCHETYPES) - 1, 0.6),
+    "kd_min": (1, 20, 2.0),
+    "kd_max": (5, 40, 3.0),
+}
+FIELDS = tuple(FIELD_BOUNDS)
+SIGMA_FLOOR = 0.05  # fraction of the initial step size
+SIGMA_LEARN = 0.3
+MOVESET_FLIP_CHANCE = 0.15
+REG_WEIGHT = 0.02  # pull toward the current profile (per normalized field)
+
+
+# =============================================================================
+# GENOME <-> PROFILE
+# =============================================================================
+
+
+def _genome_of(prof: dict) -> dict[str, float]:
+    traits = prof.get("ai_traits") or {}
+    arch = str(prof.get("archetype", "BALANCED")).upper()
+    return {
+        "GREED": float(traits.get("GREED", 25)),
+        "GOOD": float(traits.get("GOOD", 25)),
+        "BAD": float(traits.get("BAD", 25)),
+        "RND": float(traits.get("RND", 25)),
+        "arch": float(ARCHETYPES.index(arch) if arch in ARCHETYPES else 1),
+        "kd_min": float(prof.get("knockdown_thresh_min", 5)),
+        "kd_max": float(prof.get("knockdown_thresh_max", 15)),
+    }
+
+
+def _clip(field: str, x: float) -> float:
+    lo, hi, _s = FIELD_BOUNDS[field]
+    return max(float(lo), min(float(hi), float(x)))
+
+
+def _profile_patch(genome: dict[str, float], moveset: list[str] | None) -> dict:
+    """Roster-variant fields for one wrestler (integers, valid ranges)."""
+    traits = {k: int(round(_clip(k, genome[k]))) for k in TRAIT_KEYS}
+    if sum(traits.values()) <= 0:
+        traits["GREED"] = 1
+    kd_min = int(round(_clip("kd_min", genome["kd_min"])))
+    kd_max = max(kd_min, int(round(_clip("kd_max", genome["kd_max"]))))
+    out = {
+        "ai_traits": traits,
+        "archetype": ARCHETYPES[int(round(_clip("arch", genome["arch"])))],
+        "knockdown_thresh_min": kd_min,
+        "knockdown_thresh_max": kd_max,
+    }
+    if moveset is not None:
+        out["moveset"] = list(moveset)
+    return out
+
+
+def _flip_moveset(rng: random.Random, moveset: list[str], finisher: str | None, pool: list[str]) -> list[str]:
+    """Drop one listed move or borrow one from the roster-wide pool."""
+    ms = list(moveset)
+    droppable = [m for m in ms if m != finisher]
+    addable = [m for m in pool if m not in ms]
+    if droppable and (not addable or rng.random() < 0.5):
+        ms.remove(rng.choice(droppable))
+    elif addable:
+        ms.append(rng.choice(addable))
+    return ms
+
+
+# =============================================================================
+# SOURCE DIFF
+# =============================================================================
+
+
+def _block_span(src: str, slug: str) -> tuple[int, int]:
+    m = re.search(rf'^    "{re.escape(slug)}": \{{\n', src, flags=re.M)
+    if not m:
+        raise KeyError(slug)
+    end = re.search(r"^    \},?\n", src[m.end():], flags=re.M)
+    return m.start(), m.end() + (end.end() if end else len(src) - m.end())
+
+
+def _set_field(block: str, key: str, rendered: str, *, after: str) -> str:
+    line = f'        "{key}": {rendered},\n'
+    pat = re.compile(rf'^        "{key}": .*\n', flags=re.M)
+    if pat.search(block):
+        return pat.sub(lambda _m: line, block, count=1)
+    anchor = re.search(rf'^        "{after}": .*\n', block, flags=re.M)
+    pos = anchor.end() if anchor else block.index("\n") + 1
+    return block[:pos] + line + block[pos:]
+
+
+def _edit_moveset(block: str, old: list[str], new: list[str]) -> str:
+    for slug in [m for m in old if m not in new]:
+        block = re.sub(rf'^\s*"{re.escape(slug)}",[^\n]*\n', "", block, count=1, flags=re.M)
+    added = [m for m in new if m not in old]
+    if added:
+        close = re.search(r'^        \],\n', block[block.index('"moveset"'):], flags=re.M)
+        if close:
+            pos = block.index('"moveset"') + close.start()
+            lines = "            # Auto-balance additions\n" + "".join(f'            "{m}",\n' for m in added)
+            block = block[:pos] + lines + block[pos:]
+    return block
+
+
+def roster_source_with(src: str, patches: dict[str, dict], roster: dict[str, dict]) -> str:
+    """wrestler_roster.py source with the given per-slug profile patches applied."""
+    for slug, patch in patches.items():
+        a, b = _block_span(src, slug)
+        block = src[a:b]
+        # Only touch fields whose effective value changes, so the diff stays reviewable.
+        cur = _profile_patch(_genome_of(roster[slug]), None)
+        traits = patch["ai_traits"]
+        if patch["archetype"] != cur["archetype"]:
+            block = _set_field(block, "archetype", json.dumps(patch["archetype"]), after="short_name")
+        if traits != cur["ai_traits"]:
+            block = _set_field(
+                block,
+                "ai_traits",
+                "{" + ", ".join(f'"{k}": {int(traits[k])}' for k in TRAIT_KEYS) + "}",
+                after="finisher",
+            )
+        if (patch["knockdown_thresh_min"], patch["knockdown_thresh_max"]) != (
+            cur["knockdown_thresh_min"],
+            cur["knockdown_thresh_max"],
+        ):
+            block = _set_field(block, "knockdown_thresh_min", str(int(patch["knockdown_thresh_min"])), after="ai_traits")
+            block = _set_field(
+                block, "knockdown_thresh_max", str(int(patch["knockdown_thresh_max"])), after="knockdown_thresh_min"
+            )
+        if "moveset" in patch:
+            block = _edit_moveset(block, list(roster[slug].get("moveset") or []), patch["moveset"])
+        src = src[:a] + block + src[b:]
+    return src
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+
+def _loss(stats: dict, name: str, pairs, band: tuple[float, float]) -> tuple[float, float]:
+    """(band loss, worst pair distance from the band) for one candidate."""
+    lo, hi = band
+    total = 0.0
+    worst = 0.0
+    for p in pairs:
+        wr = stats[(name, p)].win_rate
+        d = max(0.0, lo - wr, wr - hi)
+        total += d * d
+        worst = max(worst, d)
+    return total / max(1, len(pairs)), worst
+
+
+def _reg(genomes: dict, base: dict) -> float:
+    acc = 0.0
+    n = 0
+    for slug, g in genomes.items():
+        for f in FIELDS:
+            lo, hi, _s = FIELD_BOUNDS[f]
+            acc += ((g[f] - base[slug][f]) / max(1.0, hi - lo)) ** 2
+            n += 1
+    return REG_WEIGHT * acc / max(1, n)
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import sim
+    from wrestler_roster import ROSTER
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--band", default="0.45,0.55", help="target win-rate band lo,hi")
+    ap.add_argument("--gens", type=int, default=12)
+    ap.add_argument("--pop", type=int, default=8, help="candidates per generation")
+    ap.add_argument("--matches", type=int, default=24, help="matches per pair per candidate")
+    ap.add_argument("--only", default="", help="wrestlers in the round-robin (default: whole roster)")
+    ap.add_argument("--tune", default="", help="wrestlers whose profiles may change (default: all in --only)")
+    ap.add_argument("--moveset", action="store_true", help="also search moveset membership")
+    ap.add_argument("--both-seats", action="store_true")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--checkpoint", default=str(root / ".sim_cache" / "auto_balance.json"))
+    ap.add_argument("--resume", action="store_true")
+    ap.add_argument("--out", default="roster_balance.patch", help="where to write the proposed diff")
+    ap.add_argument("--apply", action="store_true", help="rewrite wrestler_roster.py with the best profiles")
+    args = ap.parse_args(argv)
+
+    try:
+        band = tuple(float(x) for x in args.band.split(","))
+        assert len(band) == 2 and 0.0 <= band[0] <= band[1] <= 1.0
+    except Exception:
+        ap.error("--band must be lo,hi within 0..1")
+    slugs = [s.strip() for s in args.only.split(",") if s.strip()] or list(ROSTER)
+    tuned = [s.strip() for s in args.tune.split(",") if s.strip()] or list(slugs)
+    unknown = [s for s in slugs + tuned if s not in ROSTER]
+    if unknown:
+        ap.error(f"unknown slugs: {', '.join(sorted(set(unknown)))}")
+    pairs = sim.round_robin_pairs(slugs, both_seats=bool(args.both_seats))
+
+    settings = {
+        "band": list(band),
+        "pop": int(args.pop),
+        "matches": int(args.matches),
+        "slugs": slugs,
+        "tuned": tuned,
+        "moveset": bool(args.moveset),
+        "both_seats": bool(args.both_seats),
+        "seed": int(args.seed),
+    }
+    base = {s: _genome_of(ROSTER[s]) for s in tuned}
+    pool_moves = sorted({m for s in slugs for m in (ROSTER[s].get("moveset") or [])})
+
+    ckpt_path = Path(args.checkpoint)
+    state = None
+    if args.resume and ckpt_path.exists():
+        state = json.loads(ckpt_path.read_text(encoding="utf-8"))
+        if state.get("settings") != settings:
+            ap.error("checkpoint was written with different settings; drop --resume or match them")
+        print(f"resuming after generation {state['gen']} (best loss {state['best']['loss']:.5f})")
+    if state is None:
+        state = {
+            "settings": settings,
+            "gen": 0,
+            "mean": base,
+            "sigma": {s: {f: FIELD_BOUNDS[f][2] for f in FIELDS} for s in tuned},
+            "movesets": {s: list(ROSTER[s].get("moveset") or []) for s in tuned},
+            "best": None,
+            "rng": None,
+        }
+
+    rng = random.Random(int(args.seed))
+    if state["rng"] is not None:
+        v, internal, gauss = state["rng"]
+        rng.setstate((v, tuple(internal), gauss))
+
+    def candidate_variant(genomes: dict, movesets: dict) -> dict:
+        return {
+            "roster": {
+                s: _profile_patch(genomes[s], movesets[s] if args.moveset else None) for s in tuned
+            }
+        }
+
+    t_start = time.perf_counter()
+    while state["gen"] < int(args.gens):
+        gen = int(state["gen"]) + 1
+        t0 = time.perf_counter()
+        cands: dict[str, tuple[dict, dict]] = {}
+        # Keep the current mean in every generation so progress is measured on equal seeds.
+        cands["mean"] = (state["mean"], state["movesets"])
+        for i in range(max(1, int(args.pop))):
+            genomes = {
+                s: {f: _clip(f, state["mean"][s][f] + state["sigma"][s][f] * rng.gauss(0.0, 1.0)) for f in FIELDS}
+                for s in tuned
+            }
+            movesets = {
+                s: (
+                    _flip_moveset(rng, state["movesets"][s], ROSTER[s].get("finisher"), pool_moves)
+                    if args.moveset and rng.random() < MOVESET_FLIP_CHANCE
+                    else list(state["movesets"][s])
+                )
+                for s in tuned
+            }
+            cands[f"c{i}"] = (genomes, movesets)
+
+        variants = {name: candidate_variant(g, m) for name, (g, m) in cands.items()}
+        stats = sim.run_fixed_many(
+            pairs,
+            variants,
+            matches=int(args.matches),
+            workers=args.workers,
+            seed=int(args.seed) * 10_007 + gen,
+        )
+
+        scored = []
+        for name, (g, m) in cands.items():
+            band_loss, worst = _loss(stats, name, pairs, band)
+            scored.append((band_loss + _reg(g, base), band_loss, worst, name))
+        scored.sort()
+
+        # Recombine: log-weighted elite mean; step sizes follow the elite spread.
+        mu = max(1, len(scored) // 2)
+        weights = [math.log(mu + 0.5) - math.log(i + 1) for i in range(mu)]
+        wsum = sum(weights)
+        elite = [cands[name] for _l, _b, _w, name in scored[:mu]]
+        new_mean = {}
+        new_sigma = {}
+        for s in tuned:
+            new_mean[s] = {}
+            new_sigma[s] = {}
+            for f in FIELDS:
+                old = state["mean"][s][f]
+                m = sum(w * g[s][f] for w, (g, _ms) in zip(weights, elite)) / wsum
+                spread = math.sqrt(sum(w * (g[s][f] - old) ** 2 for w, (g, _ms) in zip(weights, elite)) / wsum)
+                s0 = FIELD_BOUNDS[f][2]
+                sig = (1.0 - SIGMA_LEARN) * state["sigma"][s][f] + SIGMA_LEARN * spread
+                new_mean[s][f] = _clip(f, m)
+                new_sigma[s][f] = max(SIGMA_FLOOR * s0, min(2.0 * s0, sig))
+        best_loss, _best_band, best_worst, best_name = scored[0]
+        # The proposal is the best-scoring search mean, not the luckiest sample:
+        # a single candidate's score on a few matches per pair is noisy.
+        mean_loss, mean_band, mean_worst, _n = next(row for row in scored if row[3] == "mean")
+        if state["best"] is None or mean_loss < float(state["best"]["loss"]):
+            state["best"] = {
+                "loss": mean_loss,
+                "band_loss": mean_band,
+                "worst": mean_worst,
+                "gen": gen,
+                "variant": variants["mean"],
+                "win_rates": {f"{p}|{c}": stats[("mean", (p, c))].win_rate for p, c in pairs},
+            }
+        state["mean"] = new_mean
+        state["sigma"] = new_sigma
+        state["movesets"] = {s: list(cands[best_name][1][s]) for s in tuned}
+        state["gen"] = gen
+        v, internal, gauss = rng.getstate()
+        state["rng"] = [v, list(internal), gauss]
+
+        ckpt_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ckpt_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        tmp.replace(ckpt_path)
+
+        print(
+            f"gen {gen:>3}: mean loss {mean_loss:.5f} (worst pair {mean_worst * 100:.1f}% out) "
+            f"| best sample {best_name} {best_loss:.5f} ({best_worst * 100:.1f}% out) | {time.perf_counter() - t0:.1f}s"
+        )
+
+    best = state["best"]
+    if best is None:
+        print("no generations run")
+        return 0
+    print(f"\nbest: gen {best['gen']}, loss {best['loss']:.5f}, worst pair {best['worst'] * 100:.1f}% outside the band")
+    lo, hi = band
+    for key, wr in sorted(best["win_rates"].items(), key=lambda kv: -abs(kv[1] - 0.5)):
+        flag = "" if lo <= wr <= hi else "  <- out of band"
+        print(f"  {key.replace('|', ' vs '):<44} {wr * 100:5.1f}%{flag}")
+
+    roster_path = root / "wrestler_roster.py"
+    src = roster_path.read_text(encoding="utf-8")
+    new_src = roster_source_with(src, best["variant"]["roster"], ROSTER)
+    diff = "".join(
+        difflib.unified_diff(
+            src.splitlines(keepends=True),
+            new_src.splitlines(keepends=True),
+            fromfile="a/wrestler_roster.py",
+            tofile="b/wrestler_roster.py",
+        )
+    )
+    if not diff:
+        print("\nno changes proposed")
+        return 0
+    Path(args.out).write_text(diff, encoding="utf-8")
+    print(f"\nproposed diff written to {args.out} ({time.perf_counter() - t_start:.1f}s this run)")
+    if args.apply:
+        roster_path.write_text(new_src, encoding="utf-8")
+        print("applied to wrestler_roster.py")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+"""Parity check: batch_engine (NumPy lockstep) vs engine.MatchEngine.
+
+1. Kernels, on shared seeds: clash scores for random moves and card plays
+   dealt from real cards.Deck builds, damage tiers, escape thresholds and
+   momentum bonuses must match the engine exactly.
+2. Legality: at every beat of seeded reference matches, the batch tables'
+   legal set for the position (plus moveset and momentum gate) must equal
+   MatchEngine._available_moves, for the states the batch models (not
+   groggy or hobbled; weight gate ignored).
+3. Match level: seeded reference matches vs a seeded batch over the same
+   pairs (repeated --batch-reps times, so the batch side is nearly
+   noise-free). The finished rate, player win share and pinfall share must
+   agree within three standard errors of the reference sample (and at least
+   a few points), mean beats within --beats-tol.
+
+Usage:
+    python tools/batch_parity.py [--seeds 2000] [--matches 100] [--batch-reps 10] [--beats-tol 0.10]
+
+Exits 1 if any check fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import random
+import sys
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seeds", type=int, default=2000, help="kernel samples (one seed each)")
+    ap.add_argument("--matches", type=int, default=100, help="reference matches for checks 2 and 3")
+    ap.add_argument("--batch-reps", type=int, default=10, help="batch copies of the reference pairs for check 3")
+    ap.add_argument("--beats-tol", type=float, default=0.10, help="allowed relative gap in mean beats")
+    args = ap.parse_args(argv)
+
+    import numpy as np
+
+    import batch_engine as be
+    from cards import COLORS, Deck
+    from engine import MatchEngine
+    from move_graph import node_of
+    from wrestler_roster import ROSTER
+
+    tables = be.BatchTables()
+    eng = MatchEngine()
+    slugs = list(tables.slugs)
+    failures = 0
+
+    # --- 1. kernels ---
+    bad = 0
+    for seed in range(int(args.seeds)):
+        random.seed(seed)
+        deck = Deck(random.choice(["JOBBER", "BALANCED", "SUPERSTAR"]))
+        cards = deck.draw(random.choice([0, 1, 2, 2]))
+        move = random.choice(slugs)
+        bonus = random.choice([0, 0, 1, 2, 4])
+        want = eng._calc_clash_score(move, cards, card_bonus=bonus)
+        c = cards + [cards[0] if cards else None] * (2 - len(cards))
+        v0 = c[0].value if c[0] else 0
+        c0 = COLORS.index(c[0].color) if c[0] else 0
+        v1 = c[1].value if c[1] else 0
+        c1 = COLORS.index(c[1].color) if c[1] else 0
+        got = int(be.clash_scores(tables, [tables.index.index[move]], [v0], [c0], [v1], [c1], [len(cards)], bonus)[0])
+        if got != want:
+            bad += 1
+            if bad <= 5:
+                print(f"  clash seed={seed} {move} {cards} bonus={bonus}: engine {want}, batch {got}")
+    print(f"clash scores:    {int(args.seeds) - bad}/{args.seeds} match")
+    failures += bad
+
+    diffs = np.arange(-5, 30)
+    mult, daze = be.damage_tiers(diffs)
+    bad = sum(1 for d, m, z in zip(diffs, mult, daze) if eng._damage_tier_from_margin(int(d))[0::2] != (float(m), bool(z)))
+    pcts = np.linspace(0.0, 1.0, 101)
+    bad += sum(1 for p, t in zip(pcts, be.escape_threshold(pcts)) if eng._escape_threshold(float(p)) != int(t))
+    for mom in range(-5, 6):
+        # The engine applies this mapping inline in _resolve_clash.
+        mag = abs(mom)
+        want = 0 if mag == 0 else (be.MOMENTUM_SCORE_TIER1_BONUS if mag <= be.MOMENTUM_SCORE_TIER1_MAX else be.MOMENTUM_SCORE_TIER2_BONUS)
+        bad += int(int(be.momentum_bonus([mom])[0]) != (want if mom >= 0 else -want))
+    print(f"tiers/thresholds: {'ok' if bad == 0 else f'{bad} mismatches'}")
+    failures += bad
+
+    # --- 2. legality along reference matches ---
+    pairs = [(random.Random(i).choice(list(ROSTER)), random.Random(-i - 1).choice(list(ROSTER))) for i in range(int(args.matches))]
+    movesets = {}
+    checked = 0
+    bad = 0
+
+    class Probe(MatchEngine):
+        def _headless_beat(self) -> None:
+            nonlocal checked, bad
+            for user, target in ((self.player, self.cpu), (self.cpu, self.player)):
+                if bool(getattr(user, "is_groggy", False)) or user.is_hobbled():
+                    continue
+                want = set(self._available_moves(user, target, ignore_weight_gate=True))
+                key = tuple(user.moveset or ())
+                if key not in movesets:
+                    movesets[key] = tables.moveset_row(user.moveset)
+                node = tables.node_id[node_of(user, target)]
+                adv = max(0, self._momentum_advantage_for(user))
+                row = tables.legal[node] & movesets[key] & (tables.req_mom <= adv)
+                got = {slugs[i] for i in np.flatnonzero(row)}
+                checked += 1
+                if got != want:
+                    bad += 1
+                    if bad <= 5:
+                        print(f"  legal {node_of(user, target)}: engine-only {sorted(want - got)}, batch-only {sorted(got - want)}")
+            super()._headless_beat()
+
+    ref = []
+    for i, (p, c) in enumerate(pairs):
+        random.seed(i)
+        probe = Probe()
+        probe._setup_match(ROSTER[p], ROSTER[c])
+        probe._log_lines = None
+        ref.append(probe.run_headless())
+    print(f"legal move sets: {checked - bad}/{checked} match")
+    failures += bad
+
+    # --- 3. match level ---
+    reps = max(1, int(args.batch_reps))
+    batch = be.simulate_batch(pairs * reps, seed=0, tables=tables)
+    s = batch.summary()
+    n = len(ref)
+    r_fin = [r for r in ref if r.winner]
+    b_fin = max(1, s["finished"])
+
+    def share(k: int, total: int) -> float:
+        return k / total if total else 0.0
+
+    def gate(label: str, want: float, got: float, tol: float, fmt: str = ".3f") -> int:
+        ok = abs(got - want) <= tol
+        print(f"  {label:<14} {want:{fmt}}  vs {got:{fmt}}  (tol {tol:{fmt}}){'' if ok else '  FAIL'}")
+        return 0 if ok else 1
+
+    def prop_tol(p: float, k: int) -> float:
+        # Three standard errors of the reference proportion, and at least 3 points.
+        return max(0.03, 3.0 * (p * (1.0 - p) / max(1, k)) ** 0.5)
+
+    print(f"match level (reference vs batch x{reps}):")
+    want = share(len(r_fin), n)
+    failures += gate("finished", want, share(s["finished"], s["matches"]), prop_tol(want, n))
+    want = share(sum(r.winner == "player" for r in r_fin), len(r_fin))
+    failures += gate("player wins", want, share(s["player_wins"], b_fin), prop_tol(want, len(r_fin)))
+    want = share(sum(r.kind == "PINFALL" for r in r_fin), len(r_fin))
+    failures += gate("pinfalls", want, share(s["pinfalls"], b_fin), prop_tol(want, len(r_fin)))
+    mean_beats = sum(r.beats for r in r_fin) / max(1, len(r_fin))
+    failures += gate("mean beats", mean_beats, s["mean_beats"], float(args.beats_tol) * mean_beats, ".1f")
+
+    print("PARITY OK" if failures == 0 else f"PARITY FAILED ({failures})")
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+"""Build the endgame tablebase (endgame.py) the CPU ships with.
+
+Solves every shard (escape play per deck and kind, pin-or-press per deck) in
+a process pool and packs them into one file. Each finished shard is written
+to .sim_cache/endgame/ under a key of its inputs (deck, rules, pin-model
+parameters), so an interrupted build resumes where it stopped and a rebuild
+after changing --keep only re-solves the pin shards. Use --fresh after
+changing the escape rules in endgame.py.
+
+Usage:
+    python tools/build_endgame_table.py [--keep 0.8] [--press-damage 6] [--workers N]
+        [--cache-dir .sim_cache/endgame] [--fresh] [--out endgame_table.bin]
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+
+def _shard_key(shard: tuple[str, str, str], params: dict, version: int, dist: dict) -> str:
+    blob = json.dumps(
+        {"shard": list(shard), "params": params if shard[0] == "pin" else {}, "version": version, "dist": sorted(dist.items())},
+        sort_keys=True,
+    )
+    return f"{shard[0]}-{shard[1].lower()}{'-' + shard[2].lower() if shard[2] else ''}-{hashlib.sha1(blob.encode('utf-8')).hexdigest()[:12]}.bin"
+
+
+def _pins(values: tuple[float, float]) -> bool:
+    return values[0] >= values[1]
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import endgame
+    import sim
+    from cards import deck_distribution
+    from engine import TUNING_PIN_ESCAPE_THRESHOLD_MULT_ON_SUCCESS
+    from wrestler import MAX_HEALTH
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--keep", type=float, default=endgame.PRESS_KEEP_DEFAULT, help="chance the attacker gets another opening")
+    ap.add_argument("--press-damage", type=int, default=endgame.PRESS_DAMAGE_DEFAULT, help="HP dealt before that opening")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--cache-dir", default=str(root / ".sim_cache" / "endgame"))
+    ap.add_argument("--fresh", action="store_true", help="re-solve every shard")
+    ap.add_argument("--out", default=str(root / endgame.ENDGAME_TABLE_FILENAME))
+    args = ap.parse_args(argv)
+
+    if not 0.0 < float(args.keep) < 1.0:
+        ap.error("--keep must be between 0 and 1")
+    if int(args.press_damage) < 1:
+        ap.error("--press-damage must be at least 1")
+
+    params = {
+        "max_health": int(MAX_HEALTH),
+        "keep": float(args.keep),
+        "press_damage": int(args.press_damage),
+        "mult_step": float(TUNING_PIN_ESCAPE_THRESHOLD_MULT_ON_SUCCESS),
+    }
+    cache_dir = Path(args.cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    parts: dict[tuple[str, str, str], bytes] = {}
+    todo: dict[tuple[str, str, str], Path] = {}
+    for shard in endgame.shards():
+        path = cache_dir / _shard_key(shard, params, endgame.ENDGAME_TABLE_VERSION, deck_distribution(shard[1]))
+        if path.exists() and not args.fresh:
+            parts[shard] = path.read_bytes()
+        else:
+            todo[shard] = path
+    print(f"{len(parts) + len(todo)} shards; {len(parts)} cached, {len(todo)} to solve")
+
+    t0 = time.perf_counter()
+    if todo:
+        workers = max(1, min(len(todo), int(args.workers or sim.default_workers())))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(endgame.build_shard, (*shard, params)) for shard in todo]
+            for k, fut in enumerate(as_completed(futures), 1):
+                shard, data = fut.result()
+                _write_atomic(todo[shard], data)
+                parts[shard] = data
+                print(f"\r{k}/{len(todo)} shards solved", end="", flush=True)
+        print(f" in {time.perf_counter() - t0:.1f}s")
+
+    data = endgame.pack_table(parts, params)
+    _write_atomic(Path(args.out), data)
+    table = endgame.EndgameTable.from_bytes(data)
+
+    reps = 20000
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        table.pin_or_press("BALANCED", 30, 1.0, 5, 5)
+        table.escape_card("BALANCED", "PINFALL", 12, 3, (2, 4, 6, 8, 9))
+    us = (time.perf_counter() - t0) / reps * 1e6
+
+    print(f"wrote {args.out} ({len(data) / 1024:.1f} KiB); one pin + one escape lookup {us:.1f} us")
+    print("pin instead of pressing at or below (fresh multiplier, full hand of 5):")
+    for arch in endgame.ARCHETYPES:
+        pins = [hp for hp in range(int(MAX_HEALTH) + 1) if _pins(table.pin_or_press(arch, hp, 1.0, 5, 5))]
+        cutoff = max(pins, default=0)
+        print(f"  {arch:<10} {cutoff} HP")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""Simulate career weeks headless and print the standings.
+
+Every match on each weekly card (the player's included) is simulated in a
+process pool; results, ratings and limb carry-over go to the career database,
+and with --history every match is also added to the match-history store.
+
+Usage:
+    python tools/career_sim.py [--weeks 52] [--db career.sqlite3] [--player slug]
+        [--seed N] [--new] [--workers N] [--history history.sqlite3]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import career
+    import history
+    from wrestler_roster import DEFAULT_PLAYER_PROFILE, ROSTER
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--weeks", type=int, default=52)
+    ap.add_argument("--db", default=career.CAREER_DB_FILENAME)
+    ap.add_argument("--player", default=DEFAULT_PLAYER_PROFILE)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--new", action="store_true", help="start a fresh career (wipes the database)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--history", help="also record every match into this match-history database")
+    args = ap.parse_args(argv)
+    if args.player not in ROSTER:
+        ap.error(f"unknown slug: {args.player}")
+
+    store = career.CareerStore(args.db)
+    hist = history.HistoryStore(args.history) if args.history else None
+    writer = history.HistoryWriter(hist) if hist is not None else None
+    try:
+        if args.new or not store.active:
+            store.new_career(args.player, list(ROSTER), seed=args.seed)
+        start = store.week
+        n = 0
+
+        def progress(week: int, results: list[dict]) -> None:
+            nonlocal n
+            n += len(results)
+            print(f"\rweek {week}: {n} matches", end="", flush=True)
+
+        t0 = time.perf_counter()
+        career.simulate_weeks(store, args.weeks, workers=args.workers, history=writer, progress=progress)
+        if writer is not None:
+            writer.flush()
+        dt = time.perf_counter() - t0
+        print(f"\nweeks {start}-{store.week - 1}: {n} matches in {dt:.1f}s\n")
+
+        print(f"{'wrestler':<20} {'rating':>7} {'W':>4} {'L':>4} {'D':>4}  limbs H/B/L")
+        for row in store.standings():
+            limbs = store.limbs_for(row["slug"])
+            print(
+                f"{row['slug']:<20} {row['rating']:>7.0f} {row['wins']:>4} {row['losses']:>4} {row['draws']:>4}"
+                f"  {limbs['HEAD']}/{limbs['BODY']}/{limbs['LEGS']}"
+            )
+    finally:
+        store.close()
+        if hist is not None:
+            hist.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Consistency check for the match-history store (history.py).
+
+Plays seeded headless matches (mirror matches, the same slug in both
+corners, included), writes them to a throwaway store and checks that the
+rollups agree with the rows they summarize:
+
+- per wrestler and move, move_totals attempts / landed / damage equal the
+  sums over move_usage, and matches equals the number of matches that
+  wrestler used the move in;
+- each match's move_usage rows add up to the engine's move_usage for the
+  wrestler (both corners together for a mirror match);
+- the stored winner corner and winner slug match the result.
+
+Usage:
+    python tools/history_check.py [--matches 20] [--mirrors 5] [--seed 0]
+
+Exits 1 if any check fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import random
+import sys
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import history
+    from engine import simulate_match
+    from wrestler_roster import ROSTER
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--matches", type=int, default=20, help="matches between two different wrestlers")
+    ap.add_argument("--mirrors", type=int, default=5, help="matches with the same wrestler in both corners")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    rnd = random.Random(int(args.seed))
+    slugs = sorted(ROSTER)
+    pairs = [tuple(rnd.sample(slugs, 2)) for _ in range(int(args.matches))]
+    pairs += [(s, s) for s in (rnd.choice(slugs) for _ in range(int(args.mirrors)))]
+
+    store = history.HistoryStore(":memory:")
+    failures = 0
+    try:
+        expected: dict[int, dict[tuple[str, str], list[int]]] = {}
+        with history.HistoryWriter(store) as writer:
+            for k, (red, blue) in enumerate(pairs):
+                seed = int(args.seed) * 100003 + k
+                res = simulate_match(red, blue, seed=seed)
+                rec = history.record_from_result(red, blue, res, seed=seed)
+                rec.content_hash = f"check:{seed}"
+                writer.add(rec)
+                want = expected.setdefault(seed, {})
+                for side, slug in (("red", red), ("blue", blue)):
+                    for move, v in rec.moves.get(side, {}).items():
+                        row = want.setdefault((slug, move), [0, 0, 0])
+                        for i in range(3):
+                            row[i] += int(v[i])
+
+        conn = store.conn
+        for m in conn.execute("SELECT id, seed, red_slug, blue_slug, winner, winner_slug FROM matches"):
+            got = {
+                (r["wrestler_slug"], r["move_slug"]): [r["attempts"], r["landed"], r["damage"]]
+                for r in conn.execute("SELECT * FROM move_usage WHERE match_id = ?", (m["id"],))
+            }
+            if got != expected[int(m["seed"])]:
+                failures += 1
+                print(f"  move_usage: seed {m['seed']} ({m['red_slug']} vs {m['blue_slug']}) differs from the engine  FAIL")
+            corner_slug = {"red": m["red_slug"], "blue": m["blue_slug"]}.get(m["winner"])
+            if corner_slug != m["winner_slug"]:
+                failures += 1
+                print(f"  winner: seed {m['seed']} corner {m['winner']} vs slug {m['winner_slug']}  FAIL")
+
+        rollup = conn.execute(
+            "SELECT t.wrestler_slug, t.move_slug, t.matches, t.attempts, t.landed, t.damage, "
+            "u.matches AS u_matches, u.attempts AS u_attempts, u.landed AS u_landed, u.damage AS u_damage FROM move_totals t "
+            "LEFT JOIN (SELECT wrestler_slug, move_slug, COUNT(*) AS matches, SUM(attempts) AS attempts, SUM(landed) AS landed, "
+            "SUM(damage) AS damage FROM move_usage GROUP BY wrestler_slug, move_slug) u USING (wrestler_slug, move_slug)"
+        ).fetchall()
+        bad = [r for r in rollup if tuple(r[2:6]) != tuple(r[6:10])]
+        failures += len(bad)
+        for r in bad[:10]:
+            print(f"  move_totals: {r['wrestler_slug']} {r['move_slug']} {tuple(r[2:6])} vs move_usage {tuple(r[6:10])}  FAIL")
+        print(f"{len(pairs)} matches ({int(args.mirrors)} mirrors), {len(rollup)} move_totals rows")
+    finally:
+        store.close()
+
+    print("HISTORY OK" if failures == 0 else f"HISTORY FAILED ({failures})")
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+"""Import exported match logs into the match-history database.
+
+Parses match_logs/match_log_*.txt (the app's EXPORT LOG format) in a process
+pool, one streaming pass per file, and stores each match with its per-move
+usage and its clash / damage / escape trail. Files are keyed by the hash of
+their contents, so running it again only imports new logs.
+
+Usage:
+    python tools/import_match_logs.py [paths ...] [--db history.sqlite3] [--workers N] [-v]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import history
+    import match_log
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("paths", nargs="*", default=[str(root / "match_logs")], help="log files or directories (default: match_logs/)")
+    ap.add_argument("--db", default=history.HISTORY_DB_FILENAME)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("-v", "--verbose", action="store_true", help="print every file's status")
+    args = ap.parse_args(argv)
+
+    def progress(path: str, status: str) -> None:
+        if args.verbose or status.startswith("error"):
+            print(f"{status:<8} {path}")
+
+    store = history.HistoryStore(args.db)
+    try:
+        t0 = time.perf_counter()
+        counts = match_log.import_logs(store, args.paths, workers=args.workers, progress=progress)
+        dt = time.perf_counter() - t0
+        total = sum(counts.values())
+        print(
+            f"{total} files in {dt:.1f}s: {counts['new']} imported, {counts['skipped']} already imported, "
+            f"{counts['duplicate']} duplicates, {counts['empty']} without a match, {counts['error']} errors"
+        )
+        print(f"{store.match_count()} matches in {args.db}")
+    finally:
+        store.close()
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,246 @@
+"""Move ablation / sensitivity: which moves actually decide matches?
+
+For each selected move the tool builds variants:
+
+- remove:        drop the move from every roster moveset that lists it
+                 (moves every wrestler gets automatically can't be removed)
+- damage+k/-k, cost+k/-k, hype_gain+k/-k:  perturb the moves_db record
+
+Each variant is A/B'd against baseline with common random numbers
+(sim.run_ab_many), only on the pairings where at least one wrestler can use
+the move. All variants share one process pool. The report gives, per move and
+variant, the change in each carrier's win rate and in match length.
+
+Results are cached in .sim_cache/move_ablation.json. The key is a hash of the
+move record, the variant, the carrier movesets and the run settings, so
+unchanged moves are skipped on later runs. Use --fresh after changes to
+engine rules or other moves.
+
+Usage:
+    python tools/move_ablation.py [--moves slug,slug,...] [-k 2] [--kinds remove,damage]
+        [--only wrestler,wrestler,...] [--max 200] [--workers N] [--fresh] [--json out.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+from pathlib import Path
+import sys
+import time
+
+
+CACHE_VERSION = 1
+PERTURB_FIELDS = ("damage", "cost", "hype_gain")
+
+
+def _carriers(slugs: list[str]) -> dict[str, list[str]]:
+    """Effective moveset per wrestler (after Wrestler adds its base moves)."""
+    from wrestler import Wrestler
+    from wrestler_roster import ROSTER
+
+    return {s: list(Wrestler("X", True, profile=dict(ROSTER[s])).moveset or []) for s in slugs}
+
+
+def _variants(move: str, rec: dict, k: int, kinds: set[str], slugs: list[str]) -> dict[str, dict]:
+    from wrestler_roster import ROSTER
+
+    out: dict[str, dict] = {}
+    if "remove" in kinds:
+        roster = {}
+        for s in slugs:
+            ms = list(ROSTER[s].get("moveset") or [])
+            if move in ms:
+                roster[s] = {"moveset": [m for m in ms if m != move]}
+        if roster:
+            out["remove"] = {"roster": roster}
+    for fld in PERTURB_FIELDS:
+        if fld not in kinds:
+            continue
+        try:
+            base = int(rec.get(fld, 0) or 0)
+        except Exception:
+            continue
+        for sign in (+1, -1):
+            val = max(0, base + sign * int(k))
+            if val != base:
+                out[f"{fld}{sign * int(k):+d}"] = {"moves": {move: {fld: val}}}
+    return out
+
+
+def _cache_key(move: str, rec: dict, name: str, variant: dict, pairs, movesets: dict, params: dict) -> str:
+    blob = json.dumps(
+        [CACHE_VERSION, move, rec, name, variant, pairs, movesets, params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _per_wrestler(rows: list[list]) -> dict[str, dict]:
+    """Fold pair rows [player, cpu, n, effect, se, d_beats, se_beats] into per-wrestler means."""
+    acc: dict[str, list] = {}
+    for p, c, n, eff, se, db, seb in rows:
+        for who, sign in ((p, 1.0), (c, -1.0)):
+            a = acc.setdefault(who, [0, 0.0, 0.0, 0.0, 0.0, 0])
+            a[0] += 1
+            a[1] += sign * eff
+            a[2] += se * se
+            a[3] += db
+            a[4] += seb * seb
+            a[5] += n
+    out = {}
+    for who, (m, eff, var, db, varb, n) in acc.items():
+        out[who] = {
+            "effect": eff / m,
+            "se": math.sqrt(var) / m,
+            "d_beats": db / m,
+            "se_beats": math.sqrt(varb) / m,
+            "pairs": m,
+            "matches": n,
+        }
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import sim
+    from moves_db import MOVES
+    from wrestler_roster import ROSTER
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--moves", default="", help="comma-separated move slugs (default: every move some wrestler can use)")
+    ap.add_argument("-k", type=int, default=2, help="perturbation size for damage/cost/hype_gain")
+    ap.add_argument("--kinds", default="remove," + ",".join(PERTURB_FIELDS), help="subset of remove,damage,cost,hype_gain")
+    ap.add_argument("--only", default="", help="comma-separated wrestler slugs (default: whole roster)")
+    ap.add_argument("--halfwidth", type=float, default=0.03)
+    ap.add_argument("--min", type=int, default=sim.SIM_MIN_MATCHES)
+    ap.add_argument("--max", type=int, default=200)
+    ap.add_argument("--chunk", type=int, default=sim.SIM_CHUNK)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--cache", default=str(root / ".sim_cache" / "move_ablation.json"))
+    ap.add_argument("--fresh", action="store_true", help="ignore cached results")
+    ap.add_argument("--json", help="also write the report here")
+    args = ap.parse_args(argv)
+
+    slugs = [s.strip() for s in args.only.split(",") if s.strip()] or list(ROSTER)
+    unknown = [s for s in slugs if s not in ROSTER]
+    if unknown:
+        ap.error(f"unknown wrestlers: {', '.join(unknown)}")
+    kinds = {s.strip() for s in args.kinds.split(",") if s.strip()}
+    bad_kinds = kinds - {"remove", *PERTURB_FIELDS}
+    if bad_kinds:
+        ap.error(f"unknown kinds: {', '.join(sorted(bad_kinds))}")
+
+    movesets = _carriers(slugs)
+    used = {m for ms in movesets.values() for m in ms}
+    moves = [s.strip() for s in args.moves.split(",") if s.strip()] or [m for m in MOVES if m in used]
+    bad_moves = [m for m in moves if m not in MOVES]
+    if bad_moves:
+        ap.error(f"unknown moves: {', '.join(bad_moves)}")
+
+    all_pairs = sim.round_robin_pairs(slugs)
+    params = {
+        "k": int(args.k),
+        "halfwidth": float(args.halfwidth),
+        "min": int(args.min),
+        "max": int(args.max),
+        "chunk": int(args.chunk),
+        "seed": int(args.seed),
+    }
+
+    cache_path = Path(args.cache)
+    cache: dict = {}
+    if cache_path.exists() and not args.fresh:
+        try:
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        except Exception:
+            cache = {}
+
+    # name -> (move, kind, variant, pairs, cache key)
+    jobs: dict[str, tuple] = {}
+    results: dict[str, dict] = {}
+    for move in moves:
+        rec = dict(MOVES[move])
+        carriers = sorted(s for s in slugs if move in movesets[s])
+        if not carriers:
+            continue
+        pairs = [p for p in all_pairs if p[0] in carriers or p[1] in carriers]
+        ms_key = {s: movesets[s] for s in carriers}
+        for kind, variant in _variants(move, rec, args.k, kinds, slugs).items():
+            name = f"{move}:{kind}"
+            key = _cache_key(move, rec, kind, variant, pairs, ms_key, params)
+            if key in cache:
+                results[name] = cache[key]
+            else:
+                jobs[name] = (move, kind, variant, pairs, key)
+
+    print(f"{len(results) + len(jobs)} variants over {len(moves)} moves; {len(results)} cached, {len(jobs)} to run")
+    t0 = time.perf_counter()
+    if jobs:
+        stats = sim.run_ab_many(
+            all_pairs,
+            {name: job[2] for name, job in jobs.items()},
+            pairs_by_variant={name: job[3] for name, job in jobs.items()},
+            workers=args.workers,
+            target_halfwidth=args.halfwidth,
+            min_matches=args.min,
+            max_matches=args.max,
+            chunk=args.chunk,
+            seed=args.seed,
+        )
+        rows: dict[str, list] = {name: [] for name in jobs}
+        for (name, (p, c)), st in stats.items():
+            rows[name].append([p, c, st.d_score.n, st.effect, st.d_score.stderr, st.d_beats.mean, st.d_beats.stderr])
+        for name, (move, kind, variant, _pairs, key) in jobs.items():
+            rec = {"move": move, "kind": kind, "variant": variant, "pairs": rows[name]}
+            cache[key] = rec
+            results[name] = rec
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache, sort_keys=True), encoding="utf-8")
+        tmp.replace(cache_path)
+    dt = time.perf_counter() - t0
+
+    report = []
+    for name, rec in results.items():
+        per = _per_wrestler(rec["pairs"])
+        carriers = [s for s in per if rec["move"] in movesets.get(s, [])]
+        report.append({"name": name, "move": rec["move"], "kind": rec["kind"], "wrestlers": per, "carriers": carriers})
+
+    print(f"{'variant':<36} {'wrestler':<20} {'d win%':>7} {'95% CI':>16} {'d beats':>8} {'n':>5}")
+    for r in sorted(report, key=lambda r: (r["move"], r["kind"])):
+        for who in r["carriers"]:
+            w = r["wrestlers"][who]
+            half = sim.SIM_Z * w["se"]
+            print(
+                f"{r['name']:<36} {who:<20} {w['effect'] * 100:>+6.1f} "
+                f"[{(w['effect'] - half) * 100:>+6.1f},{(w['effect'] + half) * 100:>+6.1f}] "
+                f"{w['d_beats']:>+8.1f} {w['matches']:>5}"
+            )
+
+    # Dominance: how much carriers lose, on average, when the move is taken away.
+    removed = [r for r in report if r["kind"] == "remove" and r["carriers"]]
+    if removed:
+        print("\nmost load-bearing moves (carrier win rate lost on removal):")
+        scored = []
+        for r in removed:
+            vals = [r["wrestlers"][w]["effect"] for w in r["carriers"]]
+            scored.append((sum(vals) / len(vals), r["move"], len(vals)))
+        for eff, move, n in sorted(scored)[:15]:
+            print(f"  {move:<32} {-eff * 100:>+6.1f}%  ({n} carriers)")
+
+    print(f"\ndone in {dt:.1f}s")
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
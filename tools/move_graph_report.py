@@ -0,0 +1,56 @@
+"""Audit the move state-transition graph for every roster profile.
+
+Prints, per profile: beats from neutral to a pin-ready / finisher position,
+moveset moves that can never become legal, reachable positions with an empty
+menu, and positions neither wrestler can get out of (soft-locks).
+
+Usage:
+    python tools/move_graph_report.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+
+def main() -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    from move_graph import NEUTRAL, UNREACHABLE, TransitionGraph
+    from move_index import build_legality_index
+    from moves_db import MOVES
+    from wrestler import Wrestler
+    from wrestler_roster import ROSTER
+
+    index = build_legality_index(MOVES)
+    everyone = TransitionGraph(MOVES, index, moveset=None)
+    problems = 0
+
+    def beats(d: int) -> str:
+        return "never" if d >= UNREACHABLE else str(d)
+
+    for slug, prof in ROSTER.items():
+        w = Wrestler("CPU", False, profile=dict(prof))
+        graph = TransitionGraph(MOVES, index, moveset=w.moveset, finisher=w.finisher)
+        unreachable = graph.unreachable_moves(opponent=everyone)
+        dead = graph.dead_ends(opponent=everyone)
+        locks = graph.soft_locks(opponent=everyone)
+        problems += len(unreachable) + len(dead) + len(locks)
+
+        print(f"{slug}: pin-ready in {beats(graph.distance_to(NEUTRAL, 'pin'))}, "
+              f"finisher ({w.finisher}) in {beats(graph.distance_to(NEUTRAL, 'finisher'))}")
+        if unreachable:
+            print(f"  unreachable moves: {', '.join(unreachable)}")
+        if dead:
+            print(f"  empty-menu positions: {dead}")
+        if locks:
+            print(f"  soft-lock positions: {locks}")
+
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+"""Adaptive ROSTER round-robin: win-rate matrix with confidence intervals.
+
+Every pairing is simulated headless until its 95% Wilson interval is narrower
+than --width or excludes 50%, whichever comes first (see sim.run_adaptive).
+Lopsided pairs stop early; close ones keep the workers. With --history
+every match played is also added to the match-history store.
+
+Usage:
+    python tools/roster_round_robin.py [--width 0.10] [--max 400] [--workers N]
+        [--both-seats] [--only slug,slug,...] [--seed 0] [--history history.sqlite3]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import history
+    import sim
+    from wrestler_roster import ROSTER
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--width", type=float, default=sim.SIM_TARGET_WIDTH, help="target interval width")
+    ap.add_argument("--min", type=int, default=sim.SIM_MIN_MATCHES, help="matches before a pair may stop")
+    ap.add_argument("--max", type=int, default=sim.SIM_MAX_MATCHES, help="matches cap per pair")
+    ap.add_argument("--chunk", type=int, default=sim.SIM_CHUNK, help="matches per worker task")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--both-seats", action="store_true", help="also play B vs A (seat bias)")
+    ap.add_argument("--only", default="", help="comma-separated slugs (default: whole roster)")
+    ap.add_argument("--history", help="also record every match into this match-history database")
+    args = ap.parse_args(argv)
+
+    slugs = [s.strip() for s in args.only.split(",") if s.strip()] or list(ROSTER)
+    unknown = [s for s in slugs if s not in ROSTER]
+    if unknown:
+        ap.error(f"unknown slugs: {', '.join(unknown)}")
+
+    pairs = sim.round_robin_pairs(slugs, both_seats=bool(args.both_seats))
+    hist = history.HistoryStore(args.history) if args.history else None
+    writer = history.HistoryWriter(hist) if hist is not None else None
+    t0 = time.perf_counter()
+    try:
+        stats = sim.run_adaptive(
+            pairs,
+            workers=args.workers,
+            target_width=args.width,
+            min_matches=args.min,
+            max_matches=args.max,
+            chunk=args.chunk,
+            seed=args.seed,
+            history=writer,
+        )
+        if writer is not None:
+            writer.flush()
+    finally:
+        if hist is not None:
+            hist.close()
+    dt = time.perf_counter() - t0
+
+    print(f"{'player':<20} {'cpu':<20} {'n':>4} {'win%':>6} {'95% CI':>15} {'beats':>6}  stop")
+    for (p, c), st in stats.items():
+        lo, hi = st.interval()
+        print(
+            f"{p:<20} {c:<20} {st.n:>4} {st.win_rate * 100:>5.1f}% "
+            f"[{lo * 100:>5.1f},{hi * 100:>5.1f}] {st.beats.mean:>6.1f}  {st.reason}"
+        )
+
+    used = sum(st.n for st in stats.values())
+    fixed = len(pairs) * int(args.max)
+    print(f"\n{len(pairs)} pairs, {used} matches in {dt:.1f}s (fixed budget would be {fixed}, {used / max(1, fixed):.0%})")
+    if writer is not None:
+        print(f"{writer.written} matches added to {args.history}")
+
+    # Overall standing: average win rate per wrestler across its pairings.
+    score: dict[str, list[float]] = {s: [] for s in slugs}
+    for (p, c), st in stats.items():
+        score[p].append(st.win_rate)
+        score[c].append(1.0 - st.win_rate)
+    print("\nstanding (mean win rate):")
+    for s in sorted(slugs, key=lambda s: -sum(score[s]) / max(1, len(score[s]))):
+        vals = score[s]
+        print(f"  {s:<20} {sum(vals) / max(1, len(vals)) * 100:5.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
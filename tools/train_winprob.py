@@ -0,0 +1,189 @@
+"""Train the win-probability model (winprob.py) from simulated matches.
+
+Two steps, each reproducible from its arguments:
+
+    simulate  play seeded headless matches over the roster round robin (both
+              seats) in a process pool and write one CSV row per sampled
+              beat: match, beat, seats, outcome and the feature vector. Its
+              arguments go to a <out>.meta.json sidecar.
+    train     fit a logistic regression to a samples file (matches that hit
+              the beat cap are dropped), report held-out log loss / Brier /
+              calibration and write the model JSON. Every fifth match is held
+              out, so beats from one match never land on both sides. The
+              model's meta records both commands.
+
+Usage:
+    python tools/train_winprob.py simulate [--matches 20] [--every 1] [--seed 0] [--workers N] [--out winprob_samples.csv.gz]
+    python tools/train_winprob.py train [--samples winprob_samples.csv.gz] [--l2 0.001] [--out winprob_model.json]
+
+train needs numpy.
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import gzip
+import json
+from pathlib import Path
+import sys
+import time
+
+
+HOLDOUT_EVERY = 5  # match_id % HOLDOUT_EVERY == 0 is held out
+
+
+def _open(path: str, mode: str):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def _sidecar(samples: str) -> Path:
+    return Path(str(samples) + ".meta.json")
+
+
+def simulate(args) -> int:
+    import sim
+    import winprob
+    from wrestler_roster import ROSTER
+
+    slugs = [s.strip() for s in args.only.split(",") if s.strip()] or list(ROSTER)
+    jobs = []
+    for p, c in sim.round_robin_pairs(slugs, both_seats=True):
+        for i in range(int(args.matches)):
+            jobs.append((len(jobs), p, c, sim.pair_seed(args.seed, p, c, i), int(args.every)))
+
+    workers = max(1, int(args.workers or sim.default_workers()))
+    t0 = time.perf_counter()
+    n_rows = 0
+    with _open(args.out, "w") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        out = csv.writer(f)
+        out.writerow(["match", "beat", "player", "cpu", "seed", "winner", *winprob.FEATURES])
+        # map() keeps job order, so the file is identical for any worker count.
+        for k, (match_id, p, c, seed, winner, rows) in enumerate(pool.map(winprob.sample_job, jobs, chunksize=8), 1):
+            for beat, x in rows:
+                out.writerow([match_id, beat, p, c, seed, winner or "", *(f"{v:.6g}" for v in x)])
+            n_rows += len(rows)
+            if k % 50 == 0 or k == len(jobs):
+                print(f"\r{k}/{len(jobs)} matches, {n_rows} samples", end="", flush=True)
+    cmd = f"python tools/train_winprob.py simulate --matches {int(args.matches)} --every {int(args.every)} --seed {int(args.seed)}"
+    if args.only:
+        cmd += f" --only {args.only}"
+    _sidecar(args.out).write_text(json.dumps({"command": cmd, "matches": len(jobs)}, indent=2) + "\n", encoding="utf-8")
+    print(f"\nwrote {args.out} in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+def train(args) -> int:
+    import winprob
+
+    winprob._require_numpy()
+    np = winprob.np
+
+    X_tr, y_tr, X_te, y_te = [], [], [], []
+    matches = set()
+    with _open(args.samples, "r") as f:
+        rows = csv.reader(f)
+        header = next(rows)
+        feats = tuple(header[6:])
+        if feats != winprob.FEATURES:
+            raise SystemExit("samples were written with a different feature set; re-run simulate")
+        for r in rows:
+            winner = r[5]
+            if winner not in ("player", "cpu"):
+                continue
+            match_id = int(r[0])
+            matches.add(match_id)
+            x = [float(v) for v in r[6:]]
+            y = 1.0 if winner == "player" else 0.0
+            if match_id % HOLDOUT_EVERY == 0:
+                X_te.append(x)
+                y_te.append(y)
+            else:
+                X_tr.append(x)
+                y_tr.append(y)
+    if not X_tr:
+        raise SystemExit("no decided matches in the samples file")
+
+    t0 = time.perf_counter()
+    weights, bias = winprob.fit_logistic(np.array(X_tr), np.array(y_tr), l2=args.l2)
+    model = winprob.WinModel(weights=weights, bias=bias)
+    fit_s = time.perf_counter() - t0
+
+    train_scores = winprob.scores(model, X_tr, y_tr)
+    test_scores = winprob.scores(model, X_te, y_te) if X_te else None
+    try:
+        simulated = json.loads(_sidecar(args.samples).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        simulated = {}
+    model.meta = {
+        "samples_file": Path(args.samples).name,
+        "commands": {
+            "simulate": simulated.get("command"),
+            "train": f"python tools/train_winprob.py train --samples {Path(args.samples).name} --l2 {float(args.l2):g}",
+        },
+        "matches": len(matches),
+        "l2": float(args.l2),
+        "train": train_scores,
+        "holdout": test_scores,
+    }
+
+    x0 = X_te[0] if X_te else X_tr[0]
+    reps = 20000
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        model.predict(x0)
+    us = (time.perf_counter() - t0) / reps * 1e6
+
+    print(f"fit {len(X_tr)} samples from {len(matches)} matches in {fit_s:.2f}s; predict {us:.1f} us")
+    for name, sc in (("train", train_scores), ("holdout", test_scores)):
+        if sc:
+            print(
+                f"{name:<8} n={sc['n']:<7} log loss {sc['log_loss']:.4f}  brier {sc['brier']:.4f}  "
+                f"accuracy {sc['accuracy'] * 100:.1f}%  (base rate {sc['base_rate'] * 100:.1f}%)"
+            )
+    if X_te:
+        print("\ncalibration (holdout): predicted -> observed (n)")
+        for pred, obs, n in winprob.calibration(model, X_te, y_te):
+            print(f"  {pred * 100:5.1f}% -> {obs * 100:5.1f}%  ({n})")
+    print("\nweights:")
+    for name, w in sorted(zip(winprob.FEATURES, weights), key=lambda t: -abs(t[1])):
+        print(f"  {name:<10} {w:+.3f}")
+    print(f"  {'bias':<10} {bias:+.3f}")
+
+    Path(args.out).write_text(json.dumps(model.to_json(), indent=2) + "\n", encoding="utf-8")
+    print(f"\nwrote {args.out}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    import winprob
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    s = sub.add_parser("simulate", help="write per-beat samples from seeded headless matches")
+    s.add_argument("--matches", type=int, default=20, help="matches per ordered pairing")
+    s.add_argument("--every", type=int, default=1, help="sample every N beats")
+    s.add_argument("--only", default="", help="comma-separated wrestler slugs (default: whole roster)")
+    s.add_argument("--seed", type=int, default=0)
+    s.add_argument("--workers", type=int, default=None)
+    s.add_argument("--out", default="winprob_samples.csv.gz")
+
+    t = sub.add_parser("train", help="fit the model to a samples file")
+    t.add_argument("--samples", default="winprob_samples.csv.gz")
+    t.add_argument("--l2", type=float, default=1e-3)
+    t.add_argument("--out", default=str(root / winprob.WINPROB_MODEL_FILENAME))
+
+    args = ap.parse_args(argv)
+    return simulate(args) if args.cmd == "simulate" else train(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
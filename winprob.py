@@ -0,0 +1,273 @@
+"""Win-probability model: P(player seat wins) from the live match state.
+
+A logistic regression over a handful of features the engine already tracks
+(HP, limbs, grit, hype, momentum, positions, deck strength). It is trained
+offline by tools/train_winprob.py from simulated matches and shipped as
+winprob_model.json; evaluating it is one short dot product, a few
+microseconds per beat.
+
+Uses:
+- the HUD's WIN % readout (Main_kivy);
+- CPU dynamic difficulty (engine CPU_DYNAMIC_DIFFICULTY, off by default,
+  via MatchEngine.win_model / win_probability());
+- pruning for search-based AIs: is_decided() says a position is already won
+  or lost and needs no deeper look.
+
+Training needs numpy (pip install numpy); evaluating does not.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import math
+import os
+
+try:
+    import numpy as np
+except Exception:  # optional dependency (training only)
+    np = None
+
+from engine import HEADLESS_MAX_BEATS, MOMENTUM_MAX_ABS, simulate_match
+from wrestler import MAX_HEALTH, GrappleRole, WrestlerState
+
+
+WINPROB_MODEL_FILENAME = "winprob_model.json"
+WINPROB_MODEL_VERSION = 1
+# is_decided(): positions beyond this (either way) are treated as settled.
+WINPROB_DECIDED = 0.95
+# Pin/submission danger zone for the low-HP indicator features.
+WINPROB_LOW_HP_PCT = 0.30
+
+FEATURES: tuple[str, ...] = (
+    "hp_p",
+    "hp_c",
+    "low_hp_p",
+    "low_hp_c",
+    "head_d",
+    "body_d",
+    "legs_d",
+    "grit_d",
+    "hype_d",
+    "momentum",
+    "deck_p",
+    "deck_c",
+    "down_p",
+    "down_c",
+    "control_p",
+    "control_c",
+    "hurt_p",
+    "hurt_c",
+)
+
+
+def _side(w) -> tuple[float, ...]:
+    hp = max(0.0, min(1.0, float(w.hp) / float(MAX_HEALTH)))
+    limbs = w.body_parts or {}
+    try:
+        deck = float(w.strength_current()) / float(max(1, w.strength_max()))
+    except Exception:
+        deck = 0.0
+    hurt = bool(getattr(w, "is_groggy", False)) or int(getattr(w, "stun_turns", 0) or 0) > 0 or int(getattr(w, "daze_turns", 0) or 0) > 0
+    return (
+        hp,
+        1.0 if hp < WINPROB_LOW_HP_PCT else 0.0,
+        float(limbs.get("HEAD", 100)) / 100.0,
+        float(limbs.get("BODY", 100)) / 100.0,
+        float(limbs.get("LEGS", 100)) / 100.0,
+        float(w.grit) / float(max(1, int(w.max_grit))),
+        float(w.hype) / 100.0,
+        deck,
+        1.0 if getattr(w, "state", None) == WrestlerState.GROUNDED else 0.0,
+        1.0 if getattr(w, "grapple_role", None) == GrappleRole.OFFENSE else 0.0,
+        1.0 if hurt else 0.0,
+    )
+
+
+def features(eng) -> list[float]:
+    """Feature vector (in FEATURES order) for a MatchEngine, player seat first."""
+    p = _side(eng.player)
+    c = _side(eng.cpu)
+    mom = max(-1.0, min(1.0, float(getattr(eng, "momentum", 0) or 0) / float(MOMENTUM_MAX_ABS)))
+    return [
+        p[0],
+        c[0],
+        p[1],
+        c[1],
+        p[2] - c[2],
+        p[3] - c[3],
+        p[4] - c[4],
+        p[5] - c[5],
+        p[6] - c[6],
+        mom,
+        p[7],
+        c[7],
+        p[8],
+        c[8],
+        p[9],
+        c[9],
+        p[10],
+        c[10],
+    ]
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+@dataclass
+class WinModel:
+    """Logistic regression on FEATURES (weights on the raw, unscaled features)."""
+
+    weights: list[float]
+    bias: float
+    features: tuple[str, ...] = FEATURES
+    meta: dict = field(default_factory=dict)
+
+    def predict(self, x: list[float]) -> float:
+        z = self.bias
+        for w, v in zip(self.weights, x):
+            z += w * v
+        return _sigmoid(z)
+
+    def evaluate(self, eng) -> float:
+        return self.predict(features(eng))
+
+    def to_json(self) -> dict:
+        return {
+            "version": WINPROB_MODEL_VERSION,
+            "features": list(self.features),
+            "weights": [float(w) for w in self.weights],
+            "bias": float(self.bias),
+            "meta": dict(self.meta),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "WinModel":
+        if int(data.get("version", 0)) != WINPROB_MODEL_VERSION:
+            raise ValueError(f"unsupported model version: {data.get('version')}")
+        feats = tuple(str(f) for f in data.get("features") or ())
+        if feats != FEATURES:
+            raise ValueError("model was trained on a different feature set; retrain it")
+        weights = [float(w) for w in data["weights"]]
+        if len(weights) != len(FEATURES):
+            raise ValueError("weight count does not match the feature set")
+        return cls(weights=weights, bias=float(data["bias"]), features=feats, meta=dict(data.get("meta") or {}))
+
+
+def default_model_path() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), WINPROB_MODEL_FILENAME)
+
+
+def load_model(path: str | None = None) -> WinModel | None:
+    """Load a trained model; None if it is missing or stale."""
+    try:
+        with open(path or default_model_path(), "r", encoding="utf-8") as f:
+            return WinModel.from_json(json.load(f))
+    except Exception:
+        return None
+
+
+def is_decided(p: float, threshold: float = WINPROB_DECIDED) -> bool:
+    """True when a win probability is close enough to 0 or 1 to stop searching."""
+    return float(p) >= float(threshold) or float(p) <= 1.0 - float(threshold)
+
+
+# --- training ----------------------------------------------------------------------
+
+
+def sample_match(
+    player: str,
+    cpu: str,
+    seed: int,
+    *,
+    every: int = 1,
+    max_beats: int = HEADLESS_MAX_BEATS,
+) -> tuple[str | None, list[tuple[int, list[float]]]]:
+    """Play one seeded match; (winner, [(beat, features), ...]) every `every` beats."""
+    rows: list[tuple[int, list[float]]] = []
+    step = max(1, int(every))
+
+    def on_beat(eng) -> None:
+        beat = int(eng.clash_count)
+        if beat % step == 0:
+            rows.append((beat, features(eng)))
+
+    res = simulate_match(player, cpu, seed=int(seed), max_beats=max_beats, on_beat=on_beat)
+    return res.winner, rows
+
+
+def sample_job(job: tuple) -> tuple:
+    """Process-pool wrapper: (match_id, player, cpu, seed, every) -> (..., winner, rows)."""
+    match_id, player, cpu, seed, every = job
+    winner, rows = sample_match(player, cpu, seed, every=every)
+    return match_id, player, cpu, seed, winner, rows
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("training the win-probability model needs numpy (pip install numpy)")
+
+
+def fit_logistic(X, y, *, l2: float = 1e-3, iters: int = 30, tol: float = 1e-8) -> tuple[list[float], float]:
+    """Newton / IRLS fit with an L2 penalty. X: (n, d), y: (n,) in {0, 1}.
+
+    Features are standardized for the solve and the weights mapped back, so
+    the penalty treats every feature alike.
+    """
+    _require_numpy()
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n, d = X.shape
+    mu = X.mean(axis=0)
+    sd = X.std(axis=0)
+    sd[sd < 1e-9] = 1.0
+    Z = np.hstack([np.ones((n, 1)), (X - mu) / sd])
+    beta = np.zeros(d + 1)
+    reg = np.full(d + 1, float(l2) * n)
+    reg[0] = 0.0
+    for _ in range(int(iters)):
+        p = 1.0 / (1.0 + np.exp(-np.clip(Z @ beta, -30, 30)))
+        grad = Z.T @ (p - y) + reg * beta
+        H = (Z * (p * (1.0 - p))[:, None]).T @ Z + np.diag(reg)
+        step = np.linalg.solve(H, grad)
+        beta -= step
+        if float(np.max(np.abs(step))) < tol:
+            break
+    w = beta[1:] / sd
+    b = float(beta[0] - np.sum(w * mu))
+    return [float(v) for v in w], b
+
+
+def scores(model: WinModel, X, y) -> dict:
+    """Log loss, Brier score and accuracy of `model` on (X, y)."""
+    _require_numpy()
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    z = X @ np.asarray(model.weights) + model.bias
+    p = np.clip(1.0 / (1.0 + np.exp(-z)), 1e-9, 1 - 1e-9)
+    return {
+        "n": int(len(y)),
+        "log_loss": float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))),
+        "brier": float(np.mean((p - y) ** 2)),
+        "accuracy": float(np.mean((p >= 0.5) == (y >= 0.5))),
+        "base_rate": float(np.mean(y)),
+    }
+
+
+def calibration(model: WinModel, X, y, *, bins: int = 10) -> list[tuple[float, float, int]]:
+    """[(mean predicted, observed win rate, count)] per probability bin."""
+    _require_numpy()
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    p = 1.0 / (1.0 + np.exp(-(X @ np.asarray(model.weights) + model.bias)))
+    idx = np.minimum((p * bins).astype(int), bins - 1)
+    out = []
+    for b in range(bins):
+        m = idx == b
+        if m.any():
+            out.append((float(p[m].mean()), float(y[m].mean()), int(m.sum())))
+    return out
@@ -4,10 +4,18 @@ from dataclasses import dataclass
 from enum import Enum
 
 from cards import Card, Deck
+from zobrist import WrestlerHasher
 
 
 MAX_HEALTH = 100
 
+_HASHER = WrestlerHasher(MAX_HEALTH)
+
+
+def set_hash_hp_edges(edges) -> bool:
+    """HP% cutoffs Wrestler hashes bucket HP by (see zobrist); True if they changed."""
+    return _HASHER.set_hp_edges(edges)
+
 
 DEFAULT_BRAWLER_MOVESET: list[str] = [
     # Neutral
@@ -346,6 +354,65 @@ class Wrestler:
         else:
             self.mistake_prob = 0.15
 
+    # --- Zobrist hash (see zobrist.py) ---
+    # Assignments to tracked fields only mark them dirty; the hash re-keys
+    # just those fields the next time it is read.
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name in _HASHER.fields:
+            self.__dict__.setdefault("_zdirty", set()).add(name)
+
+    def refresh_hash(self, *fields: str) -> None:
+        """Re-key fields changed in place (hand, body_parts); no args = recompute everything."""
+        d = self.__dict__
+        if not fields:
+            d["_zparts"] = {}
+            d["_zhash"] = 0
+            d["_zcards"] = 0
+            fields = tuple(f for f in _HASHER.fields if f in d)
+        d.setdefault("_zdirty", set()).update(fields)
+
+    def _zsync(self) -> None:
+        d = self.__dict__
+        dirty = d.get("_zdirty")
+        if "_zparts" not in d:
+            d["_zparts"] = {}
+            d["_zhash"] = 0
+            d["_zcards"] = 0
+        if d.get("_zhp_edges") is not _HASHER.hp_edges:
+            # HP cutoffs changed since HP was keyed (set_hash_hp_edges).
+            d["_zhp_edges"] = _HASHER.hp_edges
+            if "hp" in d:
+                dirty = d.setdefault("_zdirty", set())
+                dirty.add("hp")
+        if not dirty:
+            return
+        parts = d["_zparts"]
+        h = d["_zhash"]
+        hc = d["_zcards"]
+        for name in dirty:
+            new = _HASHER.part(name, d.get(name))
+            delta = parts.get(name, 0) ^ new
+            parts[name] = new
+            h ^= delta
+            if name in _HASHER.card_fields:
+                hc ^= delta
+        d["_zhash"] = h
+        d["_zcards"] = hc
+        dirty.clear()
+
+    @property
+    def zhash(self) -> int:
+        """64-bit hash of this wrestler's decision-relevant state."""
+        self._zsync()
+        return int(self.__dict__["_zhash"])
+
+    @property
+    def zhash_cards(self) -> int:
+        """Hash of just what card-play choices read (hand, grit, card bonuses)."""
+        self._zsync()
+        return int(self.__dict__["_zcards"])
+
     def has_doubles_in_hand(self) -> bool:
         if not self.hand:
             return False
@@ -452,6 +519,7 @@ class Wrestler:
             return
         self.hand.extend(self.deck.draw(need))
         self.hand.sort(key=lambda c: c.value)
+        self.refresh_hash("hand")
 
     def deck_remaining(self) -> int:
         if self.deck is None:
@@ -483,6 +551,7 @@ class Wrestler:
             if c in self.hand:
                 self.hand.remove(c)
                 self.deck.discards.append(c)
+        self.refresh_hash("hand")
 
     def take_damage(self, amount: int, *, target_part: str | None = None, limb_scale: float = 2.0) -> int:
         """Apply HP damage and (optionally) limb damage.
@@ -503,6 +572,7 @@ class Wrestler:
         before = int(self.body_parts.get(part, 100))
         after = max(0, before - max(0, int(amount)))
         self.body_parts[part] = after
+        self.refresh_hash("body_parts")
         return before - after
 
     def set_state(self, new_state: WrestlerState) -> None:
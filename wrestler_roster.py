@@ -8,6 +8,8 @@ from __future__ import annotations
 
 # NOTE: Profiles are lightweight dictionaries consumed by Wrestler(profile=...).
 # They can be expanded over time (archetype, moveset, stats, cosmetics, etc.).
+# Optional "ai_weights" overrides CPU move-scoring weights by term name
+# (see engine.cpu_score_weights / cpu_scoring.TERMS).
 
 ROSTER: dict[str, dict] = {
     # NOTE: Roster keys are slugs (stable IDs). Displayed names live in profile fields.
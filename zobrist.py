@@ -0,0 +1,204 @@
+"""Zobrist hashing of the decision-relevant match state, and the CPU's
+transposition table.
+
+Every tracked (field, value) pair has a fixed pseudo-random 64-bit key; a
+wrestler's hash is the XOR of the keys of its current field values. A
+Wrestler updates its hash incrementally: assigning a tracked field (and the
+in-place hand / limb changes in draw_to_full, discard_cards, damage_limb)
+marks that field, and reading the hash XORs out the field's old key and in
+the new one. Nothing is ever rehashed from scratch.
+
+A position is the two wrestlers seen from one seat, plus momentum
+(position_key). Card-play candidates only depend on a few of the actor's
+own fields, so they get a narrower key (cards_key) and are reused when
+only the opponent changed (e.g. the CPU re-thinking after the player fires
+up or shops).
+
+Values are bucketed where the CPU only compares them against thresholds:
+
+- HP by where it sits relative to every HP% cutoff the CPU's scoring and
+  move legality read: below, on or above each. Two HPs in one bucket give
+  the same answer to every such comparison, so reuse is exact. The cutoffs
+  come from the engine's tuning constants (engine.cpu_hp_edges(), handed to
+  the hasher with set_hp_edges); when they change, hashes re-key HP and the
+  engine drops the positions stored under the old ones;
+- limbs likewise against LIMB_EDGES, hype in steps of HYPE_BUCKET;
+- counters the CPU only tests for "> 0" (defensive cooldown, daze, fired up)
+  by that test.
+
+The hand is keyed in order (cards are (value, color); uids don't matter), so
+cached card candidates can be stored as hand indices.
+
+Keys come from blake2b of the (field, value) pair, so hashes are the same
+in every process.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from enum import Enum
+from functools import lru_cache
+import hashlib
+import threading
+from typing import Callable, Hashable
+
+
+# Limb cutoffs (0..100): critical (< 25) and concussed / winded / hobbled (< 30).
+LIMB_EDGES: tuple[int, ...] = (25, 30)
+HYPE_BUCKET = 25
+
+# The fields CPU card-play candidates depend on (with the move and MOVES);
+# Wrestler.zhash_cards covers just these.
+CARD_FIELDS: frozenset[str] = frozenset({"hand", "grit", "fired_up_turns_remaining", "next_card_bonus"})
+
+# Default number of positions kept by a TranspositionTable.
+TT_DEFAULT_SIZE = 4096
+
+_MASK64 = (1 << 64) - 1
+
+
+@lru_cache(maxsize=8192)
+def zkey(field: str, value: Hashable) -> int:
+    """The 64-bit key of one (field, bucketed value) pair."""
+    digest = hashlib.blake2b(repr((field, value)).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _side(x: float, edge: float) -> int:
+    return (x > edge) - (x < edge)
+
+
+def hp_bucket(hp: int, max_health: int, edges: tuple[float, ...]) -> tuple[int, ...]:
+    pct = max(0.0, min(1.0, int(hp) / max_health))
+    return tuple(_side(pct, e) for e in edges)
+
+
+def limb_bucket(body_parts) -> tuple:
+    parts = dict(body_parts or {})
+    return tuple((p, tuple(_side(int(parts[p]), e) for e in LIMB_EDGES)) for p in sorted(parts))
+
+
+def hand_key(hand) -> tuple:
+    return tuple((int(c.value), str(c.color)) for c in (hand or ()))
+
+
+def _enum(v):
+    return v.value if isinstance(v, Enum) else v
+
+
+def _positive(v) -> bool:
+    try:
+        return int(v or 0) > 0
+    except Exception:
+        return False
+
+
+def _bucket_fns(hasher: "WrestlerHasher", max_health: int) -> dict[str, Callable]:
+    return {
+        "state": _enum,
+        "grapple_role": _enum,
+        "hp": lambda v: hp_bucket(v, max_health, hasher.hp_edges),
+        "grit": int,
+        "hype": lambda v: int(v or 0) // HYPE_BUCKET,
+        "body_parts": limb_bucket,
+        "hand": hand_key,
+        "chain_window": lambda v: v,
+        "recent_attack_moves": lambda v: tuple(v or ()),
+        "last_move_name": lambda v: v,
+        "defensive_cooldown_turns": _positive,
+        "daze_turns": _positive,
+        "is_groggy": bool,
+        "fired_up_turns_remaining": _positive,
+        "next_card_bonus": int,
+        "moveset": lambda v: None if v is None else tuple(v),
+        "finisher": lambda v: v,
+        "weight_class": lambda v: v,
+        "profile": lambda v: tuple(sorted((str(k), repr(x)) for k, x in dict((v or {}).get("ai_weights") or {}).items())),
+    }
+
+
+class WrestlerHasher:
+    """Per-field bucketing and keys for one wrestler class."""
+
+    def __init__(self, max_health: int) -> None:
+        self.hp_edges: tuple[float, ...] = ()
+        self.buckets = _bucket_fns(self, int(max_health))
+        self.fields = frozenset(self.buckets)
+        self.card_fields = CARD_FIELDS
+
+    def set_hp_edges(self, edges) -> bool:
+        """Bucket HP by these HP% cutoffs from now on; True if they changed.
+
+        A new tuple object is the signal: hashes keyed under the old one
+        re-key HP the next time they are read.
+        """
+        edges = tuple(sorted({float(e) for e in edges}))
+        if edges == self.hp_edges:
+            return False
+        self.hp_edges = edges
+        return True
+
+    def part(self, field: str, value) -> int:
+        try:
+            return zkey(field, self.buckets[field](value))
+        except Exception:
+            # Unbucketable junk still gets a key, it just never matches a clean value.
+            return zkey(field, ("?", repr(value)))
+
+
+def _mix(h: int) -> int:
+    # splitmix64 finalizer: keeps player/cpu from cancelling when states are equal.
+    h = (h + 0x9E3779B97F4A7C15) & _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return h ^ (h >> 31)
+
+
+def position_key(actor, opponent, momentum: int) -> int:
+    """Hash of the position as `actor` sees it (momentum in actor's favour)."""
+    return int(actor.zhash) ^ _mix(int(opponent.zhash)) ^ zkey("momentum", int(momentum))
+
+
+_CARDS_SALT = zkey("cards", None)
+
+
+def cards_key(actor) -> int:
+    """Hash of what `actor`'s card-play candidates depend on."""
+    return actor.zhash_cards ^ _CARDS_SALT
+
+
+class TranspositionTable:
+    """Bounded LRU of per-position dicts. Thread-safe (CPU thinking runs on workers)."""
+
+    def __init__(self, maxsize: int = TT_DEFAULT_SIZE) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self._entries: OrderedDict[int, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entry(self, key: int) -> dict:
+        """The slot for a position (created empty, evicting the oldest if full)."""
+        with self._lock:
+            slot = self._entries.get(key)
+            if slot is None:
+                slot = {}
+                self._entries[key] = slot
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return slot
+
+    def note(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()